@@ -23,7 +23,6 @@ import json
 import logging
 import os
 import sys
-import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -34,12 +33,13 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from src.lib.callback_server import CallbackServer, start_server
+from src.lib.callback_server import CallbackServer, get_server
 from src.services.airtable_callback_handler import (
+    AirtableCallbackWriter,
     get_handler_stats,
     register_airtable_handler,
 )
-from src.services.signalhire_client import APIResponse, SignalHireAPIError, SignalHireClient
+from src.services.signalhire_client import SignalHireAPIError, SignalHireClient
 
 
 def _configure_logging(level: str) -> None:
@@ -91,13 +91,13 @@ def _parse_args() -> argparse.Namespace:
         "--chunk-size",
         type=int,
         default=75,
-        help="Maximum number of prospects to send per API batch (<=100) [default: 75]",
+        help="Prospects packed into one Person API request (<=100) [default: 75]",
     )
     reveal_group.add_argument(
         "--reveal-batch-size",
         type=int,
         default=10,
-        help="Concurrent reveals within each batch [default: 10]",
+        help="Concurrent Person API requests in flight [default: 10]",
     )
     reveal_group.add_argument(
         "--dry-run",
@@ -138,7 +138,10 @@ def _parse_args() -> argparse.Namespace:
         "--wait-for-callbacks",
         type=int,
         default=20,
-        help="Seconds to wait after reveals for callbacks to arrive [default: 20]",
+        help=(
+            "Maximum seconds to wait for callbacks when the callback server runs "
+            "in-process; the run ends as soon as all of them arrive [default: 20]"
+        ),
     )
 
     parser.add_argument(
@@ -213,45 +216,94 @@ def _save_snapshot(output_dir: Path, search_data: dict[str, Any]) -> Path:
     return path
 
 
-async def _reveal_chunk(
-    client: SignalHireClient,
-    chunk: list[str],
-    batch_size: int,
-) -> list[APIResponse]:
-    return await client.batch_reveal_contacts(chunk, batch_size=batch_size)
+def _log_failures(failures: list[tuple[str, str | None]]) -> None:
+    for prospect_id, error in failures[:5]:
+        logging.error("Reveal failed for %s: %s", prospect_id, error)
+    if len(failures) > 5:
+        logging.error("%s additional failures not shown", len(failures) - 5)
 
 
-async def _run_workflow(args: argparse.Namespace) -> None:
-    load_dotenv()
-
-    api_key = os.getenv("SIGNALHIRE_API_KEY")
-    if not api_key:
-        raise RuntimeError("SIGNALHIRE_API_KEY is not set in the environment")
+async def _submit_reveals(
+    client: SignalHireClient,
+    prospects: list[str],
+    callback_url: str | None,
+    args: argparse.Namespace,
+) -> None:
+    """Submit reveal requests; results are handled wherever the callbacks land."""
+    successes: list[tuple[str, str | None]] = []
+    failures: list[tuple[str, str | None]] = []
+
+    async for result in client.stream_reveal(
+        prospects,
+        items_per_request=args.chunk_size,
+        max_in_flight=args.reveal_batch_size,
+        callback_url=callback_url,
+    ):
+        response = result.response
+        if response.success:
+            request_id = None
+            if response.data:
+                request_id = response.data.get("requestId") or response.data.get("request_id")
+            successes.append((result.item, request_id))
+        else:
+            failures.append((result.item, response.error))
 
-    configured_callback_url = os.getenv("SIGNALHIRE_CALLBACK_URL") or os.getenv(
-        "PUBLIC_CALLBACK_URL"
+    logging.info(
+        "Reveal requests submitted: %s succeeded, %s failed",
+        len(successes),
+        len(failures),
     )
-    callback_url = configured_callback_url
-    callback_server: CallbackServer | None = None
+    _log_failures(failures)
 
-    if args.start_callback_server:
-        callback_server = start_server(host=args.callback_host, port=args.callback_port, background=True)
-        register_airtable_handler(callback_server)
-        inferred_url = f"http://{args.callback_host}:{args.callback_port}/signalhire/callback"
-        callback_url = configured_callback_url or inferred_url
-        logging.info("Callback server started at %s", inferred_url)
-        if not configured_callback_url:
-            logging.warning(
-                "SIGNALHIRE_CALLBACK_URL/PUBLIC_CALLBACK_URL not set; using %s for outgoing reveal requests.\n"
-                "Ensure this URL is reachable by SignalHire (e.g., via tunnel or public reverse proxy).",
-                inferred_url,
-            )
-    else:
-        if not configured_callback_url:
-            raise RuntimeError(
-                "SIGNALHIRE_CALLBACK_URL or PUBLIC_CALLBACK_URL is not set. Either export one of them or run with --start-callback-server."
-            )
 
+async def _reveal_and_wait(
+    client: SignalHireClient,
+    prospects: list[str],
+    callback_url: str | None,
+    args: argparse.Namespace,
+) -> None:
+    """Reveal through the in-process callback server, logging contacts as they land.
+
+    Returns as soon as every callback has arrived, or after
+    ``--wait-for-callbacks`` seconds at most.
+    """
+    revealed = 0
+    failures: list[tuple[str, str | None]] = []
+
+    async for completion in client.iter_revealed(
+        prospects,
+        timeout=args.wait_for_callbacks,
+        items_per_request=args.chunk_size,
+        max_in_flight=args.reveal_batch_size,
+        callback_url=callback_url,
+    ):
+        if completion.succeeded:
+            revealed += 1
+            logging.info(
+                "Contact revealed for %s (%s/%s)", completion.item, revealed, len(prospects)
+            )
+        else:
+            failures.append((completion.item, completion.error or completion.status))
+
+    outstanding = len(prospects) - revealed - len(failures)
+    logging.info(
+        "Reveal finished: %s revealed, %s failed, %s still outstanding",
+        revealed,
+        len(failures),
+        outstanding,
+    )
+    _log_failures(failures)
+    logging.debug("Callback stats: %s", get_handler_stats())
+
+
+async def _run_job(
+    args: argparse.Namespace,
+    api_key: str,
+    callback_url: str | None,
+    *,
+    wait_in_process: bool,
+) -> None:
+    """Search, then reveal the prospects found."""
     async with SignalHireClient(api_key=api_key, callback_url=callback_url) as client:
         search_payload = _build_search_payload(args)
         logging.debug("Search payload: %s", search_payload)
@@ -284,59 +336,62 @@ async def _run_workflow(args: argparse.Namespace) -> None:
             logging.info("Dry run complete. Reveal not requested. Snapshot=%s", snapshot_path)
             return
 
-        successes: list[tuple[str, str | None]] = []
-        failures: list[tuple[str, str | None]] = []
-
-        for i in range(0, len(prospects), args.chunk_size):
-            chunk = prospects[i : i + args.chunk_size]
-            logging.info("Revealing chunk %s - %s", i + 1, i + len(chunk))
+        logging.info(
+            "Revealing %s prospects in requests of up to %s items (%s in flight)",
+            len(prospects),
+            args.chunk_size,
+            args.reveal_batch_size,
+        )
 
-            responses = await _reveal_chunk(
-                client,
-                chunk,
-                batch_size=min(args.reveal_batch_size, len(chunk)),
-            )
+        if wait_in_process and args.wait_for_callbacks > 0:
+            await _reveal_and_wait(client, prospects, callback_url, args)
+        else:
+            await _submit_reveals(client, prospects, callback_url, args)
 
-            for prospect_id, response in zip(chunk, responses, strict=False):
-                if response.success:
-                    request_id = None
-                    if response.data:
-                        request_id = response.data.get("requestId") or response.data.get("request_id")
-                    successes.append((prospect_id, request_id))
-                else:
-                    failures.append((prospect_id, response.error))
 
-            logging.info(
-                "Chunk complete: %s successes, %s failures", len(successes), len(failures)
-            )
+async def _run_workflow(args: argparse.Namespace) -> None:
+    load_dotenv()
 
-        logging.info(
-            "Reveal requests submitted: %s succeeded, %s failed",
-            len(successes),
-            len(failures),
-        )
+    api_key = os.getenv("SIGNALHIRE_API_KEY")
+    if not api_key:
+        raise RuntimeError("SIGNALHIRE_API_KEY is not set in the environment")
 
-        if failures:
-            for prospect_id, error in failures[:5]:
-                logging.error("Reveal failed for %s: %s", prospect_id, error)
-            if len(failures) > 5:
-                logging.error("%s additional failures not shown", len(failures) - 5)
+    configured_callback_url = os.getenv("SIGNALHIRE_CALLBACK_URL") or os.getenv(
+        "PUBLIC_CALLBACK_URL"
+    )
+    callback_url = configured_callback_url
+    callback_server: CallbackServer | None = None
+    airtable_writer: AirtableCallbackWriter | None = None
 
-        if args.wait_for_callbacks > 0:
-            logging.info(
-                "Waiting %s seconds for callbacks to arrive before exiting...",
-                args.wait_for_callbacks,
+    if args.start_callback_server:
+        # Served on this event loop so handlers and reveal waiters share it
+        callback_server = get_server(host=args.callback_host, port=args.callback_port)
+        airtable_writer = register_airtable_handler(callback_server)
+        await callback_server.astart()
+        inferred_url = f"http://{args.callback_host}:{callback_server.port}/signalhire/callback"
+        callback_url = configured_callback_url or inferred_url
+        logging.info("Callback server started at %s", inferred_url)
+        if not configured_callback_url:
+            logging.warning(
+                "SIGNALHIRE_CALLBACK_URL/PUBLIC_CALLBACK_URL not set; using %s for outgoing reveal requests.\n"
+                "Ensure this URL is reachable by SignalHire (e.g., via tunnel or public reverse proxy).",
+                inferred_url,
+            )
+    else:
+        if not configured_callback_url:
+            raise RuntimeError(
+                "SIGNALHIRE_CALLBACK_URL or PUBLIC_CALLBACK_URL is not set. Either export one of them or run with --start-callback-server."
             )
-            end_time = time.time() + args.wait_for_callbacks
-            while time.time() < end_time:
-                stats = get_handler_stats()
-                logging.debug("Callback stats: %s", stats)
-                await asyncio.sleep(1)
 
+    try:
+        await _run_job(args, api_key, callback_url, wait_in_process=callback_server is not None)
+    finally:
         if callback_server:
-            logging.info(
-                "Callback server ran in-process for this job; the server ends when this script exits."
-            )
+            await callback_server.astop()
+            logging.info("Callback server stopped")
+        if airtable_writer:
+            # Same event loop as the server, so pending batches can be flushed here
+            await airtable_writer.aclose()
 
 
 def main() -> None:
@@ -1,23 +1,32 @@
 #!/usr/bin/env python3
 """Entry point to run the SignalHire callback server in production.
 
-The script wires up the FastAPI callback server with the Airtable handler so
-that every webhook received from SignalHire is processed immediately. It is
-meant to be deployed on a long-lived compute target (e.g. DigitalOcean App
-Platform or Droplet) and kept running under a process supervisor.
+The script wires up the FastAPI callback server with the Airtable handler and
+the local contact cache so that every webhook received from SignalHire is
+processed immediately. It is meant to be deployed on a long-lived compute
+target (e.g. DigitalOcean App Platform or Droplet) and kept running under a
+process supervisor.
+
+With ``--processes N`` the script forks N server processes that share the
+port through ``SO_REUSEPORT`` and a SQLite callback store (``--store``), so
+JSON parsing and handler work spread over every core during reveal bursts.
 """
 
 from __future__ import annotations
 
 import argparse
 import logging
+import multiprocessing
 import signal
 import sys
+from pathlib import Path
 from typing import NoReturn
 
 from dotenv import load_dotenv
 
 from src.lib.callback_server import get_server
+from src.lib.callback_store import SharedCallbackStore
+from src.lib.contact_cache import get_contact_cache
 from src.services.airtable_callback_handler import register_airtable_handler
 
 
@@ -36,6 +45,37 @@ def parse_args() -> argparse.Namespace:
         default=8000,
         help="Port to listen on for SignalHire callbacks [default: 8000]",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Workers draining logged callbacks into handlers [default: 4]",
+    )
+    parser.add_argument(
+        "--max-backlog",
+        type=int,
+        default=1000,
+        help="Unprocessed callbacks before answering 503 [default: 1000]",
+    )
+    parser.add_argument(
+        "--wal-dir",
+        default=None,
+        help="Callback write-ahead log directory [default: ~/.signalhire-agent/callbacks/wal]",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Server processes sharing the port via SO_REUSEPORT [default: 1]",
+    )
+    parser.add_argument(
+        "--store",
+        default=None,
+        help=(
+            "Shared SQLite callback store used by every process; implied by "
+            "--processes > 1 [default: ~/.signalhire-agent/callbacks/callbacks.db]"
+        ),
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -44,10 +84,28 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def run_server(host: str, port: int) -> NoReturn:
+def run_server(
+    host: str,
+    port: int,
+    workers: int = 4,
+    max_backlog: int = 1000,
+    wal_dir: str | None = None,
+    store_path: str | None = None,
+    reuse_port: bool = False,
+) -> NoReturn:
     """Start the callback server and block until interrupted."""
-    server = get_server(host=host, port=port)
+    server = get_server(
+        host=host,
+        port=port,
+        workers=workers,
+        max_backlog=max_backlog,
+        wal_dir=wal_dir,
+        store_path=store_path,
+        reuse_port=reuse_port,
+    )
     register_airtable_handler(server)
+    # Stamps revealed contacts so the reveal command can tell when they go stale
+    server.register_handler("contact_cache", get_contact_cache().record_callback)
 
     # Ensure the FastAPI application is instantiated before starting uvicorn
     if server.app is None:
@@ -67,11 +125,55 @@ def main() -> None:
         format="%(asctime)s %(levelname)s %(name)s - %(message)s",
     )
 
+    if args.processes > 1:
+        run_processes(args)
+        return
+
     # Allow graceful shutdown with Ctrl+C or SIGTERM
     for sig in (signal.SIGINT, signal.SIGTERM):
         signal.signal(sig, lambda *_: sys.exit(0))
 
-    run_server(args.host, args.port)
+    run_server(
+        args.host, args.port, args.workers, args.max_backlog, args.wal_dir, args.store
+    )
+
+
+def run_processes(args: argparse.Namespace) -> None:
+    """Run ``--processes`` servers on one port, sharing the callback store."""
+    store_path = args.store or str(SharedCallbackStore().path)
+    Path(store_path).parent.mkdir(parents=True, exist_ok=True)
+    kwargs = {
+        "host": args.host,
+        "port": args.port,
+        "workers": args.workers,
+        "max_backlog": args.max_backlog,
+        "store_path": store_path,
+        "reuse_port": True,
+    }
+    processes = [
+        multiprocessing.Process(target=run_server, kwargs=kwargs, name=f"callback-{i}")
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    logging.info(
+        "Started %s callback server processes on %s:%s (store %s)",
+        len(processes),
+        args.host,
+        args.port,
+        store_path,
+    )
+
+    def shutdown(*_: object) -> None:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, shutdown)
+
+    for process in processes:
+        process.join()
 
 
 if __name__ == "__main__":
@@ -14,6 +14,13 @@ import click
 import httpx
 from click import echo, style
 
+from ..lib.rate_limit_registry import get_rate_limit_registry
+from ..services.airtable_client import (
+    AirtableClient,
+    AirtableClientError,
+    shared_airtable_client,
+)
+
 # Add project root to path for imports
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
@@ -151,35 +158,30 @@ def status():
     # Check Airtable integration status
     if airtable_token and airtable_base_id:
         try:
-            import httpx
             echo(f"\n📋 Airtable Integration:")
             
             # Test connection to Airtable
             base_id = airtable_base_id
             table_id = os.getenv('AIRTABLE_TABLE_ID', 'tbl0uFVaAfcNjT2rS')
             
-            url = f"https://api.airtable.com/v0/{base_id}/{table_id}"
-            headers = {"Authorization": f"Bearer {airtable_token}"}
-            params = {"maxRecords": 3, "fields": ["Full Name", "Status"]}
-            
-            with httpx.Client() as client:
-                response = client.get(url, headers=headers, params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    records = data.get('records', [])
-                    echo(f"   🟢 Connection: ✅ Active")
-                    echo(f"   📊 Table ID: {table_id}")
-                    echo(f"   📝 Sample Records: {len(records)} found")
-                    
-                    # Count by status if available
-                    if records:
-                        statuses = {}
-                        for record in records:
-                            status = record.get('fields', {}).get('Status', 'Unknown')
-                            statuses[status] = statuses.get(status, 0) + 1
-                        echo(f"   📈 Status Distribution: {dict(statuses)}")
-                else:
-                    echo(f"   🔴 Connection: ❌ Failed (HTTP {response.status_code})")
+            try:
+                records = asyncio.run(_sample_airtable_records(airtable_token, base_id, table_id))
+            except AirtableClientError as e:
+                if e.status_code is None:
+                    raise
+                echo(f"   🔴 Connection: ❌ Failed (HTTP {e.status_code})")
+            else:
+                echo(f"   🟢 Connection: ✅ Active")
+                echo(f"   📊 Table ID: {table_id}")
+                echo(f"   📝 Sample Records: {len(records)} found")
+                
+                # Count by status if available
+                if records:
+                    statuses = {}
+                    for record in records:
+                        status = record.get('fields', {}).get('Status', 'Unknown')
+                        statuses[status] = statuses.get(status, 0) + 1
+                    echo(f"   📈 Status Distribution: {dict(statuses)}")
                     
         except Exception as e:
             echo(f"   ⚠️  Airtable check failed: {e}")
@@ -312,11 +314,14 @@ async def _execute_direct_sync(signalhire_api_key: str, airtable_api_key: str,
             echo(f"   ... and {len(ids_to_sync) - 5} more")
         return
     
-    # Sync each contact
+    # Fetch each contact, then write them to Airtable in 10-record batches
     successful_syncs = 0
     failed_syncs = 0
+    pending: dict[str, tuple[str, dict]] = {}
     
-    async with httpx.AsyncClient() as client:
+    async with httpx.AsyncClient(
+        event_hooks=get_rate_limit_registry().event_hooks()
+    ) as client:
         for uid in ids_to_sync:
             try:
                 echo(f"🔄 Syncing contact {uid}...")
@@ -325,13 +330,11 @@ async def _execute_direct_sync(signalhire_api_key: str, airtable_api_key: str,
                 contact_data = await _fetch_signalhire_contact(client, signalhire_api_key, uid)
                 
                 if contact_data:
-                    # Push to Airtable
-                    await _update_airtable_contact(
-                        client, airtable_api_key, airtable_base_id, 
-                        airtable_table_id, uid, contact_data
-                    )
-                    successful_syncs += 1
-                    echo(f"   ✅ Successfully synced {contact_data.get('fullName', uid)}")
+                    update_fields = _format_signalhire_data_for_airtable(contact_data)
+                    update_fields['SignalHire ID'] = uid
+                    # Debug logging for field data
+                    echo(f"   📋 Formatted fields for {uid}: {list(update_fields.keys())}")
+                    pending[uid] = (contact_data.get('fullName', uid), update_fields)
                 else:
                     failed_syncs += 1
                     echo(f"   ⚠️  No contact data available for {uid}")
@@ -340,41 +343,54 @@ async def _execute_direct_sync(signalhire_api_key: str, airtable_api_key: str,
                 failed_syncs += 1
                 echo(f"   ❌ Failed to sync {uid}: {e}")
     
+    if pending:
+        async with shared_airtable_client(airtable_api_key) as airtable:
+            written = await _write_airtable_contacts(
+                airtable, airtable_base_id, airtable_table_id,
+                {uid: fields for uid, (_, fields) in pending.items()},
+            )
+        for uid, (name, _) in pending.items():
+            if uid in written:
+                successful_syncs += 1
+                echo(f"   ✅ Successfully synced {name}")
+            else:
+                failed_syncs += 1
+    
     echo(f"\n📊 Sync Results:")
     echo(f"   ✅ Successful: {successful_syncs}")
     echo(f"   ❌ Failed: {failed_syncs}")
     echo(f"   📋 Total: {len(ids_to_sync)}")
 
 
+async def _sample_airtable_records(api_key: str, base_id: str, table_id: str) -> list[dict]:
+    """Fetch a few records to check the Airtable connection."""
+    async with shared_airtable_client(api_key) as client:
+        return await client.list_records(
+            base_id, table_id, fields=["Full Name", "Status"], max_records=3
+        )
+
+
 async def _find_airtable_contacts_to_sync(airtable_api_key: str, airtable_base_id: str, 
                                          airtable_table_id: str, max_contacts: int) -> list[str]:
     """Find contacts in Airtable that have SignalHire IDs but missing contact info."""
-    
-    async with httpx.AsyncClient() as client:
+    async with shared_airtable_client(airtable_api_key) as client:
         # Search for records with SignalHire ID but no Primary Email
-        url = f"https://api.airtable.com/v0/{airtable_base_id}/{airtable_table_id}"
-        headers = {"Authorization": f"Bearer {airtable_api_key}"}
-        
-        params = {
-            "filterByFormula": "AND(NOT({SignalHire ID} = ''), OR({Primary Email} = '', {Primary Email} = BLANK()))",
-            "maxRecords": max_contacts,
-            "fields": ["SignalHire ID", "Full Name"]
-        }
-        
-        response = await client.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        records = data.get('records', [])
-        
-        signalhire_ids = []
-        for record in records:
-            fields = record.get('fields', {})
-            signalhire_id = fields.get('SignalHire ID')
-            if signalhire_id:
-                signalhire_ids.append(signalhire_id)
-        
-        return signalhire_ids
+        records = await client.list_records(
+            airtable_base_id,
+            airtable_table_id,
+            formula="AND(NOT({SignalHire ID} = ''), OR({Primary Email} = '', {Primary Email} = BLANK()))",
+            max_records=max_contacts,
+            fields=["SignalHire ID", "Full Name"],
+        )
+    
+    signalhire_ids = []
+    for record in records:
+        fields = record.get('fields', {})
+        signalhire_id = fields.get('SignalHire ID')
+        if signalhire_id:
+            signalhire_ids.append(signalhire_id)
+    
+    return signalhire_ids
 
 
 async def _fetch_signalhire_contact(client: httpx.AsyncClient, api_key: str, uid: str) -> dict | None:
@@ -394,65 +410,58 @@ async def _fetch_signalhire_contact(client: httpx.AsyncClient, api_key: str, uid
         return None
 
 
-async def _update_airtable_contact(client: httpx.AsyncClient, api_key: str, base_id: str,
-                                  table_id: str, signalhire_id: str, contact_data: dict):
-    """Update or create contact in Airtable with improved deduplication."""
-    # First, find existing record by SignalHire ID
-    url = f"https://api.airtable.com/v0/{base_id}/{table_id}"
-    headers = {"Authorization": f"Bearer {api_key}"}
-    
-    # Enhanced search for existing record with better filtering
-    search_params = {
-        "filterByFormula": f"{{SignalHire ID}} = '{signalhire_id}'",
-        "maxRecords": 10  # Get more records to catch all duplicates
-    }
-    
-    response = await client.get(url, headers=headers, params=search_params)
-    response.raise_for_status()
-    
-    existing_records = response.json().get('records', [])
-    
-    # If multiple records found, log warning about duplicates
-    if len(existing_records) > 1:
-        echo(f"   ⚠️  Found {len(existing_records)} existing records for {signalhire_id}")
-        # Sort by creation date to keep the oldest/most complete
-        existing_records.sort(key=lambda r: r.get('createdTime', ''))
-        echo(f"   🔄 Will update the first record: {existing_records[0]['id']}")
-        
-        # Log duplicate record IDs for manual cleanup
-        duplicate_ids = [r['id'] for r in existing_records[1:]]
-        if duplicate_ids:
-            echo(f"   📝 Duplicate records found: {duplicate_ids}")
-            # Could add automatic cleanup here later
-    
-    # Prepare update fields from SignalHire data
-    update_fields = _format_signalhire_data_for_airtable(contact_data)
-    update_fields['SignalHire ID'] = signalhire_id
-    
-    # Debug logging for field data
-    echo(f"   📋 Formatted fields for {signalhire_id}: {list(update_fields.keys())}")
-    
+async def _write_airtable_contacts(client: AirtableClient, base_id: str, table_id: str,
+                                   contacts: dict[str, dict]) -> set[str]:
+    """Update or create Airtable contacts with improved deduplication.
+
+    ``contacts`` maps SignalHire ID -> Airtable fields. Returns the SignalHire
+    IDs that were written.
+    """
+    # First, find existing records for every SignalHire ID
     try:
-        if existing_records:
-            # Update existing record
-            record_id = existing_records[0]['id']
-            update_url = f"{url}/{record_id}"
-            payload = {"fields": update_fields}
+        existing = await client.find_by_field(base_id, table_id, 'SignalHire ID', contacts)
+    except AirtableClientError as e:
+        echo(f"   ❌ Airtable lookup failed: {e}")
+        return set()
+
+    updates, creates = [], []
+    for signalhire_id, update_fields in contacts.items():
+        existing_records = existing.get(signalhire_id, [])
+        # If multiple records found, log warning about duplicates
+        if len(existing_records) > 1:
+            echo(f"   ⚠️  Found {len(existing_records)} existing records for {signalhire_id}")
+            # Records come oldest first; keep the oldest/most complete
+            echo(f"   🔄 Will update the first record: {existing_records[0]['id']}")
             
-            echo(f"   🔄 Updating existing record {record_id}")
-            response = await client.patch(update_url, headers=headers, json=payload)
-            response.raise_for_status()
+            # Log duplicate record IDs for manual cleanup
+            duplicate_ids = [r['id'] for r in existing_records[1:]]
+            echo(f"   📝 Duplicate records found: {duplicate_ids}")
+        if existing_records:
+            echo(f"   🔄 Updating existing record {existing_records[0]['id']}")
+            updates.append((signalhire_id, {"id": existing_records[0]['id'], "fields": update_fields}))
         else:
-            # Create new record
-            payload = {"fields": update_fields}
             echo(f"   ➕ Creating new record for {signalhire_id}")
-            response = await client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-    except httpx.HTTPStatusError as e:
-        echo(f"   ❌ Airtable API error for {signalhire_id}: HTTP {e.response.status_code}")
-        echo(f"   📄 Response body: {e.response.text}")
-        echo(f"   📤 Payload sent: {payload}")
-        raise
+            creates.append((signalhire_id, update_fields))
+
+    written: set[str] = set()
+    for label, batch, send in (
+        ("update", updates, client.update_records),
+        ("create", creates, client.create_records),
+    ):
+        if not batch:
+            continue
+        try:
+            result = await send(base_id, table_id, [record for _, record in batch])
+        except AirtableClientError as e:
+            echo(f"   ❌ Airtable API error ({label} of {len(batch)} records): {e}")
+            continue
+        for failure in result.failed:
+            echo(f"   ❌ Airtable API error ({label} of {len(failure.records)} records): {failure.error}")
+        failed = result.failed_indexes
+        written.update(
+            signalhire_id for index, (signalhire_id, _) in enumerate(batch) if index not in failed
+        )
+    return written
 
 
 def validate_contact_data(contact_data: dict) -> tuple[bool, list[str], dict]:
@@ -8,13 +8,12 @@ reveal contact information for prospects using bulk operations.
 import asyncio
 import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import click
-import httpx
 from click import echo, style
 from rich.console import Console
 from rich.progress import (
@@ -31,7 +30,11 @@ from ..services.airtable_client import (
     AirtableClientError,
     AirtableContactIndex,
     AirtableContactRecord,
+    shared_airtable_client,
 )
+from ..lib.contact_cache import get_contact_cache
+from ..lib.rereveal_queue import ReRevealQueue
+from ..lib.revealed_index import RevealedIndex, get_revealed_index
 from ..models.operations import RevealOp
 from ..services.signalhire_client import SignalHireClient
 
@@ -66,51 +69,44 @@ async def update_airtable_contacts_status(signalhire_ids: List[str], status_fiel
     successful_updates = 0
     failed_updates = 0
     
-    async with httpx.AsyncClient() as client:
-        headers = {"Authorization": f"Bearer {airtable_api_key}"}
-        
+    async with shared_airtable_client(airtable_api_key) as client:
+        # Find existing records for every SignalHire ID in a few OR-formula lookups
+        try:
+            existing = await client.find_by_field(
+                airtable_base_id, airtable_table_id, 'SignalHire ID', signalhire_ids,
+                fields=["Full Name", "Status"],
+            )
+        except AirtableClientError as e:
+            echo(f"   ❌ Failed to look up contacts in Airtable: {e}")
+            return
+
+        updates = []
+        names = []
         for signalhire_id in signalhire_ids:
-            try:
-                # Find existing record by SignalHire ID
-                search_url = f"https://api.airtable.com/v0/{airtable_base_id}/{airtable_table_id}"
-                search_params = {
-                    "filterByFormula": f"{{SignalHire ID}} = '{signalhire_id}'",
-                    "maxRecords": 1,
-                    "fields": ["Full Name", "Status"]
-                }
-                
-                response = await client.get(search_url, headers=headers, params=search_params)
-                response.raise_for_status()
-                
-                records = response.json().get('records', [])
-                
-                if records:
-                    record_id = records[0]['id']
-                    contact_name = records[0].get('fields', {}).get('Full Name', signalhire_id)
-                    
-                    # Update status using field ID
-                    update_url = f"{search_url}/{record_id}"
-                    payload = {
-                        "fields": {
-                            "Status": status_field_id  # Use Airtable field ID directly
-                        }
-                    }
-                    
-                    response = await client.patch(update_url, headers=headers, json=payload)
-                    response.raise_for_status()
-                    
-                    successful_updates += 1
-                    echo(f"   ✅ Updated status for {contact_name}")
-                else:
-                    echo(f"   ⚠️  Contact not found in Airtable: {signalhire_id}")
-                    failed_updates += 1
-                    
-            except httpx.HTTPError as e:
-                failed_updates += 1
-                echo(f"   ❌ Failed to update {signalhire_id}: {e}")
-            except Exception as e:
+            records = existing.get(signalhire_id)
+            if records:
+                # Update status using field ID directly
+                updates.append({"id": records[0]['id'], "fields": {"Status": status_field_id}})
+                names.append(records[0].get('fields', {}).get('Full Name', signalhire_id))
+            else:
+                echo(f"   ⚠️  Contact not found in Airtable: {signalhire_id}")
                 failed_updates += 1
-                echo(f"   ❌ Error updating {signalhire_id}: {e}")
+
+        if updates:
+            try:
+                result = await client.update_records(airtable_base_id, airtable_table_id, updates)
+            except AirtableClientError as e:
+                failed_updates += len(updates)
+                echo(f"   ❌ Failed to update {len(updates)} contacts: {e}")
+            else:
+                for failure in result.failed:
+                    echo(f"   ❌ Failed to update {len(failure.records)} contacts: {failure.error}")
+                failed = result.failed_indexes
+                failed_updates += len(failed)
+                for index, contact_name in enumerate(names):
+                    if index not in failed:
+                        successful_updates += 1
+                        echo(f"   ✅ Updated status for {contact_name}")
     
     if successful_updates > 0:
         echo(f"📊 Airtable status updates: {successful_updates} successful, {failed_updates} failed")
@@ -412,6 +408,12 @@ def deduplicate_work_items(items: Iterable[ProspectWorkItem]) -> List[ProspectWo
             deduped[item.uid] = item
             continue
 
+        # A claimed stale contact stays a re-reveal even when listed again
+        if 'stale' in (existing.source, item.source):
+            kept = item if item.profile and not existing.profile else existing
+            deduped[item.uid] = replace(kept, source='stale')
+            continue
+
         # Prefer entries that include profile details over bare UIDs
         if existing.profile and not item.profile:
             continue
@@ -430,11 +432,19 @@ def partition_prospects(
     items: Iterable[ProspectWorkItem],
     airtable_index: Optional[AirtableContactIndex],
     skip_existing: bool,
+    revealed_index: Optional[RevealedIndex] = None,
 ) -> Tuple[
     List[ProspectWorkItem],
     List[Tuple[ProspectWorkItem, AirtableContactRecord]],
 ]:
-    """Split prospects into pending reveals and already-revealed contacts."""
+    """Split prospects into pending reveals and already-revealed contacts.
+
+    A UID counts as revealed when Airtable has contact info for it or the
+    local revealed-UID index contains it. Index hits without an Airtable
+    entry are paired with a record that has an empty ``record_id``. Stale
+    contacts claimed from the re-reveal queue (``source='stale'``) always
+    stay pending; other UIDs are answered from the indexes alone.
+    """
 
     pending: List[ProspectWorkItem] = []
     already_revealed: List[Tuple[ProspectWorkItem, AirtableContactRecord]] = []
@@ -444,11 +454,22 @@ def partition_prospects(
             pending.append(item)
             continue
 
-        entry = airtable_index.entry_for(item.uid) if airtable_index else None
-        if entry and entry.has_contact_info:
-            if skip_existing:
+        if skip_existing and item.source != 'stale':
+            entry = airtable_index.entry_for(item.uid) if airtable_index else None
+            if entry and entry.has_contact_info:
                 already_revealed.append((item, entry))
                 continue
+            if revealed_index is not None and item.uid in revealed_index:
+                already_revealed.append(
+                    (
+                        item,
+                        entry
+                        or AirtableContactRecord(
+                            record_id="", has_contact_info=True, status=None
+                        ),
+                    )
+                )
+                continue
 
         pending.append(item)
 
@@ -599,6 +620,7 @@ async def execute_reveal_with_progress(
     Execute reveal operation with enhanced progress reporting.
     """
     bulk_size = options.get('bulk_size', 1000)
+    items_per_request = options.get('items_per_request', 1)
 
     total_prospects = len(prospect_uids)
 
@@ -627,7 +649,11 @@ async def execute_reveal_with_progress(
         )
         echo("Using API for reveal")
 
-        operation = RevealOp(prospect_ids=prospect_uids, batch_size=bulk_size)
+        operation = RevealOp(
+            prospect_ids=prospect_uids,
+            batch_size=bulk_size,
+            items_per_request=items_per_request,
+        )
         return await api_client.bulk_reveal(
             operation, progress_callback=progress_callback.update_progress
         )
@@ -663,8 +689,13 @@ async def check_credits_and_confirm(config, total_prospects: int, logger) -> boo
             )
             return click.confirm("Continue without credit check?", default=True)
 
+        # Answered from the X-Credits-Left ledger when a recent call reported it
         credits_data = credits_response.data or {}
-        current_credits = credits_data.get('credits_remaining', 0)
+        current_credits = credits_response.credits_remaining
+        if current_credits is None:
+            current_credits = credits_data.get(
+                'credits_remaining', credits_data.get('credits', 0)
+            )
         estimated_cost = total_prospects  # Assume 1 credit per prospect
 
         # Check daily usage
@@ -775,6 +806,7 @@ async def execute_reveal(
     """Execute the reveal operation using appropriate client."""
 
     bulk_size = options.get('bulk_size', 1000)
+    items_per_request = options.get('items_per_request', 1)
 
     # Update Airtable status to "Contacted" before sending revelation requests
     try:
@@ -794,7 +826,11 @@ async def execute_reveal(
         prospect_count=len(prospect_uids),
     )
     echo("Using API for reveal")
-    operation = RevealOp(prospect_ids=prospect_uids, batch_size=bulk_size)
+    operation = RevealOp(
+        prospect_ids=prospect_uids,
+        batch_size=bulk_size,
+        items_per_request=items_per_request,
+    )
     return await api_client.bulk_reveal(operation)
 
 
@@ -811,6 +847,12 @@ async def execute_reveal(
     default=1000,
     help='Prospects per bulk operation [default: 1000] [range: 1-1000]',
 )
+@click.option(
+    '--items-per-request',
+    type=click.IntRange(1, 100),
+    default=100,
+    help='Prospects packed into one Person API request [default: 100] [range: 1-100]',
+)
 @click.option(
     '--use-native-export',
     is_flag=True,
@@ -854,12 +896,20 @@ async def execute_reveal(
     default=True,
     help='Skip prospects that already have contactsFetched (saves credits) [default: True]',
 )
+@click.option(
+    '--refresh-stale',
+    type=click.IntRange(0),
+    default=0,
+    help='Also re-reveal up to N cached contacts past their freshness TTL, '
+    'within the daily re-reveal budget [default: 0]',
+)
 @click.pass_context
 def reveal(
     ctx,
     prospect_uids,
     search_file,
     bulk_size,
+    items_per_request,
     use_native_export,
     export_format,
     timeout,
@@ -869,6 +919,7 @@ def reveal(
     browser_wait,
     api_only,
     skip_existing,
+    refresh_stale,
 ):
     """
     Reveal contact information (API-only in this release).
@@ -889,6 +940,8 @@ def reveal(
       signalhire reveal --search-file prospects.csv --save-to-list "Q4 Sales Leads"
       # Reveal specific prospects
       signalhire reveal uid1 uid2 uid3 --output specific_contacts.csv
+      # Also refresh up to 50 cached contacts whose data has gone stale
+      signalhire reveal --search-file prospects.csv --refresh-stale 50
     \b
     RATE LIMITS & COSTS:
     • API Mode: 5,000 contact reveals/day (1 credit per contact)
@@ -924,6 +977,28 @@ def reveal(
             echo(style(f"Error loading prospects from file: {e}", fg='red'), err=True)
             ctx.exit(1)
 
+    # Stale cached contacts are re-revealed alongside, within a daily budget
+    contact_cache = get_contact_cache() if refresh_stale else None
+    rereveal_queue = None
+    stale_claims: List[str] = []
+    if refresh_stale:
+        rereveal_queue = ReRevealQueue(contact_cache)
+        stale_claims = [stale.uid for stale in rereveal_queue.claim(limit=refresh_stale)]
+        work_items.extend(
+            ProspectWorkItem(uid=uid, source='stale') for uid in stale_claims
+        )
+        if config.verbose or stale_claims:
+            remaining = rereveal_queue.remaining_budget()
+            echo(
+                f"♻️  Re-revealing {len(stale_claims)} stale cached contacts "
+                f"({remaining} left in today's re-reveal budget)"
+            )
+
+    def release_stale_claims() -> None:
+        # Claims whose reveal was never sent go back to the budget
+        if rereveal_queue is not None and stale_claims:
+            rereveal_queue.release(stale_claims)
+
     work_items = deduplicate_work_items(work_items)
 
     if not work_items:
@@ -935,19 +1010,31 @@ def reveal(
         item.uid: item.profile for item in work_items if item.profile
     }
 
+    # Memory-mapped UID index: answers without loading the cache or Airtable
+    revealed_index = get_revealed_index() if skip_existing else None
+    unresolved = [
+        item for item in work_items
+        if item.uid and not (revealed_index is not None and item.uid in revealed_index)
+    ]
+
     airtable_index = None
-    try:
-        candidate_index = AirtableContactIndex.build_sync()
-        if candidate_index.ready:
-            airtable_index = candidate_index
-        elif skip_existing:
-            echo(style('⚠️  AIRTABLE_API_KEY or AIRTABLE_BASE_ID not set; cannot skip already revealed contacts.', fg='yellow'))
-    except AirtableClientError as airtable_error:
-        if skip_existing:
+    if skip_existing and unresolved:
+        try:
+            candidate_index = AirtableContactIndex.build_sync(
+                revealed_index=revealed_index
+            )
+            if candidate_index.ready:
+                airtable_index = candidate_index
+            else:
+                echo(style('⚠️  AIRTABLE_API_KEY or AIRTABLE_BASE_ID not set; cannot skip already revealed contacts.', fg='yellow'))
+        except AirtableClientError as airtable_error:
             echo(style(f'⚠️  Airtable lookup failed: {airtable_error}', fg='yellow'))
 
     pending_items, already_revealed = partition_prospects(
-        work_items, airtable_index, skip_existing
+        work_items,
+        airtable_index,
+        skip_existing,
+        revealed_index,
     )
 
     total_unique = len(work_items)
@@ -968,6 +1055,7 @@ def reveal(
             ),
             err=True,
         )
+        release_stale_claims()
         ctx.exit(1)
 
     if total_pending > 0 and not config.api_key:
@@ -979,6 +1067,7 @@ def reveal(
             err=True,
         )
         echo("Set the environment variable or pass --api-key explicitly.", err=True)
+        release_stale_claims()
         ctx.exit(1)
 
     pending_uids = [item.uid for item in pending_items]
@@ -1112,72 +1201,70 @@ def reveal(
         echo("✅ Reveal parameters validated. Remove --dry-run to execute.")
     if dry_run:
         render_dry_run()
+        release_stale_claims()
         return
 
+    def compose_results(api_result: Optional[dict[str, Any]]) -> dict[str, Any]:
+        revealed_count = api_result.get('revealed_count', 0) if api_result else 0
+        failed_count = api_result.get('failed_count', 0) if api_result else 0
+        credits_used = api_result.get('credits_used', 0) if api_result else 0
+        operation_id = (
+            api_result.get('operation_id', 'op_unknown') if api_result else 'no_operation'
+        )
 
-def compose_results(api_result: Optional[dict[str, Any]]) -> dict[str, Any]:
-    revealed_count = api_result.get('revealed_count', 0) if api_result else 0
-    failed_count = api_result.get('failed_count', 0) if api_result else 0
-    credits_used = api_result.get('credits_used', 0) if api_result else 0
-    operation_id = (
-        api_result.get('operation_id', 'op_unknown') if api_result else 'no_operation'
-    )
-
-    final: dict[str, Any] = {
-        'operation_id': operation_id,
-        'total_prospects': total_unique,
-        'revealed_count': revealed_count,
-        'skipped_existing_count': len(already_revealed),
-        'failed_count': failed_count,
-        'credits_used': credits_used,
-        'prospects': [],
-        'warnings': [],
-    }
-
-    if api_result and api_result.get('warnings'):
-        final['warnings'] = list(api_result['warnings'])
+        final: dict[str, Any] = {
+            'operation_id': operation_id,
+            'total_prospects': total_unique,
+            'revealed_count': revealed_count,
+            'skipped_existing_count': len(already_revealed),
+            'failed_count': failed_count,
+            'credits_used': credits_used,
+            'prospects': [],
+            'warnings': [],
+        }
 
-    if api_result:
-        for record in api_result.get('prospects', []):
-            uid = record.get('uid') or record.get('id') or record.get('prospect_id')
-            if not uid:
-                continue
-            profile = record.get('profile') or profiles_by_uid.get(uid)
-            contacts = record.get('contacts') or []
+        if api_result and api_result.get('warnings'):
+            final['warnings'] = list(api_result['warnings'])
+
+        if api_result:
+            for record in api_result.get('prospects', []):
+                uid = record.get('uid') or record.get('id') or record.get('prospect_id')
+                if not uid:
+                    continue
+                profile = record.get('profile') or profiles_by_uid.get(uid)
+                contacts = record.get('contacts') or []
+                entry = {
+                    'uid': uid,
+                    'status': record.get('status', 'success' if contacts else 'unknown'),
+                    'contacts': contacts,
+                    'profile': profile,
+                    'source': 'signalhire-api',
+                    'error': record.get('error'),
+                    'credits_used': record.get('credits_used', 0),
+                }
+                if profile:
+                    entry['full_name'] = (
+                        profile.get('full_name')
+                        or profile.get('fullName')
+                        or profile.get('name')
+                    )
+                final['prospects'].append(entry)
+
+        for item, airtable_record in already_revealed:
             entry = {
-                'uid': uid,
-                'status': record.get('status', 'success' if contacts else 'unknown'),
-                'contacts': contacts,
-                'profile': profile,
-                'source': 'signalhire-api',
-                'error': record.get('error'),
-                'credits_used': record.get('credits_used', 0),
+                'uid': item.uid,
+                'status': 'skipped_existing',
+                'source': 'airtable' if airtable_record.record_id else 'revealed_index',
+                'airtable_status': airtable_record.status,
+                'airtable_has_contact': airtable_record.has_contact_info,
+                'profile': profiles_by_uid.get(item.uid),
             }
-            if profile:
-                entry['full_name'] = (
-                    profile.get('full_name')
-                    or profile.get('fullName')
-                    or profile.get('name')
-                )
             final['prospects'].append(entry)
 
-    for item, airtable_record in already_revealed:
-        entry = {
-            'uid': item.uid,
-            'status': 'skipped_existing',
-            'source': 'airtable',
-            'airtable_status': airtable_record.status,
-            'airtable_has_contact': airtable_record.has_contact_info,
-            'profile': profiles_by_uid.get(item.uid),
-        }
-        final['prospects'].append(entry)
-
-    if api_result and api_result.get('export_file_path'):
-        final['export_file_path'] = api_result['export_file_path']
-
-    return final
-
+        if api_result and api_result.get('export_file_path'):
+            final['export_file_path'] = api_result['export_file_path']
 
+        return final
 
     if total_pending == 0:
         final_results = compose_results(None)
@@ -1206,6 +1293,7 @@ def compose_results(api_result: Optional[dict[str, Any]]) -> dict[str, Any]:
     if config.verbose:
         echo("Mode: API (recommended)")
         echo(f"Bulk size: {bulk_size}")
+        echo(f"Items per request: {items_per_request}")
         echo(f"Native export: {use_native_export}")
         if config.debug:
             echo(f"First 10 UIDs: {pending_uids[:10]}")
@@ -1215,6 +1303,7 @@ def compose_results(api_result: Optional[dict[str, Any]]) -> dict[str, Any]:
     )
     if not confirmed:
         echo("Operation cancelled.")
+        release_stale_claims()
         return
 
     try:
@@ -1224,6 +1313,7 @@ def compose_results(api_result: Optional[dict[str, Any]]) -> dict[str, Any]:
                 config,
                 logger,
                 bulk_size=bulk_size,
+                items_per_request=items_per_request,
                 use_native_export=use_native_export,
                 export_format=export_format,
                 timeout=timeout,
@@ -1271,8 +1361,10 @@ def compose_results(api_result: Optional[dict[str, Any]]) -> dict[str, Any]:
 
     except KeyboardInterrupt:
         echo("\n🛑 Reveal operation cancelled by user", err=True)
+        release_stale_claims()
         ctx.exit(1)
     except Exception as e:  # noqa: BLE001
+        release_stale_claims()
         error_message = str(e)
 
         # Try to extract status code and provide better error handling
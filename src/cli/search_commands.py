@@ -14,14 +14,20 @@ from pathlib import Path
 from typing import Any
 
 import click
-import httpx
 from click import echo, style
 
 # ContactCache removed - using Airtable as source of truth
+from ..lib.revealed_index import get_revealed_index
+from ..lib.search_cache import SearchCache
 from ..models.search_criteria import SearchCriteria
-from ..services.airtable_client import AirtableClientError, AirtableContactIndex
+from ..services.airtable_client import (
+    AirtableClient,
+    AirtableClientError,
+    AirtableContactIndex,
+    shared_airtable_client,
+)
 from ..services.search_analysis_service import create_heavy_equipment_search_templates
-from ..services.signalhire_client import SignalHireClient
+from ..services.signalhire_client import SignalHireAPIError, SignalHireClient
 from .reveal_commands import handle_api_error
 
 # Import validation utilities
@@ -261,19 +267,11 @@ def _show_search_templates() -> None:
     echo("  • Monitor credits with status command (1200 available)")
 
 
-async def _get_airtable_schema(client: httpx.AsyncClient, api_key: str, base_id: str, table_id: str) -> set:
+async def _get_airtable_schema(client: AirtableClient, base_id: str, table_id: str) -> set:
     """Get the available field names from Airtable table schema."""
     try:
         # Get a single record to see what fields exist
-        url = f"https://api.airtable.com/v0/{base_id}/{table_id}"
-        headers = {"Authorization": f"Bearer {api_key}"}
-        params = {"maxRecords": 1}
-        
-        response = await client.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        records = data.get('records', [])
+        records = await client.list_records(base_id, table_id, max_records=1)
         
         if records:
             # Get field names from the first record
@@ -312,12 +310,26 @@ async def _handle_airtable_integration(results: dict[str, Any], config, check_du
     duplicates_skipped = 0
     failures = 0
     
-    async with httpx.AsyncClient() as client:
+    async with shared_airtable_client(airtable_api_key) as client:
         # Get table schema first to avoid validation errors
         echo(f"   🔍 Detecting Airtable schema...")
-        available_fields = await _get_airtable_schema(client, airtable_api_key, airtable_base_id, airtable_table_id)
+        available_fields = await _get_airtable_schema(client, airtable_base_id, airtable_table_id)
         echo(f"   📋 Available fields: {sorted(available_fields)}")
-        
+
+        # Look up every SignalHire ID at once instead of one request per prospect
+        existing_ids: set[str] = set()
+        if check_duplicates:
+            uids = [p.get('uid') or p.get('id') for p in prospects]
+            try:
+                existing_ids = set(await _find_airtable_duplicates(
+                    client, airtable_base_id, airtable_table_id, uids
+                ))
+            except AirtableClientError as e:
+                echo(f"   ⚠️  Could not check duplicates: {e}")
+                failures += len(prospects)
+                prospects = []
+
+        to_add: list[dict[str, Any]] = []
         for prospect in prospects:
             try:
                 # Extract SignalHire ID
@@ -335,30 +347,37 @@ async def _handle_airtable_integration(results: dict[str, Any], config, check_du
                     for warning in warnings:
                         echo(f"      • {warning}")
 
-                # Check for duplicates if requested
+                # Skip duplicates if requested, including repeats within this batch
                 if check_duplicates:
-                    existing = await _check_airtable_duplicate(
-                        client, airtable_api_key, airtable_base_id, airtable_table_id, signalhire_id
-                    )
-                    if existing:
+                    if signalhire_id in existing_ids:
                         echo(f"   🔄 Skipping duplicate: {prospect.get('full_name', signalhire_id)}")
                         duplicates_skipped += 1
                         continue
+                    existing_ids.add(signalhire_id)
 
                 # Format prospect data for Airtable with schema validation
-                airtable_fields = _format_prospect_for_airtable(prospect, available_fields)
-                
-                # Add to Airtable with Status=New
-                await _add_prospect_to_airtable(
-                    client, airtable_api_key, airtable_base_id, airtable_table_id, airtable_fields
-                )
-                
-                successful_adds += 1
-                echo(f"   ✅ Added: {airtable_fields.get('Full Name', signalhire_id)}")
+                to_add.append(_format_prospect_for_airtable(prospect, available_fields))
                 
             except Exception as e:
                 failures += 1
                 echo(f"   ❌ Failed to add prospect: {e}")
+
+        # Add to Airtable with Status=New, 10 records per request
+        if to_add:
+            try:
+                result = await client.create_records(airtable_base_id, airtable_table_id, to_add)
+            except AirtableClientError as e:
+                failures += len(to_add)
+                echo(f"   ❌ Failed to add prospects: {e}")
+            else:
+                for failure in result.failed:
+                    echo(f"   ❌ Failed to add {len(failure.records)} prospects: {failure.error}")
+                failed = result.failed_indexes
+                failures += len(failed)
+                for index, airtable_fields in enumerate(to_add):
+                    if index not in failed:
+                        successful_adds += 1
+                        echo(f"   ✅ Added: {airtable_fields.get('Full Name', airtable_fields.get('SignalHire ID'))}")
     
     echo(f"\n📊 Airtable Results:")
     echo(f"   ✅ Successfully added: {successful_adds}")
@@ -367,22 +386,13 @@ async def _handle_airtable_integration(results: dict[str, Any], config, check_du
     echo(f"   ❌ Failed: {failures}")
 
 
-async def _check_airtable_duplicate(client: httpx.AsyncClient, api_key: str, base_id: str, 
-                                   table_id: str, signalhire_id: str) -> bool:
-    """Check if a contact already exists in Airtable by SignalHire ID."""
-    url = f"https://api.airtable.com/v0/{base_id}/{table_id}"
-    headers = {"Authorization": f"Bearer {api_key}"}
-    
-    params = {
-        "filterByFormula": f"{{SignalHire ID}} = '{signalhire_id}'",
-        "maxRecords": 1
-    }
-    
-    response = await client.get(url, headers=headers, params=params)
-    response.raise_for_status()
-    
-    data = response.json()
-    return len(data.get('records', [])) > 0
+async def _find_airtable_duplicates(client: AirtableClient, base_id: str, table_id: str,
+                                    signalhire_ids: list[str]) -> list[str]:
+    """Return the SignalHire IDs that already exist in Airtable."""
+    existing = await client.find_by_field(
+        base_id, table_id, 'SignalHire ID', signalhire_ids, fields=['SignalHire ID']
+    )
+    return list(existing)
 
 
 def _parse_location(location: str) -> tuple[str, str, str]:
@@ -549,24 +559,23 @@ def _format_prospect_for_airtable(prospect: dict[str, Any], available_fields: se
     return fields
 
 
-async def _add_prospect_to_airtable(client: httpx.AsyncClient, api_key: str, base_id: str,
-                                   table_id: str, fields: dict):
-    """Add a new prospect to Airtable."""
-    url = f"https://api.airtable.com/v0/{base_id}/{table_id}"
-    headers = {"Authorization": f"Bearer {api_key}"}
-    
-    payload = {"fields": fields}
-    response = await client.post(url, headers=headers, json=payload)
-    response.raise_for_status()
-
-
 async def execute_search(
-    search_criteria: SearchCriteria, config, logger, exclude_revealed: bool = False
+    search_criteria: SearchCriteria,
+    config,
+    logger,
+    exclude_revealed: bool = False,
+    search_cache: SearchCache | None = None,
+    refresh: bool = False,
+    paginate: bool = False,
 ) -> dict[str, Any]:
-    """Execute the search operation using appropriate client."""
+    """Execute the search operation using appropriate client.
+
+    ``paginate`` bypasses the search cache because the response's scrollId
+    will be followed, and a cached one may have expired.
+    """
 
     # API-only implementation
-    api_client = SignalHireClient(api_key=config.api_key)
+    api_client = SignalHireClient(api_key=config.api_key, search_cache=search_cache)
 
     logger.info("Using API for search", has_api_key=bool(config.api_key))
 
@@ -611,8 +620,12 @@ async def execute_search(
         api_response = await api_client.scroll_search(int(req_id), scr_id)
     else:
         api_response = await api_client.search_prospects(
-            search_dict, size=search_criteria.size
+            search_dict,
+            size=search_criteria.size,
+            refresh=refresh,
+            use_cache=not paginate,
         )
+    await api_client.close()
 
     if api_response.success:
         # Persist requestId/scrollId for continuation
@@ -684,6 +697,16 @@ async def execute_search(
     default=20,
     help='Maximum number of pages to fetch when using --all-pages [default: 20]',
 )
+@click.option(
+    '--no-cache',
+    is_flag=True,
+    help='Bypass the local search cache (always call the API)',
+)
+@click.option(
+    '--refresh',
+    is_flag=True,
+    help='Ignore cached results for this search and store the fresh response',
+)
 @click.option(
     '--dry-run', is_flag=True, help='Show what would be searched without executing'
 )
@@ -716,6 +739,8 @@ def search(
     dry_run,
     all_pages,
     max_pages,
+    no_cache,
+    refresh,
     to_airtable,
     check_duplicates,
     preset,
@@ -877,7 +902,18 @@ def search(
 
     try:
         # Run async search
-        results = asyncio.run(execute_search(search_criteria, config, logger, exclude_revealed))
+        search_cache = None if no_cache else SearchCache()
+        results = asyncio.run(
+            execute_search(
+                search_criteria,
+                config,
+                logger,
+                exclude_revealed,
+                search_cache=search_cache,
+                refresh=refresh,
+                paginate=all_pages,
+            )
+        )
 
         # If requested, fetch all remaining pages via scroll
         if all_pages:
@@ -888,20 +924,23 @@ def search(
             if scr_id and req_id:
 
                 async def _fetch_all():
-                    client = SignalHireClient(api_key=config.api_key)
-                    pages = 0
                     nonlocal scr_id
-                    while scr_id and pages < max_pages:
-                        resp = await client.scroll_search(int(req_id), scr_id)
-                        if not resp.success:
-                            break
-                        data = resp.data or {}
-                        new_profiles = (
-                            data.get('profiles') or data.get('prospects') or []
-                        )
-                        profiles.extend(new_profiles)
-                        scr_id = data.get('scrollId') or data.get('scroll_id')
-                        pages += 1
+                    # One pooled session for the whole scroll; the next page is
+                    # prefetched while the current one is merged
+                    async with SignalHireClient(api_key=config.api_key) as client:
+                        try:
+                            async for page in client.iter_search_pages(
+                                int(req_id),
+                                scr_id,
+                                max_pages=max_pages,
+                            ):
+                                profiles.extend(page.profiles)
+                                scr_id = page.scroll_id
+                        except SignalHireAPIError as e:
+                            logger.warning(
+                                "Stopped fetching pages after a failed scroll",
+                                error=str(e),
+                            )
 
                 asyncio.run(_fetch_all())
                 # Merge results
@@ -938,11 +977,32 @@ def search(
         original_profiles = results.get(profile_key, []) if profile_key else []
         filtered_profiles: list[dict[str, Any]] = []
 
+        # Drop UIDs the local revealed index already knows, before any Airtable scan
+        revealed_index = (
+            get_revealed_index() if (skip_revealed or exclude_revealed) else None
+        )
+        skipped_indexed = 0
+        if revealed_index is not None:
+            unrevealed = []
+            for profile in original_profiles:
+                uid = (
+                    profile.get('uid') or profile.get('id')
+                    if isinstance(profile, dict)
+                    else None
+                )
+                if uid and uid in revealed_index:
+                    skipped_indexed += 1
+                    continue
+                unrevealed.append(profile)
+            original_profiles = unrevealed
+
         airtable_index = None
         existing_contacts = 0
         skipped_existing = 0
         try:
-            index_candidate = AirtableContactIndex.build_sync()
+            index_candidate = AirtableContactIndex.build_sync(
+                revealed_index=revealed_index
+            )
             if index_candidate.ready:
                 airtable_index = index_candidate
             elif skip_revealed:
@@ -973,6 +1033,8 @@ def search(
             results[profile_key] = filtered_profiles
 
         results['returned_count'] = len(filtered_profiles)
+        if revealed_index is not None:
+            results['skipped_revealed_index'] = skipped_indexed
         if airtable_index:
             results['airtable_existing_contacts'] = existing_contacts
             results['skipped_existing_contacts'] = skipped_existing
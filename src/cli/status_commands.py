@@ -14,6 +14,7 @@ from typing import Any
 import click
 from click import echo, style
 
+from ..lib.usage_ledger import UsageLedger
 from ..services.signalhire_client import SignalHireClient
 
 
@@ -64,6 +65,11 @@ def format_credits_info(
         )
         output.append(f"Available credits: {raw_credits or 'unknown'}")
 
+    updated_at = credits_data.get('updated_at')
+    if credits_data.get('source') == 'header' and isinstance(updated_at, (int, float)):
+        age = max(0, int(datetime.now().timestamp() - updated_at))
+        output.append(f"  (reported by the API {age}s ago, no /credits call made)")
+
     without_contacts = _coerce_int(
         _first_non_null(
             credits_data,
@@ -458,6 +464,8 @@ async def check_system_status(config) -> dict[str, Any]:
     if config.api_key:
         try:
             api_client = SignalHireClient(api_key=config.api_key)
+            # A connectivity check must reach the API, not the credit ledger
+            api_client.invalidate_credits_cache()
             await api_client.check_credits()
             status['api_status'] = 'connected'
             status['auth_status'] = 'valid'
@@ -491,6 +499,7 @@ def format_daily_usage(usage_data: dict[str, Any], format_type: str = "human") -
     credits_used = usage_data.get("credits_used", 0)
     reveals = usage_data.get("reveals", 0)
     searches = usage_data.get("searches", 0)
+    search_profiles = usage_data.get("search_profiles", 0)
     daily_limit = usage_data.get("daily_limit", 5000)
     percentage_used = (credits_used / daily_limit) * 100 if daily_limit else 0
 
@@ -499,6 +508,7 @@ def format_daily_usage(usage_data: dict[str, Any], format_type: str = "human") -
     output.append(f"Credits Used: {style(str(credits_used), fg='blue', bold=True)}")
     output.append(f"Contacts Revealed: {reveals}")
     output.append(f"Searches Performed: {searches}")
+    output.append(f"Search Profiles Viewed: {search_profiles}")
     output.append(
         f"Usage vs quota: {percentage_used:.1f}% of {daily_limit:,} daily credits"
     )
@@ -600,42 +610,20 @@ async def check_credit_sufficiency(config, planned_reveals: int = 0) -> dict[str
 
 
 async def check_daily_usage() -> dict[str, Any]:
-    """Check API and browser usage for the last 24 hours."""
-    operations = await list_recent_operations(
-        limit=1000
-    )  # Get a large number of recent operations
-
-    usage_data = {
-        "credits_used": 0,
-        "reveals": 0,
-        "searches": 0,
-        "from_time": (datetime.now() - timedelta(days=1)).isoformat(),
-        "to_time": datetime.now().isoformat(),
+    """Check API usage for the last 24 hours from the persistent usage ledger."""
+    totals = UsageLedger().totals()
+    now = datetime.now()
+
+    return {
+        "credits_used": totals["credits_used"],
+        "reveals": totals["reveals"],
+        "searches": totals["searches"],
+        "search_profiles": totals["search_profiles"],
+        "from_time": (now - timedelta(days=1)).isoformat(),
+        "to_time": now.isoformat(),
         "daily_limit": 5000,
     }
 
-    one_day_ago = datetime.now() - timedelta(days=1)
-
-    for op in operations:
-        try:
-            created_time = datetime.fromisoformat(
-                op.get('created_at', '').replace('Z', '+00:00')
-            )
-            if created_time.replace(tzinfo=None) < one_day_ago:
-                continue
-        except ValueError:
-            continue
-
-        op_type = op.get("type")
-        if op_type == "reveal":
-            usage_data["reveals"] += 1
-            if op.get("status") == "completed" and op.get("results"):
-                usage_data["credits_used"] += op["results"].get("credits_used", 0)
-        elif op_type == "search":
-            usage_data["searches"] += 1
-
-    return usage_data
-
 
 @click.command()
 @click.option('--operation-id', help='Check specific operation status')
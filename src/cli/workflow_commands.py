@@ -16,6 +16,7 @@ from typing import Any
 import click
 from click import echo, style
 
+from ..lib.search_cache import SearchCache
 from ..models.search_criteria import SearchCriteria
 from ..services.export_service import ExportService
 from ..services.signalhire_client import SignalHireClient
@@ -25,10 +26,11 @@ from .reveal_commands import handle_api_error
 class WorkflowRunner:
     """Handles the execution of complete workflows."""
 
-    def __init__(self, config, logger):
+    def __init__(self, config, logger, search_cache: SearchCache | None = None):
         self.config = config
         self.logger = logger
         self.export_service = ExportService()
+        self.search_cache = search_cache
 
     async def run_lead_generation(
         self,
@@ -223,7 +225,9 @@ class WorkflowRunner:
         self, search_criteria: SearchCriteria, max_prospects: int
     ) -> dict[str, Any]:
         """Execute search operation (API-only)."""
-        api_client = SignalHireClient(api_key=self.config.api_key)
+        api_client = SignalHireClient(
+            api_key=self.config.api_key, search_cache=self.search_cache
+        )
         # Convert SearchCriteria to dict for API call
         search_dict = {
             "title": search_criteria.title,
@@ -239,7 +243,7 @@ class WorkflowRunner:
         search_dict = {k: v for k, v in search_dict.items() if v is not None}
 
         api_response = await api_client.search_prospects(
-            search_dict, page=1, limit=getattr(search_criteria, 'size', 50)
+            search_dict, size=getattr(search_criteria, 'size', 50)
         )
         if api_response.success:
             return api_response.data
@@ -436,6 +440,11 @@ def workflow():
     default=10000,
     help='Maximum prospects to process [default: 10000]',
 )
+@click.option(
+    '--no-cache',
+    is_flag=True,
+    help='Bypass the local search cache (always call the API)',
+)
 @click.pass_context
 def lead_generation(
     ctx,
@@ -447,6 +456,7 @@ def lead_generation(
     output_dir,
     list_name,
     max_prospects,
+    no_cache,
 ):
     """
     Complete lead generation workflow: search → reveal → export.
@@ -496,7 +506,9 @@ def lead_generation(
     try:
         echo("🚀 Starting lead generation workflow...")
 
-        runner = WorkflowRunner(config, logger)
+        runner = WorkflowRunner(
+            config, logger, search_cache=None if no_cache else SearchCache()
+        )
         results = asyncio.run(
             runner.run_lead_generation(
                 search_criteria_obj, output_path, list_name, max_prospects
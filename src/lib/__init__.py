@@ -7,10 +7,12 @@ async operations, validation, and other shared functionality.
 """
 
 # Import commonly used utilities for easy access
+from .adaptive_concurrency import AdaptiveConcurrencyLimiter, parse_retry_after
 from .async_utils import (
     AsyncContextTimer,
     AsyncQueue,
     AsyncRateLimiter,
+    SingleFlight,
     async_cache,
     async_filter,
     async_map,
@@ -37,7 +39,17 @@ from .common import (
     truncate_string,
     validate_url,
 )
-from .contact_cache import ContactCache, CachedContact, normalize_contacts
+from .contact_cache import (
+    CachedContact,
+    ContactCache,
+    FreshnessPolicy,
+    SqliteContactStore,
+    StaleContact,
+    get_contact_cache,
+    normalize_contacts,
+)
+from .contact_log import LogContactStore
+from .credit_ledger import CreditLedger, CreditSnapshot, get_credit_ledger
 from .config import (
     get_api_config,
     get_callback_server_config,
@@ -47,6 +59,16 @@ from .config import (
     get_signalhire_credentials,
     load_config,
 )
+from .rate_limit_registry import (
+    RateLimit,
+    RateLimitRegistry,
+    get_rate_limit_registry,
+)
+from .rereveal_queue import ReRevealQueue
+from .reveal_registry import RevealCompletion, RevealRegistry, get_reveal_registry
+from .revealed_index import RevealedIndex, get_revealed_index
+from .search_cache import SearchCache, canonicalize_criteria, search_cache_key
+from .usage_ledger import UsageLedger
 from .validation import (
     ValidationResult,
     ValidatorChain,
@@ -64,10 +86,14 @@ from .validation import (
 )
 
 __all__ = [
+    # Adaptive concurrency
+    "AdaptiveConcurrencyLimiter",
+    "parse_retry_after",
     # Async utilities
     "AsyncContextTimer",
     "AsyncQueue",
     "AsyncRateLimiter",
+    "SingleFlight",
     "async_cache",
     "async_filter",
     "async_map",
@@ -95,7 +121,16 @@ __all__ = [
     # Contact cache
     "ContactCache",
     "CachedContact",
+    "SqliteContactStore",
+    "LogContactStore",
+    "FreshnessPolicy",
+    "StaleContact",
+    "get_contact_cache",
     "normalize_contacts",
+    # Credit ledger
+    "CreditLedger",
+    "CreditSnapshot",
+    "get_credit_ledger",
     # Configuration
     "get_api_config",
     "get_callback_server_config",
@@ -104,6 +139,25 @@ __all__ = [
     "get_rate_limit_config",
     "get_signalhire_credentials",
     "load_config",
+    # Rate limit registry
+    "RateLimit",
+    "RateLimitRegistry",
+    "get_rate_limit_registry",
+    # Re-reveal queue
+    "ReRevealQueue",
+    # Reveal registry
+    "RevealCompletion",
+    "RevealRegistry",
+    "get_reveal_registry",
+    # Revealed-UID index
+    "RevealedIndex",
+    "get_revealed_index",
+    # Search cache
+    "SearchCache",
+    "canonicalize_criteria",
+    "search_cache_key",
+    # Usage ledger
+    "UsageLedger",
     # Validation
     "ValidationResult",
     "ValidatorChain",
@@ -0,0 +1,254 @@
+"""Adaptive (AIMD) concurrency limiting for outbound API requests.
+
+A fixed semaphore size is a guess: too small wastes throughput while the API
+is fast, too large keeps hammering it once it starts throttling. The
+:class:`AdaptiveConcurrencyLimiter` instead treats the in-flight limit like a
+TCP congestion window. Every ``limit`` healthy completions (p95 latency under
+target, low error rate) raise it by one; a 429, a ``Retry-After`` header or an
+error burst cuts it multiplicatively and, for ``Retry-After``, pauses new
+requests until the server asks us to come back.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = structlog.get_logger(__name__)
+
+# Status codes that count as server trouble when computing the error rate
+_ERROR_STATUSES = {408, 500, 502, 503, 504}
+
+
+def parse_retry_after(value: str | None, now: float | None = None) -> float | None:
+    """Parse a ``Retry-After`` header (delta seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    current = now if now is not None else time.time()
+    return max(0.0, retry_at.timestamp() - current)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Additive-increase / multiplicative-decrease limit on requests in flight.
+
+    Parameters
+    - name: endpoint family reported in stats and logs
+    - initial_limit / min_limit / max_limit: bounds of the in-flight limit
+    - latency_target: p95 latency (seconds) below which the API counts as healthy
+    - max_error_rate: share of 5xx/timeouts in the sample window tolerated
+    - decrease_factor: multiplier applied to the limit on throttling
+    - sample_size: number of recent completions used for p95 and error rate
+    - time_fn: injectable monotonic clock
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        *,
+        min_limit: int = 1,
+        max_limit: int = 50,
+        latency_target: float = 5.0,
+        max_error_rate: float = 0.1,
+        decrease_factor: float = 0.5,
+        sample_size: int = 100,
+        time_fn: Callable[[], float] | None = None,
+    ) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("expected 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.max_error_rate = max_error_rate
+        self.decrease_factor = decrease_factor
+        self._time = time_fn or time.monotonic
+
+        self._limit = initial_limit
+        self._in_flight = 0
+        self._latencies: deque[float] = deque(maxlen=sample_size)
+        self._outcomes: deque[bool] = deque(maxlen=sample_size)  # True = error
+        self._healthy_since_change = 0
+        self._last_decrease = float("-inf")
+        self._cooldown_until = 0.0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._decisions: deque[dict[str, Any]] = deque(maxlen=20)
+        self._stats = {"acquired": 0, "increases": 0, "decreases": 0, "throttled": 0}
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """Wait for a free slot (and for any Retry-After cooldown to pass)."""
+        while True:
+            pause = self._cooldown_until - self._time()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+            if self._in_flight < self._limit:
+                self._in_flight += 1
+                self._stats["acquired"] += 1
+                return
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass a wake-up we may have consumed on to the next waiter
+                self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    def release(
+        self,
+        latency: float,
+        status_code: int | None,
+        retry_after: float | None = None,
+    ) -> None:
+        """Return a slot and feed the outcome of the request into the controller.
+
+        ``status_code`` of None means the request never got a response
+        (connection error); it counts as an error.
+        """
+        self._in_flight = max(0, self._in_flight - 1)
+
+        throttled = status_code == 429 or retry_after is not None
+        is_error = status_code is None or status_code in _ERROR_STATUSES
+        self._outcomes.append(throttled or is_error)
+
+        if throttled:
+            self._stats["throttled"] += 1
+            if retry_after:
+                self._cooldown_until = max(
+                    self._cooldown_until, self._time() + retry_after
+                )
+            self._decrease("retry_after" if retry_after is not None else "429")
+        elif is_error:
+            if self.error_rate() > self.max_error_rate:
+                self._decrease("error_rate")
+        else:
+            self._latencies.append(latency)
+            self._healthy_since_change += 1
+            # One increase per "window" of completions, like TCP congestion avoidance
+            if self._healthy_since_change >= self._limit and self._is_healthy():
+                self._increase()
+
+        self._wake()
+
+    def p95_latency(self) -> float | None:
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def _is_healthy(self) -> bool:
+        p95 = self.p95_latency()
+        return (
+            p95 is not None
+            and p95 <= self.latency_target
+            and self.error_rate() <= self.max_error_rate
+        )
+
+    def _increase(self) -> None:
+        self._healthy_since_change = 0
+        if self._limit >= self.max_limit:
+            return
+        self._limit += 1
+        self._stats["increases"] += 1
+        self._record_decision("increase", "healthy")
+
+    def _decrease(self, reason: str) -> None:
+        self._healthy_since_change = 0
+        now = self._time()
+        # Responses to requests sent before the last cut describe the old limit;
+        # react once per congestion event rather than once per response
+        if now - self._last_decrease < max(self.p95_latency() or 0.0, 1.0):
+            return
+        new_limit = max(self.min_limit, int(self._limit * self.decrease_factor))
+        self._last_decrease = now
+        if new_limit == self._limit:
+            return
+        self._limit = new_limit
+        self._stats["decreases"] += 1
+        self._record_decision("decrease", reason)
+        logger.info(
+            "Reduced request concurrency",
+            family=self.name,
+            limit=self._limit,
+            reason=reason,
+        )
+
+    def _record_decision(self, action: str, reason: str) -> None:
+        self._decisions.append(
+            {
+                "action": action,
+                "reason": reason,
+                "limit": self._limit,
+                "p95_latency": self.p95_latency(),
+                "error_rate": round(self.error_rate(), 3),
+                "timestamp": datetime.now().isoformat(),
+            }
+        )
+
+    def _wake(self) -> None:
+        available = self._limit - self._in_flight
+        while available > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                available -= 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """Current limit, health signals and the most recent decisions."""
+        p95 = self.p95_latency()
+        return {
+            "limit": self._limit,
+            "in_flight": self._in_flight,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "waiting": len(self._waiters),
+            "p95_latency": round(p95, 3) if p95 is not None else None,
+            "error_rate": round(self.error_rate(), 3),
+            "cooldown_remaining": round(
+                max(0.0, self._cooldown_until - self._time()), 2
+            ),
+            **self._stats,
+            "recent_decisions": list(self._decisions),
+        }
+
+
+__all__ = ["AdaptiveConcurrencyLimiter", "parse_retry_after"]
@@ -385,6 +385,40 @@ class AsyncRateLimiter:
             self.calls.append(now)
 
 
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls into one in-flight execution.
+
+    The first caller for a key starts the call; callers arriving while it is
+    in flight await the same result (or exception) instead of issuing their
+    own. Nothing is cached once the call completes. The shared call runs in
+    its own task, so cancelling one waiter does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[Any, asyncio.Future] = {}
+        self.stats = {'executed': 0, 'coalesced': 0}
+
+    async def do(self, key: Any, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn()`` for ``key`` unless an identical call is already in flight."""
+        future = self._in_flight.get(key)
+        if future is None:
+            self.stats['executed'] += 1
+            future = asyncio.ensure_future(fn())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.stats['coalesced'] += 1
+        return await asyncio.shield(future)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def get_stats(self) -> dict[str, int]:
+        return {**self.stats, 'in_flight': self.in_flight}
+
+
 def run_async(coro: Awaitable[T]) -> T:
     """
     Run an async function in a sync context.
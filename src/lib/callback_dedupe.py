@@ -0,0 +1,278 @@
+"""Idempotent callback processing: drop items that were already handled.
+
+SignalHire may deliver a callback more than once, and items answered with
+``duplicate_query`` carry nothing new. Every callback item is keyed by
+``(Request-Id, item, payload hash)``; keys of handled items are recorded in a
+persistent exact index (SQLite) and mirrored in a bounded in-memory Bloom
+filter. A key the filter has never seen is new without touching the index, so
+the common case costs a few bit probes; only filter hits are confirmed
+against the index, which rules out false positives.
+
+The filter is rebuilt from the index whenever it fills up and is always
+sized to hold every key still within the retention window, so a filter miss
+is conclusive. Expired keys are pruned from the index every
+``prune_interval`` seconds. Keys added by other processes sharing the index
+are folded into the filter incrementally before each check.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_CAPACITY = 1_000_000
+DEFAULT_ERROR_RATE = 0.001
+DEFAULT_RETENTION_SECONDS = 30 * 24 * 3600.0
+DEFAULT_PRUNE_INTERVAL = 3600.0
+
+# Items that repeat an earlier reveal and carry no new data
+DUPLICATE_STATUSES = {"duplicate_query"}
+
+
+def item_key(request_id: str, entry: Any) -> bytes:
+    """16-byte dedupe key of one callback item."""
+    if isinstance(entry, dict):
+        item = entry.get("item")
+        payload = json.dumps(entry, sort_keys=True, separators=(",", ":"), default=str)
+    else:
+        item = getattr(entry, "item", None)
+        payload = repr(entry)
+    material = f"{request_id}\x00{item}\x00{payload}".encode()
+    return hashlib.blake2b(material, digest_size=16).digest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 16-byte hash keys.
+
+    Parameters
+    - capacity: keys the filter is sized for
+    - error_rate: false-positive rate at ``capacity`` keys
+    """
+
+    def __init__(self, capacity: int, error_rate: float = DEFAULT_ERROR_RATE) -> None:
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be > 0 and error_rate in (0, 1)")
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: bytes):
+        # Keys are already uniform hashes; derive k probes by double hashing
+        h1 = int.from_bytes(key[:8], "little")
+        h2 = int.from_bytes(key[8:16], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: bytes) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+
+class CallbackDeduper:
+    """Seen-set of handled callback items: Bloom filter over an exact SQLite index.
+
+    Parameters
+    - path: SQLite index file, shareable between processes (``None`` keeps it in memory)
+    - capacity: minimum keys held by the in-memory filter; it grows to cover
+      every retained key
+    - error_rate: filter false-positive rate
+    - retention: seconds keys are kept in the index
+    - prune_interval: seconds between deletions of expired keys
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS seen_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            key BLOB NOT NULL UNIQUE,
+            seen_at REAL NOT NULL
+        );
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] | None = None,
+        *,
+        capacity: int = DEFAULT_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+        retention: float = DEFAULT_RETENTION_SECONDS,
+        prune_interval: float = DEFAULT_PRUNE_INTERVAL,
+    ) -> None:
+        self.path = Path(path) if path else None
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.retention = retention
+        self.prune_interval = prune_interval
+        self._pruned_at = 0.0
+        self._db: sqlite3.Connection | None = None
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._last_id = 0
+        self._in_flight: set[bytes] = set()
+        self._lock = threading.Lock()
+        self._stats = {
+            "checked": 0,
+            "passed": 0,
+            "duplicates_dropped": 0,
+            "duplicate_queries_dropped": 0,
+            "filter_hits": 0,
+            "false_positives": 0,
+        }
+
+    def open(self) -> None:
+        if self._db is not None:
+            return
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(
+            str(self.path) if self.path else ":memory:",
+            timeout=30.0,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        if self.path is not None:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(self._SCHEMA)
+        self._db = db
+        self._rebuild()
+
+    def _prune(self) -> None:
+        """Delete keys older than the retention window."""
+        now = time.time()
+        self._db.execute(
+            "DELETE FROM seen_items WHERE seen_at < ?", (now - self.retention,)
+        )
+        self._pruned_at = now
+
+    def _rebuild(self) -> None:
+        """Refill the filter with every retained key, leaving half of it free."""
+        self._prune()
+        retained = self._db.execute("SELECT COUNT(*) FROM seen_items").fetchone()[0]
+        self._bloom = BloomFilter(max(self.capacity, 2 * retained), self.error_rate)
+        self._last_id = 0
+        for row_id, key in self._db.execute("SELECT id, key FROM seen_items ORDER BY id"):
+            self._bloom.add(bytes(key))
+            self._last_id = row_id
+
+    def _sync(self) -> None:
+        """Fold keys recorded since the last check (by any process) into the filter."""
+        if time.time() - self._pruned_at >= self.prune_interval:
+            self._prune()
+        rows = self._db.execute(
+            "SELECT id, key FROM seen_items WHERE id > ? ORDER BY id", (self._last_id,)
+        ).fetchall()
+        for row_id, key in rows:
+            self._bloom.add(bytes(key))
+            self._last_id = row_id
+        if self._bloom.full:
+            self._rebuild()
+
+    def _seen(self, key: bytes) -> bool:
+        if key in self._in_flight:
+            return True
+        if key not in self._bloom:
+            return False
+        self._stats["filter_hits"] += 1
+        found = self._db.execute(
+            "SELECT 1 FROM seen_items WHERE key = ?", (key,)
+        ).fetchone()
+        if found is None:
+            self._stats["false_positives"] += 1
+        return found is not None
+
+    def admit(
+        self, request_id: str, callback_data: list[Any]
+    ) -> tuple[list[Any], list[bytes]]:
+        """Split a callback into items to handle and drop the rest.
+
+        Returns the new items and their keys; pass the keys to :meth:`commit`
+        once the handlers have run (or :meth:`release` if they did not).
+        """
+        self.open()
+        fresh, keys = [], []
+        with self._lock:
+            self._sync()
+            for entry in callback_data:
+                self._stats["checked"] += 1
+                status = (
+                    entry.get("status")
+                    if isinstance(entry, dict)
+                    else getattr(entry, "status", None)
+                )
+                if status in DUPLICATE_STATUSES:
+                    self._stats["duplicate_queries_dropped"] += 1
+                    continue
+                key = item_key(request_id, entry)
+                if self._seen(key):
+                    self._stats["duplicates_dropped"] += 1
+                    continue
+                self._in_flight.add(key)
+                fresh.append(entry)
+                keys.append(key)
+            self._stats["passed"] += len(fresh)
+        return fresh, keys
+
+    def commit(self, keys: list[bytes]) -> None:
+        """Record handled items so later deliveries are dropped."""
+        if not keys:
+            return
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO seen_items (key, seen_at) VALUES (?, ?)",
+                [(key, now) for key in keys],
+            )
+            self._in_flight.difference_update(keys)
+            self._sync()
+
+    def release(self, keys: list[bytes]) -> None:
+        """Forget in-flight items whose processing did not finish."""
+        with self._lock:
+            self._in_flight.difference_update(keys)
+
+    def close(self) -> None:
+        if self._db is not None:
+            with self._lock:
+                self._db.close()
+                self._db = None
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            indexed = (
+                self._db.execute("SELECT COUNT(*) FROM seen_items").fetchone()[0]
+                if self._db is not None
+                else 0
+            )
+            return {
+                **self._stats,
+                "indexed": indexed,
+                "filter_keys": self._bloom.count,
+                "filter_capacity": self._bloom.capacity,
+                "in_flight": len(self._in_flight),
+            }
+
+
+__all__ = ["BloomFilter", "CallbackDeduper", "item_key"]
@@ -4,42 +4,313 @@ FastAPI callback server for SignalHire Person API webhooks.
 This server receives callbacks from SignalHire's Person API and processes
 the revealed contact information. It supports multiple callback handlers
 and provides a simple interface for starting/stopping the server.
+
+Callbacks are logged durably (``callback_wal``, or the shared SQLite
+``callback_store`` when several processes share the port), acknowledged, and
+drained into the handlers by a bounded worker pool; past ``max_backlog`` the
+endpoint answers 503 with ``Retry-After``. Duplicates are dropped by
+``callback_dedupe``, failed callbacks are retried with backoff, and each
+processed callback resolves its request in the ``reveal_registry``.
 """
 
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
+import socket
 import threading
-from contextlib import asynccontextmanager
+from concurrent.futures import Future
+from contextlib import asynccontextmanager, contextmanager, suppress
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import uvicorn
-from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
-from pydantic import ValidationError
 
-from ..models.person_callback import PersonCallbackData, PersonCallbackItem
+from ..models.person_callback import PersonCallbackData, parse_person_callback
+from .callback_dedupe import CallbackDeduper
+from .callback_store import SharedCallbackStore
+from .callback_wal import CallbackWAL, WalEntry
+from .reveal_registry import RevealRegistry, get_reveal_registry
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+
+
+class CallbackHandlerError(Exception):
+    """A handler failed, so the callback stays in the backlog for a retry."""
+
+
+class _EmbeddedServer(uvicorn.Server):
+    """uvicorn server that leaves signal handling to the host application."""
+
+    def install_signal_handlers(self) -> None:  # uvicorn < 0.29
+        pass
+
+    @contextmanager
+    def capture_signals(self):  # uvicorn >= 0.29
+        yield
+
 
 class CallbackServer:
     """FastAPI-based callback server for SignalHire Person API."""
 
-    def __init__(self, host: str = "0.0.0.0", port: int = 8000):
+    def __init__(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 8000,
+        *,
+        wal_dir: str | Path | None = None,
+        workers: int = 4,
+        max_backlog: int = 1000,
+        retry_after: int = 5,
+        fsync: bool = True,
+        reveal_registry: RevealRegistry | None = None,
+        store_path: str | Path | None = None,
+        reuse_port: bool = False,
+        poll_interval: float = 0.2,
+        dedupe: bool = True,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ):
+        if workers < 1 or max_backlog < 1 or max_attempts < 1:
+            raise ValueError("workers, max_backlog and max_attempts must be positive")
         self.host = host
         self.port = port
+        # Bind with SO_REUSEPORT so several processes can serve one port
+        self.reuse_port = reuse_port
         self.app: FastAPI | None = None
         self.server_thread: threading.Thread | None = None
         self.is_running = False
+        self._uvicorn: uvicorn.Server | None = None
+        self._serve_task: asyncio.Task | None = None
         self._callback_handlers: dict[str, Callable[[PersonCallbackData], None]] = {}
+        # Global handlers that receive parsed PersonCallbackItem models
+        self._typed_handlers: set[str] = set()
         self._request_handlers: dict[str, Callable[[str, PersonCallbackData], None]] = (
             {}
         )
+        # Request handlers addressable by name, for registrations that must
+        # be visible to every process through the shared store
+        self._named_request_handlers: dict[
+            str, Callable[[str, PersonCallbackData], None]
+        ] = {}
+        # Request ID -> futures awaited by SignalHireClient.reveal_and_wait
+        self.reveal_registry = reveal_registry or get_reveal_registry()
+        # Ingest pipeline: write-ahead log -> queue -> bounded worker pool, or
+        # with a shared store: SQLite backlog claimed by workers of any process
+        self.store = SharedCallbackStore(store_path, fsync=fsync) if store_path else None
+        self.wal = (
+            None
+            if self.store
+            else CallbackWAL(Path(wal_dir) if wal_dir else None, fsync=fsync)
+        )
+        self._backlog: CallbackWAL | SharedCallbackStore = self.store or self.wal
+        # Seen-set of handled items, kept next to the backlog it protects
+        self.dedupe: CallbackDeduper | None = None
+        if dedupe:
+            self.dedupe = CallbackDeduper(
+                self.store.path.with_name(f"{self.store.path.stem}-seen.db")
+                if self.store
+                else self.wal.directory / "seen.db"
+            )
+        self.poll_interval = poll_interval
+        self._wakeup: asyncio.Event | None = None
+        self.workers = workers
+        self.max_backlog = max_backlog
+        self.retry_after = retry_after
+        self.max_attempts = max_attempts
+        self._queue: asyncio.Queue[WalEntry] | None = None
+        self._worker_tasks: list[asyncio.Task] = []
+        # WAL sequence -> failed processing attempts (the shared store counts its own)
+        self._attempts: dict[int, int] = {}
+        self._ingest_stats = {
+            "accepted": 0,
+            "rejected": 0,
+            "processed": 0,
+            "invalid": 0,
+            "failed": 0,
+            "dead": 0,
+            "duplicates": 0,
+            "duplicate_callbacks": 0,
+            "handler_errors": 0,
+        }
+
+    async def start_ingest(self) -> None:
+        """Open the write-ahead log, queue unprocessed entries and start workers."""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+        for entry in self._backlog.open():
+            self._queue.put_nowait(entry)
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(), name=f"callback-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop_ingest(self) -> None:
+        """Stop the workers and close the log; pending entries replay next start."""
+        for task in self._worker_tasks:
+            task.cancel()
+        for task in self._worker_tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+        self._worker_tasks = []
+        self._queue = None
+        self._wakeup = None
+        self._backlog.close()
+        if self.dedupe is not None:
+            self.dedupe.close()
+
+    async def wait_idle(self) -> None:
+        """Wait until every logged callback has been processed."""
+        if self._queue is None:
+            return
+        if self.store is None:
+            await self._queue.join()
+            return
+        # Shared backlog: idle once no process has callbacks left
+        while await self.store.count_pending():
+            await asyncio.sleep(self.poll_interval / 4)
+
+    async def _next_entry(self) -> WalEntry:
+        """Next callback to process: from the local queue, or claimed from the store."""
+        if self.store is None:
+            return await self._queue.get()
+        while True:
+            entry = await self.store.claim()
+            if entry is not None:
+                return entry
+            self._wakeup.clear()
+            # Polling also picks up callbacks received by other processes and
+            # leases abandoned by crashed ones
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+
+    async def _worker(self) -> None:
+        """Drain logged callbacks into the registered handlers."""
+        while True:
+            entry = await self._next_entry()
+            done = True
+            try:
+                try:
+                    callback_data = json.loads(entry.body)
+                except ValueError as e:
+                    self._ingest_stats["invalid"] += 1
+                    logger.error(
+                        f"Dropping unparseable callback for {entry.request_id}: {e}"
+                    )
+                else:
+                    try:
+                        await self._dispatch(entry.request_id, callback_data, entry.body)
+                    except Exception as e:  # noqa: BLE001
+                        # Keep the worker alive; the entry stays un-acked
+                        done = await self._retry_later(entry, e)
+                        continue
+                self._attempts.pop(entry.seq, None)
+                if self.store is None:
+                    self.wal.ack(entry.seq)
+                else:
+                    await self.store.ack(entry.seq)
+            finally:
+                if self.store is None and done:
+                    self._queue.task_done()
+
+    async def _retry_later(self, entry: WalEntry, error: Exception) -> bool:
+        """Schedule a failed callback for another attempt, or move it aside.
+
+        Returns whether the entry is finished with (for ``Queue.task_done``).
+        """
+        self._ingest_stats["failed"] += 1
+        if self.store is not None:
+            delay = _retry_delay(entry.attempts)
+            if await self.store.retry(entry.seq, delay, self.max_attempts, str(error)):
+                self._ingest_stats["dead"] += 1
+                logger.error(
+                    f"Moved callback {entry.request_id} aside after "
+                    f"{self.max_attempts} failed attempts: {error}"
+                )
+            else:
+                logger.warning(
+                    f"Processing callback {entry.request_id} failed; "
+                    f"retrying in {delay:.0f}s: {error}"
+                )
+            return True
+
+        attempts = self._attempts.get(entry.seq, 0) + 1
+        if attempts >= self.max_attempts:
+            self._attempts.pop(entry.seq, None)
+            self.wal.set_aside(entry, str(error))
+            self._ingest_stats["dead"] += 1
+            logger.error(
+                f"Moved callback {entry.request_id} aside after "
+                f"{attempts} failed attempts: {error}"
+            )
+            return True
+        self._attempts[entry.seq] = attempts
+        delay = _retry_delay(attempts)
+        logger.warning(
+            f"Processing callback {entry.request_id} failed; "
+            f"retrying in {delay:.0f}s: {error}"
+        )
+        queue = self._queue
+
+        def requeue() -> None:
+            # The entry counts as unfinished until it is back on the queue,
+            # so wait_idle() does not return in between
+            if self._queue is queue:
+                queue.put_nowait(entry)
+                queue.task_done()
+
+        asyncio.get_running_loop().call_later(delay, requeue)
+        return False
+
+    async def _dispatch(
+        self, request_id: str, callback_data: Any, body: bytes | None = None
+    ) -> None:
+        """Run the handlers on the items of a callback not handled before."""
+        if self.dedupe is None or not isinstance(callback_data, list):
+            if not await self._process_callback(request_id, callback_data, body):
+                raise CallbackHandlerError(f"a handler failed for {request_id}")
+            self._ingest_stats["processed"] += 1
+            return
+
+        fresh, keys = await asyncio.to_thread(
+            self.dedupe.admit, request_id, callback_data
+        )
+        if not fresh:
+            self._ingest_stats["duplicate_callbacks"] += 1
+            logger.info(f"Dropped duplicate delivery of callback {request_id}")
+            # Waiters still learn the outcome (e.g. all items duplicate_query);
+            # a request that was already resolved is left as it is
+            self.reveal_registry.resolve(request_id, callback_data)
+            return
+        try:
+            # Handlers only see new items, waiters get the whole callback.
+            # The raw body still matches when nothing was dropped
+            handled = await self._process_callback(
+                request_id,
+                fresh,
+                body if len(fresh) == len(callback_data) else None,
+                resolve_with=callback_data,
+            )
+        except BaseException:
+            self.dedupe.release(keys)
+            raise
+        if not handled:
+            # Not seen yet, so the retry reaches the handlers again
+            self.dedupe.release(keys)
+            raise CallbackHandlerError(f"a handler failed for {request_id}")
+        await asyncio.to_thread(self.dedupe.commit, keys)
+        self._ingest_stats["processed"] += 1
 
     def create_app(self) -> FastAPI:
         """Create and configure the FastAPI application."""
@@ -47,8 +318,10 @@ class CallbackServer:
         @asynccontextmanager
         async def lifespan(_app: FastAPI):
             logger.info("Starting SignalHire callback server")
+            await self.start_ingest()
             yield
             logger.info("Shutting down SignalHire callback server")
+            await self.stop_ingest()
 
         app = FastAPI(
             title="SignalHire Callback Server",
@@ -58,48 +331,63 @@ class CallbackServer:
         )
 
         @app.post("/signalhire/callback")
-        async def handle_callback(
-            request: Request, background_tasks: BackgroundTasks
-        ) -> JSONResponse:
-            """Handle SignalHire Person API callback."""
-            try:
-                # Extract request ID from headers
-                request_id = request.headers.get("Request-Id")
-                if not request_id:
-                    logger.warning("Callback received without Request-Id header")
-                    raise HTTPException(
-                        status_code=400, detail="Missing Request-Id header"
-                    )
-
-                # Parse callback data - skip Pydantic validation to avoid errors
-                raw_data = await request.json()
-                callback_data = raw_data  # Use raw data directly
-
-                logger.info(
-                    f"Received callback for request {request_id} with {len(callback_data)} items"
-                )
-
-                # Process callback in background
-                background_tasks.add_task(
-                    self._process_callback, request_id, callback_data
+        async def handle_callback(request: Request) -> JSONResponse:
+            """Log a SignalHire Person API callback and acknowledge it."""
+            # Extract request ID from headers
+            request_id = request.headers.get("Request-Id")
+            if not request_id:
+                logger.warning("Callback received without Request-Id header")
+                raise HTTPException(status_code=400, detail="Missing Request-Id header")
+
+            # Started by the lifespan; also covers apps served without it
+            await self.start_ingest()
+
+            backlog = (
+                self.wal.pending
+                if self.store is None
+                else await self.store.count_pending()
+            )
+            if backlog >= self.max_backlog:
+                self._ingest_stats["rejected"] += 1
+                logger.warning(
+                    f"Callback backlog full ({backlog}); "
+                    f"rejecting {request_id} for {self.retry_after}s"
                 )
-
                 return JSONResponse(
-                    status_code=200,
-                    content={"status": "accepted", "request_id": request_id},
+                    status_code=503,
+                    content={"status": "busy", "request_id": request_id},
+                    headers={"Retry-After": str(self.retry_after)},
                 )
 
-            except ValidationError as e:
-                logger.error(f"Invalid callback data: {e}")
-                raise HTTPException(
-                    status_code=422, detail=f"Invalid callback data: {e}"
-                ) from e
-            except Exception as e:
-                logger.error(f"Error processing callback: {e}")
+            # The body is stored raw and only parsed by the workers
+            body = await request.body()
+            try:
+                entry = await self._backlog.append(request_id, body)
+            except OSError as e:
+                logger.error(f"Could not log callback {request_id}: {e}")
                 raise HTTPException(
                     status_code=500, detail="Internal server error"
                 ) from e
 
+            if entry is None:
+                # Shared store: the same callback was already received
+                self._ingest_stats["duplicates"] += 1
+                return JSONResponse(
+                    status_code=200,
+                    content={"status": "duplicate", "request_id": request_id},
+                )
+            if self.store is None:
+                self._queue.put_nowait(entry)
+            else:
+                self._wakeup.set()
+            self._ingest_stats["accepted"] += 1
+            logger.info(f"Logged callback for request {request_id} ({len(body)} bytes)")
+
+            return JSONResponse(
+                status_code=200,
+                content={"status": "accepted", "request_id": request_id},
+            )
+
         @app.get("/health")
         async def health_check() -> dict[str, Any]:
             """Health check endpoint."""
@@ -118,71 +406,206 @@ class CallbackServer:
         return app
 
     async def _process_callback(
-        self, request_id: str, callback_data: PersonCallbackData
-    ) -> None:
-        """Process callback data using registered handlers."""
+        self,
+        request_id: str,
+        callback_data: PersonCallbackData,
+        body: bytes | None = None,
+        *,
+        resolve_with: Any = None,
+    ) -> bool:
+        """Process callback data using registered handlers.
+
+        Handlers get the decoded items, except typed handlers, which get
+        ``PersonCallbackItem`` models. Those models are parsed once per
+        callback, straight from ``body`` when it is available. The request
+        is resolved with ``resolve_with`` (default ``callback_data``).
+        Returns whether every handler succeeded.
+        """
+        parsed: PersonCallbackData | None = None
+        handled = True
         try:
-            # Call request-specific handlers first
-            if request_id in self._request_handlers:
-                handler = self._request_handlers[request_id]
+            # Call request-specific handlers first. The registration is only
+            # dropped once the handler succeeded, so a retry runs it again
+            handler = self._request_handlers.get(request_id)
+            name = None
+            if handler is None and self.store is not None:
+                name = await asyncio.to_thread(self.store.request_handler, request_id)
+                handler = self._named_request_handlers.get(name) if name else None
+                if name and handler is None:
+                    logger.error(
+                        f"Request handler {name!r} for {request_id} is not defined"
+                    )
+            if handler is not None:
                 if asyncio.iscoroutinefunction(handler):
                     await handler(request_id, callback_data)
                 else:
                     await asyncio.to_thread(handler, request_id, callback_data)
-                del self._request_handlers[request_id]
+                self._request_handlers.pop(request_id, None)
+            if name:
+                await asyncio.to_thread(self.store.drop_request_handler, request_id)
 
             for handler_name, handler in self._callback_handlers.items():
                 try:
+                    data = callback_data
+                    if handler_name in self._typed_handlers:
+                        if parsed is None:
+                            parsed = parse_person_callback(
+                                body if body is not None else callback_data
+                            )
+                        data = parsed
                     if asyncio.iscoroutinefunction(handler):
-                        await handler(callback_data)
+                        await handler(data)
                     else:
-                        await asyncio.to_thread(handler, callback_data)
+                        await asyncio.to_thread(handler, data)
                     logger.debug(
                         f"Handler {handler_name} processed callback successfully"
                     )
                 except Exception as e:  # noqa: BLE001
+                    handled = False
                     logger.error(f"Handler {handler_name} failed: {e}")
 
             # Log callback statistics
-            success_count = sum(1 for item in callback_data if item.get("status") == "success")
+            success_count = sum(
+                1 for item in callback_data if _item_status(item) == "success"
+            )
             failed_count = len(callback_data) - success_count
             logger.info(
                 f"Callback {request_id}: {success_count} successful, {failed_count} failed"
             )
 
         except Exception as e:  # noqa: BLE001
+            handled = False
             logger.error(f"Error in callback processing for {request_id}: {e}")
+        finally:
+            # Waiters are released even when a handler failed
+            try:
+                self.reveal_registry.resolve(
+                    request_id,
+                    callback_data if resolve_with is None else resolve_with,
+                )
+            except Exception as e:  # noqa: BLE001
+                logger.error(f"Could not resolve waiters for {request_id}: {e}")
+        if not handled:
+            self._ingest_stats["handler_errors"] += 1
+        return handled
 
     def register_handler(
-        self, name: str, handler: Callable[[PersonCallbackData], None]
+        self,
+        name: str,
+        handler: Callable[[PersonCallbackData], None],
+        *,
+        typed: bool = False,
     ) -> None:
-        """Register a global callback handler."""
+        """Register a global callback handler.
+
+        With ``typed=True`` the handler receives ``PersonCallbackItem`` models
+        (see :func:`parse_person_callback`) instead of decoded dicts.
+        """
         self._callback_handlers[name] = handler
+        if typed:
+            self._typed_handlers.add(name)
+        else:
+            self._typed_handlers.discard(name)
         logger.info(f"Registered global callback handler: {name}")
 
-    def register_request_handler(
-        self, request_id: str, handler: Callable[[str, PersonCallbackData], None]
+    def define_request_handler(
+        self, name: str, handler: Callable[[str, PersonCallbackData], None]
     ) -> None:
-        """Register a one-time handler for a specific request ID."""
-        self._request_handlers[request_id] = handler
+        """Make a request handler addressable by name (see register_request_handler)."""
+        self._named_request_handlers[name] = handler
+
+    def register_request_handler(
+        self,
+        request_id: str,
+        handler: Callable[[str, PersonCallbackData], None] | str | None = None,
+    ) -> Future:
+        """Register a one-time handler for a specific request ID.
+
+        ``handler`` is a callable, or the name of a handler defined with
+        :meth:`define_request_handler`; named registrations are written to the
+        shared store when there is one, so whichever process receives the
+        callback runs it. The handler is optional.
+
+        Returns a future resolving to the request's list of ``RevealCompletion``
+        once its callback has been processed in this process; await it from
+        any event loop with ``asyncio.wrap_future``.
+        """
+        if isinstance(handler, str):
+            if handler not in self._named_request_handlers:
+                raise KeyError(f"Request handler {handler!r} is not defined")
+            if self.store is not None:
+                self.store.open()
+                self.store.register_request_handler(request_id, handler)
+            else:
+                self._request_handlers[request_id] = self._named_request_handlers[
+                    handler
+                ]
+        elif handler is not None:
+            self._request_handlers[request_id] = handler
         logger.info(f"Registered request handler for: {request_id}")
+        return self.reveal_registry.wait_for(request_id)
+
+    async def wait_for_request(
+        self, request_id: str, timeout: float | None = None
+    ) -> list[Any]:
+        """Wait for the callback of ``request_id`` and return its completions."""
+        future = asyncio.wrap_future(self.reveal_registry.wait_for(request_id))
+        # Shielded so a timeout does not cancel the future other waiters share
+        return await asyncio.wait_for(asyncio.shield(future), timeout)
 
     def unregister_handler(self, name: str) -> bool:
         """Unregister a global callback handler."""
         if name in self._callback_handlers:
             del self._callback_handlers[name]
+            self._typed_handlers.discard(name)
             logger.info(f"Unregistered callback handler: {name}")
             return True
         return False
 
+    def _make_uvicorn_server(self, *, embedded: bool) -> uvicorn.Server:
+        if not self.app:
+            self.create_app()
+        options: dict[str, Any] = {}
+        if embedded:
+            # Keep the host application's logging configuration
+            options["log_config"] = None
+        config = uvicorn.Config(
+            self.app,
+            host=self.host,
+            port=self.port,
+            log_level="info",
+            access_log=False,
+            **options,
+        )
+        server_class = _EmbeddedServer if embedded else uvicorn.Server
+        return server_class(config)
+
+    def _sockets(self) -> list[socket.socket] | None:
+        """Pre-bound listening socket when sharing the port with other processes."""
+        if not self.reuse_port:
+            return None
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # The kernel spreads connections across every process bound this way
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((self.host, self.port))
+        return [sock]
+
     def start(self, background: bool = True) -> None:
-        """Start the callback server."""
+        """Start the callback server.
+
+        With ``background`` the server runs in a daemon thread with its own
+        event loop; otherwise this call blocks until the server exits. Use
+        :meth:`astart` to serve on the caller's event loop instead.
+        """
         if self.is_running:
             logger.warning("Server is already running")
             return
 
-        if not self.app:
-            self.create_app()
+        self._uvicorn = self._make_uvicorn_server(embedded=background)
+        self.is_running = True
+        logger.info(f"Callback server starting on {self.host}:{self.port}")
 
         if background:
             self.server_thread = threading.Thread(target=self._run_server, daemon=True)
@@ -190,35 +613,90 @@ class CallbackServer:
         else:
             self._run_server()
 
-        self.is_running = True
-        logger.info(f"Callback server started on {self.host}:{self.port}")
-
     def _run_server(self) -> None:
-        """Run the FastAPI server with uvicorn."""
+        """Run the uvicorn server until it is asked to exit."""
         try:
-            uvicorn.run(
-                self.app,
-                host=self.host,
-                port=self.port,
-                log_level="info",
-                access_log=False,
-            )
+            self._uvicorn.run(sockets=self._sockets())
         except Exception as e:  # noqa: BLE001
             logger.error(f"Server error: {e}")
+        finally:
             self.is_running = False
 
-    def stop(self) -> None:
-        """Stop the callback server."""
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop a server started with :meth:`start` and wait for its thread."""
+        if self._serve_task is not None:
+            raise RuntimeError("Server runs on an event loop; use 'await astop()'")
         if not self.is_running:
             logger.warning("Server is not running")
             return
 
-        # Note: uvicorn doesn't provide clean shutdown in thread mode
-        # For production, consider using asyncio-based startup
-        logger.warning(
-            "Server stop requested - restart application to fully stop server"
-        )
+        self._uvicorn.should_exit = True
+        if self.server_thread is not None:
+            self.server_thread.join(timeout)
+            if self.server_thread.is_alive():
+                logger.warning(f"Callback server did not stop within {timeout}s")
+            self.server_thread = None
         self.is_running = False
+        logger.info("Callback server stopped")
+
+    async def astart(self) -> None:
+        """Serve on the running event loop; returns once the socket is bound.
+
+        Handlers run on this loop, so coroutine handlers are awaited directly
+        alongside ``SignalHireClient``. With ``port=0`` the bound port is
+        stored in :attr:`port`.
+        """
+        if self.is_running:
+            logger.warning("Server is already running")
+            return
+
+        self._uvicorn = self._make_uvicorn_server(embedded=True)
+        self._serve_task = asyncio.create_task(self._serve(), name="callback-server")
+        while not self._uvicorn.started:
+            if self._serve_task.done():
+                error = self._serve_task.exception()
+                self._serve_task = None
+                raise RuntimeError(
+                    f"Callback server failed to start on {self.host}:{self.port}"
+                ) from error
+            await asyncio.sleep(0.01)
+
+        sockets = [
+            sock for server in self._uvicorn.servers for sock in server.sockets
+        ]
+        if sockets and self.port == 0:
+            self.port = sockets[0].getsockname()[1]
+        self.is_running = True
+        logger.info(f"Callback server started on {self.host}:{self.port} (in-loop)")
+
+    async def _serve(self) -> None:
+        try:
+            await self._uvicorn.serve(sockets=self._sockets())
+        except SystemExit as e:
+            # uvicorn exits the process when it cannot bind; keep the host alive
+            raise RuntimeError(f"uvicorn exited with status {e.code}") from None
+
+    async def astop(self) -> None:
+        """Shut down a server started with :meth:`astart`."""
+        if self._serve_task is None:
+            logger.warning("Server is not running")
+            return
+
+        self._uvicorn.should_exit = True
+        try:
+            await self._serve_task
+        finally:
+            self._serve_task = None
+            self._uvicorn = None
+            self.is_running = False
+        logger.info("Callback server stopped")
+
+    async def __aenter__(self) -> CallbackServer:
+        await self.astart()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.astop()
 
     def get_callback_url(self, external_host: str | None = None) -> str:
         """Get the callback URL for SignalHire API requests."""
@@ -230,13 +708,25 @@ class CallbackServer:
     @property
     def status(self) -> dict[str, Any]:
         """Get server status information."""
+        pending_requests = list(self._request_handlers.keys())
+        if self.store is not None and self.store.is_open:
+            pending_requests += self.store.request_handler_ids()
         return {
             "running": self.is_running,
             "host": self.host,
             "port": self.port,
             "callback_url": self.get_callback_url(),
             "handlers": list(self._callback_handlers.keys()),
-            "pending_requests": list(self._request_handlers.keys()),
+            "pending_requests": pending_requests,
+            "awaited_requests": self.reveal_registry.get_stats(),
+            "ingest": {
+                **self._ingest_stats,
+                "backlog": self._backlog.pending if self._backlog.is_open else 0,
+                "max_backlog": self.max_backlog,
+                "workers": len(self._worker_tasks),
+                "store" if self.store else "wal": self._backlog.get_stats(),
+                "dedupe": self.dedupe.get_stats() if self.dedupe else None,
+            },
         }
 
 
@@ -244,19 +734,24 @@ class CallbackServer:
 _default_server: CallbackServer | None = None
 
 
-def get_server(host: str = "0.0.0.0", port: int = 8000) -> CallbackServer:
-    """Get or create the default callback server instance."""
+def get_server(
+    host: str = "0.0.0.0", port: int = 8000, **options: Any
+) -> CallbackServer:
+    """Get or create the default callback server instance.
+
+    ``options`` (wal_dir, workers, max_backlog, ...) apply on creation only.
+    """
     global _default_server
     if _default_server is None:
-        _default_server = CallbackServer(host=host, port=port)
+        _default_server = CallbackServer(host=host, port=port, **options)
     return _default_server
 
 
 def start_server(
-    host: str = "0.0.0.0", port: int = 8000, background: bool = True
+    host: str = "0.0.0.0", port: int = 8000, background: bool = True, **options: Any
 ) -> CallbackServer:
     """Start the default callback server."""
-    server = get_server(host, port)
+    server = get_server(host, port, **options)
     if not server.is_running:
         server.start(background=background)
     return server
@@ -269,12 +764,24 @@ def stop_server() -> None:
         _default_server.stop()
 
 
-# Example usage handlers
+def _retry_delay(attempts: int) -> float:
+    """Backoff before the next attempt of a callback that failed ``attempts`` times."""
+    return min(RETRY_BASE_DELAY * 2 ** max(attempts - 1, 0), RETRY_MAX_DELAY)
+
+
+def _item_status(item: Any) -> str | None:
+    """Status of a callback item, decoded or parsed."""
+    if isinstance(item, dict):
+        return item.get("status")
+    return getattr(item, "status", None)
+
+
+# Example usage handlers (register with typed=True)
 def log_callback_handler(callback_data: PersonCallbackData) -> None:
     """Example handler that logs callback data."""
     for item in callback_data:
         if item.status == "success" and item.candidate:
-            logger.info(f"Received contact for {item.candidate.fullName}")
+            logger.info(f"Received contact for {item.candidate.full_name}")
         else:
             logger.warning(f"Failed to process item {item.item}: {item.status}")
 
@@ -291,8 +798,8 @@ def save_to_csv_handler(callback_data: PersonCallbackData) -> None:
 if __name__ == "__main__":
     # Example usage
     server = CallbackServer(port=8001)
-    server.register_handler("logger", log_callback_handler)
-    server.register_handler("csv_saver", save_to_csv_handler)
+    server.register_handler("logger", log_callback_handler, typed=True)
+    server.register_handler("csv_saver", save_to_csv_handler, typed=True)
 
     print(f"Starting callback server at {server.get_callback_url()}")
     server.start(background=False)
@@ -0,0 +1,353 @@
+"""Shared SQLite store for callback servers running as several processes.
+
+With more than one uvicorn process behind the same port, any process may
+receive any callback, so everything the single-process server keeps in memory
+lives in one SQLite database (WAL journal) instead:
+
+- the ingest backlog: callbacks are inserted on receipt and claimed by worker
+  tasks of any process under a lease, so a crashed process's callbacks are
+  picked up by the others once the lease expires. A failed callback is
+  retried once a shortened lease runs out and moved to ``dead_callbacks``
+  after too many attempts. The backlog size is kept in a counter row by
+  triggers, so admission control does not count the table;
+- dedupe state: a digest of every ``Request-Id`` + body, so a callback
+  redelivered to a different process is dropped at insert;
+- request-handler registrations: request ID -> handler *name*, resolved by
+  each process against the handlers it defined at startup.
+
+Claims and inserts run in ``BEGIN IMMEDIATE`` transactions, which SQLite
+serializes across processes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from .callback_wal import WalEntry
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_LEASE_SECONDS = 60.0
+DEFAULT_DIGEST_RETENTION = 7 * 24 * 3600.0
+
+
+def _default_store_path() -> Path:
+    """Return the default location of the shared callback store."""
+    return Path.home() / ".signalhire-agent" / "callbacks" / "callbacks.db"
+
+
+class SharedCallbackStore:
+    """Callback backlog, dedupe digests and handler registrations in SQLite.
+
+    Parameters
+    - path: database file shared by every server process
+    - fsync: commit with ``synchronous=FULL`` so accepted callbacks survive power loss
+    - lease_timeout: seconds a claimed callback stays with its worker
+    - digest_retention: seconds dedupe digests are kept
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS callbacks (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            request_id TEXT NOT NULL,
+            body BLOB NOT NULL,
+            received_at REAL NOT NULL,
+            state TEXT NOT NULL DEFAULT 'pending',
+            lease_until REAL,
+            owner INTEGER,
+            attempts INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS callbacks_ready
+            ON callbacks (state, lease_until, seq);
+        CREATE TABLE IF NOT EXISTS callback_digests (
+            request_id TEXT NOT NULL,
+            digest TEXT NOT NULL,
+            received_at REAL NOT NULL,
+            PRIMARY KEY (request_id, digest)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS callback_digests_age
+            ON callback_digests (received_at);
+        CREATE TABLE IF NOT EXISTS request_handlers (
+            request_id TEXT PRIMARY KEY,
+            handler TEXT NOT NULL,
+            registered_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS dead_callbacks (
+            seq INTEGER PRIMARY KEY,
+            request_id TEXT NOT NULL,
+            body BLOB NOT NULL,
+            received_at REAL NOT NULL,
+            attempts INTEGER NOT NULL,
+            error TEXT,
+            died_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS backlog_size (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            callbacks INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO backlog_size SELECT 0, COUNT(*) FROM callbacks;
+        CREATE TRIGGER IF NOT EXISTS callbacks_added AFTER INSERT ON callbacks
+        BEGIN
+            UPDATE backlog_size SET callbacks = callbacks + 1 WHERE id = 0;
+        END;
+        CREATE TRIGGER IF NOT EXISTS callbacks_removed AFTER DELETE ON callbacks
+        BEGIN
+            UPDATE backlog_size SET callbacks = callbacks - 1 WHERE id = 0;
+        END;
+    """
+
+    # Callbacks marked dead by stores from before the dead_callbacks table
+    _ARCHIVE_DEAD = """
+        INSERT OR IGNORE INTO dead_callbacks
+            (seq, request_id, body, received_at, attempts, error, died_at)
+        SELECT seq, request_id, body, received_at, attempts, NULL, ?
+        FROM callbacks WHERE state = 'dead'
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] | None = None,
+        *,
+        fsync: bool = True,
+        lease_timeout: float = DEFAULT_LEASE_SECONDS,
+        digest_retention: float = DEFAULT_DIGEST_RETENTION,
+    ) -> None:
+        self.path = Path(path) if path else _default_store_path()
+        self.fsync = fsync
+        self.lease_timeout = lease_timeout
+        self.digest_retention = digest_retention
+        self._db: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "appended": 0,
+            "duplicates": 0,
+            "claimed": 0,
+            "acked": 0,
+            "retried": 0,
+            "dead": 0,
+        }
+
+    @property
+    def is_open(self) -> bool:
+        return self._db is not None
+
+    def open(self) -> list[WalEntry]:
+        """Open the database. Callbacks are claimed from it, so nothing is replayed."""
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(
+                self.path, timeout=30.0, isolation_level=None, check_same_thread=False
+            )
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(f"PRAGMA synchronous={'FULL' if self.fsync else 'NORMAL'}")
+            db.executescript(self._SCHEMA)
+            self._db = db
+
+            def archive(db: sqlite3.Connection) -> None:
+                db.execute(self._ARCHIVE_DEAD, (time.time(),))
+                db.execute("DELETE FROM callbacks WHERE state = 'dead'")
+
+            self._transaction(archive)
+        return []
+
+    def _transaction(self, work):
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(self._db)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return result
+
+    # Ingest -----------------------------------------------------------------
+
+    def append_sync(self, request_id: str, body: bytes) -> WalEntry | None:
+        """Insert a callback; returns ``None`` when the same one was already received."""
+        digest = hashlib.sha256(body).hexdigest()
+        now = time.time()
+
+        def insert(db: sqlite3.Connection) -> WalEntry | None:
+            cursor = db.execute(
+                "INSERT OR IGNORE INTO callback_digests (request_id, digest, received_at) "
+                "VALUES (?, ?, ?)",
+                (request_id, digest, now),
+            )
+            if cursor.rowcount == 0:
+                return None
+            cursor = db.execute(
+                "INSERT INTO callbacks (request_id, body, received_at) VALUES (?, ?, ?)",
+                (request_id, body, now),
+            )
+            return WalEntry(
+                seq=cursor.lastrowid, request_id=request_id, body=body, received_at=now
+            )
+
+        entry = self._transaction(insert)
+        self._stats["appended" if entry else "duplicates"] += 1
+        return entry
+
+    async def append(self, request_id: str, body: bytes) -> WalEntry | None:
+        """Insert a callback once it is committed (see :meth:`append_sync`)."""
+        if not self.is_open:
+            raise RuntimeError("Callback store is not open")
+        try:
+            return await asyncio.to_thread(self.append_sync, request_id, body)
+        except sqlite3.Error as exc:
+            raise OSError(f"callback store write failed: {exc}") from exc
+
+    def claim_sync(self) -> WalEntry | None:
+        """Lease the oldest available callback to this process."""
+        now = time.time()
+
+        def claim(db: sqlite3.Connection) -> WalEntry | None:
+            row = db.execute(
+                "UPDATE callbacks SET state = 'processing', lease_until = ?, owner = ?, "
+                "attempts = attempts + 1 WHERE seq = ("
+                "  SELECT seq FROM callbacks WHERE state = 'pending' "
+                "  OR (state = 'processing' AND lease_until < ?) ORDER BY seq LIMIT 1"
+                ") RETURNING seq, request_id, body, received_at, attempts",
+                (now + self.lease_timeout, os.getpid(), now),
+            ).fetchone()
+            if row is None:
+                return None
+            return WalEntry(
+                seq=row[0],
+                request_id=row[1],
+                body=bytes(row[2]),
+                received_at=row[3],
+                attempts=row[4],
+            )
+
+        entry = self._transaction(claim)
+        if entry is not None:
+            self._stats["claimed"] += 1
+        return entry
+
+    async def claim(self) -> WalEntry | None:
+        return await asyncio.to_thread(self.claim_sync)
+
+    def ack_sync(self, seq: int) -> None:
+        """Remove a processed callback; its digest stays for deduplication."""
+        with self._lock:
+            self._db.execute("DELETE FROM callbacks WHERE seq = ?", (seq,))
+        self._stats["acked"] += 1
+
+    async def ack(self, seq: int) -> None:
+        await asyncio.to_thread(self.ack_sync, seq)
+
+    def retry_sync(
+        self, seq: int, delay: float, max_attempts: int, error: str | None = None
+    ) -> bool:
+        """Hand a failed callback back for a retry after ``delay`` seconds.
+
+        Returns ``True`` when it has used up ``max_attempts`` and was moved to
+        ``dead_callbacks``.
+        """
+
+        def release(db: sqlite3.Connection) -> bool:
+            now = time.time()
+            row = db.execute(
+                "INSERT INTO dead_callbacks "
+                "(seq, request_id, body, received_at, attempts, error, died_at) "
+                "SELECT seq, request_id, body, received_at, attempts, ?, ? "
+                "FROM callbacks WHERE seq = ? AND attempts >= ? RETURNING seq",
+                (error, now, seq, max_attempts),
+            ).fetchone()
+            if row is not None:
+                db.execute("DELETE FROM callbacks WHERE seq = ?", (seq,))
+                return True
+            db.execute(
+                "UPDATE callbacks SET state = 'processing', lease_until = ?, "
+                "owner = NULL WHERE seq = ?",
+                (now + delay, seq),
+            )
+            return False
+
+        dead = self._transaction(release)
+        self._stats["dead" if dead else "retried"] += 1
+        return dead
+
+    async def retry(
+        self, seq: int, delay: float, max_attempts: int, error: str | None = None
+    ) -> bool:
+        return await asyncio.to_thread(self.retry_sync, seq, delay, max_attempts, error)
+
+    @property
+    def pending(self) -> int:
+        """Callbacks received by any process and not yet processed (or dead)."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT callbacks FROM backlog_size WHERE id = 0"
+            ).fetchone()[0]
+
+    async def count_pending(self) -> int:
+        """:attr:`pending`, read off the event loop."""
+        return await asyncio.to_thread(lambda: self.pending)
+
+    def prune_digests(self) -> int:
+        """Drop dedupe digests older than ``digest_retention``."""
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM callback_digests WHERE received_at < ?",
+                (time.time() - self.digest_retention,),
+            )
+        return cursor.rowcount
+
+    # Request handlers -------------------------------------------------------
+
+    def register_request_handler(self, request_id: str, handler: str) -> None:
+        """Route the callback of ``request_id`` to the handler named ``handler``."""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO request_handlers (request_id, handler, registered_at) "
+                "VALUES (?, ?, ?)",
+                (request_id, handler, time.time()),
+            )
+
+    def request_handler(self, request_id: str) -> str | None:
+        """Return the handler name registered for ``request_id``, if any."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT handler FROM request_handlers WHERE request_id = ?",
+                (request_id,),
+            ).fetchone()
+        return row[0] if row else None
+
+    def drop_request_handler(self, request_id: str) -> None:
+        """Remove the registration once its handler has run."""
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM request_handlers WHERE request_id = ?", (request_id,)
+            )
+
+    def request_handler_ids(self) -> list[str]:
+        with self._lock:
+            rows = self._db.execute("SELECT request_id FROM request_handlers").fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        if self._db is not None:
+            with self._lock:
+                self._db.close()
+                self._db = None
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            **self._stats,
+            "pending": self.pending if self.is_open else 0,
+            "path": str(self.path),
+        }
+
+
+__all__ = ["SharedCallbackStore"]
@@ -0,0 +1,330 @@
+"""Segmented write-ahead log for incoming SignalHire callbacks.
+
+The callback endpoint appends the raw request body and ``Request-Id`` here and
+acknowledges SignalHire as soon as the entry is durable; workers then drain the
+log into the registered handlers. Entries are JSON lines in segment files
+(``wal-<first seq>.log``) and every processed entry is recorded in the
+segment's ``.ack`` file. A segment is deleted once it is no longer written to
+and all of its entries are acknowledged, and entries that were never
+acknowledged are replayed when the log is reopened. Entries that keep failing
+are moved aside to ``dead.log`` with their error.
+
+Appends are fsync-batched (group commit): an append waits for the next
+``fsync`` of the segment, and one ``fsync`` covers every append written while
+the previous one was in progress, so durability costs one disk flush per burst
+rather than per callback.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+SEGMENT_PREFIX = "wal-"
+SEGMENT_SUFFIX = ".log"
+ACK_SUFFIX = ".ack"
+DEAD_FILE_NAME = "dead.log"
+
+DEFAULT_SEGMENT_BYTES = 16 * 1024 * 1024
+
+
+def _default_wal_dir() -> Path:
+    """Return the default directory of the callback write-ahead log."""
+    return Path.home() / ".signalhire-agent" / "callbacks" / "wal"
+
+
+@dataclass
+class WalEntry:
+    """One callback as received: its ``Request-Id`` and raw body."""
+
+    seq: int
+    request_id: str
+    body: bytes
+    received_at: float
+    attempts: int = 0  # Claims so far (shared store only)
+
+
+class _Segment:
+    def __init__(self, directory: Path, first_seq: int) -> None:
+        self.first_seq = first_seq
+        name = f"{SEGMENT_PREFIX}{first_seq:020d}"
+        self.log_path = directory / f"{name}{SEGMENT_SUFFIX}"
+        self.ack_path = directory / f"{name}{ACK_SUFFIX}"
+        self.unacked: set[int] = set()
+        self.size = 0
+        self.ack_file: IO[str] | None = None
+
+    def record_ack(self, seq: int) -> None:
+        if self.ack_file is None:
+            self.ack_file = open(self.ack_path, "a", encoding="utf-8")  # noqa: SIM115
+        self.ack_file.write(f"{seq}\n")
+        self.ack_file.flush()
+
+    def remove(self) -> None:
+        if self.ack_file is not None:
+            self.ack_file.close()
+            self.ack_file = None
+        for path in (self.log_path, self.ack_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class CallbackWAL:
+    """Durable, segmented log of received callbacks.
+
+    Parameters
+    - directory: where segments live (defaults to ``~/.signalhire-agent/callbacks/wal``)
+    - segment_bytes: size after which appends roll over to a new segment
+    - fsync: flush appends to disk before they are acknowledged
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        *,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        fsync: bool = True,
+    ) -> None:
+        self.directory = Path(directory) if directory else _default_wal_dir()
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self._segments: dict[int, _Segment] = {}
+        self._segment_of: dict[int, _Segment] = {}
+        self._active: _Segment | None = None
+        self._file: IO[bytes] | None = None
+        self._next_seq = 1
+        # (future, seq) of appends waiting for the next fsync
+        self._waiters: list[tuple[asyncio.Future, int]] = []
+        self._flusher: asyncio.Task | None = None
+        self._stats = {"appended": 0, "acked": 0, "replayed": 0, "fsyncs": 0, "dead": 0}
+
+    @property
+    def is_open(self) -> bool:
+        return self._file is not None
+
+    @property
+    def pending(self) -> int:
+        """Entries appended but not yet acknowledged."""
+        return len(self._segment_of)
+
+    def open(self) -> list[WalEntry]:
+        """Open the log and return unacknowledged entries to replay, oldest first."""
+        if self.is_open:
+            return []
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        replay: list[WalEntry] = []
+        for log_path in sorted(self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")):
+            try:
+                first_seq = int(log_path.stem[len(SEGMENT_PREFIX) :])
+            except ValueError:
+                continue
+            segment = _Segment(self.directory, first_seq)
+            acked = self._read_acks(segment.ack_path)
+            for entry in self._read_entries(log_path):
+                self._next_seq = max(self._next_seq, entry.seq + 1)
+                if entry.seq in acked:
+                    continue
+                segment.unacked.add(entry.seq)
+                self._segment_of[entry.seq] = segment
+                replay.append(entry)
+            if segment.unacked:
+                self._segments[first_seq] = segment
+            else:
+                segment.remove()
+
+        self._roll()
+        self._stats["replayed"] += len(replay)
+        if replay:
+            logger.info(
+                "Replaying unprocessed callbacks",
+                entries=len(replay),
+                segments=len(self._segments) - 1,
+            )
+        return replay
+
+    @staticmethod
+    def _read_acks(path: Path) -> set[int]:
+        try:
+            lines = path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return set()
+        return {int(line) for line in lines if line.strip().isdigit()}
+
+    @staticmethod
+    def _read_entries(path: Path) -> list[WalEntry]:
+        entries = []
+        with open(path, "rb") as handle:
+            for raw_line in handle:
+                try:
+                    record = json.loads(raw_line)
+                    entries.append(
+                        WalEntry(
+                            seq=int(record["seq"]),
+                            request_id=str(record["request_id"]),
+                            body=record["body"].encode("utf-8", "surrogateescape"),
+                            received_at=float(record["received_at"]),
+                        )
+                    )
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    # A torn write from a crash; nothing after it was acknowledged
+                    continue
+        return entries
+
+    def _roll(self) -> None:
+        """Start a new active segment, sealing the current one."""
+        if self._file is not None:
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._file.close()
+            sealed = self._active
+            if sealed is not None and not sealed.unacked:
+                self._segments.pop(sealed.first_seq, None)
+                sealed.remove()
+
+        segment = _Segment(self.directory, self._next_seq)
+        self._segments[segment.first_seq] = segment
+        self._active = segment
+        self._file = open(segment.log_path, "ab")  # noqa: SIM115
+
+    async def append(self, request_id: str, body: bytes) -> WalEntry:
+        """Append a callback and return once it is durable."""
+        if not self.is_open:
+            raise RuntimeError("Callback WAL is not open")
+
+        entry = WalEntry(
+            seq=self._next_seq,
+            request_id=request_id,
+            body=body,
+            received_at=time.time(),
+        )
+        line = (
+            json.dumps(
+                {
+                    "seq": entry.seq,
+                    "request_id": entry.request_id,
+                    "received_at": entry.received_at,
+                    "body": body.decode("utf-8", "surrogateescape"),
+                },
+                separators=(",", ":"),
+            ).encode("utf-8")
+            + b"\n"
+        )
+        if self._active.size and self._active.size + len(line) > self.segment_bytes:
+            self._roll()
+
+        self._next_seq += 1
+        self._file.write(line)
+        self._file.flush()
+        self._active.size += len(line)
+        self._active.unacked.add(entry.seq)
+        self._segment_of[entry.seq] = self._active
+        self._stats["appended"] += 1
+
+        if self.fsync:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append((waiter, entry.seq))
+            if self._flusher is None or self._flusher.done():
+                self._flusher = asyncio.create_task(self._flush())
+            await waiter
+        return entry
+
+    async def _flush(self) -> None:
+        """fsync until no appends are waiting; each fsync covers a whole batch."""
+        while self._waiters:
+            waiters, self._waiters = self._waiters, []
+            try:
+                if self._file is None:
+                    raise OSError("callback WAL was closed before the append was flushed")
+                # A duplicate descriptor stays valid if the segment rolls meanwhile
+                fd = os.dup(self._file.fileno())
+                try:
+                    await asyncio.to_thread(os.fsync, fd)
+                finally:
+                    os.close(fd)
+                self._stats["fsyncs"] += 1
+            except OSError as exc:
+                for waiter, seq in waiters:
+                    # The caller was refused and SignalHire redelivers, so the
+                    # entry must neither count as pending nor be replayed
+                    self._settle(seq)
+                    if not waiter.done():
+                        waiter.set_exception(exc)
+                continue
+            for waiter, _ in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    def _settle(self, seq: int) -> bool:
+        """Record ``seq`` as done; fully settled sealed segments are deleted."""
+        segment = self._segment_of.pop(seq, None)
+        if segment is None:
+            return False
+        segment.unacked.discard(seq)
+        try:
+            segment.record_ack(seq)
+        except OSError as exc:
+            logger.warning("Could not record callback ack", seq=seq, error=str(exc))
+        if not segment.unacked and segment is not self._active:
+            self._segments.pop(segment.first_seq, None)
+            segment.remove()
+        return True
+
+    def ack(self, seq: int) -> None:
+        """Mark an entry as processed; fully processed sealed segments are deleted."""
+        if self._settle(seq):
+            self._stats["acked"] += 1
+
+    def set_aside(self, entry: WalEntry, error: str) -> None:
+        """Move an entry that keeps failing to ``dead.log`` and settle it."""
+        record = {
+            "seq": entry.seq,
+            "request_id": entry.request_id,
+            "received_at": entry.received_at,
+            "body": entry.body.decode("utf-8", "surrogateescape"),
+            "error": error,
+        }
+        with open(self.directory / DEAD_FILE_NAME, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(record, separators=(",", ":")) + "\n")
+        if self._settle(entry.seq):
+            self._stats["dead"] += 1
+
+    def close(self) -> None:
+        """Flush and close the log; unacknowledged entries are replayed on reopen."""
+        if self._file is None:
+            return
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        for segment in self._segments.values():
+            if segment.ack_file is not None:
+                segment.ack_file.close()
+                segment.ack_file = None
+        self._segments.clear()
+        self._segment_of.clear()
+        self._active = None
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            **self._stats,
+            "pending": self.pending,
+            "segments": len(self._segments),
+            "directory": str(self.directory),
+        }
+
+
+__all__ = ["CallbackWAL", "WalEntry"]
@@ -7,25 +7,69 @@ New workflow: Search → Airtable → Webhook → Reveal
 The cache allows CLI workflows to avoid re-revealing contacts that were already
 fetched previously while still making the data available for exports and other
 post-processing steps.
+
+Records live in a SQLite database (WAL journal, one row per UID), so an
+upsert writes only that record and readers in other processes are never
+blocked by a writer. The legacy whole-file ``revealed_contacts.json`` is
+imported automatically the first time the database is created next to it;
+a ``.json`` cache path keeps using the legacy file format.
+
+Several processes (a reveal run and the callback server, say) can share one
+cache. SQLite serializes their writes, and each upsert re-reads and merges
+the record inside its write transaction. The legacy JSON file is saved under
+an advisory lock: pending updates are replayed onto whatever is on disk at
+that moment, so concurrent saves merge instead of overwriting each other.
+
+Cached contacts go stale: a :class:`FreshnessPolicy` gives each contact type
+a time-to-live, measured from when a reveal last returned contacts of that
+type (the record's ``verified`` map). Profile and metadata merges do not
+touch it. The SQLite store keeps each record's oldest verification in an
+indexed ``verified_at`` column, so enumerating stale records is a range scan
+over the oldest rows rather than a pass over the whole cache.
 """
 
 from __future__ import annotations
 
 import json
+import sqlite3
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import structlog
+
+from .revealed_index import RevealedIndex, get_revealed_index
+
+try:  # pragma: no cover - platform dependent
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+logger = structlog.get_logger(__name__)
 
 CACHE_DIR_NAME = ".signalhire-agent"
 CACHE_FILE_NAME = "revealed_contacts.json"
+CACHE_DB_NAME = "contacts.db"
+CACHE_LOG_DIR_NAME = "contacts-log"
+REVEALED_INDEX_NAME = "revealed.idx"
+DEFAULT_MAX_MEMORY_BYTES = 32 * 1024 * 1024
+DEFAULT_CONTACT_TTLS = {
+    "phone": timedelta(days=90),
+    "mobile": timedelta(days=90),
+    "email": timedelta(days=180),
+    "linkedin": timedelta(days=365),
+}
 CACHE_SUBDIR_NAME = "cache"
 
 
 def _default_cache_path() -> Path:
-    """Return the default path for the revealed contact cache file."""
+    """Return the default path for the revealed contact cache database."""
     home = Path.home()
-    return home / CACHE_DIR_NAME / CACHE_SUBDIR_NAME / CACHE_FILE_NAME
+    return home / CACHE_DIR_NAME / CACHE_SUBDIR_NAME / CACHE_DB_NAME
 
 
 def _utc_now_iso() -> str:
@@ -33,6 +77,41 @@ def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _as_utc(value: datetime) -> datetime:
+    """Convert to UTC; naive values are taken as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _parse_iso(value: str) -> datetime:
+    """Parse a cache timestamp; naive values are taken as UTC."""
+    return _as_utc(datetime.fromisoformat(value.replace("Z", "+00:00")))
+
+
+def _stat_key(path: Path) -> Optional[tuple]:
+    """Return an identity for the file's current contents (``None`` if missing)."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on ``path`` (created if missing)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
 def normalize_contacts(payload: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Normalize raw contact payloads into a consistent list structure."""
     if not payload:
@@ -124,6 +203,8 @@ class CachedContact:
     first_revealed_at: str = field(default_factory=_utc_now_iso)
     last_updated_at: str = field(default_factory=_utc_now_iso)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Contact type -> when a reveal last returned contacts of that type
+    verified: Dict[str, str] = field(default_factory=dict)
 
     @classmethod
     def from_dict(cls, uid: str, data: Dict[str, Any]) -> "CachedContact":
@@ -139,6 +220,7 @@ class CachedContact:
             first_revealed_at=first_revealed,
             last_updated_at=last_updated,
             metadata=dict(metadata),
+            verified=dict(data.get("verified") or {}),
         )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -149,29 +231,52 @@ class CachedContact:
             "first_revealed_at": self.first_revealed_at,
             "last_updated_at": self.last_updated_at,
             "metadata": dict(self.metadata),
+            "verified": dict(self.verified),
         }
 
-    def merge_contacts(self, new_contacts: Iterable[Dict[str, Any]]) -> None:
-        """Merge new contact entries into the cache, deduplicating by type + value."""
-        combined = list(self.contacts)
+    def merge_contacts(
+        self, new_contacts: Iterable[Dict[str, Any]], verified_at: Optional[str] = None
+    ) -> None:
+        """Merge new contact entries into the cache, deduplicating by type + value.
+
+        The types of the merged contacts, new or already cached, are stamped
+        as verified at ``verified_at`` (now by default).
+        """
+        stamp = verified_at or _utc_now_iso()
+        combined = self.contacts
         existing = {(c.get("type"), c.get("value")) for c in combined if c.get("value")}
 
         for entry in new_contacts:
             if not isinstance(entry, dict) or not entry.get("value"):
                 continue
+            contact_type = entry.get("type") or "unknown"
+            if stamp > self.verified.get(contact_type, ""):
+                self.verified[contact_type] = stamp
             key = (entry.get("type"), entry.get("value"))
             if key in existing:
                 continue
             existing.add(key)
             combined.append({
-                "type": entry.get("type") or "unknown",
+                "type": contact_type,
                 "value": entry.get("value"),
                 "label": entry.get("label"),
             })
 
-        self.contacts = combined
         self.last_updated_at = _utc_now_iso()
 
+    def contacts_verified_at(self) -> Optional[str]:
+        """When the least recently verified contact type was last revealed.
+
+        Types cached before verification was recorded fall back to
+        ``last_updated_at``. ``None`` when the record has no contacts.
+        """
+        stamps = [
+            self.verified.get(contact.get("type") or "unknown", self.last_updated_at)
+            for contact in self.contacts
+            if isinstance(contact, dict)
+        ]
+        return min(stamps) if stamps else None
+
     def merge_profile(self, profile: Optional[Dict[str, Any]]) -> None:
         if not profile:
             return
@@ -190,42 +295,192 @@ class CachedContact:
         self.last_updated_at = _utc_now_iso()
 
 
-class ContactCache:
-    """Simple JSON-backed cache for revealed contacts."""
+@dataclass(frozen=True)
+class FreshnessPolicy:
+    """How long each type of cached contact can be trusted.
 
-    def __init__(self, cache_path: Optional[Path] = None):
-        self._cache_path = cache_path or _default_cache_path()
-        self._data: Dict[str, CachedContact] = {}
-        self._loaded = False
-        self._dirty = False
+    ``ttls`` maps a contact type (``"phone"``, ``"email"``...) to its
+    time-to-live; other types use ``default_ttl``, and ``None`` never expires.
+    Ages are measured from when each type was last verified by a reveal.
+    """
 
-    @property
-    def cache_path(self) -> Path:
-        return self._cache_path
+    ttls: Dict[str, timedelta] = field(default_factory=lambda: dict(DEFAULT_CONTACT_TTLS))
+    default_ttl: Optional[timedelta] = None
 
-    def _ensure_loaded(self) -> None:
-        if self._loaded:
-            return
+    def ttl(self, contact_type: Optional[str]) -> Optional[timedelta]:
+        return self.ttls.get(contact_type or "unknown", self.default_ttl)
 
-        if self._cache_path.exists():
+    def shortest_ttl(self) -> Optional[timedelta]:
+        ttls = [ttl for ttl in [*self.ttls.values(), self.default_ttl] if ttl is not None]
+        return min(ttls) if ttls else None
+
+    def stale_fields(
+        self,
+        contacts: Iterable[Dict[str, Any]],
+        last_updated_at: str,
+        now: Optional[datetime] = None,
+        verified: Optional[Dict[str, str]] = None,
+    ) -> List[str]:
+        """Return the contact types in ``contacts`` whose TTL has run out.
+
+        Each type is aged from its ``verified`` stamp, or from
+        ``last_updated_at`` when it has none.
+        """
+        now = _as_utc(now) if now else datetime.now(timezone.utc)
+        verified = verified or {}
+        stale = set()
+        for contact in contacts:
+            contact_type = contact.get("type") if isinstance(contact, dict) else None
+            contact_type = contact_type or "unknown"
+            ttl = self.ttl(contact_type)
+            if ttl is None:
+                continue
+            age = now - _parse_iso(verified.get(contact_type, last_updated_at))
+            if age >= ttl:
+                stale.add(contact_type)
+        return sorted(stale)
+
+
+@dataclass
+class StaleContact:
+    """A cached record with at least one expired contact type.
+
+    ``verified_at`` is when its least recently verified contact was revealed.
+    """
+
+    uid: str
+    verified_at: str
+    stale_fields: List[str]
+
+
+def _by_verification(records: Iterable[CachedContact], cutoff: str) -> Iterator[CachedContact]:
+    """Sorted full pass for stores without a time index."""
+    rows = []
+    for record in records:
+        verified_at = record.contacts_verified_at()
+        if verified_at is not None and verified_at < cutoff:
+            rows.append((verified_at, record.uid, record))
+    rows.sort(key=lambda row: row[:2])
+    for _, _, record in rows:
+        yield record
+
+
+def _load_json_cache(path: Path) -> Dict[str, CachedContact]:
+    """Read a legacy whole-file JSON cache; unreadable files count as empty."""
+    records: Dict[str, CachedContact] = {}
+    if not path.exists():
+        return records
+    try:
+        raw = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return records
+    if isinstance(raw, dict):
+        for uid, payload in raw.items():
+            if isinstance(payload, dict):
+                records[uid] = CachedContact.from_dict(uid, payload)
+    return records
+
+
+def _apply_update(
+    record: CachedContact,
+    contacts: Optional[Iterable[Dict[str, Any]]],
+    profile: Optional[Dict[str, Any]],
+    metadata: Optional[Dict[str, Any]],
+) -> CachedContact:
+    if contacts:
+        record.merge_contacts(contacts)
+    if profile:
+        record.merge_profile(profile)
+    if metadata:
+        merged_metadata = dict(record.metadata)
+        merged_metadata.update(metadata)
+        record.metadata = merged_metadata
+        record.last_updated_at = _utc_now_iso()
+    return record
+
+
+class JsonContactStore:
+    """Legacy storage: the whole cache in one JSON file, rewritten on save.
+
+    Entries are kept as compact encoded JSON and decoded only when read;
+    records changed since the last save are held decoded until written out.
+    Saves hold ``<file>.lock`` and replay the pending updates onto the file's
+    current contents, so other processes' saves in the meantime are kept.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock_path = path.with_name(path.name + ".lock")
+        self._raw: Optional[Dict[str, bytes]] = None
+        self._raw_stat: Optional[tuple] = None
+        self._changed: Dict[str, CachedContact] = {}
+        # Updates to replay on save; None means the record replaces the file's
+        self._updates: Dict[str, Optional[List[tuple]]] = {}
+        self._reloaded = False
+        self._dirty = False
+
+    def _read_file(self) -> Dict[str, bytes]:
+        entries: Dict[str, bytes] = {}
+        self._raw_stat = _stat_key(self.path)
+        if self._raw_stat is not None:
             try:
-                raw = json.loads(self._cache_path.read_text())
-                if isinstance(raw, dict):
-                    for uid, payload in raw.items():
-                        if not isinstance(payload, dict):
-                            continue
-                        contact = CachedContact.from_dict(uid, payload)
-                        self._data[uid] = contact
+                raw = json.loads(self.path.read_text())
             except (OSError, json.JSONDecodeError):
-                # Start fresh on load errors
-                self._data = {}
-        self._loaded = True
+                raw = None
+            if isinstance(raw, dict):
+                for uid, payload in raw.items():
+                    if isinstance(payload, dict):
+                        entries[uid] = json.dumps(payload).encode()
+        return entries
+
+    def _entries(self) -> Dict[str, bytes]:
+        if self._raw is None:
+            self._raw = self._read_file()
+        return self._raw
+
+    def _rebase(self, entries: Dict[str, bytes]) -> None:
+        """Re-apply pending updates on top of freshly read entries."""
+        for uid, updates in self._updates.items():
+            encoded = entries.get(uid)
+            if updates is None or encoded is None:
+                continue
+            record = CachedContact.from_dict(uid, json.loads(encoded))
+            for contacts, profile, metadata in updates:
+                _apply_update(record, contacts, profile, metadata)
+            self._changed[uid] = record
+
+    def refresh(self) -> bool:
+        """Reload the file if another process saved it; True if anything changed."""
+        if self._raw is not None and _stat_key(self.path) != self._raw_stat:
+            self._raw = self._read_file()
+            self._rebase(self._raw)
+            self._reloaded = True
+        changed, self._reloaded = self._reloaded, False
+        return changed
+
+    def load(self, uid: str) -> Optional[Tuple[CachedContact, int]]:
+        """Decode one record; returns it with its encoded size."""
+        record = self._changed.get(uid)
+        if record is not None:
+            return record, len(json.dumps(record.to_dict()))
+        encoded = self._entries().get(uid)
+        if encoded is None:
+            return None
+        return CachedContact.from_dict(uid, json.loads(encoded)), len(encoded)
 
     def get(self, uid: str) -> Optional[CachedContact]:
-        self._ensure_loaded()
-        return self._data.get(uid)
+        loaded = self.load(uid)
+        return loaded[0] if loaded else None
 
-    def upsert(
+    def version(self, uid: str) -> Optional[str]:
+        """The record's ``last_updated_at``, which every update moves forward."""
+        record = self._changed.get(uid)
+        if record is not None:
+            return record.last_updated_at
+        encoded = self._entries().get(uid)
+        return json.loads(encoded).get("last_updated_at") if encoded is not None else None
+
+    def append(
         self,
         uid: str,
         *,
@@ -233,25 +488,562 @@ class ContactCache:
         profile: Optional[Dict[str, Any]] = None,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> CachedContact:
-        self._ensure_loaded()
-        record = self._data.get(uid)
-        if not record:
-            record = CachedContact(uid=uid)
-            self._data[uid] = record
-
-        if contacts:
-            record.merge_contacts(contacts)
-        if profile:
-            record.merge_profile(profile)
-        if metadata:
-            merged_metadata = dict(record.metadata)
-            merged_metadata.update(metadata)
-            record.metadata = merged_metadata
-            record.last_updated_at = _utc_now_iso()
+        contacts = list(contacts) if contacts else None
+        record = self.get(uid) or CachedContact(uid=uid)
+        _apply_update(record, contacts, profile, metadata)
+        self._changed[uid] = record
+        if self._updates.get(uid, []) is not None:
+            self._updates.setdefault(uid, []).append((contacts, profile, metadata))
+        self._dirty = True
+        return record
 
+    def put_many(self, records: Iterable[CachedContact]) -> None:
+        for record in records:
+            self._changed[record.uid] = record
+            self._updates[record.uid] = None
         self._dirty = True
+
+    def uids(self) -> List[str]:
+        return list(dict.fromkeys([*self._entries(), *self._changed]))
+
+    def verified_before(self, cutoff: str) -> Iterator[CachedContact]:
+        """Yield records with a contact type verified before ``cutoff``, oldest first."""
+        return _by_verification((self.get(uid) for uid in self.uids()), cutoff)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        yield
+
+    def flush(self) -> None:
+        if not self._dirty:
+            return
+        with _file_lock(self.lock_path):
+            if self._raw is not None and _stat_key(self.path) != self._raw_stat:
+                self._reloaded = True
+            entries = self._read_file()
+            self._rebase(entries)
+            for uid, record in self._changed.items():
+                entries[uid] = json.dumps(record.to_dict()).encode()
+            serializable = {uid: json.loads(encoded) for uid, encoded in entries.items()}
+            temp_path = self.path.with_suffix(".tmp")
+            temp_path.write_text(json.dumps(serializable, indent=2, sort_keys=True))
+            temp_path.replace(self.path)
+            self._raw = entries
+            self._raw_stat = _stat_key(self.path)
+        self._changed.clear()
+        self._updates.clear()
+        self._dirty = False
+
+    def clear(self) -> None:
+        self._raw = {}
+        self._changed.clear()
+        self._updates.clear()
+        self._dirty = False
+        if self.path.exists():
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+        self._raw_stat = None
+
+    def close(self) -> None:
+        self.flush()
+
+
+class SqliteContactStore:
+    """One row per UID in a WAL-journaled SQLite database.
+
+    Parameters
+    - path: database file; shared safely by concurrent readers
+    - legacy_path: JSON cache imported once when the database is first created
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS contacts (
+            uid TEXT PRIMARY KEY,
+            contacts TEXT NOT NULL,
+            profile TEXT,
+            metadata TEXT NOT NULL,
+            first_revealed_at TEXT NOT NULL,
+            last_updated_at TEXT NOT NULL,
+            verified TEXT,
+            verified_at TEXT
+        );
+        CREATE TABLE IF NOT EXISTS cache_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+    _COLUMNS = (
+        "uid, contacts, profile, metadata, first_revealed_at, last_updated_at, "
+        "verified, verified_at"
+    )
+
+    def __init__(self, path: Path, legacy_path: Optional[Path] = None):
+        self.path = path
+        self.legacy_path = legacy_path
+        self._db: Optional[sqlite3.Connection] = None
+        self._data_version: Optional[int] = None
+        self._lock = threading.RLock()
+        self._depth = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(
+                self.path, timeout=30.0, isolation_level=None, check_same_thread=False
+            )
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(self._SCHEMA)
+            self._db = db
+            self._add_verified_columns()
+            self._migrate_legacy()
+        return self._db
+
+    def _add_verified_columns(self) -> None:
+        """Add and backfill the verification columns in databases created before them."""
+        db = self._db
+        columns = {row[1] for row in db.execute("PRAGMA table_info(contacts)")}
+        if "verified_at" not in columns:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                columns = {row[1] for row in db.execute("PRAGMA table_info(contacts)")}
+                if "verified_at" not in columns:
+                    db.execute("ALTER TABLE contacts ADD COLUMN verified TEXT")
+                    db.execute("ALTER TABLE contacts ADD COLUMN verified_at TEXT")
+                    # Older records carry no stamps; their types age from the record
+                    db.execute(
+                        "UPDATE contacts SET verified_at = last_updated_at "
+                        "WHERE contacts != '[]'"
+                    )
+                    db.execute("DROP INDEX IF EXISTS contacts_last_updated")
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        db.execute(
+            "CREATE INDEX IF NOT EXISTS contacts_verified ON contacts (verified_at, uid)"
+        )
+
+    def _migrate_legacy(self) -> None:
+        """Import the legacy JSON file once; the file itself is left in place."""
+        if self.legacy_path is None or not self.legacy_path.exists():
+            return
+        db = self._db
+        if db.execute("SELECT 1 FROM cache_meta WHERE key = 'migrated_from'").fetchone():
+            return
+        records = _load_json_cache(self.legacy_path)
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated while we waited for the lock
+            if not db.execute(
+                "SELECT 1 FROM cache_meta WHERE key = 'migrated_from'"
+            ).fetchone():
+                db.executemany(
+                    f"INSERT OR IGNORE INTO contacts ({self._COLUMNS}) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [self._row(record) for record in records.values()],
+                )
+                db.execute(
+                    "INSERT INTO cache_meta (key, value) VALUES ('migrated_from', ?)",
+                    (str(self.legacy_path),),
+                )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        logger.info(
+            "Migrated legacy contact cache",
+            source=str(self.legacy_path),
+            records=len(records),
+        )
+
+    @staticmethod
+    def _row(record: CachedContact) -> tuple:
+        return (
+            record.uid,
+            json.dumps(record.contacts),
+            json.dumps(record.profile) if record.profile is not None else None,
+            json.dumps(record.metadata),
+            record.first_revealed_at,
+            record.last_updated_at,
+            json.dumps(record.verified),
+            record.contacts_verified_at(),
+        )
+
+    @staticmethod
+    def _record(row: tuple) -> CachedContact:
+        uid, contacts, profile, metadata, first_revealed_at, last_updated_at, verified = row
+        return CachedContact(
+            uid=uid,
+            contacts=json.loads(contacts),
+            profile=json.loads(profile) if profile is not None else None,
+            first_revealed_at=first_revealed_at,
+            last_updated_at=last_updated_at,
+            metadata=json.loads(metadata),
+            verified=json.loads(verified) if verified else {},
+        )
+
+    def refresh(self) -> bool:
+        """True if another connection committed changes since the last call."""
+        with self._lock:
+            version = self._conn().execute("PRAGMA data_version").fetchone()[0]
+            changed = self._data_version is not None and version != self._data_version
+            self._data_version = version
+        return changed
+
+    def load(self, uid: str) -> Optional[Tuple[CachedContact, int]]:
+        """Decode one row; returns the record with its encoded size."""
+        with self._lock:
+            row = self._conn().execute(
+                "SELECT uid, contacts, profile, metadata, first_revealed_at, "
+                "last_updated_at, verified FROM contacts WHERE uid = ?",
+                (uid,),
+            ).fetchone()
+        if row is None:
+            return None
+        return self._record(row), sum(len(value) for value in row if value)
+
+    def get(self, uid: str) -> Optional[CachedContact]:
+        loaded = self.load(uid)
+        return loaded[0] if loaded else None
+
+    def version(self, uid: str) -> Optional[str]:
+        """The row's ``last_updated_at``, read without decoding the record."""
+        with self._lock:
+            row = self._conn().execute(
+                "SELECT last_updated_at FROM contacts WHERE uid = ?", (uid,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def append(
+        self,
+        uid: str,
+        *,
+        contacts: Optional[Iterable[Dict[str, Any]]] = None,
+        profile: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> CachedContact:
+        """Read, merge and rewrite one record in a single transaction.
+
+        ``BEGIN IMMEDIATE`` takes the database write lock before the read, so a
+        concurrent writer's update is always merged rather than overwritten.
+        """
+        with self.transaction():
+            record = self.get(uid) or CachedContact(uid=uid)
+            _apply_update(record, contacts, profile, metadata)
+            self.put_many([record])
         return record
 
+    def put_many(self, records: Iterable[CachedContact]) -> None:
+        rows = [self._row(record) for record in records]
+        if not rows:
+            return
+        with self.transaction():
+            self._conn().executemany(
+                f"INSERT OR REPLACE INTO contacts ({self._COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def uids(self) -> List[str]:
+        with self._lock:
+            rows = self._conn().execute("SELECT uid FROM contacts").fetchall()
+        return [row[0] for row in rows]
+
+    def verified_before(
+        self, cutoff: str, *, page_size: int = 500
+    ) -> Iterator[CachedContact]:
+        """Yield records with a contact type verified before ``cutoff``, oldest first.
+
+        Pages through the ``verified_at`` index, so only the rows before the
+        cutoff are read, and profiles and metadata are never decoded.
+        """
+        after = ("", "")
+        while True:
+            with self._lock:
+                rows = self._conn().execute(
+                    "SELECT uid, verified_at, contacts, verified, last_updated_at "
+                    "FROM contacts WHERE verified_at < ? AND (verified_at, uid) > (?, ?) "
+                    "ORDER BY verified_at, uid LIMIT ?",
+                    (cutoff, *after, page_size),
+                ).fetchall()
+            for uid, _, contacts, verified, last_updated_at in rows:
+                yield CachedContact(
+                    uid=uid,
+                    contacts=json.loads(contacts),
+                    last_updated_at=last_updated_at,
+                    verified=json.loads(verified) if verified else {},
+                )
+            if len(rows) < page_size:
+                return
+            after = (rows[-1][1], rows[-1][0])
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group writes into one transaction; nested calls join the outer one."""
+        with self._lock:
+            db = self._conn()
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                return
+            db.execute("BEGIN IMMEDIATE")
+            self._depth = 1
+            try:
+                yield
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            else:
+                db.execute("COMMIT")
+            finally:
+                self._depth = 0
+
+    def flush(self) -> None:
+        """Writes are committed as they happen; nothing is buffered."""
+
+    def clear(self) -> None:
+        with self.transaction():
+            self._conn().execute("DELETE FROM contacts")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+                self._data_version = None
+
+
+class RecordLRU:
+    """Size-bounded LRU of decoded records.
+
+    Sizes are the records' encoded sizes, a stable proxy for their decoded
+    footprint. The least recently used records are evicted once the total
+    exceeds ``max_bytes`` (or the count exceeds ``max_records``).
+
+    :meth:`expire` marks every held record as possibly outdated without
+    dropping it: :meth:`get` stops returning it until the owner has checked
+    it against the store and called :meth:`renew`, or replaced it.
+
+    Parameters
+    - max_bytes: memory ceiling for decoded records
+    - max_records: optional cap on the number of records
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        max_records: Optional[int] = None,
+    ):
+        self.max_bytes = max_bytes
+        self.max_records = max_records
+        # uid -> (record, encoded size, generation it was last known current)
+        self._entries: "OrderedDict[str, Tuple[CachedContact, int, int]]" = OrderedDict()
+        self._bytes = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "renewals": 0}
+
+    def get(self, uid: str) -> Optional[CachedContact]:
+        with self._lock:
+            entry = self._entries.get(uid)
+            if entry is None or entry[2] != self._generation:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(uid)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def get_expired(self, uid: str) -> Optional[CachedContact]:
+        """The record held for ``uid`` if it was decoded before the last :meth:`expire`."""
+        with self._lock:
+            entry = self._entries.get(uid)
+            if entry is None or entry[2] == self._generation:
+                return None
+            return entry[0]
+
+    def renew(self, uid: str) -> None:
+        """Mark an expired record as current again."""
+        with self._lock:
+            entry = self._entries.get(uid)
+            if entry is not None:
+                self._entries[uid] = (entry[0], entry[1], self._generation)
+                self._entries.move_to_end(uid)
+                self._stats["renewals"] += 1
+
+    def expire(self) -> None:
+        """Mark every held record as possibly outdated."""
+        with self._lock:
+            self._generation += 1
+
+    def put(self, uid: str, record: CachedContact, size: int) -> None:
+        with self._lock:
+            old = self._entries.pop(uid, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[uid] = (record, size, self._generation)
+            self._bytes += size
+            while self._bytes > self.max_bytes or (
+                self.max_records is not None and len(self._entries) > self.max_records
+            ):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats["evictions"] += 1
+
+    def discard(self, uid: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(uid, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+                "records": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+class ContactCache:
+    """Cache of revealed contacts, keyed by prospect UID.
+
+    Parameters
+    - cache_path: SQLite database, log directory (``mode="log"``), or a
+      ``.json`` file for the legacy format
+    - legacy_path: JSON cache migrated into a new database or log (defaults
+      to ``revealed_contacts.json`` next to it)
+    - mode: ``"sqlite"``, ``"log"`` (append-only segments, see
+      :mod:`src.lib.contact_log`) or ``"json"``; inferred from the path by default
+    - revealed_index: membership index that UIDs with contacts are added to
+      (defaults to ``revealed.idx`` next to the cache)
+    - max_memory_bytes: ceiling for decoded records held in memory
+    - max_records: optional cap on the number of decoded records held
+    - freshness_policy: contact TTLs used by :meth:`is_fresh` and :meth:`iter_stale`
+    - store_options: extra keyword arguments for the log store
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[Path] = None,
+        *,
+        legacy_path: Optional[Path] = None,
+        mode: Optional[str] = None,
+        revealed_index: Optional[RevealedIndex] = None,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        max_records: Optional[int] = None,
+        freshness_policy: Optional[FreshnessPolicy] = None,
+        **store_options: Any,
+    ):
+        if mode is None:
+            mode = "json" if cache_path and Path(cache_path).suffix == ".json" else "sqlite"
+        if cache_path:
+            self._cache_path = Path(cache_path)
+        elif mode == "log":
+            self._cache_path = _default_cache_path().with_name(CACHE_LOG_DIR_NAME)
+        else:
+            self._cache_path = _default_cache_path()
+        legacy_path = legacy_path or self._cache_path.with_name(CACHE_FILE_NAME)
+
+        if mode == "json":
+            self._store = JsonContactStore(self._cache_path)
+        elif mode == "sqlite":
+            self._store = SqliteContactStore(self._cache_path, legacy_path)
+        elif mode == "log":
+            from .contact_log import LogContactStore
+
+            self._store = LogContactStore(self._cache_path, legacy_path, **store_options)
+        else:
+            raise ValueError(f"Unknown contact cache mode: {mode!r}")
+        self.mode = mode
+        self.revealed_index = revealed_index or RevealedIndex(
+            self._cache_path.with_name(REVEALED_INDEX_NAME)
+        )
+        self.freshness_policy = freshness_policy or FreshnessPolicy()
+        # Records stay encoded in the store; decoded ones are kept here
+        self._decoded = RecordLRU(max_memory_bytes, max_records)
+
+    @property
+    def cache_path(self) -> Path:
+        return self._cache_path
+
+    def get(self, uid: str) -> Optional[CachedContact]:
+        # Once another process has written, each decoded record is checked
+        # against its stored version when next read, and reloaded if it moved
+        if self._store.refresh():
+            self._decoded.expire()
+        record = self._decoded.get(uid)
+        if record is not None:
+            return record
+        record = self._decoded.get_expired(uid)
+        if record is not None and self._store.version(uid) == record.last_updated_at:
+            self._decoded.renew(uid)
+            return record
+        loaded = self._store.load(uid)
+        if loaded is None:
+            return None
+        record, size = loaded
+        self._decoded.put(uid, record, size)
+        return record
+
+    def upsert(
+        self,
+        uid: str,
+        *,
+        contacts: Optional[Iterable[Dict[str, Any]]] = None,
+        profile: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> CachedContact:
+        self._decoded.discard(uid)
+        record = self._store.append(
+            uid, contacts=contacts, profile=profile, metadata=metadata
+        )
+        if contacts and record.contacts:
+            self.revealed_index.add([uid])
+        return record
+
+    def upsert_many(self, updates: Dict[str, Dict[str, Any]]) -> List[CachedContact]:
+        """Apply ``{uid: {"contacts"/"profile"/"metadata": ...}}`` in one transaction."""
+        for uid in updates:
+            self._decoded.discard(uid)
+        with self._store.transaction():
+            records = [
+                self._store.append(
+                    uid,
+                    contacts=update.get("contacts"),
+                    profile=update.get("profile"),
+                    metadata=update.get("metadata"),
+                )
+                for uid, update in updates.items()
+            ]
+        self.revealed_index.add(
+            record.uid
+            for record in records
+            if record.contacts and updates[record.uid].get("contacts")
+        )
+        return records
+
+    @contextmanager
+    def batch(self) -> Iterator["ContactCache"]:
+        """Run several upserts in one transaction."""
+        with self._store.transaction():
+            yield self
+
     def update_from_reveal_payload(
         self,
         uid: str,
@@ -266,37 +1058,120 @@ class ContactCache:
         return self.upsert(uid, contacts=normalized, profile=profile, metadata=metadata)
 
     def merge_profiles(self, profiles: Dict[str, Dict[str, Any]]) -> None:
-        self._ensure_loaded()
-        for uid, profile in profiles.items():
-            self.upsert(uid, profile=profile)
+        self.upsert_many({uid: {"profile": profile} for uid, profile in profiles.items()})
+
+    def record_callback(self, callback_data: Iterable[Dict[str, Any]]) -> int:
+        """Callback handler: store the contacts of successful Person API items.
+
+        Every contact type returned is stamped as verified now, which is what
+        :meth:`is_fresh` and :meth:`iter_stale` age. Returns the records written.
+        """
+        updates: Dict[str, Dict[str, Any]] = {}
+        for entry in callback_data or []:
+            if not isinstance(entry, dict) or entry.get("status") != "success":
+                continue
+            candidate = entry.get("candidate")
+            if not isinstance(candidate, dict):
+                continue
+            uid = candidate.get("uid") or entry.get("item")
+            contacts = normalize_contacts(candidate)
+            if uid and contacts:
+                updates[str(uid)] = {"contacts": contacts}
+        if updates:
+            self.upsert_many(updates)
+        return len(updates)
 
     def list_cached_uids(self) -> List[str]:
-        self._ensure_loaded()
-        return list(self._data.keys())
+        return self._store.uids()
 
-    def save(self) -> None:
-        if not self._dirty:
+    def is_fresh(
+        self,
+        uid: str,
+        contact_type: Optional[str] = None,
+        *,
+        now: Optional[datetime] = None,
+    ) -> bool:
+        """True if ``uid`` is cached with contacts (of ``contact_type``) still within their TTL."""
+        record = self.get(uid)
+        if record is None:
+            return False
+        contacts = [
+            c for c in record.contacts if contact_type is None or c.get("type") == contact_type
+        ]
+        if not contacts:
+            return False
+        return not self.freshness_policy.stale_fields(
+            contacts, record.last_updated_at, now, record.verified
+        )
+
+    def iter_stale(self, *, now: Optional[datetime] = None) -> Iterator[StaleContact]:
+        """Yield records with expired contacts, least recently verified first."""
+        now = _as_utc(now) if now else datetime.now(timezone.utc)
+        shortest = self.freshness_policy.shortest_ttl()
+        if shortest is None:
             return
+        cutoff = (now - shortest).isoformat()
+        for record in self._store.verified_before(cutoff):
+            fields = self.freshness_policy.stale_fields(
+                record.contacts, record.last_updated_at, now, record.verified
+            )
+            if fields:
+                yield StaleContact(record.uid, record.contacts_verified_at(), fields)
 
-        self._ensure_loaded()
-        target = self._cache_path
-        target.parent.mkdir(parents=True, exist_ok=True)
+    def rebuild_revealed_index(self) -> int:
+        """Rebuild the revealed-UID index from every cached record with contacts."""
+        uids = []
+        for uid in self._store.uids():
+            record = self._store.get(uid)
+            if record and record.contacts:
+                uids.append(uid)
+        self.revealed_index.rebuild(uids)
+        return len(uids)
 
-        serializable = {uid: contact.to_dict() for uid, contact in self._data.items()}
-        temp_path = target.with_suffix(".tmp")
-        temp_path.write_text(json.dumps(serializable, indent=2, sort_keys=True))
-        temp_path.replace(target)
-        self._dirty = False
+    def save(self) -> None:
+        """Write out pending updates, merging with other processes' saves."""
+        self._store.flush()
 
     def clear(self) -> None:
-        self._ensure_loaded()
-        self._data.clear()
-        self._dirty = True
-        if self._cache_path.exists():
-            try:
-                self._cache_path.unlink()
-            except OSError:
-                pass
+        self._decoded.clear()
+        self._store.clear()
+        self.revealed_index.rebuild([])
+
+    def close(self) -> None:
+        self._decoded.clear()
+        self._store.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Decoded-record LRU counters: hits, misses, evictions, renewals and memory use."""
+        return {"mode": self.mode, **self._decoded.get_stats()}
+
+
+_default_cache: Optional[ContactCache] = None
+
+
+def get_contact_cache() -> ContactCache:
+    """Return the shared contact cache, indexed into the shared revealed-UID index."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ContactCache(revealed_index=get_revealed_index())
+    return _default_cache
+
+
+def set_contact_cache(cache: Optional[ContactCache]) -> None:
+    """Replace the shared contact cache (``None`` resets it)."""
+    global _default_cache
+    _default_cache = cache
 
 
-__all__ = ["ContactCache", "CachedContact", "normalize_contacts"]
+__all__ = [
+    "ContactCache",
+    "CachedContact",
+    "FreshnessPolicy",
+    "JsonContactStore",
+    "RecordLRU",
+    "SqliteContactStore",
+    "StaleContact",
+    "get_contact_cache",
+    "normalize_contacts",
+    "set_contact_cache",
+]
@@ -0,0 +1,668 @@
+"""Log-structured storage for the contact cache.
+
+Reveal bursts write several small updates to the same UIDs in a row: a
+profile merge, then contacts, then metadata. In log-structured mode each
+upsert appends one compact delta record (a JSON line holding just the new
+contacts, profile keys and metadata) to the active segment file, so a write
+costs O(delta) however large the record already is.
+
+An in-memory hash index maps every UID to the offsets of its deltas. A read
+folds those deltas into a :class:`CachedContact`. Recently touched records
+are kept folded, so repeated writes to a hot UID never re-read it.
+
+When the active segment reaches ``segment_bytes`` it is sealed. Sealing
+appends a footer with the segment's UID -> offsets index and a fixed-size
+trailer that points at the footer, so startup reads footers instead of
+scanning whole segments. Only the unsealed tail segment is scanned (and a
+torn last line truncated). Once ``compact_segments`` sealed segments have
+piled up, a background thread merges them into one segment holding a single
+folded record per UID, which drops every superseded delta.
+
+Several processes can share one log directory. Writers hold an exclusive
+advisory lock on ``LOCK`` while appending, sealing or swapping in a compacted
+segment; readers hold it shared. Under the lock each process first catches
+up: it indexes deltas that others appended to the active segment, or
+rebuilds its index from the footers if segments were sealed, compacted or
+removed. Deltas are merged on read, so no writer's update is lost.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import struct
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import structlog
+
+from .contact_cache import (
+    CachedContact,
+    _by_verification,
+    _load_json_cache,
+    _stat_key,
+    _utc_now_iso,
+)
+
+try:  # pragma: no cover - platform dependent
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_SEGMENT_BYTES = 4 * 1024 * 1024
+DEFAULT_COMPACT_SEGMENTS = 4
+DEFAULT_HOT_RECORDS = 1024
+
+_TRAILER = struct.Struct("<8sQ")
+_TRAILER_MAGIC = b"CCLOGFT1"
+_SEGMENT_RE = re.compile(r"^segment-(\d{8})\.log$")
+_MIGRATED_MARKER = "migrated"
+_LOCK_NAME = "LOCK"
+
+# (segment id, byte offset) of one delta
+Location = Tuple[int, int]
+
+
+def _encode(delta: Dict[str, Any]) -> bytes:
+    return json.dumps(delta, separators=(",", ":")).encode() + b"\n"
+
+
+def apply_delta(record: Optional[CachedContact], delta: Dict[str, Any]) -> CachedContact:
+    """Fold one delta record into ``record`` (``None`` for a new UID)."""
+    if delta.get("f") or record is None:
+        record = CachedContact(
+            uid=delta["u"],
+            first_revealed_at=delta.get("r") or delta["t"],
+            last_updated_at=delta["t"],
+        )
+        if delta.get("f"):
+            record.contacts = list(delta.get("c") or [])
+            record.profile = delta.get("p")
+            record.metadata = dict(delta.get("m") or {})
+            record.verified = dict(delta.get("v") or {})
+            return record
+    if delta.get("c"):
+        record.merge_contacts(delta["c"], verified_at=delta["t"])
+    if delta.get("p"):
+        record.merge_profile(delta["p"])
+    if delta.get("m"):
+        record.metadata = {**record.metadata, **delta["m"]}
+    record.last_updated_at = delta["t"]
+    return record
+
+
+def _full_delta(record: CachedContact) -> Dict[str, Any]:
+    return {
+        "u": record.uid,
+        "f": 1,
+        "r": record.first_revealed_at,
+        "t": record.last_updated_at,
+        "c": record.contacts,
+        "p": record.profile,
+        "m": record.metadata,
+        "v": record.verified,
+    }
+
+
+class LogContactStore:
+    """Append-only segment files with an in-memory UID index.
+
+    Parameters
+    - directory: folder holding the ``segment-NNNNNNNN.log`` files
+    - legacy_path: JSON cache imported once into a new log
+    - segment_bytes: size at which the active segment is sealed
+    - compact_segments: sealed segments that trigger a background compaction
+    - hot_records: folded records kept in memory for repeated writes
+    - fsync: fsync segment writes (otherwise they are only flushed to the OS)
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        legacy_path: Optional[Path] = None,
+        *,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        compact_segments: int = DEFAULT_COMPACT_SEGMENTS,
+        hot_records: int = DEFAULT_HOT_RECORDS,
+        fsync: bool = False,
+    ):
+        self.directory = Path(directory)
+        self.legacy_path = legacy_path
+        self.segment_bytes = segment_bytes
+        self.compact_segments = compact_segments
+        self.hot_records = hot_records
+        self.fsync = fsync
+        self.lock_path = self.directory / _LOCK_NAME
+        self._index: Dict[str, List[Location]] = {}
+        self._hot: "OrderedDict[str, CachedContact]" = OrderedDict()
+        self._sealed: List[int] = []
+        self._readers: Dict[int, BinaryIO] = {}
+        self._active: Optional[BinaryIO] = None
+        self._active_id = 0
+        self._active_index: Dict[str, List[int]] = {}
+        self._active_size = 0
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._opened = False
+        self._lock_file: Optional[BinaryIO] = None
+        self._lock_depth = 0
+        # Directory identity when last indexed; a change means segments moved
+        self._dir_stat: Optional[tuple] = None
+        # Bumped whenever other processes' writes are picked up
+        self._generation = 0
+        self._reported_generation = 0
+        self._compactor: Optional[threading.Thread] = None
+        self._stats = {"appended": 0, "sealed": 0, "compactions": 0, "dropped_deltas": 0}
+
+    # Segments ---------------------------------------------------------------
+
+    def _segment_path(self, segment_id: int) -> Path:
+        return self.directory / f"segment-{segment_id:08d}.log"
+
+    def _reader(self, segment_id: int) -> BinaryIO:
+        reader = self._readers.get(segment_id)
+        if reader is None:
+            reader = open(self._segment_path(segment_id), "rb")
+            self._readers[segment_id] = reader
+        return reader
+
+    def _read_delta(self, location: Location) -> Dict[str, Any]:
+        segment_id, offset = location
+        if segment_id == self._active_id and self._active is not None:
+            self._active.flush()
+        reader = self._reader(segment_id)
+        reader.seek(offset)
+        return json.loads(reader.readline())
+
+    @staticmethod
+    def _read_footer(path: Path) -> Optional[Dict[str, List[int]]]:
+        """Return a sealed segment's UID -> offsets footer, or ``None`` if unsealed."""
+        with open(path, "rb") as handle:
+            handle.seek(0, os.SEEK_END)
+            size = handle.tell()
+            if size < _TRAILER.size:
+                return None
+            handle.seek(size - _TRAILER.size)
+            magic, footer_offset = _TRAILER.unpack(handle.read(_TRAILER.size))
+            if magic != _TRAILER_MAGIC:
+                return None
+            handle.seek(footer_offset)
+            return json.loads(handle.readline())
+
+    @staticmethod
+    def _scan(
+        path: Path, start: int = 0, *, repair: bool = True
+    ) -> Tuple[Dict[str, List[int]], int]:
+        """Index an unsealed segment line by line from ``start``.
+
+        Returns the offsets per UID and the end of the last complete line. With
+        ``repair`` a torn last write is truncated, otherwise it is skipped.
+        """
+        offsets: Dict[str, List[int]] = {}
+        offset = start
+        with open(path, "r+b" if repair else "rb") as handle:
+            handle.seek(start)
+            for line in handle:
+                try:
+                    delta = json.loads(line) if line.endswith(b"\n") else None
+                except ValueError:
+                    delta = None
+                if delta is None:
+                    if repair:
+                        handle.truncate(offset)
+                    break
+                offsets.setdefault(delta["u"], []).append(offset)
+                offset += len(line)
+        return offsets, offset
+
+    def _stat_dir(self) -> tuple:
+        st = os.stat(self.directory)
+        return (st.st_ino, st.st_mtime_ns)
+
+    def _load(self, *, repair: bool) -> bool:
+        """Rebuild the index from segment footers (scanning only the tail).
+
+        Returns whether any segment existed.
+        """
+        self._close_files()
+        self._index.clear()
+        self._hot.clear()
+        self._sealed = []
+        self._active_index = {}
+        self._active_id = 0
+        self._active_size = 0
+        self._dir_stat = self._stat_dir()
+        segment_ids = sorted(
+            int(match.group(1))
+            for match in (_SEGMENT_RE.match(p.name) for p in self.directory.iterdir())
+            if match
+        )
+        for segment_id in segment_ids:
+            path = self._segment_path(segment_id)
+            footer = self._read_footer(path)
+            if footer is None:
+                # The tail is the active segment; an older unsealed one crashed
+                # before sealing but is still readable line by line
+                footer, end = self._scan(path, repair=repair)
+                if segment_id == segment_ids[-1]:
+                    self._active_index = footer
+                    self._active_id = segment_id
+                    self._active_size = end
+            if segment_id != self._active_id:
+                self._sealed.append(segment_id)
+            for uid, offsets in footer.items():
+                self._index.setdefault(uid, []).extend(
+                    (segment_id, offset) for offset in offsets
+                )
+        if not self._active_id:
+            self._active_id = (segment_ids[-1] if segment_ids else 0) + 1
+        self._opened = True
+        return bool(segment_ids)
+
+    def _catch_up(self, *, repair: bool) -> None:
+        """Pick up what other processes wrote since this process last looked."""
+        if not self._opened:
+            # Output of a compaction that did not finish
+            for leftover in self.directory.glob("segment-*.compact*"):
+                leftover.unlink(missing_ok=True)
+            self._migrate_legacy(fresh=not self._load(repair=repair))
+            return
+        if self._stat_dir() != self._dir_stat:
+            # Segments were sealed, compacted or cleared elsewhere
+            self._load(repair=repair)
+            self._generation += 1
+            return
+        path = self._segment_path(self._active_id)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size <= self._active_size:
+            return
+        if self._read_footer(path) is not None:
+            self._load(repair=repair)
+            self._generation += 1
+            return
+        offsets, self._active_size = self._scan(path, self._active_size, repair=repair)
+        for uid, uid_offsets in offsets.items():
+            self._index.setdefault(uid, []).extend(
+                (self._active_id, offset) for offset in uid_offsets
+            )
+            self._active_index.setdefault(uid, []).extend(uid_offsets)
+            record = self._hot.get(uid)
+            if record is not None:
+                # Keep hot records folded rather than re-reading their history
+                for offset in uid_offsets:
+                    record = apply_delta(record, self._read_delta((self._active_id, offset)))
+                self._hot[uid] = record
+        if offsets:
+            self._generation += 1
+
+    @contextmanager
+    def _file_locked(self, *, exclusive: bool) -> Iterator[None]:
+        """Hold the directory lock, caught up with other processes.
+
+        Reentrant for the thread holding ``_lock``; nested blocks share the
+        outermost lock. The first open always locks exclusively.
+        """
+        with self._lock:
+            if self._lock_depth:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+            exclusive = exclusive or not self._opened
+            if self._lock_file is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._lock_file = open(self.lock_path, "a+b")
+            if fcntl is not None:
+                fcntl.flock(
+                    self._lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+                )
+            self._lock_depth = 1
+            try:
+                self._catch_up(repair=exclusive)
+                yield
+            finally:
+                self._lock_depth = 0
+                if exclusive and self._opened:
+                    # Any directory change made while holding the lock is ours
+                    self._dir_stat = self._stat_dir()
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def open(self) -> None:
+        """Build the index (importing the legacy JSON cache into a new log)."""
+        with self._file_locked(exclusive=True):
+            pass
+
+    def refresh(self) -> bool:
+        """Pick up other processes' writes; True if any were found since the last call."""
+        with self._file_locked(exclusive=False):
+            changed = self._generation != self._reported_generation
+            self._reported_generation = self._generation
+        return changed
+
+    def _migrate_legacy(self, *, fresh: bool) -> None:
+        marker = self.directory / _MIGRATED_MARKER
+        if marker.exists():
+            return
+        if fresh and self.legacy_path is not None and self.legacy_path.exists():
+            records = _load_json_cache(self.legacy_path)
+            with self.transaction():
+                for record in records.values():
+                    self._append(_full_delta(record))
+            logger.info(
+                "Migrated legacy contact cache",
+                source=str(self.legacy_path),
+                records=len(records),
+            )
+        marker.write_text(str(self.legacy_path or ""))
+
+    def _append(self, delta: Dict[str, Any]) -> None:
+        """Append one delta (directory lock held exclusively)."""
+        if self._active is None:
+            self._active = open(self._segment_path(self._active_id), "ab")
+        data = _encode(delta)
+        offset = self._active_size
+        self._active.write(data)
+        self._active_size += len(data)
+        uid = delta["u"]
+        self._index.setdefault(uid, []).append((self._active_id, offset))
+        self._active_index.setdefault(uid, []).append(offset)
+        self._stats["appended"] += 1
+        if not self._depth:
+            self._sync()
+        if self._active_size >= self.segment_bytes and not self._depth:
+            self._seal()
+
+    def _sync(self) -> None:
+        self._active.flush()
+        if self.fsync:
+            os.fsync(self._active.fileno())
+
+    def _seal(self, *, compact: bool = True) -> None:
+        """Write the footer and trailer, then start a new active segment."""
+        if not self._active_index or self._active is None:
+            return
+        footer_offset = self._active_size
+        self._active.write(_encode(self._active_index))
+        self._active.write(_TRAILER.pack(_TRAILER_MAGIC, footer_offset))
+        self._sync()
+        self._active.close()
+        self._active = None
+        self._sealed.append(self._active_id)
+        self._stats["sealed"] += 1
+        self._active_id += 1
+        self._active_index = {}
+        self._active_size = 0
+        self._active = open(self._segment_path(self._active_id), "ab")
+        if compact and len(self._sealed) >= self.compact_segments:
+            self._start_compaction()
+
+    # Compaction -------------------------------------------------------------
+
+    def _start_compaction(self) -> None:
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self._compactor = threading.Thread(
+            target=self.compact, name="contact-log-compactor", daemon=True
+        )
+        self._compactor.start()
+
+    def compact(self) -> int:
+        """Merge all sealed segments into one; returns the deltas dropped."""
+        with self._lock:
+            segments = list(self._sealed)
+            if len(segments) < 2:
+                return 0
+            chosen = set(segments)
+            # Deltas of sealed segments are a prefix of each UID's history
+            prefixes = {
+                uid: [loc for loc in locations if loc[0] in chosen]
+                for uid, locations in self._index.items()
+            }
+        target_id = segments[-1]
+        target_stat = _stat_key(self._segment_path(target_id))
+        temp_path = self.directory / f"segment-{target_id:08d}.compact.{os.getpid()}"
+        footer: Dict[str, List[int]] = {}
+        try:
+            dropped = self._write_compacted(temp_path, prefixes, footer)
+        except (OSError, ValueError):
+            # Another process compacted or cleared these segments meanwhile
+            temp_path.unlink(missing_ok=True)
+            return 0
+
+        with self._file_locked(exclusive=True):
+            if _stat_key(self._segment_path(target_id)) != target_stat or not chosen.issubset(
+                self._sealed
+            ):
+                temp_path.unlink(missing_ok=True)
+                return 0
+            for segment_id in segments:
+                reader = self._readers.pop(segment_id, None)
+                if reader is not None:
+                    reader.close()
+            # The newest input is replaced atomically; a crash before the older
+            # inputs are removed leaves data that the folded records override
+            os.replace(temp_path, self._segment_path(target_id))
+            for segment_id in segments[:-1]:
+                self._segment_path(segment_id).unlink(missing_ok=True)
+            for uid, offsets in footer.items():
+                locations = self._index[uid]
+                keep = [loc for loc in locations if loc[0] not in chosen]
+                self._index[uid] = [(target_id, offsets[0])] + keep
+            self._sealed = [target_id] + [s for s in self._sealed if s not in chosen]
+            self._stats["compactions"] += 1
+            self._stats["dropped_deltas"] += dropped
+        logger.info(
+            "Compacted contact log", segments=len(segments), dropped_deltas=dropped
+        )
+        return dropped
+
+    def _write_compacted(
+        self,
+        temp_path: Path,
+        prefixes: Dict[str, List[Location]],
+        footer: Dict[str, List[int]],
+    ) -> int:
+        """Write one folded record per UID into a sealed segment at ``temp_path``."""
+        dropped = 0
+        with open(temp_path, "wb") as out:
+            readers: Dict[int, BinaryIO] = {}
+            try:
+                for uid, locations in prefixes.items():
+                    if not locations:
+                        continue
+                    record = None
+                    for segment_id, offset in locations:
+                        reader = readers.get(segment_id)
+                        if reader is None:
+                            reader = readers[segment_id] = open(
+                                self._segment_path(segment_id), "rb"
+                            )
+                        reader.seek(offset)
+                        record = apply_delta(record, json.loads(reader.readline()))
+                    footer[uid] = [out.tell()]
+                    out.write(_encode(_full_delta(record)))
+                    dropped += len(locations) - 1
+            finally:
+                for reader in readers.values():
+                    reader.close()
+            footer_offset = out.tell()
+            out.write(_encode(footer))
+            out.write(_TRAILER.pack(_TRAILER_MAGIC, footer_offset))
+            out.flush()
+            os.fsync(out.fileno())
+        return dropped
+
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> None:
+        if self._compactor is not None:
+            self._compactor.join(timeout)
+
+    # Store interface --------------------------------------------------------
+
+    def _remember(self, record: CachedContact) -> None:
+        self._hot[record.uid] = record
+        self._hot.move_to_end(record.uid)
+        while len(self._hot) > self.hot_records:
+            self._hot.popitem(last=False)
+
+    def _fold(self, uid: str) -> Optional[CachedContact]:
+        record = self._hot.get(uid)
+        if record is not None:
+            self._hot.move_to_end(uid)
+            return record
+        locations = self._index.get(uid)
+        if not locations:
+            return None
+        for location in locations:
+            record = apply_delta(record, self._read_delta(location))
+        self._remember(record)
+        return record
+
+    def load(self, uid: str) -> Optional[Tuple[CachedContact, int]]:
+        """Fold one record; returns a copy with its compacted encoded size."""
+        with self._file_locked(exclusive=False):
+            record = self._fold(uid)
+            if record is None:
+                return None
+            encoded = _encode(_full_delta(record))
+        return apply_delta(None, json.loads(encoded)), len(encoded)
+
+    def get(self, uid: str) -> Optional[CachedContact]:
+        loaded = self.load(uid)
+        return loaded[0] if loaded else None
+
+    def version(self, uid: str) -> Optional[str]:
+        """The record's ``last_updated_at``; hot records answer without a read."""
+        with self._file_locked(exclusive=False):
+            record = self._fold(uid)
+        return record.last_updated_at if record is not None else None
+
+    def append(
+        self,
+        uid: str,
+        *,
+        contacts: Optional[Iterable[Dict[str, Any]]] = None,
+        profile: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> CachedContact:
+        """Append a delta for ``uid`` and return the updated record."""
+        delta: Dict[str, Any] = {"u": uid, "t": _utc_now_iso()}
+        if contacts:
+            delta["c"] = [c for c in contacts if isinstance(c, dict)]
+        if profile:
+            delta["p"] = profile
+        if metadata:
+            delta["m"] = metadata
+        with self._file_locked(exclusive=True):
+            record = self._fold(uid)
+            self._append(delta)
+            record = apply_delta(record, delta)
+            self._remember(record)
+        return record
+
+    def put_many(self, records: Iterable[CachedContact]) -> None:
+        with self.transaction():
+            for record in records:
+                self._append(_full_delta(record))
+                self._remember(record)
+
+    def uids(self) -> List[str]:
+        with self._file_locked(exclusive=False):
+            return list(self._index)
+
+    def verified_before(self, cutoff: str) -> Iterator[CachedContact]:
+        """Yield records with a contact type verified before ``cutoff``, oldest first.
+
+        The log has no time index, so this folds every record.
+        """
+        return _by_verification((self.get(uid) for uid in self.uids()), cutoff)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Defer flushing (and sealing) until the outermost block ends.
+
+        The directory lock is held exclusively for the whole block.
+        """
+        with self._file_locked(exclusive=True):
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if not self._depth and self._active is not None:
+                    self._sync()
+                    if self._active_size >= self.segment_bytes:
+                        self._seal()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._active is not None:
+                self._sync()
+
+    def clear(self) -> None:
+        self.wait_for_compaction()
+        with self._file_locked(exclusive=True):
+            self._close_files()
+            for path in self.directory.glob("segment-*"):
+                path.unlink()
+            self._index.clear()
+            self._hot.clear()
+            self._sealed = []
+            self._active_index = {}
+            self._active_id = 1
+            self._active_size = 0
+
+    def _close_files(self) -> None:
+        for reader in self._readers.values():
+            reader.close()
+        self._readers.clear()
+        if self._active is not None:
+            self._active.close()
+            self._active = None
+
+    def close(self) -> None:
+        """Seal the active segment so the next open reads only footers."""
+        self.wait_for_compaction()
+        with self._lock:
+            if not self._opened:
+                return
+            with self._file_locked(exclusive=True):
+                self._seal(compact=False)
+                self._close_files()
+                # Drop the empty segment the seal started
+                active = self._segment_path(self._active_id)
+                stat = _stat_key(active)
+                if stat is not None and not stat[1]:
+                    active.unlink()
+            self._lock_file.close()
+            self._lock_file = None
+            self._opened = False
+            self._index.clear()
+            self._hot.clear()
+            self._sealed = []
+            self._active_index = {}
+            self._active_id = 0
+            self._active_size = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "uids": len(self._index),
+                "deltas": sum(len(locations) for locations in self._index.values()),
+                "segments": len(self._sealed) + (1 if self._active is not None else 0),
+            }
+
+
+__all__ = ["LogContactStore", "apply_delta"]
@@ -0,0 +1,248 @@
+"""Credit balance tracked from ``X-Credits-Left`` response headers.
+
+SignalHire reports the remaining credit balance on every API response, so a
+separate ``GET /credits`` call is only needed when no recent response has been
+seen. The ledger keeps the latest balance per API key (stored as a short
+fingerprint) and, when given a path, persists it so later CLI invocations can
+answer "how many credits are left" without a round trip.
+
+Every response carries the header, so writes are debounced: a balance is
+written at most once per ``persist_interval``, and only when it changed or
+the stored copy is about to go stale. :meth:`CreditLedger.flush` writes
+whatever is pending; clients call it when their session closes and the
+process-wide ledger also flushes at exit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from .rate_limit_registry import key_fingerprint
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = structlog.get_logger(__name__)
+
+LEDGER_ENV_VAR = "SIGNALHIRE_CREDIT_LEDGER"
+LEDGER_DIR_NAME = ".signalhire-agent"
+LEDGER_SUBDIR_NAME = "usage"
+LEDGER_FILE_NAME = "credits.json"
+
+DEFAULT_MAX_AGE_SECONDS = 300.0
+DEFAULT_PERSIST_INTERVAL = 5.0
+
+
+def _default_ledger_path() -> Path:
+    """Return the default location of the persisted credit ledger."""
+    return Path.home() / LEDGER_DIR_NAME / LEDGER_SUBDIR_NAME / LEDGER_FILE_NAME
+
+
+@dataclass
+class CreditSnapshot:
+    """Last known balance of one API key."""
+
+    credits: int
+    updated_at: float  # Epoch seconds
+    source: str = "header"  # "header" (X-Credits-Left) or "credits" (GET /credits)
+
+    def as_credits_data(self) -> dict[str, Any]:
+        """Shape the snapshot like a ``GET /credits`` payload."""
+        return {
+            "credits": self.credits,
+            "credits_remaining": self.credits,
+            "updated_at": self.updated_at,
+            "source": self.source,
+        }
+
+
+class CreditLedger:
+    """Latest credit balance per API key, optionally persisted to disk.
+
+    Parameters
+    - path: JSON file shared with later invocations (``None`` keeps it in memory)
+    - max_age: seconds a balance counts as fresh for :meth:`fresh`
+    - persist_interval: minimum seconds between writes of the ledger file
+    - time_fn: injectable clock returning epoch seconds
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        max_age: float = DEFAULT_MAX_AGE_SECONDS,
+        persist_interval: float = DEFAULT_PERSIST_INTERVAL,
+        time_fn: Callable[[], float] | None = None,
+    ) -> None:
+        self._path = path
+        self._max_age = max_age
+        self._persist_interval = persist_interval
+        self._time = time_fn or time.time
+        self._entries: dict[str, CreditSnapshot] = {}
+        # Snapshots as last written, and when
+        self._persisted: dict[str, CreditSnapshot] = {}
+        self._persisted_at: float | None = None
+        self._dirty = False
+        self._mtime: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path | None:
+        return self._path
+
+    def _read_file(self) -> dict[str, CreditSnapshot]:
+        try:
+            raw = json.loads(self._path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        entries = {}
+        for fingerprint, entry in raw.items() if isinstance(raw, dict) else ():
+            try:
+                entries[fingerprint] = CreditSnapshot(
+                    credits=int(entry["credits"]),
+                    updated_at=float(entry["updated_at"]),
+                    source=str(entry.get("source", "header")),
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+        return entries
+
+    def _merge(self, entries: dict[str, CreditSnapshot]) -> None:
+        for fingerprint, snapshot in entries.items():
+            current = self._entries.get(fingerprint)
+            if current is None or snapshot.updated_at > current.updated_at:
+                self._entries[fingerprint] = snapshot
+
+    def _refresh(self) -> None:
+        """Pick up balances written by other processes since the last read."""
+        if self._path is None:
+            return
+        try:
+            mtime = self._path.stat().st_mtime
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self._merge(self._read_file())
+            self._mtime = mtime
+
+    def _persist(self, drop: str | None = None) -> None:
+        if self._path is None:
+            return
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            # Merge with the file so balances of other keys/processes survive
+            self._merge(self._read_file())
+            if drop is not None:
+                self._entries.pop(drop, None)
+            payload = {
+                fingerprint: asdict(snapshot)
+                for fingerprint, snapshot in self._entries.items()
+            }
+            temp_path = self._path.with_suffix(f".{os.getpid()}.tmp")
+            temp_path.write_text(json.dumps(payload, separators=(",", ":")))
+            temp_path.replace(self._path)
+            self._mtime = self._path.stat().st_mtime
+        except OSError as exc:
+            logger.warning("Could not persist credit balance", error=str(exc))
+        self._persisted = dict(self._entries)
+        self._persisted_at = self._time()
+        self._dirty = False
+
+    def update(self, api_key: str, credits: int, *, source: str = "header") -> None:
+        """Record the balance reported for ``api_key``.
+
+        The file is written only when the balance changed (or the stored copy
+        is half-way to stale) and ``persist_interval`` has passed since the
+        last write; otherwise the change waits for the next write or :meth:`flush`.
+        """
+        fingerprint = key_fingerprint(api_key)
+        now = self._time()
+        with self._lock:
+            self._entries[fingerprint] = CreditSnapshot(
+                credits=int(credits), updated_at=now, source=source
+            )
+            stored = self._persisted.get(fingerprint)
+            if (
+                stored is None
+                or stored.credits != int(credits)
+                or now - stored.updated_at >= self._max_age / 2
+            ):
+                self._dirty = True
+            if self._dirty and (
+                self._persisted_at is None
+                or now - self._persisted_at >= self._persist_interval
+            ):
+                self._persist()
+
+    def flush(self) -> None:
+        """Write balances held back by the debounce."""
+        with self._lock:
+            if self._dirty:
+                self._persist()
+
+    def get(self, api_key: str) -> CreditSnapshot | None:
+        """Last known balance for ``api_key`` regardless of age."""
+        with self._lock:
+            self._refresh()
+            return self._entries.get(key_fingerprint(api_key))
+
+    def fresh(self, api_key: str) -> CreditSnapshot | None:
+        """Last known balance if it is younger than ``max_age``."""
+        snapshot = self.get(api_key)
+        if snapshot is None or self._time() - snapshot.updated_at >= self._max_age:
+            return None
+        return snapshot
+
+    def invalidate(self, api_key: str) -> None:
+        """Forget the balance of ``api_key`` so the next check hits the API."""
+        fingerprint = key_fingerprint(api_key)
+        with self._lock:
+            self._entries.pop(fingerprint, None)
+            self._persist(drop=fingerprint)
+
+
+_ledger: CreditLedger | None = None
+
+
+def get_credit_ledger() -> CreditLedger:
+    """Return the process-wide credit ledger, creating it on first use.
+
+    Balances are persisted to ``~/.signalhire-agent/usage/credits.json`` unless
+    ``SIGNALHIRE_CREDIT_LEDGER`` names another file, or is ``0``/``off`` to
+    keep them in memory only.
+    """
+    global _ledger
+    if _ledger is None:
+        setting = os.getenv(LEDGER_ENV_VAR, "").strip()
+        if setting.lower() in {"0", "false", "no", "off"}:
+            path = None
+        elif setting and setting.lower() not in {"1", "true", "yes", "on"}:
+            path = Path(setting).expanduser()
+        else:
+            path = _default_ledger_path()
+        _ledger = CreditLedger(path)
+        atexit.register(_ledger.flush)
+    return _ledger
+
+
+def set_credit_ledger(ledger: CreditLedger | None) -> None:
+    """Replace the process-wide ledger (``None`` recreates it lazily)."""
+    global _ledger
+    _ledger = ledger
+
+
+__all__ = [
+    "CreditLedger",
+    "CreditSnapshot",
+    "get_credit_ledger",
+    "set_credit_ledger",
+]
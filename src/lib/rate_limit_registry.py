@@ -0,0 +1,405 @@
+"""Process-wide registry of hierarchical rate limits.
+
+Every outbound call acquires through one registry so that SignalHire and
+Airtable callers share budgets instead of each assuming the full quota. A call
+is admitted only when every level of its hierarchy has room::
+
+    global -> <api> -> <api>/<endpoint> -> <api>/key:<fingerprint>
+
+The key level holds per-credential or per-partition limits: the SignalHire API
+key (600 elements/minute) or the Airtable base (5 requests/second). Keys are
+stored as short SHA-256 fingerprints, never in clear text.
+
+When a state file is configured (``SIGNALHIRE_RATE_LIMIT_STATE``), admissions
+are recorded in it under an advisory lock so parallel CLI processes on the same
+host draw from one budget. Waiting for that lock and rewriting the file happen
+in a worker thread, so contention between processes never stalls the event
+loop. Within a process, waiters queue per scope and are admitted in arrival
+order, so a large request is not starved by a stream of small ones.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from .rate_limiter import SlidingWindowLimiter
+
+try:  # POSIX only; shared state falls back to in-process limits elsewhere
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import httpx
+
+logger = structlog.get_logger(__name__)
+
+STATE_ENV_VAR = "SIGNALHIRE_RATE_LIMIT_STATE"
+GLOBAL_SCOPE = "global"
+KEY_TEMPLATE = "key:*"
+
+_HOST_APIS = {
+    "api.airtable.com": "airtable",
+    "www.signalhire.com": "signalhire",
+    "signalhire.com": "signalhire",
+}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """At most ``max_events`` admissions per ``window`` seconds."""
+
+    max_events: int
+    window: float
+
+
+DEFAULT_LIMITS: dict[str, RateLimit] = {
+    # SignalHire: 600 Person API elements per minute per account
+    f"signalhire/{KEY_TEMPLATE}": RateLimit(600, 60.0),
+    # Airtable: 5 requests per second per base
+    f"airtable/{KEY_TEMPLATE}": RateLimit(5, 1.0),
+}
+
+
+def _default_state_path() -> Path:
+    return Path.home() / ".signalhire-agent" / "rate_limits.json"
+
+
+def key_fingerprint(key: str) -> str:
+    """Stable, non-reversible identifier for an API key or base ID."""
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+
+
+class _SharedWindowStore:
+    """Sliding-window logs kept in a JSON file guarded by ``flock``."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def _locked(self, update: Callable[[dict[str, Any]], bool]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a+", encoding="utf-8") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                raw = handle.read()
+                try:
+                    state = json.loads(raw) if raw.strip() else {}
+                except json.JSONDecodeError:
+                    state = {}
+                if update(state):
+                    handle.seek(0)
+                    handle.truncate()
+                    handle.write(json.dumps(state, separators=(",", ":")))
+                    handle.flush()
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def try_admit(self, scopes: list[tuple[str, RateLimit]], n: int) -> float:
+        """Admit ``n`` events in every scope or return the delay until possible."""
+        delay = 0.0
+
+        def update(state: dict[str, Any]) -> bool:
+            nonlocal delay
+            now = time.time()
+            for scope, limit in scopes:
+                runs = [
+                    run for run in state.get(scope, []) if run[0] > now - limit.window
+                ]
+                state[scope] = runs
+                total = sum(run[1] for run in runs)
+                excess = total + n - limit.max_events
+                if excess <= 0:
+                    continue
+                freed = 0
+                for timestamp, count in runs:
+                    freed += count
+                    if freed >= excess:
+                        delay = max(delay, timestamp + limit.window - now, 1e-3)
+                        break
+            if delay == 0.0:
+                for scope, _ in scopes:
+                    state[scope].append([now, n])
+            # Drop scopes whose windows have fully drained
+            for scope in [name for name, runs in state.items() if not runs]:
+                del state[scope]
+            return True
+
+        self._locked(update)
+        return delay
+
+    def counts(
+        self, limit_for: Callable[[str], RateLimit | None]
+    ) -> dict[str, int]:
+        result: dict[str, int] = {}
+
+        def read(state: dict[str, Any]) -> bool:
+            now = time.time()
+            for scope, runs in state.items():
+                limit = limit_for(scope)
+                window = limit.window if limit else 0.0
+                result[scope] = sum(run[1] for run in runs if run[0] > now - window)
+            return False
+
+        self._locked(read)
+        return result
+
+
+class RateLimitRegistry:
+    """Hierarchical rate limits shared by every caller in the process.
+
+    Parameters
+    - limits: scope -> RateLimit; defaults to :data:`DEFAULT_LIMITS`.
+      ``"<api>/key:*"`` applies to every key of that API.
+    - state_path: optional file used to share admissions across processes
+    - time_fn: injectable monotonic clock for in-process windows
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, RateLimit] | None = None,
+        *,
+        state_path: Path | None = None,
+        time_fn: Callable[[], float] | None = None,
+    ) -> None:
+        self._limits: dict[str, RateLimit] = dict(
+            DEFAULT_LIMITS if limits is None else limits
+        )
+        self._time = time_fn
+        self._windows: dict[str, SlidingWindowLimiter] = {}
+        self._queues: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Lock]] = {}
+        self._store: _SharedWindowStore | None = None
+        self._stats = {"acquired": 0, "delayed": 0, "wait_seconds": 0.0}
+        if state_path is not None:
+            if fcntl is None:
+                logger.warning(
+                    "Shared rate limit state needs POSIX file locks; using in-process limits",
+                    state_path=str(state_path),
+                )
+            else:
+                self._store = _SharedWindowStore(state_path)
+
+    @property
+    def shared(self) -> bool:
+        return self._store is not None
+
+    def configure(self, scope: str, max_events: int, window: float) -> None:
+        """Set (or replace) the limit of a scope."""
+        if max_events <= 0 or window <= 0:
+            raise ValueError("max_events and window must be > 0")
+        self._limits[scope] = RateLimit(max_events, window)
+        self._drop_windows(scope)
+
+    def remove(self, scope: str) -> None:
+        """Drop the limit of a scope (the level becomes unlimited)."""
+        self._limits.pop(scope, None)
+        self._drop_windows(scope)
+
+    def _drop_windows(self, scope: str) -> None:
+        if scope.endswith(KEY_TEMPLATE):
+            prefix = scope[: -len("*")]
+            for name in [n for n in self._windows if n.startswith(prefix)]:
+                del self._windows[name]
+        else:
+            self._windows.pop(scope, None)
+
+    def scopes_for(
+        self, api: str, endpoint: str | None = None, key: str | None = None
+    ) -> list[tuple[str, RateLimit]]:
+        """Limited scopes a call to ``api``/``endpoint`` with ``key`` must pass."""
+        candidates = [(GLOBAL_SCOPE, GLOBAL_SCOPE), (api, api)]
+        if endpoint:
+            name = f"{api}/{endpoint.strip('/')}"
+            candidates.append((name, name))
+        if key:
+            candidates.append(
+                (f"{api}/key:{key_fingerprint(key)}", f"{api}/{KEY_TEMPLATE}")
+            )
+
+        scopes = []
+        for name, template in candidates:
+            limit = self._limits.get(name) or self._limits.get(template)
+            if limit is not None:
+                scopes.append((name, limit))
+        return scopes
+
+    def _window(self, scope: str, limit: RateLimit) -> SlidingWindowLimiter:
+        window = self._windows.get(scope)
+        if window is None:
+            window = SlidingWindowLimiter(
+                limit.max_events, limit.window, time_fn=self._time
+            )
+            self._windows[scope] = window
+        return window
+
+    def _queue(self, scope: str) -> asyncio.Lock:
+        # Locks bind to the loop they are first contended on; CLI commands may
+        # call asyncio.run() more than once with the same registry
+        loop = asyncio.get_running_loop()
+        entry = self._queues.get(scope)
+        if entry is None or entry[0] is not loop:
+            entry = (loop, asyncio.Lock())
+            self._queues[scope] = entry
+        return entry[1]
+
+    async def _try_admit(self, scopes: list[tuple[str, RateLimit]], n: int) -> float:
+        store = self._store
+        if store is not None:
+            try:
+                # flock blocks while another process holds the state file
+                return await asyncio.to_thread(store.try_admit, scopes, n)
+            except OSError as exc:
+                logger.warning(
+                    "Shared rate limit state unavailable; using in-process limits",
+                    error=str(exc),
+                )
+                self._store = None
+
+        windows = [self._window(scope, limit) for scope, limit in scopes]
+        delay = max((window.delay_for(n) for window in windows), default=0.0)
+        if delay == 0.0:
+            # No await between the check and the admission, so this is atomic
+            for window in windows:
+                window.try_acquire(n)
+        return delay
+
+    async def acquire(
+        self,
+        api: str,
+        endpoint: str | None = None,
+        *,
+        key: str | None = None,
+        n: int = 1,
+    ) -> float:
+        """Wait until every level has room for ``n`` events and admit them.
+
+        Waiters hold their place in each scope's queue (taken in name order,
+        so overlapping hierarchies cannot deadlock) until admitted; later
+        callers wait behind them even when their smaller ``n`` would fit.
+        Returns the seconds spent waiting.
+        """
+        scopes = self.scopes_for(api, endpoint, key)
+        if not scopes or n <= 0:
+            return 0.0
+        for scope, limit in scopes:
+            if n > limit.max_events:
+                raise ValueError(
+                    f"cannot acquire {n} events; {scope} allows {limit.max_events}"
+                )
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        delayed = False
+        async with contextlib.AsyncExitStack() as queues:
+            for scope, _ in sorted(scopes):
+                queue = self._queue(scope)
+                delayed = delayed or queue.locked()
+                await queues.enter_async_context(queue)
+            while True:
+                delay = await self._try_admit(scopes, n)
+                if delay <= 0:
+                    break
+                delayed = True
+                await asyncio.sleep(delay)
+
+        self._stats["acquired"] += 1
+        if not delayed:
+            return 0.0
+        waited = loop.time() - started
+        self._stats["delayed"] += 1
+        self._stats["wait_seconds"] += waited
+        return waited
+
+    def get_stats(self) -> dict[str, Any]:
+        """Configured limits, current window usage and wait totals."""
+        if self._store is not None:
+            counts = self._store.counts(self._limit_for)
+        else:
+            counts = {scope: window.count for scope, window in self._windows.items()}
+        return {
+            "shared": self.shared,
+            "limits": {
+                scope: {"max_events": limit.max_events, "window": limit.window}
+                for scope, limit in self._limits.items()
+            },
+            "usage": counts,
+            **self._stats,
+            "wait_seconds": round(self._stats["wait_seconds"], 3),
+        }
+
+    def _limit_for(self, scope: str) -> RateLimit | None:
+        if scope in self._limits:
+            return self._limits[scope]
+        api, _, rest = scope.partition("/")
+        if rest.startswith("key:"):
+            return self._limits.get(f"{api}/{KEY_TEMPLATE}")
+        return None
+
+    def event_hooks(self) -> dict[str, list[Callable[[httpx.Request], Any]]]:
+        """``httpx.AsyncClient(event_hooks=...)`` that throttles known API hosts.
+
+        Airtable requests are keyed by base ID; direct SignalHire calls by the
+        ``apikey`` header.
+        """
+
+        async def throttle(request: httpx.Request) -> None:
+            api = _HOST_APIS.get(request.url.host)
+            if api == "airtable":
+                parts = request.url.path.strip("/").split("/")
+                base_id = parts[1] if len(parts) > 1 and parts[0] == "v0" else None
+                await self.acquire(api, key=base_id)
+            elif api == "signalhire":
+                await self.acquire(api, key=request.headers.get("apikey"))
+
+        return {"request": [throttle]}
+
+
+_registry: RateLimitRegistry | None = None
+
+
+def get_rate_limit_registry() -> RateLimitRegistry:
+    """Return the process-wide registry, creating it on first use.
+
+    Set ``SIGNALHIRE_RATE_LIMIT_STATE`` to a file path (or ``1`` for
+    ``~/.signalhire-agent/rate_limits.json``) to share budgets across processes.
+    """
+    global _registry
+    if _registry is None:
+        state = os.getenv(STATE_ENV_VAR, "").strip()
+        state_path = None
+        if state:
+            state_path = (
+                _default_state_path()
+                if state.lower() in {"1", "true", "yes"}
+                else Path(state).expanduser()
+            )
+        _registry = RateLimitRegistry(state_path=state_path)
+    return _registry
+
+
+def set_rate_limit_registry(registry: RateLimitRegistry | None) -> None:
+    """Replace the process-wide registry (``None`` recreates it lazily)."""
+    global _registry
+    _registry = registry
+
+
+__all__ = [
+    "DEFAULT_LIMITS",
+    "RateLimit",
+    "RateLimitRegistry",
+    "get_rate_limit_registry",
+    "key_fingerprint",
+    "set_rate_limit_registry",
+]
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import asyncio
+import time
+from collections import deque
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -69,3 +71,124 @@ class AsyncTokenBucket:
                 wait_s = need / self._refill_rate
             # Sleep outside the lock to allow other waiters to proceed/refill
             await asyncio.sleep(wait_s)
+
+
+class SlidingWindowLimiter:
+    """An async sliding-log limiter: at most ``max_events`` per ``window`` seconds.
+
+    Admissions are stored as ``[timestamp, count]`` runs in a deque with a
+    running total, so admitting and expiring events is O(1) amortised no matter
+    how many events the window holds. Waiters queue on a lock and sleep while
+    holding it, which admits them strictly in arrival order and prevents
+    concurrent callers from all passing the same check and overshooting.
+
+    Parameters
+    - max_events: events allowed inside one window
+    - window: window length in seconds
+    - time_fn: injectable monotonic time function; defaults to time.monotonic
+    """
+
+    def __init__(
+        self,
+        max_events: int,
+        window: float,
+        *,
+        time_fn: Callable[[], float] | None = None,
+    ) -> None:
+        if max_events <= 0:
+            raise ValueError("max_events must be > 0")
+        if window <= 0:
+            raise ValueError("window must be > 0")
+        self._max_events = max_events
+        self._window = window
+        self._time = time_fn or time.monotonic
+        self._runs: deque[list[float]] = deque()
+        self._total = 0
+        self._lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def max_events(self) -> int:
+        return self._max_events
+
+    @property
+    def count(self) -> int:
+        """Events admitted within the current window."""
+        self._evict(self._time())
+        return self._total
+
+    def _get_lock(self) -> asyncio.Lock:
+        # Locks bind to the loop they are first contended on; CLI commands may
+        # call asyncio.run() more than once with the same limiter
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _evict(self, now: float) -> None:
+        cutoff = now - self._window
+        runs = self._runs
+        while runs and runs[0][0] <= cutoff:
+            self._total -= int(runs.popleft()[1])
+
+    def _admit(self, now: float, n: int) -> None:
+        if self._runs and self._runs[-1][0] == now:
+            self._runs[-1][1] += n
+        else:
+            self._runs.append([now, n])
+        self._total += n
+
+    def _wait_time(self, now: float, n: int) -> float:
+        """Seconds until enough of the oldest events expire to fit ``n`` more."""
+        excess = self._total + n - self._max_events
+        freed = 0
+        for timestamp, count in self._runs:
+            freed += int(count)
+            if freed >= excess:
+                return max(timestamp + self._window - now, 0.0)
+        return 0.0
+
+    def delay_for(self, n: int = 1) -> float:
+        """Seconds until ``n`` more events would be admitted (0.0 if they fit now)."""
+        now = self._time()
+        self._evict(now)
+        if self._total + n <= self._max_events:
+            return 0.0
+        return max(self._wait_time(now, n), 1e-3)
+
+    def try_acquire(self, n: int = 1) -> bool:
+        """Admit ``n`` events without waiting; returns False when over the limit."""
+        if n <= 0:
+            return True
+        now = self._time()
+        self._evict(now)
+        if self._total + n > self._max_events:
+            return False
+        self._admit(now, n)
+        return True
+
+    async def acquire(self, n: int = 1) -> float:
+        """Wait until ``n`` events fit in the window and admit them.
+
+        Returns the number of seconds spent waiting. ``n`` must not exceed
+        ``max_events``. Cancellation while waiting admits nothing.
+        """
+        if n <= 0:
+            return 0.0
+        if n > self._max_events:
+            raise ValueError("cannot acquire more events than max_events")
+
+        waited = 0.0
+        async with self._get_lock():
+            while True:
+                now = self._time()
+                self._evict(now)
+                if self._total + n <= self._max_events:
+                    self._admit(now, n)
+                    return waited
+                delay = self._wait_time(now, n)
+                # Guard against a clock that has not advanced past the boundary
+                delay = max(delay, 1e-3)
+                await asyncio.sleep(delay)
+                waited += delay
@@ -0,0 +1,176 @@
+"""Low-priority queue of stale cached contacts to reveal again.
+
+:meth:`ContactCache.iter_stale` lists cached records whose contacts have
+outlived their TTL, least recently updated first. The queue hands those UIDs
+out in batches, never more than ``daily_budget`` reveals in any rolling 24
+hours, so refreshing old data cannot crowd out new reveals. Claims are kept
+in a small SQLite database next to the cache:
+
+- every claim is a row, so the spend of the last 24 hours is a count over
+  the ``claimed_at`` index;
+- a UID claimed within ``retry_after`` is skipped while its reveal is in
+  flight. Once the reveal lands, the updated record is no longer stale.
+
+Claims run in ``BEGIN IMMEDIATE`` transactions, so processes sharing the
+queue cannot overspend the budget between them.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable
+
+import structlog
+
+from .contact_cache import ContactCache, StaleContact
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = structlog.get_logger(__name__)
+
+REREVEAL_DB_NAME = "rereveal.db"
+DEFAULT_DAILY_BUDGET = 100
+DEFAULT_RETRY_AFTER = 7 * 24 * 3600.0
+
+_DAY = 24 * 3600.0
+
+
+class ReRevealQueue:
+    """Stale UIDs handed out within a rolling daily reveal budget.
+
+    Parameters
+    - cache: contact cache scanned for stale records
+    - daily_budget: reveals (one credit each) allowed in any 24 hours
+    - path: claims database (defaults to ``rereveal.db`` next to the cache)
+    - retry_after: seconds a claimed UID is skipped while its reveal is pending
+    - time_fn: injectable clock returning epoch seconds
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS claims (
+            uid TEXT NOT NULL,
+            claimed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS claims_age ON claims (claimed_at);
+    """
+
+    def __init__(
+        self,
+        cache: ContactCache,
+        *,
+        daily_budget: int = DEFAULT_DAILY_BUDGET,
+        path: str | os.PathLike[str] | None = None,
+        retry_after: float = DEFAULT_RETRY_AFTER,
+        time_fn: Callable[[], float] | None = None,
+    ) -> None:
+        if daily_budget < 0:
+            raise ValueError("daily_budget must be >= 0")
+        self.cache = cache
+        self.daily_budget = daily_budget
+        self.path = Path(path) if path else cache.cache_path.with_name(REREVEAL_DB_NAME)
+        self.retry_after = retry_after
+        self._time = time_fn or time.time
+        self._db: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(
+                self.path, timeout=30.0, isolation_level=None, check_same_thread=False
+            )
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(self._SCHEMA)
+            self._db = db
+        return self._db
+
+    def _spent(self, db: sqlite3.Connection, now: float) -> int:
+        return db.execute(
+            "SELECT COUNT(*) FROM claims WHERE claimed_at > ?", (now - _DAY,)
+        ).fetchone()[0]
+
+    def remaining_budget(self) -> int:
+        """Reveals still allowed in the current rolling 24 hours."""
+        with self._lock:
+            return max(0, self.daily_budget - self._spent(self._conn(), self._time()))
+
+    def claim(self, limit: int | None = None) -> list[StaleContact]:
+        """Claim the least recently updated stale UIDs that fit the remaining budget."""
+        now = self._time()
+        claimed: list[StaleContact] = []
+        with self._lock:
+            db = self._conn()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute(
+                    "DELETE FROM claims WHERE claimed_at <= ?",
+                    (now - max(_DAY, self.retry_after),),
+                )
+                room = self.daily_budget - self._spent(db, now)
+                if limit is not None:
+                    room = min(room, limit)
+                if room > 0:
+                    pending = {
+                        uid
+                        for (uid,) in db.execute(
+                            "SELECT uid FROM claims WHERE claimed_at > ?",
+                            (now - self.retry_after,),
+                        )
+                    }
+                    stale = self.cache.iter_stale(now=datetime.fromtimestamp(now, timezone.utc))
+                    for candidate in stale:
+                        if candidate.uid in pending:
+                            continue
+                        claimed.append(candidate)
+                        if len(claimed) >= room:
+                            break
+                    db.executemany(
+                        "INSERT INTO claims (uid, claimed_at) VALUES (?, ?)",
+                        [(candidate.uid, now) for candidate in claimed],
+                    )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        if claimed:
+            logger.info("Claimed stale contacts for re-reveal", count=len(claimed))
+        return claimed
+
+    def release(self, uids: Iterable[str]) -> int:
+        """Return claims whose reveal was never sent, refunding their budget."""
+        uids = list(uids)
+        with self._lock:
+            db = self._conn()
+            cursor = db.executemany("DELETE FROM claims WHERE uid = ?", [(uid,) for uid in uids])
+            return cursor.rowcount
+
+    def get_stats(self) -> dict[str, Any]:
+        now = self._time()
+        with self._lock:
+            db = self._conn()
+            spent = self._spent(db, now)
+            pending = db.execute(
+                "SELECT COUNT(DISTINCT uid) FROM claims WHERE claimed_at > ?",
+                (now - self.retry_after,),
+            ).fetchone()[0]
+        return {
+            "daily_budget": self.daily_budget,
+            "spent": spent,
+            "remaining": max(0, self.daily_budget - spent),
+            "pending": pending,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+__all__ = ["ReRevealQueue"]
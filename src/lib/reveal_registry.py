@@ -0,0 +1,309 @@
+"""Correlation of Person API callbacks with in-flight reveal requests.
+
+A reveal returns only a request ID; the contacts arrive later as a callback
+carrying that ID in its ``Request-Id`` header. The registry sits between
+:class:`~src.services.signalhire_client.SignalHireClient`, which records each
+request it submits, and :class:`~src.lib.callback_server.CallbackServer`, which
+resolves the request when its callback has been processed. Callers await the
+result instead of sleeping and polling.
+
+Each request is backed by a :class:`concurrent.futures.Future` so it can be
+resolved from the callback server's thread (uvicorn runs its own event loop)
+and awaited from any loop via :func:`asyncio.wrap_future`. Callbacks that
+arrive before anyone waits for them are kept for ``ttl`` seconds so a fast
+callback racing the submit response is not lost. Requests whose callback
+never arrives are abandoned after the same ``ttl``: their futures are
+cancelled so the registry stays bounded in a long-running process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import AsyncIterator, Iterable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_TTL_SECONDS = 3600.0
+DEFAULT_MAX_COMPLETED = 1000
+
+
+@dataclass
+class RevealCompletion:
+    """Outcome of one revealed item as reported by its callback."""
+
+    request_id: str | None
+    item: str
+    status: str
+    candidate: dict[str, Any] | None = None
+    error: str | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == "success" and self.candidate is not None
+
+
+def completions_from_callback(
+    request_id: str, callback_data: Iterable[Any]
+) -> list[RevealCompletion]:
+    """Turn a callback payload (dicts or parsed models) into completions."""
+    completions = []
+    for entry in callback_data or []:
+        if isinstance(entry, dict):
+            item, status, candidate = (
+                entry.get("item"),
+                entry.get("status"),
+                entry.get("candidate"),
+            )
+        else:
+            item = getattr(entry, "item", None)
+            status = getattr(entry, "status", None)
+            candidate = getattr(entry, "candidate", None)
+            if candidate is not None and hasattr(candidate, "model_dump"):
+                candidate = candidate.model_dump(by_alias=True)
+        if item is None:
+            continue
+        completions.append(
+            RevealCompletion(
+                request_id=request_id,
+                item=str(item),
+                status=str(status or "failed"),
+                candidate=candidate if isinstance(candidate, dict) else None,
+            )
+        )
+    return completions
+
+
+@dataclass
+class _Request:
+    future: Future = field(default_factory=Future)
+    items: list[str] = field(default_factory=list)
+    created_at: float = 0.0
+    resolved_at: float | None = None
+
+
+class _Subscriber:
+    """Queue of completions consumed on one event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.queue: asyncio.Queue[RevealCompletion] = asyncio.Queue()
+
+    def push(self, completions: list[RevealCompletion]) -> None:
+        def put() -> None:
+            for completion in completions:
+                self.queue.put_nowait(completion)
+
+        try:
+            self.loop.call_soon_threadsafe(put)
+        except RuntimeError:
+            # The consuming loop has closed; nothing left to deliver to
+            pass
+
+
+class RevealRegistry:
+    """Futures for Person API requests, resolved by their callbacks.
+
+    Parameters
+    - ttl: seconds a resolved request nobody waited for is kept, and seconds
+      an unresolved request waits for its callback before it is abandoned
+    - max_completed: resolved requests kept at most; oldest dropped first
+    - time_fn: injectable clock returning epoch seconds
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_completed: int = DEFAULT_MAX_COMPLETED,
+        time_fn: Callable[[], float] | None = None,
+    ) -> None:
+        self._ttl = ttl
+        self._max_completed = max_completed
+        self._time = time_fn or time.time
+        self._requests: dict[str, _Request] = {}
+        # Expiry queues in insertion order, so pruning pops from the front:
+        # unresolved request -> created_at, resolved request -> resolved_at
+        self._unresolved: dict[str, float] = {}
+        self._resolved: dict[str, float] = {}
+        self._subscribers: set[_Subscriber] = set()
+        self._lock = threading.Lock()
+        self._stats = {
+            "expected": 0,
+            "resolved": 0,
+            "unexpected": 0,
+            "expired": 0,
+            "abandoned": 0,
+        }
+
+    def _entry(self, request_id: str) -> _Request:
+        entry = self._requests.get(request_id)
+        if entry is None:
+            entry = _Request(created_at=self._time())
+            self._requests[request_id] = entry
+            self._unresolved[request_id] = entry.created_at
+        return entry
+
+    def _prune(self) -> list[Future]:
+        """Drop expired requests; returns abandoned futures to cancel unlocked.
+
+        Only the oldest entries of each queue are looked at, so a call costs
+        O(1) plus the number of requests it drops.
+        """
+        now = self._time()
+        while self._resolved:
+            request_id, resolved_at = next(iter(self._resolved.items()))
+            if (
+                len(self._resolved) <= self._max_completed
+                and now - resolved_at < self._ttl
+            ):
+                break
+            del self._resolved[request_id]
+            self._requests.pop(request_id, None)
+            self._stats["expired"] += 1
+        futures = []
+        while self._unresolved:
+            request_id, created_at = next(iter(self._unresolved.items()))
+            if now - created_at < self._ttl:
+                break
+            del self._unresolved[request_id]
+            entry = self._requests.pop(request_id, None)
+            if entry is not None:
+                futures.append(entry.future)
+                self._stats["abandoned"] += 1
+        return futures
+
+    @staticmethod
+    def _cancel(futures: list[Future]) -> None:
+        # Outside the lock: done callbacks run synchronously on cancel
+        for future in futures:
+            future.cancel()
+
+    def expect(self, request_id: str | int, items: Iterable[str] = ()) -> Future:
+        """Record a submitted request and return the future of its callback."""
+        with self._lock:
+            abandoned = self._prune()
+            entry = self._entry(str(request_id))
+            entry.items = list(items)
+            self._stats["expected"] += 1
+        self._cancel(abandoned)
+        return entry.future
+
+    def wait_for(self, request_id: str | int) -> Future:
+        """Future resolving to the request's list of :class:`RevealCompletion`."""
+        with self._lock:
+            return self._entry(str(request_id)).future
+
+    def items_for(self, request_id: str | int) -> list[str] | None:
+        """Items submitted under a request, ``None`` once it is forgotten."""
+        with self._lock:
+            entry = self._requests.get(str(request_id))
+            return list(entry.items) if entry else None
+
+    def resolve(
+        self, request_id: str | int, callback_data: Iterable[Any]
+    ) -> list[RevealCompletion]:
+        """Complete a request with its callback payload. Safe from any thread."""
+        request_id = str(request_id)
+        completions = completions_from_callback(request_id, callback_data)
+        with self._lock:
+            known = request_id in self._requests
+            entry = self._entry(request_id)
+            if entry.future.done():
+                # A redelivered callback; the first one already completed it
+                return completions
+            entry.resolved_at = self._time()
+            entry.future.set_result(completions)
+            self._unresolved.pop(request_id, None)
+            self._resolved[request_id] = entry.resolved_at
+            self._stats["resolved"] += 1
+            if not known:
+                self._stats["unexpected"] += 1
+            subscribers = list(self._subscribers)
+            abandoned = self._prune()
+
+        self._cancel(abandoned)
+        for subscriber in subscribers:
+            subscriber.push(completions)
+        return completions
+
+    def discard(self, request_id: str | int) -> list[str] | None:
+        """Forget a request once its result has been consumed; returns its items."""
+        with self._lock:
+            entry = self._requests.pop(str(request_id), None)
+            self._unresolved.pop(str(request_id), None)
+            self._resolved.pop(str(request_id), None)
+        if entry is None:
+            return None
+        if not entry.future.done():
+            entry.future.cancel()
+        return entry.items
+
+    async def completions(self) -> AsyncIterator[RevealCompletion]:
+        """Stream every completion resolved from now on, across all requests."""
+        subscriber = _Subscriber(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(subscriber)
+        try:
+            while True:
+                yield await subscriber.queue.get()
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
+
+    @property
+    def pending(self) -> list[str]:
+        """Request IDs still waiting for their callback."""
+        with self._lock:
+            return [
+                request_id
+                for request_id, entry in self._requests.items()
+                if not entry.future.done()
+            ]
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            waiting = sum(
+                1 for entry in self._requests.values() if not entry.future.done()
+            )
+            return {
+                **self._stats,
+                "waiting": waiting,
+                "completed": len(self._requests) - waiting,
+                "subscribers": len(self._subscribers),
+            }
+
+
+_registry: RevealRegistry | None = None
+
+
+def get_reveal_registry() -> RevealRegistry:
+    """Return the process-wide registry shared by the client and callback server."""
+    global _registry
+    if _registry is None:
+        _registry = RevealRegistry()
+    return _registry
+
+
+def set_reveal_registry(registry: RevealRegistry | None) -> None:
+    """Replace the process-wide registry (``None`` recreates it lazily)."""
+    global _registry
+    _registry = registry
+
+
+__all__ = [
+    "RevealCompletion",
+    "RevealRegistry",
+    "completions_from_callback",
+    "get_reveal_registry",
+    "set_reveal_registry",
+]
@@ -0,0 +1,301 @@
+"""Memory-mapped membership index of UIDs whose contacts are already revealed.
+
+Hot paths such as skipping already revealed prospects only need a yes/no
+answer per UID. They should not have to load the contact cache or scan the
+Airtable table for it. The index answers from a read-only memory map, with
+no parsing at startup:
+
+- ``revealed.idx`` holds a 16-byte header (magic, key count) followed by the
+  keys, sorted. A key is the 32-char hex UID packed into 16 bytes; any other
+  UID is hashed to 16 bytes. Lookups binary-search the map in O(log n).
+- ``revealed.idx.delta`` is an append-only list of keys added since the last
+  merge. It is small and held in a set. Once it reaches ``merge_threshold``
+  keys it is merge-sorted into a new index file, which atomically replaces
+  the old one.
+
+Appends and merges take an advisory lock, so several processes can feed the
+same index. Lookups pick up their changes by re-checking both files at most
+every ``refresh_interval`` seconds; :meth:`RevealedIndex.refresh` forces it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+import structlog
+
+try:  # pragma: no cover - platform dependent
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+logger = structlog.get_logger(__name__)
+
+KEY_SIZE = 16
+DEFAULT_MERGE_THRESHOLD = 4096
+# Seconds between checks of the files for other processes' changes
+DEFAULT_REFRESH_INTERVAL = 1.0
+
+_HEADER = struct.Struct("<8sQ")
+_MAGIC = b"SHUIDX01"
+
+
+def _default_index_path() -> Path:
+    """Return the default location of the revealed-UID index."""
+    return Path.home() / ".signalhire-agent" / "cache" / "revealed.idx"
+
+
+def pack_uid(uid: str) -> bytes:
+    """Pack a SignalHire UID into a 16-byte key."""
+    if len(uid) == 2 * KEY_SIZE:
+        try:
+            return bytes.fromhex(uid)
+        except ValueError:
+            pass
+    return hashlib.blake2b(uid.encode(), digest_size=KEY_SIZE).digest()
+
+
+class RevealedIndex:
+    """Sorted, memory-mapped set of revealed UIDs plus a small append log.
+
+    Parameters
+    - path: index file; the delta log lives next to it
+    - merge_threshold: delta keys that trigger a merge into the index file
+    - refresh_interval: seconds lookups trust the loaded state before
+      re-checking the files for other processes' changes
+    - time_fn: injectable monotonic clock
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] | None = None,
+        *,
+        merge_threshold: int = DEFAULT_MERGE_THRESHOLD,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        time_fn: Callable[[], float] | None = None,
+    ) -> None:
+        self.path = Path(path) if path else _default_index_path()
+        self.delta_path = self.path.with_name(self.path.name + ".delta")
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.merge_threshold = merge_threshold
+        self.refresh_interval = refresh_interval
+        self._time = time_fn or time.monotonic
+        self._refreshed_at = 0.0
+        self._map: mmap.mmap | None = None
+        self._count = 0
+        # () never matches a stat result, so the first refresh maps the file
+        self._main_stat: tuple | None = ()
+        self._delta: set[bytes] = set()
+        self._delta_read = 0
+        self._opened = False
+        self._lock = threading.RLock()
+
+    # Loading ----------------------------------------------------------------
+
+    def open(self) -> None:
+        with self._lock:
+            if not self._opened:
+                self._opened = True
+                self.refresh()
+            elif self._time() - self._refreshed_at >= self.refresh_interval:
+                self.refresh()
+
+    def _stat(self, path: Path) -> tuple | None:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _map_main(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._count = 0
+        self._main_stat = self._stat(self.path)
+        if self._main_stat is None or self._main_stat[1] < _HEADER.size:
+            return
+        with open(self.path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = _HEADER.unpack_from(mapped, 0)
+        if magic != _MAGIC or _HEADER.size + count * KEY_SIZE > len(mapped):
+            mapped.close()
+            logger.warning("Ignoring corrupt revealed index", path=str(self.path))
+            return
+        self._map = mapped
+        self._count = count
+
+    def _read_delta(self) -> None:
+        """Load keys appended to the delta log since the last read."""
+        try:
+            with open(self.delta_path, "rb") as handle:
+                size = handle.seek(0, os.SEEK_END)
+                if size < self._delta_read:
+                    # Truncated by a merge; everything older is in the index
+                    self._delta.clear()
+                    self._delta_read = 0
+                handle.seek(self._delta_read)
+                # A key still being written by another process is read next time
+                data = handle.read((size - self._delta_read) // KEY_SIZE * KEY_SIZE)
+        except FileNotFoundError:
+            self._delta.clear()
+            self._delta_read = 0
+            return
+        self._delta.update(
+            data[offset : offset + KEY_SIZE] for offset in range(0, len(data), KEY_SIZE)
+        )
+        self._delta_read += len(data)
+
+    def refresh(self) -> None:
+        """Pick up merges and additions made by other processes."""
+        with self._lock:
+            if self._stat(self.path) != self._main_stat:
+                self._map_main()
+                # The new index may contain keys of a delta that was merged
+                self._delta.clear()
+                self._delta_read = 0
+            self._read_delta()
+            self._refreshed_at = self._time()
+
+    # Lookups ----------------------------------------------------------------
+
+    def _in_main(self, key: bytes) -> bool:
+        mapped = self._map
+        if mapped is None:
+            return False
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = _HEADER.size + mid * KEY_SIZE
+            probe = mapped[offset : offset + KEY_SIZE]
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def __contains__(self, uid: object) -> bool:
+        if not isinstance(uid, str) or not uid:
+            return False
+        self.open()
+        key = pack_uid(uid)
+        with self._lock:
+            return key in self._delta or self._in_main(key)
+
+    def __len__(self) -> int:
+        self.open()
+        with self._lock:
+            return self._count + len(self._delta)
+
+    # Updates ----------------------------------------------------------------
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a+b") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def add(self, uids: Iterable[str]) -> int:
+        """Record revealed UIDs; returns how many were new."""
+        self.open()
+        with self._lock:
+            keys = {pack_uid(uid) for uid in uids if uid}
+            keys = [key for key in keys if key not in self._delta and not self._in_main(key)]
+            if not keys:
+                return 0
+            with self._file_lock():
+                with open(self.delta_path, "ab") as handle:
+                    handle.write(b"".join(keys))
+                self.refresh()
+                if len(self._delta) >= self.merge_threshold:
+                    self._merge()
+            return len(keys)
+
+    def _main_keys(self) -> Iterator[bytes]:
+        mapped = self._map
+        for i in range(self._count):
+            offset = _HEADER.size + i * KEY_SIZE
+            yield mapped[offset : offset + KEY_SIZE]
+
+    def _write(self, keys: Iterable[bytes], count: int) -> None:
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "wb") as handle:
+            handle.write(_HEADER.pack(_MAGIC, count))
+            for key in keys:
+                handle.write(key)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, self.path)
+
+    def _merge(self) -> None:
+        """Merge-sort the delta log into a new index file (file lock held)."""
+        # Another process may have merged first
+        if self._stat(self.path) != self._main_stat:
+            self._map_main()
+        delta = sorted(key for key in self._delta if not self._in_main(key))
+        self._write(heapq.merge(self._main_keys(), delta), self._count + len(delta))
+        with open(self.delta_path, "wb"):
+            pass
+        self._map_main()
+        self._delta.clear()
+        self._delta_read = 0
+        logger.debug("Merged revealed index", keys=self._count, added=len(delta))
+
+    def rebuild(self, uids: Iterable[str]) -> None:
+        """Replace the whole index with ``uids``."""
+        keys = sorted({pack_uid(uid) for uid in uids if uid})
+        with self._lock, self._file_lock():
+            self._write(keys, len(keys))
+            with open(self.delta_path, "wb"):
+                pass
+            self._opened = True
+            self._map_main()
+            self._delta.clear()
+            self._delta_read = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._opened = False
+            self._main_stat = ()
+            self._delta.clear()
+            self._delta_read = 0
+
+
+_default_index: RevealedIndex | None = None
+
+
+def get_revealed_index() -> RevealedIndex:
+    """Return the shared revealed-UID index."""
+    global _default_index
+    if _default_index is None:
+        _default_index = RevealedIndex()
+    return _default_index
+
+
+def set_revealed_index(index: RevealedIndex | None) -> None:
+    """Replace the shared revealed-UID index (``None`` resets it)."""
+    global _default_index
+    _default_index = index
+
+
+__all__ = ["RevealedIndex", "get_revealed_index", "pack_uid", "set_revealed_index"]
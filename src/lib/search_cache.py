@@ -0,0 +1,266 @@
+"""On-disk cache of SignalHire search responses.
+
+Re-running a saved search, a workflow or a search template calls
+``/candidate/searchByQuery`` again, which costs a full round trip and daily
+search-profile quota. Successful responses are therefore cached on disk keyed
+by a canonical form of the criteria: keys sorted, whitespace collapsed and
+Boolean operators (``AND``/``OR``/``NOT``) upper-cased outside quoted phrases,
+so cosmetic differences between equivalent queries still hit.
+
+Entries expire after ``ttl`` seconds and the cache is bounded by entry count
+and total bytes, evicting the least recently used entries first. Each entry is
+one JSON file written atomically, so concurrent CLI processes can share the
+cache directory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = structlog.get_logger(__name__)
+
+CACHE_DIR_NAME = ".signalhire-agent"
+CACHE_SUBDIR_NAME = "cache"
+SEARCH_CACHE_SUBDIR_NAME = "search"
+
+DEFAULT_TTL_SECONDS = 3600.0
+DEFAULT_MAX_ENTRIES = 200
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+_QUOTED = re.compile(r'("[^"]*")')
+_BOOLEAN_OPERATOR = re.compile(r"\b(and|or|not)\b", re.IGNORECASE)
+
+
+def _default_cache_dir() -> Path:
+    """Return the default directory holding cached search responses."""
+    return Path.home() / CACHE_DIR_NAME / CACHE_SUBDIR_NAME / SEARCH_CACHE_SUBDIR_NAME
+
+
+def _canonical_text(text: str) -> str:
+    text = " ".join(text.split())
+    # Quoted phrases are matched literally, so only normalize operators outside them
+    parts = _QUOTED.split(text)
+    return "".join(
+        part if part.startswith('"') else _BOOLEAN_OPERATOR.sub(
+            lambda match: match.group(1).upper(), part
+        )
+        for part in parts
+    )
+
+
+def canonicalize_criteria(value: Any) -> Any:
+    """Return ``value`` in a canonical form suitable for cache keys.
+
+    Dict keys are sorted and ``None`` values dropped, strings have their
+    whitespace collapsed and Boolean operators upper-cased. List order is kept
+    because it can be meaningful to the API.
+    """
+    if isinstance(value, dict):
+        return {
+            str(key): canonicalize_criteria(item)
+            for key, item in sorted(value.items(), key=lambda pair: str(pair[0]))
+            if item is not None
+        }
+    if isinstance(value, (list, tuple)):
+        return [canonicalize_criteria(item) for item in value]
+    if isinstance(value, str):
+        return _canonical_text(value)
+    return value
+
+
+def search_cache_key(
+    endpoint: str, criteria: dict[str, Any], namespace: str | None = None
+) -> str:
+    """Stable cache key for a search request."""
+    payload = {
+        "endpoint": endpoint,
+        "criteria": canonicalize_criteria(criteria),
+        "namespace": namespace,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class SearchCache:
+    """TTL + LRU cache of search responses stored as one JSON file per entry.
+
+    Parameters
+    - directory: where entries are stored (defaults to ``~/.signalhire-agent/cache/search``)
+    - ttl: seconds an entry stays fresh
+    - max_entries: maximum number of cached responses
+    - max_bytes: maximum total size of cached responses on disk
+    - time_fn: injectable clock returning epoch seconds
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        *,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        time_fn: Callable[[], float] | None = None,
+    ) -> None:
+        if ttl <= 0 or max_entries <= 0 or max_bytes <= 0:
+            raise ValueError("ttl, max_entries and max_bytes must be > 0")
+        self._dir = directory or _default_cache_dir()
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._time = time_fn or time.time
+        # key -> file size, least recently used first
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._bytes = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+    @property
+    def directory(self) -> Path:
+        return self._dir
+
+    def _path(self, key: str) -> Path:
+        return self._dir / f"{key}.json"
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        entries = []
+        if self._dir.exists():
+            for path in self._dir.glob("*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, path.stem, stat.st_size))
+        # File mtimes record the last access, which restores the LRU order
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._bytes += size
+        self._loaded = True
+
+    def _forget(self, key: str, *, unlink: bool) -> None:
+        self._bytes -= self._index.pop(key, 0)
+        if unlink:
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the cached response for ``key`` if present and fresh."""
+        with self._lock:
+            self._ensure_loaded()
+            path = self._path(key)
+            try:
+                entry = json.loads(path.read_text(encoding="utf-8"))
+                stored_at = float(entry["stored_at"])
+                data = entry["data"]
+            except (OSError, ValueError, KeyError, TypeError):
+                # Missing, or evicted/corrupted by another process
+                self._forget(key, unlink=key in self._index)
+                self._stats["misses"] += 1
+                return None
+
+            if self._time() - stored_at >= self._ttl:
+                self._forget(key, unlink=True)
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            if key in self._index:
+                self._index.move_to_end(key)
+            else:
+                size = path.stat().st_size
+                self._index[key] = size
+                self._bytes += size
+            self._stats["hits"] += 1
+            return data
+
+    def put(
+        self,
+        key: str,
+        data: dict[str, Any],
+        *,
+        endpoint: str | None = None,
+        criteria: dict[str, Any] | None = None,
+    ) -> None:
+        """Store a response, evicting least recently used entries past the bounds."""
+        entry = {
+            "stored_at": self._time(),
+            "endpoint": endpoint,
+            "criteria": canonicalize_criteria(criteria) if criteria else None,
+            "data": data,
+        }
+        payload = json.dumps(entry, separators=(",", ":")).encode("utf-8")
+        if len(payload) > self._max_bytes:
+            logger.debug("Search response too large to cache", size=len(payload))
+            return
+
+        with self._lock:
+            self._ensure_loaded()
+            self._dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            temp_path.write_bytes(payload)
+            temp_path.replace(path)
+
+            self._forget(key, unlink=False)
+            self._index[key] = len(payload)
+            self._bytes += len(payload)
+            while len(self._index) > self._max_entries or self._bytes > self._max_bytes:
+                oldest = next(iter(self._index))
+                self._forget(oldest, unlink=True)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, key: str) -> None:
+        """Drop a single entry."""
+        with self._lock:
+            self._ensure_loaded()
+            self._forget(key, unlink=True)
+
+    def clear(self) -> int:
+        """Remove every cached entry. Returns the number removed."""
+        with self._lock:
+            self._ensure_loaded()
+            removed = len(self._index)
+            for key in list(self._index):
+                self._forget(key, unlink=True)
+            return removed
+
+    def get_stats(self) -> dict[str, Any]:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            self._ensure_loaded()
+            return {
+                **self._stats,
+                "entries": len(self._index),
+                "bytes": self._bytes,
+                "ttl": self._ttl,
+                "max_entries": self._max_entries,
+                "max_bytes": self._max_bytes,
+            }
+
+
+__all__ = [
+    "SearchCache",
+    "canonicalize_criteria",
+    "search_cache_key",
+]
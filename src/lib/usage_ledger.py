@@ -0,0 +1,361 @@
+"""Append-only, hour-bucketed ledger of SignalHire API usage.
+
+The rate limiter needs the rolling 24 hour usage (credits, reveals and search
+profiles) before every request. Re-scanning ``~/.signalhire-agent/operations``
+for that answer costs O(number of historical operations) per request, so usage
+is instead appended to a small JSON-lines ledger where every line is a delta
+for one UTC hour bucket. The ledger keeps running totals in memory and only
+reads bytes appended since the last refresh, so answering "how much have we
+used in the last 24 hours" is O(1) regardless of history size.
+
+Appends, compaction and the creation of the ledger (with its migration of
+legacy operations) hold an exclusive advisory lock on the ledger file, so a
+compaction never drops lines another process is appending and only one
+process imports the legacy operations. Readers notice a
+compaction by the file's inode changing and rebuild their totals from it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+try:  # POSIX only; elsewhere appends rely on O_APPEND alone
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+logger = structlog.get_logger(__name__)
+
+LEDGER_DIR_NAME = ".signalhire-agent"
+LEDGER_SUBDIR_NAME = "usage"
+LEDGER_FILE_NAME = "ledger.jsonl"
+OPERATIONS_SUBDIR_NAME = "operations"
+
+USAGE_COUNTERS = ("credits_used", "reveals", "search_profiles", "searches")
+
+# Rewrite the ledger on load once it holds this many lines per live bucket
+_COMPACTION_FACTOR = 8
+
+
+def _default_ledger_path() -> Path:
+    """Return the default location of the usage ledger."""
+    return Path.home() / LEDGER_DIR_NAME / LEDGER_SUBDIR_NAME / LEDGER_FILE_NAME
+
+
+def _default_operations_dir() -> Path:
+    """Return the legacy operation tracking directory used for migration."""
+    return Path.home() / LEDGER_DIR_NAME / OPERATIONS_SUBDIR_NAME
+
+
+def _empty_counters() -> dict[str, int]:
+    return dict.fromkeys(USAGE_COUNTERS, 0)
+
+
+class UsageLedger:
+    """Persistent rolling-window usage counters bucketed by UTC hour.
+
+    Parameters
+    - path: ledger file location (defaults to ``~/.signalhire-agent/usage/ledger.jsonl``)
+    - operations_dir: legacy operation files used for the one-time migration
+    - window_hours: size of the rolling window reported by :meth:`totals`
+    - time_fn: injectable clock returning epoch seconds
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        operations_dir: Path | None = None,
+        window_hours: int = 24,
+        time_fn: Callable[[], float] | None = None,
+    ) -> None:
+        if window_hours <= 0:
+            raise ValueError("window_hours must be > 0")
+        self._path = path or _default_ledger_path()
+        self._operations_dir = operations_dir or _default_operations_dir()
+        self._window_hours = window_hours
+        self._time = time_fn or time.time
+        self._buckets: dict[int, dict[str, int]] = {}
+        self._totals = _empty_counters()
+        self._offset = 0
+        self._inode: int | None = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _current_hour(self) -> int:
+        return int(self._time() // 3600)
+
+    def _apply(self, hour: int, counters: dict[str, Any]) -> None:
+        """Add a delta to its bucket and to the running totals (if in window)."""
+        if hour <= self._current_hour() - self._window_hours:
+            return
+        bucket = self._buckets.setdefault(hour, _empty_counters())
+        for key in USAGE_COUNTERS:
+            value = counters.get(key) or 0
+            if not isinstance(value, int) or value == 0:
+                continue
+            bucket[key] += value
+            self._totals[key] += value
+
+    def _evict_expired(self) -> None:
+        """Drop buckets that fell out of the window (at most ``window_hours``)."""
+        cutoff = self._current_hour() - self._window_hours
+        for hour in [h for h in self._buckets if h <= cutoff]:
+            bucket = self._buckets.pop(hour)
+            for key in USAGE_COUNTERS:
+                self._totals[key] -= bucket[key]
+
+    def _read_new_lines(self) -> int:
+        """Apply lines appended since the last read. Returns lines consumed."""
+        try:
+            handle = open(self._path, "rb")
+        except OSError:
+            return 0
+        with handle:
+            stat = os.fstat(handle.fileno())
+            if stat.st_ino != self._inode or stat.st_size < self._offset:
+                # File was compacted/replaced by another process; rebuild from scratch
+                self._buckets.clear()
+                self._totals = _empty_counters()
+                self._offset = 0
+                self._inode = stat.st_ino
+            if stat.st_size == self._offset:
+                return 0
+            handle.seek(self._offset)
+            chunk = handle.read()
+
+        consumed = 0
+        # Only consume complete lines; a partial trailing write is picked up later
+        end = chunk.rfind(b"\n") + 1
+        for raw_line in chunk[:end].splitlines():
+            if not raw_line.strip():
+                continue
+            try:
+                entry = json.loads(raw_line)
+                hour = int(entry["hour"])
+            except (ValueError, KeyError, TypeError):
+                continue
+            self._apply(hour, entry)
+            consumed += 1
+        self._offset += end
+        return consumed
+
+    @contextmanager
+    def _locked(self) -> Iterator[int]:
+        """Yield an append descriptor holding the ledger's exclusive lock.
+
+        Compaction replaces the file, so a lock taken on a file that is no
+        longer at the ledger path is dropped and taken again on the new one.
+        """
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            fd = os.open(self._path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                if fcntl is None:
+                    break
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                if os.fstat(fd).st_ino == os.stat(self._path).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+            except BaseException:
+                os.close(fd)
+                raise
+            os.close(fd)
+        try:
+            yield fd
+        finally:
+            # Closing the descriptor releases the lock
+            os.close(fd)
+
+    @staticmethod
+    def _encode(entries: list[dict[str, Any]]) -> bytes:
+        return "".join(
+            json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries
+        ).encode("utf-8")
+
+    def _append(self, entries: list[dict[str, Any]]) -> None:
+        if not entries:
+            return
+        # A single O_APPEND write keeps concurrent CLI processes from interleaving lines
+        with self._locked() as fd:
+            os.write(fd, self._encode(entries))
+
+    def _compact(self) -> None:
+        """Rewrite the ledger as one line per live bucket."""
+        target = self._path
+        try:
+            with self._locked():
+                # Appends wait on the lock, so nothing lands between this read
+                # and the replace below
+                self._read_new_lines()
+                self._evict_expired()
+                entries = [
+                    {"hour": hour, **{k: v for k, v in counters.items() if v}}
+                    for hour, counters in sorted(self._buckets.items())
+                ]
+                temp_path = target.with_suffix(".tmp")
+                temp_path.write_text(
+                    "".join(json.dumps(e, separators=(",", ":")) + "\n" for e in entries)
+                )
+                temp_path.replace(target)
+                stat = target.stat()
+                self._inode, self._offset = stat.st_ino, stat.st_size
+        except OSError as exc:
+            logger.warning("Could not compact usage ledger", error=str(exc))
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        if not self._path.exists():
+            self._initialise()
+
+        lines = self._read_new_lines()
+        self._evict_expired()
+        if lines > max(len(self._buckets), 1) * _COMPACTION_FACTOR:
+            self._compact()
+        self._loaded = True
+
+    def _initialise(self) -> None:
+        """Create the ledger and import legacy operations into it.
+
+        Several processes may find the ledger missing at once. Taking the lock
+        creates the file, and only the process that still finds it empty under
+        the lock runs the migration.
+        """
+        with self._locked() as fd:
+            if os.fstat(fd).st_size:
+                return
+            migrated = self._migration_entries(self._operations_dir)
+            if migrated:
+                os.write(fd, self._encode(migrated))
+        logger.info(
+            "Usage ledger initialised",
+            path=str(self._path),
+            migrated_buckets=len(migrated),
+        )
+
+    def _migration_entries(self, operations_dir: Path) -> list[dict[str, Any]]:
+        """Bucket legacy operation files that fall inside the current window."""
+        if not operations_dir.exists():
+            return []
+
+        buckets: dict[int, dict[str, int]] = {}
+        cutoff = self._current_hour() - self._window_hours
+        for op_file in operations_dir.glob("*.json"):
+            try:
+                op_data = json.loads(op_file.read_text())
+                created = datetime.fromisoformat(
+                    op_data.get("created_at", "").replace("Z", "+00:00")
+                )
+            except (OSError, ValueError, TypeError, AttributeError):
+                continue
+
+            hour = int(created.timestamp() // 3600)
+            if hour <= cutoff or op_data.get("status") != "completed":
+                continue
+
+            counters = buckets.setdefault(hour, _empty_counters())
+            results = op_data.get("results") or {}
+            if op_data.get("type") == "reveal":
+                counters["reveals"] += 1
+                counters["credits_used"] += int(results.get("credits_used", 0) or 0)
+            elif op_data.get("type") == "search":
+                profiles = results.get("profiles") or results.get("prospects") or []
+                counters["searches"] += 1
+                counters["search_profiles"] += len(profiles)
+
+        return [
+            {"hour": hour, **{k: v for k, v in counters.items() if v}}
+            for hour, counters in sorted(buckets.items())
+            if any(counters.values())
+        ]
+
+    def migrate_from_operations(self, operations_dir: Path | None = None) -> int:
+        """Append usage found in legacy operation files. Returns buckets written.
+
+        This runs automatically the first time a ledger file is created; call it
+        explicitly only to re-import operations recorded by other tooling.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            entries = self._migration_entries(operations_dir or self._operations_dir)
+            self._append(entries)
+            self._read_new_lines()
+            return len(entries)
+
+    def record(
+        self,
+        *,
+        credits_used: int = 0,
+        reveals: int = 0,
+        search_profiles: int = 0,
+        searches: int = 0,
+    ) -> None:
+        """Append a usage delta to the current hour bucket."""
+        counters = {
+            "credits_used": credits_used,
+            "reveals": reveals,
+            "search_profiles": search_profiles,
+            "searches": searches,
+        }
+        if not any(counters.values()):
+            return
+
+        with self._lock:
+            entry = {
+                "hour": self._current_hour(),
+                **{k: v for k, v in counters.items() if v},
+            }
+            try:
+                self._ensure_loaded()
+                self._append([entry])
+            except OSError as exc:
+                # Keep counting in memory even when the ledger is not writable
+                logger.warning("Could not persist usage", error=str(exc))
+                self._apply(entry["hour"], entry)
+                return
+            self._read_new_lines()
+
+    def _changed(self) -> bool:
+        """True if the ledger was appended to or replaced since the last read."""
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return False
+        return stat.st_ino != self._inode or stat.st_size != self._offset
+
+    def totals(self) -> dict[str, int]:
+        """Return usage counters for the rolling window.
+
+        Once loaded, the file is only re-read when a ``stat`` shows that its
+        size or inode changed, so repeated checks answer from memory.
+        """
+        with self._lock:
+            try:
+                self._ensure_loaded()
+                if self._changed():
+                    self._read_new_lines()
+            except OSError as exc:
+                logger.warning("Could not read usage ledger", error=str(exc))
+            self._evict_expired()
+            return dict(self._totals)
+
+
+__all__ = ["USAGE_COUNTERS", "UsageLedger"]
@@ -164,6 +164,7 @@ class RevealOp(BaseOperation):
     credits_used: int = 0
     credits_available: int | None = None
     batch_size: int = 10
+    items_per_request: int = 1  # Person API items packed into one request (max 100)
     use_bulk_export: bool = False
     export_format: str = "csv"
 
@@ -1,58 +1,78 @@
+"""Person API callback payloads.
+
+Callbacks are parsed in one pass over the raw body with
+:func:`parse_person_callback`. The models are lenient: unknown keys are
+ignored, numbers are accepted where strings are expected, and most fields are
+optional. ``experience`` and ``education`` stay raw dicts during parsing.
+They become :class:`ExperienceEntry` / :class:`EducationEntry` objects only
+when ``experience_entries`` / ``education_entries`` are read.
+"""
+
 from __future__ import annotations
 
-from typing import Literal
+import json
+from functools import cached_property
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
 
-from .education import EducationEntry
+from .education import DegreeType, EducationEntry
 from .experience import ExperienceEntry
 
 
-class PersonLocation(BaseModel):
+class _CallbackModel(BaseModel):
+    model_config = ConfigDict(
+        extra="ignore",
+        populate_by_name=True,
+        coerce_numbers_to_str=True,
+    )
+
+
+class PersonLocation(_CallbackModel):
     name: str = Field(..., description="Location name")
 
 
-class PersonPhoto(BaseModel):
-    url: HttpUrl = Field(..., description="Photo URL")
+class PersonPhoto(_CallbackModel):
+    url: str = Field(..., description="Photo URL")
 
 
-class PersonContact(BaseModel):
-    type: Literal["email", "phone"] = Field(..., description="Contact type")
+class PersonContact(_CallbackModel):
+    type: str = Field(..., description="Contact type like email, phone")
     value: str = Field(..., description="Contact value")
-    rating: str = Field(..., description="Contact rating")
-    sub_type: str = Field(
-        ...,
+    rating: str | None = Field(None, description="Contact rating")
+    sub_type: str | None = Field(
+        None,
         description="Contact subtype like work, personal, work_phone",
         alias="subType",
     )
     info: str | None = Field(None, description="Additional contact info")
 
 
-class PersonSocial(BaseModel):
+class PersonSocial(_CallbackModel):
     type: str = Field(..., description="Social platform type like li, fb, tw")
-    link: HttpUrl = Field(..., description="Social profile link")
-    rating: str = Field(..., description="Social profile rating")
+    link: str = Field(..., description="Social profile link")
+    rating: str | None = Field(None, description="Social profile rating")
 
 
-class PersonLanguage(BaseModel):
+class PersonLanguage(_CallbackModel):
     name: str = Field(..., description="Language name")
-    proficiency: str = Field(..., description="Language proficiency level")
+    proficiency: str | None = Field(None, description="Language proficiency level")
 
 
-class PersonCandidate(BaseModel):
+class PersonCandidate(_CallbackModel):
     uid: str = Field(..., description="Unique identifier")
-    full_name: str = Field(..., description="Full name", alias="fullName")
+    full_name: str | None = Field(None, description="Full name", alias="fullName")
     gender: str | None = Field(None, description="Gender")
     photo: PersonPhoto | None = Field(None, description="Profile photo")
     locations: list[PersonLocation] = Field(
         default_factory=list, description="Location history"
     )
     skills: list[str] = Field(default_factory=list, description="Skills list")
-    education: list[EducationEntry] = Field(
-        default_factory=list, description="Education history"
+    education: list[dict[str, Any]] = Field(
+        default_factory=list, description="Education history (raw)"
     )
-    experience: list[ExperienceEntry] = Field(
-        default_factory=list, description="Work experience"
+    experience: list[dict[str, Any]] = Field(
+        default_factory=list, description="Work experience (raw)"
     )
     contacts: list[PersonContact] = Field(
         default_factory=list, description="Contact information"
@@ -68,8 +88,70 @@ class PersonCandidate(BaseModel):
         default_factory=list, description="Languages"
     )
 
+    @cached_property
+    def experience_entries(self) -> list[ExperienceEntry]:
+        """Work experience as :class:`ExperienceEntry`; unusable entries are skipped."""
+        entries = []
+        for raw in self.experience:
+            try:
+                entries.append(_experience_entry(raw))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return entries
+
+    @cached_property
+    def education_entries(self) -> list[EducationEntry]:
+        """Education history as :class:`EducationEntry`; unusable entries are skipped."""
+        entries = []
+        for raw in self.education:
+            try:
+                entries.append(_education_entry(raw))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return entries
+
+
+def _name(value: Any) -> str | None:
+    if isinstance(value, dict):
+        value = value.get("name")
+    return str(value) if value not in (None, "") else None
+
+
+def _year(value: Any) -> str | None:
+    return str(value)[:10] if value not in (None, "") else None
+
+
+def _experience_entry(raw: dict[str, Any]) -> ExperienceEntry:
+    """Build an ExperienceEntry from a Person API (or stored) experience dict."""
+    return ExperienceEntry(
+        company_name=_name(raw.get("company") or raw.get("company_name")),
+        job_title=raw.get("position") or raw.get("title") or raw.get("job_title"),
+        start_date=_year(raw.get("started") or raw.get("start_date")),
+        end_date=None
+        if raw.get("current")
+        else _year(raw.get("ended") or raw.get("end_date")),
+        location=_name(raw.get("location")),
+        description=raw.get("summary") or raw.get("description"),
+        industry=_name(raw.get("industry")),
+    )
 
-class PersonCallbackItem(BaseModel):
+
+def _education_entry(raw: dict[str, Any]) -> EducationEntry:
+    """Build an EducationEntry from a Person API (or stored) education dict."""
+    degree = raw.get("degree") or raw.get("degree_name")
+    if isinstance(degree, list):
+        degree = ", ".join(str(d) for d in degree if d) or None
+    return EducationEntry(
+        institution_name=_name(raw.get("university") or raw.get("institution_name")),
+        degree_type=DegreeType.OTHER,
+        field_of_study=raw.get("faculty") or raw.get("field_of_study"),
+        degree_name=degree,
+        start_date=_year(raw.get("startedYear") or raw.get("start_date")),
+        end_date=_year(raw.get("endedYear") or raw.get("end_date")),
+    )
+
+
+class PersonCallbackItem(_CallbackModel):
     status: Literal[
         "success", "failed", "credits_are_over", "timeout_exceeded", "duplicate_query"
     ] = Field(..., description="Processing status")
@@ -80,3 +162,48 @@ class PersonCallbackItem(BaseModel):
 
 
 PersonCallbackData = list[PersonCallbackItem]
+
+_callback_adapter: TypeAdapter[list[PersonCallbackItem]] = TypeAdapter(
+    list[PersonCallbackItem]
+)
+
+
+def parse_person_callback(data: bytes | str | list[Any]) -> PersonCallbackData:
+    """Validate a callback body (raw JSON or already decoded) into typed items.
+
+    The whole body is validated in one pass. If some items are malformed,
+    those items are dropped and the rest are kept. A body that is not a JSON
+    list raises ``ValueError``.
+    """
+    raw = isinstance(data, (bytes, bytearray, str))
+    try:
+        if raw:
+            return _callback_adapter.validate_json(data)
+        return _callback_adapter.validate_python(data)
+    except ValidationError as exc:
+        bad = {
+            error["loc"][0]
+            for error in exc.errors()
+            if error["loc"] and isinstance(error["loc"][0], int)
+        }
+        if not bad:
+            raise
+    entries = json.loads(data) if raw else data
+    return [
+        PersonCallbackItem.model_validate(entry)
+        for index, entry in enumerate(entries)
+        if index not in bad
+    ]
+
+
+__all__ = [
+    "PersonCallbackData",
+    "PersonCallbackItem",
+    "PersonCandidate",
+    "PersonContact",
+    "PersonLanguage",
+    "PersonLocation",
+    "PersonPhoto",
+    "PersonSocial",
+    "parse_person_callback",
+]
@@ -0,0 +1,606 @@
+"""Callback handler that writes revealed contacts to Airtable in batches.
+
+Successful Person API callback items are written to a durable SQLite outbox
+and shipped to Airtable as upserts of up to 10 records, the maximum Airtable
+accepts per request, merged on ``SignalHire ID``. A batch is sent as soon as
+10 records are waiting or when the oldest record has waited ``flush_interval``
+seconds. Requests go through the process-wide :class:`AirtableClient`, which
+acquires from the shared rate limit registry, so the writer shares one session
+and one 429 penalty map with every other Airtable caller in the process and
+stays within Airtable's 5 requests/second per base.
+
+Records stay in the outbox until Airtable accepts them; failed batches are
+retried with exponential backoff and moved aside as ``dead`` after
+``max_attempts``. A crash between receiving a callback and shipping it
+therefore loses nothing: the records are sent by the next writer that opens
+the outbox. Writers lease a batch before sending it, so the processes of
+``serve_callback --processes N`` share one outbox without sending a record
+twice; the lease of a writer that dies expires after ``lease_timeout``.
+Outbox reads and writes run in a worker thread, so a writer waiting on
+another process's transaction never stalls the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from ..lib.rate_limit_registry import RateLimitRegistry, get_rate_limit_registry
+from ..lib.revealed_index import RevealedIndex, get_revealed_index
+from .airtable_client import (
+    AIRTABLE_MAX_RECORDS,
+    AirtableClient,
+    AirtableClientError,
+    shared_airtable_client,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    import httpx
+
+    from ..lib.callback_server import CallbackServer
+
+logger = structlog.get_logger(__name__)
+
+AIRTABLE_API_URL = "https://api.airtable.com/v0"
+DEFAULT_TABLE_ID = "tbl0uFVaAfcNjT2rS"
+MERGE_FIELD = "SignalHire ID"
+# Fields that make a record count as revealed
+CONTACT_FIELDS = ("Primary Email", "Secondary Email", "Phone Number")
+
+DEFAULT_FLUSH_INTERVAL = 2.0
+DEFAULT_MAX_ATTEMPTS = 8
+DEFAULT_LEASE_SECONDS = 120.0
+RETRY_BASE_DELAY = 2.0
+RETRY_MAX_DELAY = 300.0
+
+# Airtable single-select option IDs of the Status field
+STATUS_REVEALED = "selJfOFUDHriiWSMs"
+STATUS_NO_CONTACTS = "selu4tmP79JA16PHe"
+
+
+def _default_outbox_path() -> Path:
+    """Return the default location of the Airtable outbox database."""
+    return Path.home() / ".signalhire-agent" / "airtable" / "outbox.db"
+
+
+def candidate_to_fields(candidate: dict[str, Any]) -> dict[str, Any]:
+    """Map a Person API candidate to Airtable contact fields."""
+    fields: dict[str, Any] = {MERGE_FIELD: candidate.get("uid")}
+    if candidate.get("fullName"):
+        fields["Full Name"] = candidate["fullName"]
+
+    experience = [e for e in candidate.get("experience") or [] if isinstance(e, dict)]
+    if experience:
+        current = experience[0]
+        title = current.get("position") or current.get("title")
+        company = current.get("company") or current.get("company_name")
+        if isinstance(company, dict):
+            # The Person API nests the company as {"name": ..., ...}
+            company = company.get("name")
+        if title:
+            fields["Job Title"] = title
+        if company:
+            fields["Company"] = company
+    elif candidate.get("headLine"):
+        fields["Job Title"] = candidate["headLine"]
+
+    locations = [
+        loc.get("name") for loc in candidate.get("locations") or [] if isinstance(loc, dict)
+    ]
+    if locations and locations[0]:
+        fields["Location"] = locations[0]
+
+    emails, phones = [], []
+    for contact in candidate.get("contacts") or []:
+        if not isinstance(contact, dict) or not contact.get("value"):
+            continue
+        if contact.get("type") == "email":
+            emails.append(contact["value"])
+        elif contact.get("type") == "phone":
+            phones.append(contact["value"])
+    if emails:
+        fields["Primary Email"] = emails[0]
+        if len(emails) > 1:
+            fields["Secondary Email"] = emails[1]
+    if phones:
+        fields["Phone Number"] = phones[0]
+
+    for social in candidate.get("social") or []:
+        if not isinstance(social, dict) or not social.get("link"):
+            continue
+        if social.get("type") == "li":
+            fields["LinkedIn URL"] = social["link"]
+        elif social.get("type") == "fb":
+            fields["Facebook URL"] = social["link"]
+
+    skills = [str(skill) for skill in candidate.get("skills") or [] if skill]
+    if skills:
+        fields["Skills"] = ", ".join(skills)
+    if candidate.get("uid"):
+        fields["SignalHire Profile"] = (
+            f"https://www.signalhire.com/candidates/{candidate['uid']}"
+        )
+
+    fields["Status"] = STATUS_REVEALED if emails or phones else STATUS_NO_CONTACTS
+    return fields
+
+
+class AirtableCallbackWriter:
+    """Coalesces callback contacts into 10-record Airtable upserts.
+
+    Parameters
+    - api_key / base_id / table_id: Airtable credentials and contacts table
+    - outbox_path: SQLite outbox file (``None`` keeps it in memory)
+    - batch_size: records per upsert request (at most 10)
+    - flush_interval: seconds a record may wait for a full batch
+    - max_attempts: failed sends before a record is moved aside as dead
+    - lease_timeout: seconds a batch being sent stays with this writer
+    - registry: rate limit registry throttling requests per base
+    - revealed_index: membership index that written contacts are added to
+    - transport: optional httpx transport (tests)
+
+    A ``registry`` or ``transport`` passed in gives the writer a client of its
+    own; otherwise it uses the process-wide client for ``api_key``.
+    - time_fn: injectable clock returning epoch seconds
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            signalhire_id TEXT NOT NULL,
+            fields TEXT NOT NULL,
+            state TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL,
+            enqueued_at REAL NOT NULL,
+            last_error TEXT,
+            owner TEXT,
+            lease_until REAL
+        );
+        CREATE INDEX IF NOT EXISTS outbox_due ON outbox (state, next_attempt_at, id);
+    """
+
+    # Pending records whose backoff has passed and that no writer holds
+    _DUE = (
+        "state = 'pending' AND next_attempt_at <= :now "
+        "AND (lease_until IS NULL OR lease_until < :now)"
+    )
+
+    def __init__(
+        self,
+        api_key: str,
+        base_id: str,
+        table_id: str = DEFAULT_TABLE_ID,
+        *,
+        outbox_path: str | os.PathLike[str] | None = None,
+        batch_size: int = AIRTABLE_MAX_RECORDS,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        lease_timeout: float = DEFAULT_LEASE_SECONDS,
+        registry: RateLimitRegistry | None = None,
+        revealed_index: RevealedIndex | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        time_fn: Callable[[], float] | None = None,
+    ) -> None:
+        if not 1 <= batch_size <= AIRTABLE_MAX_RECORDS:
+            raise ValueError(f"batch_size must be between 1 and {AIRTABLE_MAX_RECORDS}")
+        self.api_key = api_key
+        self.base_id = base_id
+        self.table_id = table_id
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.lease_timeout = lease_timeout
+        self.registry = registry or get_rate_limit_registry()
+        self.revealed_index = revealed_index
+        self._time = time_fn or time.time
+        self._client: AirtableClient | None = None
+        self._owns_client = registry is not None or transport is not None
+        if self._owns_client:
+            self._client = AirtableClient(api_key, registry=self.registry, transport=transport)
+        self._shared_client = contextlib.AsyncExitStack()
+        self._flusher: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._send_lock: asyncio.Lock | None = None
+        self._lock = threading.Lock()
+        self._owner = uuid.uuid4().hex
+        self._started_at = self._time()
+        self._stats = {
+            "received": 0,
+            "skipped": 0,
+            "requests": 0,
+            "records_written": 0,
+            "failed_batches": 0,
+            "retried_records": 0,
+            "dead_records": 0,
+        }
+        self._lag_total = 0.0
+        self._lag_max = 0.0
+        self._last_flush_at: float | None = None
+
+        self.outbox_path = str(outbox_path) if outbox_path else ":memory:"
+        if outbox_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.outbox_path)), exist_ok=True)
+        self._db = sqlite3.connect(
+            self.outbox_path, timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        self._db.row_factory = sqlite3.Row
+        if outbox_path:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(self._SCHEMA)
+        self._add_lease_columns()
+
+    def _add_lease_columns(self) -> None:
+        """Add the lease columns to outboxes created before them."""
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(outbox)")}
+        if "lease_until" not in columns:
+
+            def migrate(db: sqlite3.Connection) -> None:
+                columns = {row[1] for row in db.execute("PRAGMA table_info(outbox)")}
+                if "lease_until" not in columns:
+                    db.execute("ALTER TABLE outbox ADD COLUMN owner TEXT")
+                    db.execute("ALTER TABLE outbox ADD COLUMN lease_until REAL")
+
+            self._transaction(migrate)
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS outbox_leases ON outbox (lease_until)"
+        )
+
+    def _transaction(self, work):
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(self._db)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return result
+
+    @property
+    def url(self) -> str:
+        return f"{AIRTABLE_API_URL}/{self.base_id}/{self.table_id}"
+
+    # Outbox -----------------------------------------------------------------
+
+    def enqueue(self, records: Iterable[dict[str, Any]]) -> int:
+        """Store Airtable field dicts in the outbox. Returns the number stored."""
+        now = self._time()
+        rows = [
+            (str(fields[MERGE_FIELD]), json.dumps(fields), now, now)
+            for fields in records
+            if fields.get(MERGE_FIELD)
+        ]
+        if not rows:
+            return 0
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO outbox (signalhire_id, fields, next_attempt_at, enqueued_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def _count(self, state: str, due_only: bool = False) -> int:
+        if due_only:
+            query = f"SELECT COUNT(*) FROM outbox WHERE {self._DUE}"
+            params: dict[str, Any] = {"now": self._time()}
+        else:
+            query = "SELECT COUNT(*) FROM outbox WHERE state = :state"
+            params = {"state": state}
+        with self._lock:
+            return self._db.execute(query, params).fetchone()[0]
+
+    def _oldest_due(self) -> float | None:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT MIN(enqueued_at) FROM outbox WHERE {self._DUE}",
+                {"now": self._time()},
+            ).fetchone()
+        return row[0]
+
+    def _next_batch(self) -> list[sqlite3.Row]:
+        """Lease the oldest due records, at most one per SignalHire ID.
+
+        IDs with a record leased by another writer are skipped, so an older
+        and a newer version of a contact are never sent at the same time.
+        """
+        now = self._time()
+
+        def lease(db: sqlite3.Connection) -> list[sqlite3.Row]:
+            rows = db.execute(
+                f"SELECT id, signalhire_id FROM outbox WHERE {self._DUE} "
+                "AND signalhire_id NOT IN ("
+                "  SELECT signalhire_id FROM outbox WHERE lease_until >= :now"
+                ") ORDER BY id LIMIT :limit",
+                {"now": now, "limit": self.batch_size * 4},
+            ).fetchall()
+            ids, seen = [], set()
+            for row in rows:
+                # performUpsert rejects a request that merges one key twice
+                if row["signalhire_id"] in seen:
+                    continue
+                seen.add(row["signalhire_id"])
+                ids.append(row["id"])
+                if len(ids) == self.batch_size:
+                    break
+            if not ids:
+                return []
+            return db.execute(
+                "UPDATE outbox SET owner = ?, lease_until = ? "
+                f"WHERE id IN ({', '.join('?' * len(ids))}) RETURNING *",
+                (self._owner, now + self.lease_timeout, *ids),
+            ).fetchall()
+
+        return sorted(self._transaction(lease), key=lambda row: row["id"])
+
+    def _complete(self, rows: list[sqlite3.Row]) -> None:
+        with self._lock:
+            self._db.executemany(
+                "DELETE FROM outbox WHERE id = ?", [(row["id"],) for row in rows]
+            )
+
+    def _reschedule(self, rows: list[sqlite3.Row], error: str) -> None:
+        now = self._time()
+        updates, dead = [], 0
+        for row in rows:
+            attempts = row["attempts"] + 1
+            if attempts >= self.max_attempts:
+                state, dead = "dead", dead + 1
+            else:
+                state = "pending"
+            delay = min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+            updates.append((state, attempts, now + delay, error, row["id"], self._owner))
+        with self._lock:
+            # A record whose lease ran out meanwhile belongs to another writer
+            self._db.executemany(
+                "UPDATE outbox SET state = ?, attempts = ?, next_attempt_at = ?, "
+                "last_error = ?, owner = NULL, lease_until = NULL "
+                "WHERE id = ? AND owner = ?",
+                updates,
+            )
+        self._stats["retried_records"] += len(rows) - dead
+        self._stats["dead_records"] += dead
+        if dead:
+            logger.error(
+                "Airtable records dropped after repeated failures",
+                records=dead,
+                error=error,
+            )
+
+    def requeue_dead(self) -> int:
+        """Give dead records another round of attempts. Returns how many."""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE outbox SET state = 'pending', attempts = 0, next_attempt_at = ? "
+                "WHERE state = 'dead'",
+                (self._time(),),
+            )
+        return cursor.rowcount
+
+    # Sending ----------------------------------------------------------------
+
+    async def _airtable(self) -> AirtableClient:
+        """The writer's client, joining the process-wide one on first use."""
+        if self._client is None:
+            self._client = await self._shared_client.enter_async_context(
+                shared_airtable_client(self.api_key)
+            )
+        return self._client
+
+    async def _send(self, rows: list[sqlite3.Row]) -> bool:
+        self._stats["requests"] += 1
+        client = await self._airtable()
+        try:
+            result = await client.upsert_records(
+                self.base_id,
+                self.table_id,
+                [json.loads(row["fields"]) for row in rows],
+                merge_on=[MERGE_FIELD],
+            )
+        except AirtableClientError as exc:
+            error = str(exc)
+        else:
+            # A batch is a single chunk, so it either went through or failed
+            error = str(result.failed[0].error) if result.failed else None
+        if error is None:
+            now = self._time()
+            for row in rows:
+                lag = now - row["enqueued_at"]
+                self._lag_total += lag
+                self._lag_max = max(self._lag_max, lag)
+            await asyncio.to_thread(self._complete, rows)
+            self._stats["records_written"] += len(rows)
+            if self.revealed_index is not None:
+                await asyncio.to_thread(self._index_revealed, rows)
+            self._last_flush_at = now
+            return True
+
+        self._stats["failed_batches"] += 1
+        logger.warning(
+            "Airtable batch upsert failed; records stay in the outbox",
+            records=len(rows),
+            error=error,
+        )
+        await asyncio.to_thread(self._reschedule, rows, error)
+        return False
+
+    def _index_revealed(self, rows: list[sqlite3.Row]) -> None:
+        """Add written records that carry an email or phone to the revealed index."""
+        uids = []
+        for row in rows:
+            fields = json.loads(row["fields"])
+            if any(fields.get(name) for name in CONTACT_FIELDS):
+                uids.append(row["signalhire_id"])
+        try:
+            self.revealed_index.add(uids)
+        except OSError as exc:
+            logger.warning("Could not update the revealed index", error=str(exc))
+
+    async def flush(self, *, force: bool = False) -> int:
+        """Send due batches. Partial batches are sent only when ``force`` is set
+        or their oldest record has waited ``flush_interval``. Returns records written.
+        """
+        if self._send_lock is None:
+            self._send_lock = asyncio.Lock()
+        written = 0
+        async with self._send_lock:
+            while True:
+                due = await asyncio.to_thread(self._count, "pending", due_only=True)
+                if not due:
+                    break
+                if due < self.batch_size and not force:
+                    oldest = await asyncio.to_thread(self._oldest_due)
+                    if oldest is None or self._time() - oldest < self.flush_interval:
+                        break
+                batch = await asyncio.to_thread(self._next_batch)
+                if not batch:
+                    # Everything due is being sent by other writers
+                    break
+                if not await self._send(batch):
+                    # Stop on failure; the records are rescheduled with backoff
+                    break
+                written += len(batch)
+        return written
+
+    async def _run(self) -> None:
+        """Background flusher: size-triggered wakeups plus a periodic timer."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as exc:  # noqa: BLE001
+                logger.error("Airtable flush failed", error=str(exc))
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is None or self._flusher.done():
+            self._wakeup = asyncio.Event()
+            self._flusher = asyncio.create_task(self._run(), name="airtable-flusher")
+
+    async def handle(self, callback_data: list[Any]) -> None:
+        """CallbackServer handler: queue successful items for the next batch."""
+        records = []
+        for entry in callback_data or []:
+            if not isinstance(entry, dict):
+                entry = entry.model_dump(by_alias=True) if hasattr(entry, "model_dump") else {}
+            candidate = entry.get("candidate")
+            if entry.get("status") != "success" or not isinstance(candidate, dict):
+                self._stats["skipped"] += 1
+                continue
+            # The payload is shared with the other handlers; map a copy
+            candidate = {"uid": entry.get("item"), **candidate}
+            records.append(candidate_to_fields(candidate))
+
+        # Outbox writes wait on other processes' transactions; keep them off the loop
+        self._stats["received"] += await asyncio.to_thread(self.enqueue, records)
+        self._ensure_flusher()
+        due = await asyncio.to_thread(self._count, "pending", due_only=True)
+        if due >= self.batch_size:
+            self._wakeup.set()
+
+    async def aclose(self) -> None:
+        """Stop the flusher after sending everything that is due."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush(force=True)
+        if self._owns_client:
+            await self._client.aclose()
+        else:
+            # Leave the shared client; the last of its users closes the session
+            self._client = None
+            await self._shared_client.aclose()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Throughput, lag and outbox counters."""
+        elapsed = max(self._time() - self._started_at, 1e-9)
+        written = self._stats["records_written"]
+        oldest = self._oldest_due()
+        return {
+            **self._stats,
+            "pending": self._count("pending"),
+            "dead": self._count("dead"),
+            "records_per_second": round(written / elapsed, 3),
+            "avg_lag_seconds": round(self._lag_total / written, 3) if written else 0.0,
+            "max_lag_seconds": round(self._lag_max, 3),
+            "oldest_pending_seconds": (
+                round(self._time() - oldest, 3) if oldest is not None else 0.0
+            ),
+            "last_flush_at": self._last_flush_at,
+        }
+
+    def close(self) -> None:
+        """Close the outbox database."""
+        with self._lock:
+            self._db.close()
+
+
+_writer: AirtableCallbackWriter | None = None
+
+
+def register_airtable_handler(
+    server: CallbackServer, writer: AirtableCallbackWriter | None = None
+) -> AirtableCallbackWriter | None:
+    """Register the Airtable writer as a global handler of ``server``.
+
+    Without an explicit writer one is built from ``AIRTABLE_API_KEY``,
+    ``AIRTABLE_BASE_ID`` and ``AIRTABLE_TABLE_ID``; the outbox lives at
+    ``AIRTABLE_OUTBOX_DB`` or ``~/.signalhire-agent/airtable/outbox.db``.
+    Returns ``None`` when Airtable is not configured.
+    """
+    global _writer
+    if writer is None:
+        api_key = os.getenv("AIRTABLE_API_KEY")
+        base_id = os.getenv("AIRTABLE_BASE_ID")
+        if not (api_key and base_id):
+            logger.warning(
+                "Airtable is not configured (AIRTABLE_API_KEY / AIRTABLE_BASE_ID); "
+                "callbacks will not be written to Airtable"
+            )
+            return None
+        writer = AirtableCallbackWriter(
+            api_key,
+            base_id,
+            os.getenv("AIRTABLE_TABLE_ID", DEFAULT_TABLE_ID),
+            outbox_path=os.getenv("AIRTABLE_OUTBOX_DB") or _default_outbox_path(),
+            revealed_index=get_revealed_index(),
+        )
+    server.register_handler("airtable", writer.handle)
+    _writer = writer
+    return writer
+
+
+def get_handler_stats() -> dict[str, Any]:
+    """Counters of the registered Airtable writer."""
+    if _writer is None:
+        return {"registered": False}
+    return {"registered": True, **_writer.get_stats()}
+
+
+__all__ = [
+    "AirtableCallbackWriter",
+    "candidate_to_fields",
+    "get_handler_stats",
+    "register_airtable_handler",
+]
@@ -1,21 +1,72 @@
-"""Thin Airtable REST helpers used by the CLI.
+"""Shared async Airtable client used by the CLI and services.
 
-Provides a lightweight read-only index of existing SignalHire contacts so
-commands can make decisions without falling back to the legacy local cache.
+Every Airtable call in the process goes through one :class:`AirtableClient`:
+
+- one pooled keep-alive ``httpx.AsyncClient``, so consecutive requests reuse
+  their TLS connection instead of opening a client per command;
+- requests acquire from the shared rate limit registry keyed by base, which
+  holds every base to Airtable's 5 requests/second;
+- a 429 response pauses the whole base for Airtable's 30-second penalty
+  before the request is retried (and after the last retry), so callers never
+  hammer a base that is already being throttled;
+- creates, updates and deletes are split into requests of 10 records, the
+  most Airtable accepts, and :meth:`AirtableClient.upsert_records` wraps
+  ``performUpsert`` with ``fieldsToMergeOn``. A rejected chunk does not stop
+  the write: the remaining chunks are still sent and the :class:`WriteResult`
+  lists the failed ones.
+
+Commands use the process-wide client through :func:`shared_airtable_client`,
+which reference-counts its users and closes the pooled session when the last
+one leaves, so concurrent users never lose the session under them.
+
+:class:`AirtableContactIndex` builds a read-only index of existing SignalHire
+contacts on top of the client, so commands can make decisions without
+falling back to the legacy local cache.
 """
 
 from __future__ import annotations
 
 import asyncio
 import os
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+import time
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence
 
 import httpx
+import structlog
+
+from ..lib.rate_limit_registry import RateLimitRegistry, get_rate_limit_registry
+from ..lib.revealed_index import RevealedIndex
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+logger = structlog.get_logger(__name__)
+
+AIRTABLE_API_URL = "https://api.airtable.com/v0"
+# Airtable accepts at most 10 records per create/update/delete request
+AIRTABLE_MAX_RECORDS = 10
+AIRTABLE_PAGE_SIZE = 100
+# A base that answered 429 rejects every request for the next 30 seconds
+RATE_LIMIT_PENALTY_SECONDS = 30.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_TIMEOUT = 30.0
+# Values per filterByFormula lookup; keeps the query string well under 16k
+FORMULA_CHUNK = 50
+# Errors that every later chunk of a write would hit as well
+FATAL_WRITE_STATUSES = frozenset({401, 403, 404})
 
 
 class AirtableClientError(RuntimeError):
-    """Raised when Airtable API calls fail."""
+    """Raised when Airtable API calls fail.
+
+    ``status_code`` is set when Airtable answered with an HTTP error.
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
 
 
 @dataclass
@@ -27,6 +78,423 @@ class AirtableContactRecord:
     status: Optional[str]
 
 
+@dataclass
+class ChunkFailure:
+    """A chunk of a write that Airtable did not accept.
+
+    ``start`` is the position of its first record in the records passed in.
+    """
+
+    start: int
+    records: List[Dict[str, Any]]
+    error: AirtableClientError
+
+    @property
+    def indexes(self) -> range:
+        return range(self.start, self.start + len(self.records))
+
+
+@dataclass
+class WriteResult:
+    """Records Airtable returned for a chunked write, and the chunks it rejected."""
+
+    records: List[Dict[str, Any]] = field(default_factory=list)
+    failed: List[ChunkFailure] = field(default_factory=list)
+
+    @property
+    def failed_indexes(self) -> set[int]:
+        """Positions of the records passed in that were not written."""
+        return {index for failure in self.failed for index in failure.indexes}
+
+    def _add(self, payload: Dict[str, Any]) -> None:
+        self.records.extend(payload.get("records", []))
+
+
+@dataclass
+class UpsertResult(WriteResult):
+    """Records returned by a chunked ``performUpsert``."""
+
+    created: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+
+    def _add(self, payload: Dict[str, Any]) -> None:
+        super()._add(payload)
+        self.created.extend(payload.get("createdRecords", []))
+        self.updated.extend(payload.get("updatedRecords", []))
+
+
+def _chunks(items: Sequence[Any], size: int = AIRTABLE_MAX_RECORDS) -> Iterable[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _quote(value: Any) -> str:
+    """Formula string literal for ``value``."""
+    text = str(value).replace("\\", "\\\\").replace("'", "\\'")
+    return f"'{text}'"
+
+
+def match_formula(field_name: str, values: Iterable[Any]) -> str:
+    """``filterByFormula`` matching records whose ``field_name`` is any of ``values``."""
+    terms = [f"{{{field_name}}} = {_quote(value)}" for value in values]
+    if len(terms) == 1:
+        return terms[0]
+    return f"OR({', '.join(terms)})"
+
+
+class AirtableClient:
+    """Pooled, rate-limited Airtable REST client.
+
+    Parameters
+    - api_key: personal access token (defaults to ``AIRTABLE_API_KEY`` or
+      ``AIRTABLE_TOKEN``)
+    - registry: rate limit registry throttling requests per base
+    - transport: optional httpx transport (tests)
+    - timeout: seconds per request
+    - max_retries: 429 responses retried per request before giving up
+    - penalty_seconds: pause applied to a base after a 429
+    - sleep / time_fn: injectable ``asyncio.sleep`` and monotonic clock
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        *,
+        registry: Optional[RateLimitRegistry] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        penalty_seconds: float = RATE_LIMIT_PENALTY_SECONDS,
+        sleep: Optional[Callable[[float], Awaitable[Any]]] = None,
+        time_fn: Optional[Callable[[], float]] = None,
+    ) -> None:
+        self.api_key = api_key or os.getenv("AIRTABLE_API_KEY") or os.getenv("AIRTABLE_TOKEN")
+        self.registry = registry or get_rate_limit_registry()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.penalty_seconds = penalty_seconds
+        self._transport = transport
+        self._sleep = sleep or asyncio.sleep
+        self._time = time_fn or time.monotonic
+        self._session: Optional[httpx.AsyncClient] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        # base ID -> monotonic time until which the base is penalized
+        self._penalized_until: Dict[str, float] = {}
+        # Users inside shared_airtable_client(); the last one closes the session
+        self._users = 0
+        self._stats = {"requests": 0, "records": 0, "rate_limited": 0, "penalty_seconds": 0.0}
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.api_key)
+
+    async def __aenter__(self) -> "AirtableClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def _get_session(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._session is not None and self._session_loop is not loop:
+            # Connections belong to the loop that opened them; each
+            # ``asyncio.run`` of a CLI command starts a fresh pool
+            session, self._session = self._session, None
+            await self._close_session(session)
+        if self._session is None:
+            if not self.api_key:
+                raise AirtableClientError(
+                    "Airtable API key is not configured (AIRTABLE_API_KEY / AIRTABLE_TOKEN)."
+                )
+            self._session = httpx.AsyncClient(
+                base_url=AIRTABLE_API_URL,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                transport=self._transport,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60.0),
+            )
+            self._session_loop = loop
+        return self._session
+
+    @staticmethod
+    async def _close_session(session: httpx.AsyncClient) -> None:
+        """Close ``session``, which may belong to an event loop that has ended."""
+        try:
+            await session.aclose()
+        except RuntimeError as exc:
+            # Connections of a closed loop cannot be shut down from this one;
+            # their sockets are released when the transports are collected
+            logger.debug("Airtable session of a closed event loop dropped", error=str(exc))
+
+    async def _wait_for_base(self, base_id: str) -> None:
+        """Sit out a running 429 penalty, then take a slot from the base's bucket."""
+        while True:
+            remaining = self._penalized_until.get(base_id, 0.0) - self._time()
+            if remaining <= 0:
+                break
+            self._stats["penalty_seconds"] += remaining
+            await self._sleep(remaining)
+        await self.registry.acquire("airtable", key=base_id)
+
+    async def request(
+        self,
+        method: str,
+        base_id: str,
+        path: str,
+        *,
+        params: Optional[Any] = None,
+        json: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Send one request to ``/v0/<base_id>/<path>`` and return its JSON body."""
+        session = await self._get_session()
+        url = f"/{base_id}/{path.lstrip('/')}"
+        attempt = 0
+        while True:
+            await self._wait_for_base(base_id)
+            self._stats["requests"] += 1
+            try:
+                response = await session.request(method, url, params=params, json=json)
+            except httpx.HTTPError as exc:
+                raise AirtableClientError(
+                    f"Airtable request failed: {exc or type(exc).__name__}"
+                ) from exc
+
+            if response.status_code == 429:
+                # The base is penalized either way; other callers must wait too
+                self._stats["rate_limited"] += 1
+                self._penalized_until[base_id] = self._time() + self.penalty_seconds
+                if attempt < self.max_retries:
+                    attempt += 1
+                    logger.warning(
+                        "Airtable rate limit hit; pausing base",
+                        base_id=base_id,
+                        seconds=self.penalty_seconds,
+                        attempt=attempt,
+                    )
+                    continue
+            if response.is_error:
+                raise AirtableClientError(
+                    f"HTTP {response.status_code}: {response.text[:200]}",
+                    status_code=response.status_code,
+                )
+            return response.json() if response.content else {}
+
+    # Reads ------------------------------------------------------------------
+
+    async def iter_records(
+        self,
+        base_id: str,
+        table_id: str,
+        *,
+        fields: Optional[Sequence[str]] = None,
+        formula: Optional[str] = None,
+        max_records: Optional[int] = None,
+        page_size: int = AIRTABLE_PAGE_SIZE,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield records of a table page by page."""
+        params: Dict[str, Any] = {"pageSize": min(page_size, AIRTABLE_PAGE_SIZE)}
+        if fields:
+            params["fields[]"] = list(fields)
+        if formula:
+            params["filterByFormula"] = formula
+        if max_records is not None:
+            params["maxRecords"] = max_records
+        while True:
+            payload = await self.request("GET", base_id, table_id, params=params)
+            for record in payload.get("records", []):
+                yield record
+            offset = payload.get("offset")
+            if not offset:
+                return
+            params["offset"] = offset
+
+    async def list_records(self, base_id: str, table_id: str, **options: Any) -> List[Dict[str, Any]]:
+        """All records matching :meth:`iter_records` options."""
+        return [record async for record in self.iter_records(base_id, table_id, **options)]
+
+    async def find_by_field(
+        self,
+        base_id: str,
+        table_id: str,
+        field_name: str,
+        values: Iterable[Any],
+        *,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Records whose ``field_name`` equals one of ``values``, grouped by value.
+
+        Looks up many values per request with ``OR`` formulas. Groups keep
+        Airtable's order, oldest record first.
+        """
+        wanted = list(dict.fromkeys(str(value) for value in values if value))
+        found: Dict[str, List[Dict[str, Any]]] = {}
+        if fields and field_name not in fields:
+            fields = [*fields, field_name]
+        for chunk in _chunks(wanted, FORMULA_CHUNK):
+            records = await self.list_records(
+                base_id, table_id, fields=fields, formula=match_formula(field_name, chunk)
+            )
+            for record in sorted(records, key=lambda r: r.get("createdTime", "")):
+                value = record.get("fields", {}).get(field_name)
+                if value is not None:
+                    found.setdefault(str(value), []).append(record)
+        return found
+
+    # Writes -----------------------------------------------------------------
+
+    async def _write(
+        self,
+        method: str,
+        base_id: str,
+        table_id: str,
+        records: Sequence[Dict[str, Any]],
+        *,
+        typecast: bool,
+        extra: Optional[Dict[str, Any]] = None,
+        result: Optional[WriteResult] = None,
+    ) -> WriteResult:
+        """Send ``records`` 10 per request; a failed chunk is recorded, not raised.
+
+        ``DELETE`` takes record IDs, which are sent as ``records[]`` parameters.
+        """
+        result = result if result is not None else WriteResult()
+        fatal: Optional[AirtableClientError] = None
+        for start in range(0, len(records), AIRTABLE_MAX_RECORDS):
+            chunk = list(records[start : start + AIRTABLE_MAX_RECORDS])
+            if fatal is not None:
+                result.failed.append(ChunkFailure(start, chunk, fatal))
+                continue
+            if method == "DELETE":
+                params: Optional[Any] = [("records[]", rid) for rid in chunk]
+                body: Optional[Dict[str, Any]] = None
+            else:
+                params, body = None, {"records": chunk, "typecast": typecast}
+                if extra:
+                    body.update(extra)
+            try:
+                payload = await self.request(
+                    method, base_id, table_id, params=params, json=body
+                )
+            except AirtableClientError as exc:
+                logger.warning(
+                    "Airtable rejected a chunk of records",
+                    base_id=base_id,
+                    records=len(chunk),
+                    error=str(exc),
+                )
+                result.failed.append(ChunkFailure(start, chunk, exc))
+                if exc.status_code in FATAL_WRITE_STATUSES:
+                    fatal = exc
+                continue
+            result._add(payload)
+            self._stats["records"] += len(chunk)
+        return result
+
+    async def create_records(
+        self,
+        base_id: str,
+        table_id: str,
+        fields: Sequence[Dict[str, Any]],
+        *,
+        typecast: bool = False,
+    ) -> WriteResult:
+        """Create one record per fields mapping, 10 per request."""
+        return await self._write(
+            "POST", base_id, table_id, [{"fields": item} for item in fields], typecast=typecast
+        )
+
+    async def update_records(
+        self,
+        base_id: str,
+        table_id: str,
+        records: Sequence[Dict[str, Any]],
+        *,
+        typecast: bool = False,
+    ) -> WriteResult:
+        """Patch ``{"id": ..., "fields": {...}}`` records, 10 per request."""
+        return await self._write("PATCH", base_id, table_id, records, typecast=typecast)
+
+    async def upsert_records(
+        self,
+        base_id: str,
+        table_id: str,
+        fields: Sequence[Dict[str, Any]],
+        *,
+        merge_on: Sequence[str] = ("SignalHire ID",),
+        typecast: bool = True,
+    ) -> UpsertResult:
+        """Create or update records matched on ``merge_on``, 10 per request."""
+        return await self._write(
+            "PATCH",
+            base_id,
+            table_id,
+            [{"fields": item} for item in fields],
+            typecast=typecast,
+            extra={"performUpsert": {"fieldsToMergeOn": list(merge_on)}},
+            result=UpsertResult(),
+        )
+
+    async def delete_records(
+        self, base_id: str, table_id: str, record_ids: Sequence[str]
+    ) -> WriteResult:
+        """Delete records by ID, 10 per request.
+
+        ``records`` holds Airtable's ``{"id": ..., "deleted": true}`` entries.
+        """
+        return await self._write("DELETE", base_id, table_id, list(record_ids), typecast=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Requests sent, records written and time spent in 429 penalties."""
+        return {**self._stats, "penalty_seconds": round(self._stats["penalty_seconds"], 3)}
+
+    async def aclose(self) -> None:
+        session, self._session = self._session, None
+        if session is not None:
+            await self._close_session(session)
+        self._session_loop = None
+
+
+_clients: Dict[str, AirtableClient] = {}
+
+
+def get_airtable_client(api_key: Optional[str] = None) -> AirtableClient:
+    """Return the process-wide client for ``api_key`` (or the environment key).
+
+    Use it through :func:`shared_airtable_client` rather than closing it.
+    """
+    key = api_key or os.getenv("AIRTABLE_API_KEY") or os.getenv("AIRTABLE_TOKEN") or ""
+    client = _clients.get(key)
+    if client is None:
+        client = AirtableClient(key or None)
+        _clients[key] = client
+    return client
+
+
+def set_airtable_client(client: Optional[AirtableClient]) -> None:
+    """Register ``client`` for its API key (``None`` drops every shared client)."""
+    if client is None:
+        _clients.clear()
+    else:
+        _clients[client.api_key or ""] = client
+
+
+@asynccontextmanager
+async def shared_airtable_client(api_key: Optional[str] = None) -> AsyncIterator[AirtableClient]:
+    """Use the process-wide client for ``api_key``.
+
+    Concurrent users share its pooled session; it is closed when the last of
+    them leaves, before the command's event loop ends.
+    """
+    client = get_airtable_client(api_key)
+    client._users += 1
+    try:
+        yield client
+    finally:
+        client._users -= 1
+        if not client._users:
+            await client.aclose()
+
+
 class AirtableContactIndex:
     """Caches Airtable contact metadata in memory."""
 
@@ -36,11 +504,16 @@ class AirtableContactIndex:
         api_key: Optional[str] = None,
         base_id: Optional[str] = None,
         table_id: Optional[str] = None,
+        revealed_index: Optional[RevealedIndex] = None,
+        client: Optional[AirtableClient] = None,
     ) -> None:
         self.api_key = api_key or os.getenv("AIRTABLE_API_KEY")
         self.base_id = base_id or os.getenv("AIRTABLE_BASE_ID")
         self.table_id = table_id or os.getenv("AIRTABLE_TABLE_ID", "tbl0uFVaAfcNjT2rS")
         self._records: Dict[str, AirtableContactRecord] = {}
+        # Synced contacts are added to this membership index when given
+        self.revealed_index = revealed_index
+        self._client = client
 
     @property
     def ready(self) -> bool:
@@ -63,54 +536,43 @@ class AirtableContactIndex:
                 "Airtable credentials are not configured (AIRTABLE_API_KEY / AIRTABLE_BASE_ID)."
             )
 
-        headers = {"Authorization": f"Bearer {self.api_key}"}
-        params: Dict[str, Any] = {
-            "pageSize": 100,
-            "fields": [
-                "SignalHire ID",
-                "Primary Email",
-                "Secondary Email",
-                "Phone Number",
-                "Status",
-            ],
-        }
-        url = f"https://api.airtable.com/v0/{self.base_id}/{self.table_id}"
-
-        async with httpx.AsyncClient() as client:
-            next_offset: Optional[str] = None
-            while True:
-                if next_offset:
-                    params["offset"] = next_offset
-                elif "offset" in params:
-                    params.pop("offset")
-
-                response = await client.get(url, headers=headers, params=params)
-                try:
-                    response.raise_for_status()
-                except httpx.HTTPError as exc:  # pragma: no cover - network failure path
-                    raise AirtableClientError(f"Airtable request failed: {exc}") from exc
-
-                payload = response.json()
-                for record in payload.get("records", []):
-                    fields = record.get("fields", {})
-                    signalhire_id = fields.get("SignalHire ID")
-                    if not signalhire_id:
-                        continue
-                    has_contact = bool(
-                        fields.get("Primary Email")
-                        or fields.get("Secondary Email")
-                        or fields.get("Phone Number")
-                    )
-                    status = fields.get("Status")
-                    self._records[signalhire_id] = AirtableContactRecord(
-                        record_id=record.get("id", ""),
-                        has_contact_info=has_contact,
-                        status=status,
-                    )
+        # A client passed in belongs to the caller, who closes it
+        if self._client is not None:
+            owner = nullcontext(self._client)
+        else:
+            owner = shared_airtable_client(self.api_key)
+        async with owner as client:
+            records = client.iter_records(
+                self.base_id,
+                self.table_id,
+                fields=[
+                    "SignalHire ID",
+                    "Primary Email",
+                    "Secondary Email",
+                    "Phone Number",
+                    "Status",
+                ],
+            )
+            async for record in records:
+                fields = record.get("fields", {})
+                signalhire_id = fields.get("SignalHire ID")
+                if not signalhire_id:
+                    continue
+                has_contact = bool(
+                    fields.get("Primary Email")
+                    or fields.get("Secondary Email")
+                    or fields.get("Phone Number")
+                )
+                self._records[signalhire_id] = AirtableContactRecord(
+                    record_id=record.get("id", ""),
+                    has_contact_info=has_contact,
+                    status=fields.get("Status"),
+                )
 
-                next_offset = payload.get("offset")
-                if not next_offset:
-                    break
+        if self.revealed_index is not None:
+            self.revealed_index.add(
+                uid for uid, record in self._records.items() if record.has_contact_info
+            )
 
     @classmethod
     def build_sync(
@@ -119,9 +581,33 @@ class AirtableContactIndex:
         api_key: Optional[str] = None,
         base_id: Optional[str] = None,
         table_id: Optional[str] = None,
+        revealed_index: Optional[RevealedIndex] = None,
+        client: Optional[AirtableClient] = None,
     ) -> "AirtableContactIndex":
-        index = cls(api_key=api_key, base_id=base_id, table_id=table_id)
+        index = cls(
+            api_key=api_key,
+            base_id=base_id,
+            table_id=table_id,
+            revealed_index=revealed_index,
+            client=client,
+        )
         if not index.ready:
             return index
         asyncio.run(index._fetch_all())
         return index
+
+
+__all__ = [
+    "AIRTABLE_MAX_RECORDS",
+    "AirtableClient",
+    "AirtableClientError",
+    "AirtableContactIndex",
+    "AirtableContactRecord",
+    "ChunkFailure",
+    "UpsertResult",
+    "WriteResult",
+    "get_airtable_client",
+    "set_airtable_client",
+    "shared_airtable_client",
+    "match_formula",
+]
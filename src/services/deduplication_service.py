@@ -1,7 +1,8 @@
 import json
 import os
 from typing import Any
-import httpx
+
+from .airtable_client import AirtableClientError, shared_airtable_client
 
 
 async def load_contacts_from_airtable() -> list[dict[str, Any]]:
@@ -14,48 +15,27 @@ async def load_contacts_from_airtable() -> list[dict[str, Any]]:
     base_id = os.getenv('AIRTABLE_BASE_ID', 'appQoYINM992nBZ50')
     table_id = os.getenv('AIRTABLE_TABLE_ID', 'tbl0uFVaAfcNjT2rS')
     
-    url = f"https://api.airtable.com/v0/{base_id}/{table_id}"
-    headers = {"Authorization": f"Bearer {airtable_api_key}"}
-    
     contacts = []
-    offset = None
-    
-    async with httpx.AsyncClient() as client:
-        while True:
-            params = {"pageSize": 100}
-            if offset:
-                params["offset"] = offset
-                
-            try:
-                response = await client.get(url, headers=headers, params=params)
-                response.raise_for_status()
-                data = response.json()
-                
-                records = data.get('records', [])
-                for record in records:
-                    fields = record.get('fields', {})
-                    # Convert Airtable record to contact format
-                    contact = {
-                        'uid': fields.get('SignalHire ID', record.get('id')),
-                        'name': fields.get('Full Name', ''),
-                        'linkedin_url': fields.get('LinkedIn URL', ''),
-                        'job_title': fields.get('Job Title', ''),
-                        'company': fields.get('Company', ''),
-                        'email': fields.get('Primary Email', ''),
-                        'phone': fields.get('Phone Number', ''),
-                        'location': fields.get('Location', ''),
-                        'status': fields.get('Status', ''),
-                        'airtable_id': record.get('id')
-                    }
-                    contacts.append(contact)
-                
-                offset = data.get('offset')
-                if not offset:
-                    break
-                    
-            except Exception as e:
-                print(f"❌ Error loading contacts from Airtable: {e}")
-                break
+    try:
+        async with shared_airtable_client(airtable_api_key) as client:
+            async for record in client.iter_records(base_id, table_id):
+                fields = record.get('fields', {})
+                # Convert Airtable record to contact format
+                contact = {
+                    'uid': fields.get('SignalHire ID', record.get('id')),
+                    'name': fields.get('Full Name', ''),
+                    'linkedin_url': fields.get('LinkedIn URL', ''),
+                    'job_title': fields.get('Job Title', ''),
+                    'company': fields.get('Company', ''),
+                    'email': fields.get('Primary Email', ''),
+                    'phone': fields.get('Phone Number', ''),
+                    'location': fields.get('Location', ''),
+                    'status': fields.get('Status', ''),
+                    'airtable_id': record.get('id')
+                }
+                contacts.append(contact)
+    except AirtableClientError as e:
+        print(f"❌ Error loading contacts from Airtable: {e}")
     
     return contacts
 
@@ -131,54 +111,46 @@ async def save_contacts_to_airtable(contacts: list[dict[str, Any]]) -> bool:
     base_id = os.getenv('AIRTABLE_BASE_ID', 'appQoYINM992nBZ50')
     table_id = os.getenv('AIRTABLE_TABLE_ID', 'tbl0uFVaAfcNjT2rS')
     
-    url = f"https://api.airtable.com/v0/{base_id}/{table_id}"
-    headers = {"Authorization": f"Bearer {airtable_api_key}"}
+    records = []
+    for contact in contacts:
+        airtable_id = contact.get('airtable_id')
+        if not airtable_id:
+            continue  # Skip contacts without Airtable ID
+            
+        # Convert back to Airtable format
+        fields = {
+            'Full Name': contact.get('name', ''),
+            'SignalHire ID': contact.get('uid', ''),
+            'Job Title': contact.get('job_title', ''),
+            'Company': contact.get('company', ''),
+            'LinkedIn URL': contact.get('linkedin_url', ''),
+            'Primary Email': contact.get('email', ''),
+            'Phone Number': contact.get('phone', ''),
+            'Location': contact.get('location', ''),
+            'Status': contact.get('status', 'Deduplicated')
+        }
+        
+        # Only include non-empty fields
+        filtered_fields = {k: v for k, v in fields.items() if v}
+        
+        records.append({
+            'id': airtable_id,
+            'fields': filtered_fields
+        })
     
     success_count = 0
-    
-    async with httpx.AsyncClient() as client:
-        # Process in batches of 10 (Airtable limit)
-        for i in range(0, len(contacts), 10):
-            batch = contacts[i:i+10]
-            records = []
-            
-            for contact in batch:
-                airtable_id = contact.get('airtable_id')
-                if not airtable_id:
-                    continue  # Skip contacts without Airtable ID
-                    
-                # Convert back to Airtable format
-                fields = {
-                    'Full Name': contact.get('name', ''),
-                    'SignalHire ID': contact.get('uid', ''),
-                    'Job Title': contact.get('job_title', ''),
-                    'Company': contact.get('company', ''),
-                    'LinkedIn URL': contact.get('linkedin_url', ''),
-                    'Primary Email': contact.get('email', ''),
-                    'Phone Number': contact.get('phone', ''),
-                    'Location': contact.get('location', ''),
-                    'Status': contact.get('status', 'Deduplicated')
-                }
-                
-                # Only include non-empty fields
-                filtered_fields = {k: v for k, v in fields.items() if v}
-                
-                records.append({
-                    'id': airtable_id,
-                    'fields': filtered_fields
-                })
-            
-            if not records:
-                continue
-                
-            try:
-                response = await client.patch(url, headers=headers, json={'records': records})
-                response.raise_for_status()
-                success_count += len(records)
-                print(f"✅ Updated {len(records)} contacts in Airtable")
-                
-            except Exception as e:
-                print(f"❌ Error updating batch to Airtable: {e}")
+    if records:
+        # The client sends batches of 10 (Airtable limit)
+        try:
+            async with shared_airtable_client(airtable_api_key) as client:
+                result = await client.update_records(base_id, table_id, records)
+        except AirtableClientError as e:
+            print(f"❌ Error updating contacts in Airtable: {e}")
+        else:
+            for failure in result.failed:
+                print(f"❌ Error updating {len(failure.records)} contacts in Airtable: {failure.error}")
+            success_count = len(result.records)
+            print(f"✅ Updated {success_count} contacts in Airtable")
                 
     print(f"📊 Successfully updated {success_count}/{len(contacts)} contacts")
     return success_count > 0
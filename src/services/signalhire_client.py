@@ -9,21 +9,60 @@ import json
 import logging
 import os
 import random
+import sqlite3
+import threading
+import time
 import uuid
-from collections import deque
-from collections.abc import Awaitable, Callable
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+)
 from contextlib import suppress
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any
 
 import httpx
 import structlog
 
+from ..lib.adaptive_concurrency import AdaptiveConcurrencyLimiter, parse_retry_after
+from ..lib.async_utils import SingleFlight
 from ..lib.contact_cache import normalize_contacts
+from ..lib.credit_ledger import CreditLedger, get_credit_ledger
+from ..lib.rate_limit_registry import (
+    RateLimitRegistry,
+    get_rate_limit_registry,
+    key_fingerprint,
+)
+from ..lib.reveal_registry import (
+    RevealCompletion,
+    RevealRegistry,
+    get_reveal_registry,
+)
+from ..lib.search_cache import SearchCache, search_cache_key
+from ..lib.usage_ledger import UsageLedger
 
 DEFAULT_CALLBACK_URL = "http://64.225.1.24/signalhire/callback"
 
+# Person API accepts at most 100 items (UIDs, LinkedIn URLs, emails) per request
+PERSON_API_MAX_ITEMS = 100
+# Multi-item reveal failures that are split and resubmitted to isolate bad items
+SPLITTABLE_REVEAL_ERRORS = {400, 406, 422}
+# Callback item statuses worth submitting again
+RETRYABLE_CALLBACK_STATUSES = {"timeout_exceeded"}
+
+# Queue path that keeps the batch queue in memory instead of on disk
+IN_MEMORY_QUEUE = ":memory:"
+
+
+def _default_queue_path() -> Path:
+    """Return the default location of the batch queue database."""
+    return Path.home() / ".signalhire-agent" / "queue" / "batch_queue.db"
+
 
 @dataclass
 class APIResponse:
@@ -37,6 +76,25 @@ class APIResponse:
     credits_remaining: int | None = None
 
 
+@dataclass
+class RevealResult:
+    """Outcome of one item yielded by SignalHireClient.stream_reveal."""
+
+    index: int  # Position of the item in the input stream
+    item: str
+    response: APIResponse
+
+
+@dataclass
+class SearchPage:
+    """One page of scroll-search results yielded by SignalHireClient.iter_search_pages."""
+
+    number: int  # 1-based position within the scroll
+    profiles: list[dict[str, Any]]
+    scroll_id: str | None  # Cursor for the page after this one, if any
+    response: APIResponse
+
+
 class SignalHireAPIError(Exception):
     """Custom exception for SignalHire API errors."""
 
@@ -57,77 +115,53 @@ class RateLimiter:
     def __init__(
         self,
         max_requests: int = 600,
-        time_window: int = 60,
         daily_limit: int = 5000,
         search_profile_limit: int = 5000,
+        usage_ledger: UsageLedger | None = None,
+        registry: RateLimitRegistry | None = None,
+        api_key: str | None = None,
     ):
         self.max_requests = max_requests
-        self.time_window = time_window
         self.daily_limit = daily_limit  # API daily limit (5000 reveals/day)
         self.search_profile_limit = (
             search_profile_limit  # Search profile daily limit (5000/day)
         )
-        self.requests = []
-        self.daily_usage = {
-            "credits_used": 0,
-            "reveals": 0,
-            "search_profiles": 0,
-            "last_reset": datetime.now().date(),
-        }
+        self.usage_ledger = usage_ledger or UsageLedger()
+        # Per-minute admission comes from the process-wide (optionally
+        # host-wide) registry alone, shared with every other caller of the key
+        self.registry = registry or get_rate_limit_registry()
+        self.api_key = api_key
 
     async def _check_daily_usage(self) -> dict:
-        """Check current daily usage from operation tracking."""
-        try:
-            from pathlib import Path
-
-            # Try to load from local operation tracking
-            operations_dir = Path.home() / '.signalhire-agent' / 'operations'
-            if operations_dir.exists():
-                usage_data = {"credits_used": 0, "reveals": 0, "search_profiles": 0}
-                one_day_ago = datetime.now() - timedelta(days=1)
-
-                for op_file in operations_dir.glob("*.json"):
-                    try:
-                        import json
-
-                        with open(op_file) as f:
-                            op_data = json.load(f)
-
-                        created_time = datetime.fromisoformat(
-                            op_data.get('created_at', '').replace('Z', '+00:00')
-                        )
-                        if created_time.replace(tzinfo=None) < one_day_ago:
-                            continue
-
-                        if (
-                            op_data.get("type") == "reveal"
-                            and op_data.get("status") == "completed"
-                        ):
-                            usage_data["reveals"] += 1
-                            if op_data.get("results"):
-                                usage_data["credits_used"] += op_data["results"].get(
-                                    "credits_used", 0
-                                )
-                        elif (
-                            op_data.get("type") == "search"
-                            and op_data.get("status") == "completed"
-                        ):
-                            if op_data.get("results"):
-                                # Count search profiles from API response
-                                profiles = (
-                                    op_data["results"].get("profiles")
-                                    or op_data["results"].get("prospects")
-                                    or []
-                                )
-                                usage_data["search_profiles"] += len(profiles)
-                    except (ValueError, TypeError, json.JSONDecodeError):
-                        continue
-
-                return usage_data
-        except (OSError, ImportError):
-            pass
+        """Check rolling 24h usage from the persistent usage ledger."""
+        # Loading the ledger may wait on another process's lock; keep it off the loop
+        totals = await asyncio.to_thread(self.usage_ledger.totals)
+        return {
+            "credits_used": totals["credits_used"],
+            "reveals": totals["reveals"],
+            "search_profiles": totals["search_profiles"],
+        }
 
-        return {"credits_used": 0, "reveals": 0, "search_profiles": 0}
+    def record_usage(
+        self,
+        *,
+        credits_used: int = 0,
+        reveals: int = 0,
+        search_profiles: int = 0,
+        searches: int = 0,
+    ) -> None:
+        """Persist consumed quota so later checks (and other processes) see it."""
+        try:
+            self.usage_ledger.record(
+                credits_used=credits_used,
+                reveals=reveals,
+                search_profiles=search_profiles,
+                searches=searches,
+            )
+        except OSError as exc:
+            structlog.get_logger(__name__).warning(
+                "Failed to record API usage", error=str(exc)
+            )
 
     async def check_daily_limits(self) -> dict:
         """Check if daily limits are approaching or exceeded."""
@@ -173,20 +207,18 @@ class RateLimiter:
         return result
 
     async def wait_if_needed(
-        self, credits_needed: int = 1, search_profiles_needed: int = 0
+        self,
+        credits_needed: int = 1,
+        search_profiles_needed: int = 0,
+        elements: int = 1,
+        endpoint: str | None = None,
     ) -> dict:
-        """Wait if rate limit would be exceeded, with daily limit checking."""
-        now = datetime.now()
-
-        # Reset daily counter if it's a new day
-        if now.date() != self.daily_usage["last_reset"]:
-            self.daily_usage = {
-                "credits_used": 0,
-                "reveals": 0,
-                "search_profiles": 0,
-                "last_reset": now.date(),
-            }
-
+        """
+        Wait if rate limit would be exceeded, with daily limit checking.
+        ``elements`` is the number of per-minute slots the request consumes
+        (one per item for multi-item Person API requests); ``endpoint`` selects
+        the endpoint level of the shared rate limit registry.
+        """
         # Check daily limits first
         daily_status = await self.check_daily_limits()
 
@@ -200,7 +232,7 @@ class RateLimiter:
                 f"Insufficient daily search profile quota. Need {search_profiles_needed}, have {daily_status['search_profiles_remaining']} remaining"
             )
 
-        if not daily_status["can_proceed"]:
+        if credits_needed > 0 and not daily_status["can_proceed"]:
             raise SignalHireAPIError(
                 f"Daily API limit exceeded ({self.daily_limit} credits/day). Current usage: {daily_status['current_usage']}"
             )
@@ -210,28 +242,11 @@ class RateLimiter:
                 f"Daily search profile limit exceeded ({self.search_profile_limit} profiles/day). Current usage: {daily_status['search_profiles_used']}"
             )
 
-        # Check per-minute rate limiting
-        self.requests = [
-            req_time
-            for req_time in self.requests
-            if now - req_time < timedelta(seconds=self.time_window)
-        ]
-
-        if len(self.requests) >= self.max_requests:
-            oldest_request = min(self.requests)
-            wait_time = self.time_window - (now - oldest_request).total_seconds()
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-
-        # Record this request
-        self.requests.append(now)
-
-        # Update daily usage tracking
-        self.daily_usage["credits_used"] += credits_needed
-        if credits_needed > 0:
-            self.daily_usage["reveals"] += 1
-        if search_profiles_needed > 0:
-            self.daily_usage["search_profiles"] += search_profiles_needed
+        # Per-minute rate limiting (one slot per element)
+        elements = max(1, min(elements, self.max_requests))
+        await self.registry.acquire(
+            "signalhire", endpoint, key=self.api_key, n=elements
+        )
 
         return daily_status
 
@@ -456,18 +471,133 @@ class BatchQueue:
     Queue management system for batch operations within API limits.
     Handles queuing, prioritization, and automatic batching of prospect
     contact reveals while respecting API rate limits and daily quotas.
+
+    Items live in an embedded SQLite database (WAL journal) so the backlog
+    survives crashes and Ctrl-C. ``path`` defaults to ``SIGNALHIRE_QUEUE_DB``
+    and then to ``~/.signalhire-agent/queue/batch_queue.db``; pass
+    ``":memory:"`` (or set the variable to it) to keep the queue in memory.
+    Ready items are ordered by an index on
+    (priority, sequence), giving O(log n) enqueue and dequeue, and item IDs
+    are the primary key for O(1) lookups.
+
+    Dequeued items are leased rather than removed: ``get_next_batch`` marks
+    them as processing until ``lease_timeout`` seconds pass, and
+    ``mark_completed`` acknowledges them. Leases that are never acknowledged
+    (an interrupted run) expire and the items become available again, so a new
+    run resumes exactly where the previous one stopped.
     """
 
-    def __init__(self, max_batch_size: int = 10, max_daily_contacts: int = 5000):
-        self.queue: deque[QueueItem] = deque()
-        self.processing: set[str] = set()  # Currently processing items
-        self.completed: dict[str, QueueItem] = {}  # Successfully completed
-        self.failed: dict[str, QueueItem] = {}  # Failed items
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS queue_items (
+            id TEXT PRIMARY KEY,
+            prospect_id TEXT NOT NULL,
+            priority INTEGER NOT NULL,
+            seq INTEGER NOT NULL,
+            state TEXT NOT NULL,
+            retry_count INTEGER NOT NULL DEFAULT 0,
+            max_retries INTEGER NOT NULL DEFAULT 3,
+            lease_until REAL,
+            added_at TEXT NOT NULL,
+            metadata TEXT
+        );
+        CREATE INDEX IF NOT EXISTS queue_items_ready
+            ON queue_items (state, priority DESC, seq);
+        CREATE INDEX IF NOT EXISTS queue_items_leases
+            ON queue_items (state, lease_until);
+        CREATE INDEX IF NOT EXISTS queue_items_seq ON queue_items (seq);
+        CREATE TABLE IF NOT EXISTS queue_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = 10,
+        max_daily_contacts: int = 5000,
+        path: str | os.PathLike[str] | None = None,
+        lease_timeout: float = 300.0,
+    ):
         self.max_batch_size = max_batch_size
         self.max_daily_contacts = max_daily_contacts
-        self.daily_count = 0
-        self.day_start = datetime.now().date()
+        self.lease_timeout = lease_timeout
+        self.path = str(
+            path or os.getenv("SIGNALHIRE_QUEUE_DB") or _default_queue_path()
+        )
         self.logger = structlog.get_logger(__name__)
+        self._lock = threading.Lock()
+
+        if self.durable:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._db = sqlite3.connect(
+            self.path, timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        self._db.row_factory = sqlite3.Row
+        if self.durable:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(self._SCHEMA)
+
+        self.day_start = datetime.now().date()
+        self.daily_count = 0
+        day = self._get_meta("day_start")
+        if day == self.day_start.isoformat():
+            self.daily_count = int(self._get_meta("daily_count") or 0)
+
+    @property
+    def durable(self) -> bool:
+        return self.path != IN_MEMORY_QUEUE
+
+    def _get_meta(self, key: str) -> str | None:
+        row = self._db.execute(
+            "SELECT value FROM queue_meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row["value"] if row else None
+
+    def _set_daily_count(self) -> None:
+        self._db.executemany(
+            "INSERT OR REPLACE INTO queue_meta (key, value) VALUES (?, ?)",
+            [
+                ("day_start", self.day_start.isoformat()),
+                ("daily_count", str(self.daily_count)),
+            ],
+        )
+
+    def _next_seq(self) -> int:
+        row = self._db.execute("SELECT MAX(seq) FROM queue_items").fetchone()
+        return (row[0] or 0) + 1
+
+    @staticmethod
+    def _to_item(row: sqlite3.Row) -> QueueItem:
+        return QueueItem(
+            id=row["id"],
+            prospect_id=row["prospect_id"],
+            priority=row["priority"],
+            added_at=datetime.fromisoformat(row["added_at"]),
+            retry_count=row["retry_count"],
+            max_retries=row["max_retries"],
+            metadata=json.loads(row["metadata"]) if row["metadata"] else {},
+        )
+
+    def _count(self, state: str) -> int:
+        return self._db.execute(
+            "SELECT COUNT(*) FROM queue_items WHERE state = ?", (state,)
+        ).fetchone()[0]
+
+    def __len__(self) -> int:
+        """Number of items waiting to be processed."""
+        with self._lock:
+            return self._count("queued")
+
+    @property
+    def queue(self) -> list[QueueItem]:
+        """Waiting items in processing order."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM queue_items WHERE state = 'queued' "
+                "ORDER BY priority DESC, seq"
+            ).fetchall()
+        return [self._to_item(row) for row in rows]
 
     def reset_daily_count(self) -> None:
         """Reset daily contact count if it's a new day."""
@@ -475,8 +605,40 @@ class BatchQueue:
         if today != self.day_start:
             self.daily_count = 0
             self.day_start = today
+            with self._lock:
+                self._set_daily_count()
             self.logger.info("Daily contact count reset", new_day=today.isoformat())
 
+    def _insert(
+        self,
+        prospect_ids: list[str],
+        priority: int,
+        metadata: dict[str, Any] | None,
+    ) -> list[str]:
+        """Insert items in one transaction. Returns their IDs."""
+        added_at = datetime.now().isoformat()
+        encoded = json.dumps(metadata or {}, default=str)
+        item_ids = [str(uuid.uuid4()) for _ in prospect_ids]
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                seq = self._next_seq()
+                self._db.executemany(
+                    "INSERT INTO queue_items (id, prospect_id, priority, seq, state, "
+                    "added_at, metadata) VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+                    [
+                        (item_id, prospect_id, priority, seq + i, added_at, encoded)
+                        for i, (item_id, prospect_id) in enumerate(
+                            zip(item_ids, prospect_ids, strict=True)
+                        )
+                    ],
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return item_ids
+
     def add_item(
         self,
         prospect_id: str,
@@ -487,36 +649,16 @@ class BatchQueue:
         Add a prospect to the processing queue.
         Returns the queue item ID for tracking.
         """
-        item_id = str(uuid.uuid4())
-        item = QueueItem(
-            id=item_id,
-            prospect_id=prospect_id,
-            priority=priority,
-            metadata=metadata or {},
-        )
-
-        # Insert based on priority (higher priority = processed first)
-        if priority >= 3:  # Urgent
-            self.queue.appendleft(item)
-        elif priority >= 2:  # High
-            # Insert after other high priority items
-            insert_pos = 0
-            for i, existing_item in enumerate(self.queue):
-                if existing_item.priority < 2:
-                    insert_pos = i
-                    break
-            else:
-                insert_pos = len(self.queue)
-            self.queue.insert(insert_pos, item)
-        else:  # Normal
-            self.queue.append(item)
+        # Higher priority is processed first (3=urgent, 2=high, 1=normal),
+        # FIFO within the same priority
+        item_id = self._insert([prospect_id], priority, metadata)[0]
 
         self.logger.info(
             "Item added to queue",
             item_id=item_id,
             prospect_id=prospect_id,
             priority=priority,
-            queue_size=len(self.queue),
+            queue_size=len(self),
         )
 
         return item_id
@@ -531,24 +673,23 @@ class BatchQueue:
         Add multiple prospects to the queue.
         Returns list of queue item IDs.
         """
-        item_ids = []
-        for prospect_id in prospect_ids:
-            item_id = self.add_item(prospect_id, priority, metadata)
-            item_ids.append(item_id)
+        # One transaction and one log line for the whole batch
+        item_ids = self._insert(list(prospect_ids), priority, metadata)
 
         self.logger.info(
             "Batch added to queue",
             batch_size=len(prospect_ids),
             priority=priority,
-            total_queue_size=len(self.queue),
+            total_queue_size=len(self),
         )
 
         return item_ids
 
     def get_next_batch(self, batch_size: int | None = None) -> list[QueueItem]:
         """
-        Get the next batch of items to process.
-        Respects daily limits and returns items that can be processed.
+        Lease the next batch of items to process.
+        Respects daily limits and returns items that can be processed; each
+        must be acknowledged with mark_completed before the lease expires.
         """
         self.reset_daily_count()
 
@@ -566,34 +707,41 @@ class BatchQueue:
             return []
 
         batch_size = min(batch_size, available_slots)
-        batch = []
-
-        while len(batch) < batch_size and self.queue:
-            item = self.queue.popleft()
-
-            # Skip if already processing or completed
-            if item.id in self.processing or item.id in self.completed:
-                continue
-
-            # Check retry limit
-            if item.retry_count >= item.max_retries:
-                self.failed[item.id] = item
-                self.logger.warning(
-                    "Item exceeded max retries",
-                    item_id=item.id,
-                    prospect_id=item.prospect_id,
-                    retry_count=item.retry_count,
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                # Expired leases belong to interrupted runs; make them available
+                expired = self._db.execute(
+                    "UPDATE queue_items SET state = 'queued', lease_until = NULL "
+                    "WHERE state = 'processing' AND lease_until <= ?",
+                    (now,),
+                ).rowcount
+                rows = self._db.execute(
+                    "SELECT * FROM queue_items WHERE state = 'queued' "
+                    "ORDER BY priority DESC, seq LIMIT ?",
+                    (batch_size,),
+                ).fetchall()
+                self._db.executemany(
+                    "UPDATE queue_items SET state = 'processing', lease_until = ? "
+                    "WHERE id = ?",
+                    [(now + self.lease_timeout, row["id"]) for row in rows],
                 )
-                continue
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            remaining = self._count("queued")
 
-            batch.append(item)
-            self.processing.add(item.id)
+        if expired:
+            self.logger.info("Expired queue leases reclaimed", count=expired)
 
+        batch = [self._to_item(row) for row in rows]
         if batch:
             self.logger.info(
                 "Batch prepared for processing",
                 batch_size=len(batch),
-                remaining_queue=len(self.queue),
+                remaining_queue=remaining,
                 daily_count=self.daily_count,
             )
 
@@ -601,32 +749,66 @@ class BatchQueue:
 
     def mark_completed(self, item_id: str, success: bool = True) -> None:
         """
-        Mark an item as completed (success or failure).
+        Mark a leased item as completed (success or failure).
+        Failed items are queued again until they reach max_retries.
         """
-        if item_id in self.processing:
-            self.processing.remove(item_id)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT retry_count, max_retries FROM queue_items "
+                    "WHERE id = ? AND state = 'processing'",
+                    (item_id,),
+                ).fetchone()
+                if row is not None and success:
+                    self._db.execute(
+                        "UPDATE queue_items SET state = 'completed', lease_until = NULL "
+                        "WHERE id = ?",
+                        (item_id,),
+                    )
+                    # Re-read inside the transaction so processes sharing the
+                    # database keep one daily count
+                    if self._get_meta("day_start") == self.day_start.isoformat():
+                        self.daily_count = int(self._get_meta("daily_count") or 0)
+                    self.daily_count += 1
+                    self._set_daily_count()
+                elif row is not None:
+                    retry_count = row["retry_count"] + 1
+                    exhausted = retry_count >= row["max_retries"]
+                    # Retries go to the back of their priority level
+                    self._db.execute(
+                        "UPDATE queue_items SET state = ?, retry_count = ?, "
+                        "seq = ?, lease_until = NULL WHERE id = ?",
+                        (
+                            "failed" if exhausted else "queued",
+                            retry_count,
+                            self._next_seq(),
+                            item_id,
+                        ),
+                    )
+                    if exhausted:
+                        self.logger.warning(
+                            "Item exceeded max retries",
+                            item_id=item_id,
+                            retry_count=retry_count,
+                        )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
 
-            if success:
-                # Find the item and move to completed
-                for item in (
-                    list(self.queue)
-                    + list(self.completed.values())
-                    + list(self.failed.values())
-                ):
-                    if item.id == item_id:
-                        self.completed[item_id] = item
-                        self.daily_count += 1
-                        break
-            else:
-                # Move back to queue for retry
-                for item in list(self.completed.values()) + list(self.failed.values()):
-                    if item.id == item_id:
-                        item.retry_count += 1
-                        if item.retry_count < item.max_retries:
-                            self.queue.append(item)
-                        else:
-                            self.failed[item_id] = item
-                        break
+    def release(self, item_ids: Iterable[str]) -> int:
+        """
+        Return leased items to the queue without counting a retry (e.g. when a
+        run is cancelled). Returns the number of items released.
+        """
+        with self._lock:
+            cursor = self._db.executemany(
+                "UPDATE queue_items SET state = 'queued', lease_until = NULL "
+                "WHERE id = ? AND state = 'processing'",
+                [(item_id,) for item_id in item_ids],
+            )
+            return cursor.rowcount
 
     def get_queue_stats(self) -> dict[str, Any]:
         """
@@ -634,31 +816,47 @@ class BatchQueue:
         """
         self.reset_daily_count()
 
+        with self._lock:
+            counts = dict.fromkeys(("queued", "processing", "completed", "failed"), 0)
+            counts.update(
+                self._db.execute(
+                    "SELECT state, COUNT(*) FROM queue_items GROUP BY state"
+                ).fetchall()
+            )
+
         return {
-            "queue_size": len(self.queue),
-            "processing": len(self.processing),
-            "completed": len(self.completed),
-            "failed": len(self.failed),
+            "queue_size": counts["queued"],
+            "processing": counts["processing"],
+            "completed": counts["completed"],
+            "failed": counts["failed"],
             "daily_count": self.daily_count,
             "daily_limit": self.max_daily_contacts,
             "daily_remaining": max(0, self.max_daily_contacts - self.daily_count),
-            "total_processed": len(self.completed) + len(self.failed),
-            "success_rate": len(self.completed)
-            / max(1, len(self.completed) + len(self.failed))
+            "total_processed": counts["completed"] + counts["failed"],
+            "success_rate": counts["completed"]
+            / max(1, counts["completed"] + counts["failed"])
             * 100,
+            "durable": self.durable,
             "timestamp": datetime.now().isoformat(),
         }
 
     def clear_completed(self) -> int:
         """
-        Clear completed items from memory.
+        Clear completed items from the store.
         Returns number of items cleared.
         """
-        cleared_count = len(self.completed)
-        self.completed.clear()
+        with self._lock:
+            cleared_count = self._db.execute(
+                "DELETE FROM queue_items WHERE state = 'completed'"
+            ).rowcount
         self.logger.info("Completed items cleared", cleared_count=cleared_count)
         return cleared_count
 
+    def close(self) -> None:
+        """Close the underlying database."""
+        with self._lock:
+            self._db.close()
+
 
 class SignalHireClient:
     """
@@ -673,6 +871,10 @@ class SignalHireClient:
         base_url: str = "https://www.signalhire.com/api/v1",
         api_prefix: str = "",
         callback_url: str | None = None,
+        search_cache: SearchCache | None = None,
+        credit_ledger: CreditLedger | None = None,
+        queue_path: str | os.PathLike[str] | None = None,
+        reveal_registry: RevealRegistry | None = None,
     ):
         # Allow environment variables to override defaults
         env_base = os.getenv("SIGNALHIRE_API_BASE_URL")
@@ -693,15 +895,32 @@ class SignalHireClient:
         prefix_value = env_prefix if env_prefix else api_prefix
         self.api_prefix = ("/" + prefix_value.strip("/")) if prefix_value else ""
         self.callback_url = resolved_callback.strip() if resolved_callback else None
-        self.rate_limiter = RateLimiter(max_requests=600, time_window=60)  # 600/minute
+        self.rate_limiter = RateLimiter(
+            max_requests=600, api_key=self.api_key
+        )  # 600/minute
         self.session: httpx.AsyncClient | None = None
         self._credits_cache: dict[str, Any] | None = None
         self._cache_timestamp: datetime | None = None
         self._cache_ttl = 300  # 5 minutes
+        # Concurrent identical idempotent requests share one in-flight call
+        self._single_flight = SingleFlight()
+        self._credits_cache_hits = 0
+        # Balance reported by X-Credits-Left on every response; check_credits
+        # answers from it while fresh instead of calling /credits
+        self.credit_ledger = credit_ledger or get_credit_ledger()
+        self._credits_ledger_hits = 0
+        # Optional on-disk cache in front of searchByQuery (scroll pages are live)
+        self.search_cache = search_cache
         # Enhanced controls
-        self.max_concurrency: int = 5
+        # Ceiling on reveal requests in flight; the adaptive "reveal" limiter
+        # decides how much of it is actually used
+        self.max_concurrency: int = 20
         self.max_retries: int = 3
         self.retry_backoff_base: float = 0.25
+        # Shared with the in-process CallbackServer, which resolves requests
+        # as their callbacks are processed. It also remembers the items of
+        # each request for matching callbacks, and expires both together
+        self.reveal_registry = reveal_registry or get_reveal_registry()
         self.logger = structlog.get_logger(__name__)
 
         if callback_url:
@@ -725,8 +944,12 @@ class SignalHireClient:
                 callback_url=self.callback_url,
             )
 
-        # Queue management
-        self.batch_queue = BatchQueue(max_batch_size=10, max_daily_contacts=5000)
+        # Queue management; on disk unless queue_path is ":memory:"
+        self.batch_queue = BatchQueue(
+            max_batch_size=10,
+            max_daily_contacts=5000,
+            path=queue_path,
+        )
         # Enhanced retry strategy
         self.retry_strategy = RetryStrategy(
             max_retries=self.max_retries,
@@ -735,8 +958,19 @@ class SignalHireClient:
             circuit_breaker_threshold=10,
             circuit_breaker_timeout=120.0,
         )
-        # Search API concurrency limit (max 3 concurrent requests)
-        self._search_semaphore = asyncio.Semaphore(3)
+        # Adaptive (AIMD) in-flight limits per endpoint family. Search is capped
+        # at the documented 3 concurrent requests.
+        self.concurrency_limiters: dict[str, AdaptiveConcurrencyLimiter] = {
+            "search": AdaptiveConcurrencyLimiter(
+                "search", initial_limit=3, max_limit=3, latency_target=10.0
+            ),
+            "reveal": AdaptiveConcurrencyLimiter(
+                "reveal", initial_limit=5, max_limit=self.max_concurrency
+            ),
+            "credits": AdaptiveConcurrencyLimiter(
+                "credits", initial_limit=2, max_limit=5
+            ),
+        }
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -767,22 +1001,37 @@ class SignalHireClient:
         if self.session:
             await self.session.aclose()
             self.session = None
+        # Write the balance the debounced ledger is still holding back
+        self.credit_ledger.flush()
 
     async def _make_request(self, method: str, endpoint: str, **kwargs) -> APIResponse:
         """Make an API request with rate limiting and error handling."""
         if not self.session:
             await self.start_session()
 
-        # Estimate search profiles needed based on endpoint and size
+        endpoint_path = "/" + endpoint.lstrip("/")
+        json_data = kwargs.get("json") or {}
+
+        # Charge the rate limiter per item: every Person API item costs a credit
+        # and counts against the 600 items/minute limit, searches cost profiles
+        credits_needed = 0
         search_profiles_needed = 0
-        if "/candidate/search" in endpoint and method == "POST":
-            # Estimate search profiles based on size parameter
-            json_data = kwargs.get('json', {})
-            search_profiles_needed = json_data.get('size', 25)  # Default size is 25
+        elements = 1
+        if method == "POST" and endpoint_path == "/candidate/search":
+            items = json_data.get("items") or []
+            credits_needed = len(items)
+            elements = max(1, len(items))
+        elif method == "POST" and endpoint_path.startswith(
+            ("/candidate/searchByQuery", "/candidate/scrollSearch")
+        ):
+            search_profiles_needed = json_data.get("size", 25)  # Default size is 25
 
         # Apply rate limiting with daily usage tracking
         daily_status = await self.rate_limiter.wait_if_needed(
-            search_profiles_needed=search_profiles_needed
+            credits_needed=credits_needed,
+            search_profiles_needed=search_profiles_needed,
+            elements=elements,
+            endpoint=_endpoint_family(endpoint_path),
         )
 
         # Log warnings for high daily usage
@@ -797,11 +1046,10 @@ class SignalHireClient:
                     f"High daily usage: Credits: {daily_status['percentage_used']:.1f}%, Search: {daily_status['search_percentage_used']:.1f}%"
                 )
 
-        endpoint_path = "/" + endpoint.lstrip("/")
         url = f"{self.base_url}{self.api_prefix}{endpoint_path}"
 
         try:
-            response = await self.session.request(method, url, **kwargs)
+            response = await self._send(method, url, endpoint_path, **kwargs)
 
             # Parse response
             try:
@@ -822,6 +1070,14 @@ class SignalHireClient:
                     if credits_remaining_header and credits_remaining_header.isdigit()
                     else data.get("credits_remaining")
                 )
+                if (
+                    credits_remaining_header
+                    and credits_remaining_header.isdigit()
+                    and self.api_key
+                ):
+                    self.credit_ledger.update(self.api_key, credits_remaining)
+
+                self._record_usage(method, endpoint_path, kwargs.get("json"), data)
 
                 return APIResponse(
                     success=True,
@@ -908,8 +1164,66 @@ class SignalHireClient:
 
             return APIResponse(success=False, error=enhanced_error, status_code=None)
 
+    async def _send(
+        self, method: str, url: str, endpoint_path: str, **kwargs
+    ) -> httpx.Response:
+        """Send a request inside the adaptive concurrency slot of its endpoint family."""
+        limiter = self.concurrency_limiters.get(_endpoint_family(endpoint_path))
+        if limiter is None:
+            return await self.session.request(method, url, **kwargs)
+
+        await limiter.acquire()
+        started = time.monotonic()
+        status_code: int | None = None
+        retry_after: float | None = None
+        try:
+            response = await self.session.request(method, url, **kwargs)
+            status_code = response.status_code
+            if status_code in (429, 503):
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            return response
+        finally:
+            limiter.release(time.monotonic() - started, status_code, retry_after)
+
+    def _record_usage(
+        self,
+        method: str,
+        endpoint_path: str,
+        json_body: dict[str, Any] | None,
+        data: dict[str, Any],
+    ) -> None:
+        """Charge a successful request against the persistent daily usage ledger."""
+        if method != "POST":
+            return
+        if endpoint_path == "/candidate/search":
+            items = (json_body or {}).get("items") or []
+            self.rate_limiter.record_usage(
+                credits_used=len(items), reveals=len(items)
+            )
+        elif endpoint_path.startswith(
+            ("/candidate/searchByQuery", "/candidate/scrollSearch")
+        ):
+            profiles = data.get("profiles") or data.get("prospects") or []
+            self.rate_limiter.record_usage(
+                search_profiles=len(profiles), searches=1
+            )
+
     async def check_credits(self) -> APIResponse:
-        """Check current credit balance and usage."""
+        """
+        Check current credit balance and usage.
+
+        Answers from the credit ledger when a recent response reported the
+        balance, so no /credits request (or rate limit slot) is spent.
+        """
+        snapshot = self.credit_ledger.fresh(self.api_key) if self.api_key else None
+        if snapshot is not None:
+            self._credits_ledger_hits += 1
+            return APIResponse(
+                success=True,
+                data=snapshot.as_credits_data(),
+                credits_remaining=snapshot.credits,
+            )
+
         # Check cache first
         if (
             self._credits_cache
@@ -917,19 +1231,35 @@ class SignalHireClient:
             and datetime.now() - self._cache_timestamp
             < timedelta(seconds=self._cache_ttl)
         ):
+            self._credits_cache_hits += 1
             return APIResponse(success=True, data=self._credits_cache)
 
-        response = await self._make_request("GET", "/credits")
+        async def fetch() -> APIResponse:
+            response = await self._make_request("GET", "/credits")
+
+            # Cache successful responses
+            if response.success and response.data:
+                self._credits_cache = response.data
+                self._cache_timestamp = datetime.now()
+                credits = response.data.get("credits")
+                if response.credits_remaining is None and isinstance(credits, int):
+                    response.credits_remaining = credits
+                    if self.api_key:
+                        self.credit_ledger.update(
+                            self.api_key, credits, source="credits"
+                        )
 
-        # Cache successful responses
-        if response.success and response.data:
-            self._credits_cache = response.data
-            self._cache_timestamp = datetime.now()
+            return response
 
-        return response
+        return await self._single_flight.do(("GET", "/credits"), fetch)
 
     async def search_prospects(
-        self, search_criteria: dict[str, Any], size: int = 25
+        self,
+        search_criteria: dict[str, Any],
+        size: int = 25,
+        *,
+        refresh: bool = False,
+        use_cache: bool = True,
     ) -> APIResponse:
         """
         Search for prospects using the SignalHire Search API.
@@ -938,6 +1268,9 @@ class SignalHireClient:
         Args:
             search_criteria: Dict with search filters (currentTitle, location, keywords, etc.)
             size: Number of results per batch (1-100, default 25)
+            refresh: Skip the search cache lookup (the response is still cached)
+            use_cache: Set to False when the returned scrollId will be followed;
+                a cached first page may carry a scroll cursor that has expired
         Returns:
             APIResponse with profiles array, total count, and scrollId if applicable
         """
@@ -947,24 +1280,126 @@ class SignalHireClient:
         # Prepare search data
         search_data = {"size": size, **search_criteria}
 
-        # Enforce single-concurrency per client for Search API
-        async with self._search_semaphore:
+        if not use_cache:
             return await self._make_request(
                 "POST", "/candidate/searchByQuery", json=search_data
             )
+        # Search API concurrency is bounded by the "search" adaptive limiter
+        return await self._cached_search(
+            "/candidate/searchByQuery", search_data, refresh=refresh
+        )
 
     async def scroll_search(self, request_id: int, scroll_id: str) -> APIResponse:
-        """Fetch next batch using POST /candidate/scrollSearch/{requestId} with JSON body {scrollId}."""
+        """Fetch next batch using POST /candidate/scrollSearch/{requestId} with JSON body {scrollId}.
+
+        Scroll cursors are single-use and expire on the server, so pages are
+        never served from the search cache.
+        """
         endpoint = f"/candidate/scrollSearch/{request_id}"
-        body = {"scrollId": scroll_id}
-        async with self._search_semaphore:
+        return await self._make_request("POST", endpoint, json={"scrollId": scroll_id})
+
+    async def _cached_search(
+        self, endpoint: str, body: dict[str, Any], *, refresh: bool = False
+    ) -> APIResponse:
+        """
+        POST a search request through the search cache, if one is configured.
+
+        Cache hits skip the rate limiter entirely, so they are not charged
+        against the daily search-profile quota. ``refresh`` bypasses the lookup
+        but still stores the fresh response.
+        """
+        if self.search_cache is None:
             return await self._make_request("POST", endpoint, json=body)
 
+        key = search_cache_key(
+            endpoint,
+            body,
+            namespace=key_fingerprint(self.api_key) if self.api_key else None,
+        )
+        if not refresh:
+            cached = self.search_cache.get(key)
+            if cached is not None:
+                self.logger.debug("Search cache hit", endpoint=endpoint)
+                return APIResponse(success=True, data=cached, status_code=200)
+
+        response = await self._make_request("POST", endpoint, json=body)
+        if response.success and isinstance(response.data, dict):
+            try:
+                self.search_cache.put(
+                    key, response.data, endpoint=endpoint, criteria=body
+                )
+            except OSError as exc:
+                self.logger.warning("Could not cache search response", error=str(exc))
+        return response
+
+    async def iter_search_pages(
+        self,
+        request_id: int,
+        scroll_id: str | None,
+        max_pages: int | None = None,
+    ) -> AsyncIterator[SearchPage]:
+        """
+        Walk a scroll search page by page, starting from ``scroll_id``.
+
+        The request for the next page is sent as soon as its scrollId is known,
+        before the current page is yielded, so the caller's processing of page
+        N overlaps the round trip for page N+1. All pages share one pooled
+        session, which is started if needed. Stops after ``max_pages`` pages or
+        when no scrollId is returned; raises SignalHireAPIError if a page fails.
+        """
+        if not self.session:
+            await self.start_session()
+
+        def fetch(cursor: str) -> asyncio.Task:
+            return asyncio.create_task(
+                self.scroll_search(int(request_id), cursor)
+            )
+
+        pending = fetch(scroll_id) if scroll_id and max_pages != 0 else None
+        number = 0
+        try:
+            while pending is not None:
+                response = await pending
+                pending = None
+                if not response.success:
+                    raise SignalHireAPIError(
+                        f"Scroll search failed on page {number + 1}: {response.error}",
+                        status_code=response.status_code,
+                        response_data=response.data,
+                    )
+                number += 1
+                data = response.data or {}
+                next_scroll_id = data.get("scrollId") or data.get("scroll_id")
+                if next_scroll_id and (max_pages is None or number < max_pages):
+                    pending = fetch(next_scroll_id)
+                yield SearchPage(
+                    number=number,
+                    profiles=data.get("profiles") or data.get("prospects") or [],
+                    scroll_id=next_scroll_id,
+                    response=response,
+                )
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def iter_search_profiles(
+        self, request_id: int, scroll_id: str | None, max_pages: int | None = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream individual profiles from a scroll search (see iter_search_pages)."""
+        async for page in self.iter_search_pages(request_id, scroll_id, max_pages):
+            for profile in page.profiles:
+                yield profile
+
     async def get_prospect_details(self, prospect_id: str) -> APIResponse:
         """Get detailed information for a specific prospect using search API."""
         # Use searchByQuery to find the prospect by ID
         search_query = {"query": f"id:{prospect_id}"}
-        return await self._make_request("POST", "/candidate/searchByQuery", json=search_query)
+        return await self._single_flight.do(
+            ("details", prospect_id),
+            lambda: self._make_request(
+                "POST", "/candidate/searchByQuery", json=search_query
+            ),
+        )
 
     async def reveal_contact_by_identifier(
         self, identifier: str, callback_url: str
@@ -977,20 +1412,23 @@ class SignalHireClient:
         Returns:
             APIResponse with request ID if successful
         """
-        data = {"items": [identifier], "callbackUrl": callback_url}
+        return await self.reveal_items([identifier], callback_url=callback_url)
 
-        return await self._make_request("POST", "/candidate/search", json=data)
-
-    async def reveal_contact(self, prospect_id: str) -> APIResponse:
-        """Reveal contact for a single prospect with retry logic (compatibility path)."""
+    async def _reveal_with_retry(
+        self, items: list[str], callback_url: str | None = None
+    ) -> APIResponse:
+        """POST ``items`` to the Person API, retrying transient failures."""
+        log_context: dict[str, Any] = (
+            {"prospect_id": items[0]} if len(items) == 1 else {"items": len(items)}
+        )
         attempt = 0
         while True:
             # Circuit breaker check
             if self.retry_strategy.circuit_open:
                 self.logger.warning(
                     "Circuit breaker open, skipping request",
-                    prospect_id=prospect_id,
                     attempt=attempt,
+                    **log_context,
                 )
                 return APIResponse(
                     success=False,
@@ -998,12 +1436,14 @@ class SignalHireClient:
                     status_code=503,
                 )
 
-            callback_destination = self.callback_url or DEFAULT_CALLBACK_URL
+            callback_destination = (
+                callback_url or self.callback_url or DEFAULT_CALLBACK_URL
+            )
             resp = await self._make_request(
                 "POST",
                 "/candidate/search",
                 json={
-                    "items": [prospect_id],
+                    "items": list(items),
                     "callbackUrl": callback_destination,
                 },
             )
@@ -1016,9 +1456,9 @@ class SignalHireClient:
                 if attempt > 1:
                     self.logger.info(
                         "Request succeeded after retry",
-                        prospect_id=prospect_id,
                         attempts=attempt,
                         final_status=resp.status_code,
+                        **log_context,
                     )
                 return resp
 
@@ -1030,212 +1470,523 @@ class SignalHireClient:
                 )
                 self.logger.warning(
                     "Request failed permanently",
-                    prospect_id=prospect_id,
                     attempts=attempt,
                     status_code=resp.status_code,
                     error_type=error_type,
                     error=resp.error,
+                    **log_context,
                 )
                 return resp
 
             delay = self.retry_strategy.calculate_delay(attempt)
             self.logger.info(
                 "Retrying request",
-                prospect_id=prospect_id,
                 attempt=attempt,
                 max_retries=self.retry_strategy.max_retries,
                 delay=round(delay, 2),
                 status_code=resp.status_code,
                 error=resp.error,
+                **log_context,
             )
             await asyncio.sleep(delay)
 
-    async def batch_reveal_contacts(
-        self,
-        prospect_ids: list[str],
-        batch_size: int = 10,
-        progress_callback: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
-    ) -> list[APIResponse]:
+    async def reveal_contact(self, prospect_id: str) -> APIResponse:
+        """Reveal contact for a single prospect with retry logic (compatibility path)."""
+        resp = await self._reveal_with_retry([prospect_id])
+        self._expect_reveal(resp, [prospect_id])
+        return resp
+
+    def _expect_reveal(self, resp: APIResponse, items: list[str]) -> None:
+        """Record an accepted request's items so its callback can be correlated."""
+        request_id = _extract_request_id(resp.data)
+        if resp.success and request_id is not None:
+            self.reveal_registry.expect(request_id, items)
+
+    async def reveal_items(
+        self, items: list[str], callback_url: str | None = None
+    ) -> APIResponse:
         """
-        Reveal contacts for multiple prospects in batches with enhanced progress reporting.
-        Limited to API constraints (~100 total). For larger operations,
-        use browser automation service.
+        Submit up to 100 UIDs, LinkedIn URLs or emails in one Person API request.
+        The returned request ID is remembered together with its items so the
+        callback can be matched back (see get_reveal_request_items).
         """
-        # Validate inputs
-        if not isinstance(prospect_ids, list) or any(
-            not isinstance(p, str) for p in prospect_ids
-        ):
-            raise SignalHireAPIError("prospect_ids must be a list of strings")
-        if not isinstance(batch_size, int) or batch_size <= 0:
-            raise SignalHireAPIError("batch_size must be a positive integer")
+        if not items:
+            raise SignalHireAPIError("items must not be empty")
+        if len(items) > PERSON_API_MAX_ITEMS:
+            raise SignalHireAPIError(
+                f"Person API accepts at most {PERSON_API_MAX_ITEMS} items per request",
+                status_code=406,
+            )
 
-        total = len(prospect_ids)
-        if total > 100:
+        resp = await self._reveal_with_retry(items, callback_url=callback_url)
+        self._expect_reveal(resp, items)
+        return resp
+
+    async def stream_reveal(
+        self,
+        items: AsyncIterable[str] | Iterable[str],
+        items_per_request: int = 1,
+        max_in_flight: int | None = None,
+        callback_url: str | None = None,
+    ) -> AsyncIterator[RevealResult]:
+        """
+        Reveal items from a (possibly async) stream with a sliding window of
+        requests in flight. A new request is submitted as soon as any request
+        finishes, so one slow request never holds back the rest, and results
+        are yielded in completion order as they arrive.
+
+        With ``items_per_request`` == 1 each item goes through reveal_contact;
+        otherwise items are packed into multi-item Person API requests which
+        are bisected when rejected as malformed.
+        """
+        if not 1 <= items_per_request <= PERSON_API_MAX_ITEMS:
             raise SignalHireAPIError(
-                "API batch reveal limited to 100 prospects. Use browser automation for larger batches."
+                f"items_per_request must be between 1 and {PERSON_API_MAX_ITEMS}"
             )
+        window = max_in_flight or self.max_concurrency
+        if window < 1:
+            raise SignalHireAPIError("max_in_flight must be a positive integer")
+
+        source = _aiter_items(items)
+        in_flight: set[asyncio.Task] = set()
+        pull: asyncio.Task | None = None
+        exhausted = False
+        next_index = 0
 
-        # Credit pre-check (assume 1 credit per reveal)
         try:
-            credits_response = await self.check_credits()
-            remaining = (
-                (credits_response.data or {}).get("credits_remaining")
-                if credits_response.success
-                else None
-            )
-            if isinstance(remaining, int) and remaining < total:
-                raise SignalHireAPIError(
-                    f"Insufficient credits: need {total}, have {remaining}",
-                    status_code=402,
-                    response_data={"needed": total, "remaining": remaining},
-                )
-        except SignalHireAPIError:
-            # Propagate credit errors
-            raise
-        except Exception as e:
-            # If credits check fails for other reasons, proceed but log the issue
-            self.logger.warning("Credit pre-check failed", error=str(e))
+            while True:
+                if pull is None and not exhausted and len(in_flight) < window:
+                    pull = asyncio.create_task(
+                        _next_chunk(source, items_per_request)
+                    )
 
-        # Enhanced progress tracking
-        start_time = datetime.now()
-        results = []
-        semaphore = asyncio.Semaphore(self.max_concurrency)
-
-        # Progress statistics
-        stats = {
-            "total": total,
-            "processed": 0,
-            "successful": 0,
-            "failed": 0,
-            "start_time": start_time,
-            "last_update": start_time,
-            "batch_size": batch_size,
-            "errors": [],
-            "estimated_completion": None,
-        }
+                waiting = in_flight | ({pull} if pull else set())
+                if not waiting:
+                    break
+                done, _ = await asyncio.wait(
+                    waiting, return_when=asyncio.FIRST_COMPLETED
+                )
 
-        async def wrapped_reveal(pid: str) -> APIResponse:
-            async with semaphore:
-                try:
-                    result = await self.reveal_contact(pid)
-
-                    # Update statistics
-                    stats["processed"] += 1
-                    if result.success:
-                        stats["successful"] += 1
-                    else:
-                        stats["failed"] += 1
-                        if result.error:
-                            stats["errors"].append(
-                                {
-                                    "prospect_id": pid,
-                                    "error": result.error,
-                                    "status_code": result.status_code,
-                                }
+                if pull is not None and pull in done:
+                    chunk, exhausted = pull.result()
+                    done.discard(pull)
+                    pull = None
+                    if chunk:
+                        indexed = list(enumerate(chunk, start=next_index))
+                        next_index += len(chunk)
+                        in_flight.add(
+                            asyncio.create_task(
+                                self._reveal_chunk(
+                                    indexed, items_per_request, callback_url
+                                )
                             )
+                        )
 
-                    # Calculate progress metrics
-                    elapsed = (datetime.now() - start_time).total_seconds()
-                    success_rate = (
-                        stats["successful"] / stats["processed"]
-                        if stats["processed"] > 0
-                        else 0
-                    )
-                    avg_time_per_contact = (
-                        elapsed / stats["processed"] if stats["processed"] > 0 else 0
+                for task in done:
+                    in_flight.discard(task)
+                    for result in task.result():
+                        yield result
+        finally:
+            for task in in_flight | ({pull} if pull else set()):
+                task.cancel()
+
+    async def _reveal_chunk(
+        self,
+        indexed: list[tuple[int, str]],
+        items_per_request: int,
+        callback_url: str | None,
+    ) -> list[RevealResult]:
+        """Reveal one window slot; never raises, failures become results."""
+        chunk = [item for _, item in indexed]
+        try:
+            if items_per_request == 1 and callback_url is None:
+                resp = await self.reveal_contact(chunk[0])
+                index, item = indexed[0]
+                return [RevealResult(index=index, item=item, response=resp)]
+            resp = await self.reveal_items(chunk, callback_url=callback_url)
+        except Exception as ex:  # noqa: BLE001
+            resp = APIResponse(success=False, error=str(ex))
+
+        if (
+            not resp.success
+            and len(indexed) > 1
+            and resp.status_code in SPLITTABLE_REVEAL_ERRORS
+        ):
+            middle = len(indexed) // 2
+            halves = await asyncio.gather(
+                self._reveal_chunk(indexed[:middle], items_per_request, callback_url),
+                self._reveal_chunk(indexed[middle:], items_per_request, callback_url),
+            )
+            return halves[0] + halves[1]
+
+        request_id = _extract_request_id(resp.data)
+        return [
+            RevealResult(
+                index=index,
+                item=item,
+                response=APIResponse(
+                    success=resp.success,
+                    data={"requestId": request_id, "item": item}
+                    if resp.success
+                    else {"item": item, **(resp.data or {})},
+                    error=resp.error,
+                    status_code=resp.status_code,
+                    credits_remaining=resp.credits_remaining,
+                ),
+            )
+            for index, item in indexed
+        ]
+
+    async def _collect_reveals(
+        self,
+        items: list[str],
+        items_per_request: int,
+        progress_callback: Callable[[dict[str, Any]], Awaitable[None]] | None,
+        callback_url: str | None = None,
+        batch_size: int | None = None,
+        credits_remaining: int | None = None,
+    ) -> list[APIResponse]:
+        """Drain stream_reveal into input order while reporting progress."""
+        total = len(items)
+        start_time = datetime.now()
+        results: list[APIResponse | None] = [None] * total
+        stats = {"processed": 0, "successful": 0, "failed": 0, "errors": []}
+
+        async for result in self.stream_reveal(
+            items, items_per_request=items_per_request, callback_url=callback_url
+        ):
+            resp = result.response
+            results[result.index] = resp
+            stats["processed"] += 1
+            if resp.success:
+                stats["successful"] += 1
+            else:
+                stats["failed"] += 1
+                if resp.error:
+                    stats["errors"].append(
+                        {
+                            "prospect_id": result.item,
+                            "error": resp.error,
+                            "status_code": resp.status_code,
+                        }
                     )
-                    remaining_contacts = total - stats["processed"]
 
-                    # Estimate completion time
-                    if avg_time_per_contact > 0:
-                        estimated_remaining = remaining_contacts * avg_time_per_contact
-                        stats["estimated_completion"] = datetime.now() + timedelta(
-                            seconds=estimated_remaining
-                        )
+            if not progress_callback:
+                continue
 
-                    # Enhanced progress report
-                    progress_data = {
-                        "current": stats["processed"],
+            processed = stats["processed"]
+            elapsed = (datetime.now() - start_time).total_seconds()
+            avg_time_per_contact = elapsed / processed
+            remaining_contacts = total - processed
+            estimated_completion = (
+                datetime.now() + timedelta(seconds=remaining_contacts * avg_time_per_contact)
+                if avg_time_per_contact > 0
+                else None
+            )
+            with suppress(Exception):
+                await progress_callback(
+                    {
+                        "current": processed,
                         "total": total,
                         "successful": stats["successful"],
                         "failed": stats["failed"],
-                        "success_rate": round(success_rate * 100, 1),
+                        "success_rate": round(stats["successful"] / processed * 100, 1),
                         "elapsed_seconds": round(elapsed, 1),
                         "avg_time_per_contact": round(avg_time_per_contact, 2),
                         "estimated_completion": (
-                            stats["estimated_completion"].isoformat()
-                            if stats["estimated_completion"]
+                            estimated_completion.isoformat()
+                            if estimated_completion
                             else None
                         ),
                         "remaining_contacts": remaining_contacts,
-                        "batch_size": batch_size,
-                        "recent_errors": (
-                            stats["errors"][-3:] if stats["errors"] else []
-                        ),  # Last 3 errors
+                        "batch_size": batch_size or items_per_request,
+                        "recent_errors": stats["errors"][-3:],
                         "credits_used": stats["successful"],
-                        "credits_remaining": remaining,
+                        "credits_remaining": credits_remaining,
                     }
+                )
 
-                    # Call progress callback if provided
-                    if progress_callback:
-                        with suppress(Exception):
-                            await progress_callback(progress_data)
-
-                    return result
-
-                except Exception as ex:
-                    # Update failure statistics
-                    stats["processed"] += 1
-                    stats["failed"] += 1
-                    stats["errors"].append(
-                        {"prospect_id": pid, "error": str(ex), "status_code": None}
-                    )
-
-                    # Return error response
-                    return APIResponse(
-                        success=False, error=str(ex), data={"prospect_id": pid}
-                    )
-
-        # Process in smaller batches to respect rate limits
-        for i in range(0, total, batch_size):
-            batch = prospect_ids[i : i + batch_size]
-            batch_results = await asyncio.gather(
-                *(wrapped_reveal(pid) for pid in batch)
-            )
-            results.extend(batch_results)
-
-            # Log batch completion
-            batch_num = (i // batch_size) + 1
-            total_batches = (total + batch_size - 1) // batch_size
-            self.logger.info(
-                "Batch completed",
-                batch=batch_num,
-                total_batches=total_batches,
-                batch_successful=sum(1 for r in batch_results if r.success),
-                batch_failed=sum(1 for r in batch_results if not r.success),
-            )
-
-        # Final progress report
         total_elapsed = (datetime.now() - start_time).total_seconds()
-        final_success_rate = stats["successful"] / total if total > 0 else 0
-
         self.logger.info(
             "Batch reveal completed",
             total=total,
+            items_per_request=items_per_request,
             successful=stats["successful"],
             failed=stats["failed"],
-            success_rate=round(final_success_rate * 100, 1),
+            success_rate=round(stats["successful"] / total * 100, 1) if total else 0,
             total_time=round(total_elapsed, 1),
-            avg_time_per_contact=round(total_elapsed / total, 2) if total > 0 else 0,
+            avg_time_per_contact=round(total_elapsed / total, 2) if total else 0,
             credits_used=stats["successful"],
         )
+        return results  # type: ignore[return-value]
+
+    async def batch_reveal_items(
+        self,
+        items: list[str],
+        items_per_request: int = PERSON_API_MAX_ITEMS,
+        progress_callback: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+        callback_url: str | None = None,
+    ) -> list[APIResponse]:
+        """
+        Reveal many items by packing them into multi-item Person API requests.
+        Returns one APIResponse per input item, in input order. Items in an
+        accepted request share its requestId. When a multi-item request is
+        rejected as malformed (400/406/422) it is split in half and resubmitted,
+        so only the offending items end up failed.
+        """
+        if not 1 <= items_per_request <= PERSON_API_MAX_ITEMS:
+            raise SignalHireAPIError(
+                f"items_per_request must be between 1 and {PERSON_API_MAX_ITEMS}"
+            )
+        # Always use reveal_items so every item is tracked under its request ID
+        return await self._collect_reveals(
+            items,
+            items_per_request,
+            progress_callback,
+            callback_url=callback_url or self.callback_url,
+        )
+
+    async def iter_revealed(
+        self,
+        items: AsyncIterable[str] | Iterable[str],
+        timeout: float | None = None,
+        *,
+        items_per_request: int = PERSON_API_MAX_ITEMS,
+        max_in_flight: int | None = None,
+        callback_url: str | None = None,
+    ) -> AsyncIterator[RevealCompletion]:
+        """
+        Reveal items and yield each contact as its callback lands.
+
+        Requests are submitted through stream_reveal while earlier callbacks
+        are already being yielded. Callbacks must reach a CallbackServer in
+        this process sharing the client's reveal registry. Items whose request
+        was rejected are yielded with status ``request_failed``, and items of
+        a request the registry abandoned (no callback within its ttl) with
+        status ``abandoned``. Iteration stops after ``timeout`` seconds even if
+        callbacks are outstanding.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        waiting: dict[asyncio.Future, str] = {}
+        # Items submitted under each request in ``waiting``; its keys also
+        # give an O(1) check per submitted item
+        awaited: dict[str, list[str]] = {}
+        rejected: list[RevealCompletion] = []
+        wake = asyncio.Event()
+
+        async def submit() -> None:
+            async for result in self.stream_reveal(
+                items,
+                items_per_request=items_per_request,
+                max_in_flight=max_in_flight,
+                callback_url=callback_url or self.callback_url,
+            ):
+                resp = result.response
+                request_id = _extract_request_id(resp.data) if resp.success else None
+                if request_id is None:
+                    rejected.append(
+                        RevealCompletion(
+                            request_id=None,
+                            item=result.item,
+                            status="request_failed",
+                            error=resp.error or "No request ID returned",
+                        )
+                    )
+                elif request_id not in awaited:
+                    future = asyncio.wrap_future(
+                        self.reveal_registry.wait_for(request_id)
+                    )
+                    waiting[future] = request_id
+                    awaited[request_id] = [result.item]
+                else:
+                    awaited[request_id].append(result.item)
+                    continue
+                wake.set()
 
+        submitter = asyncio.create_task(submit())
+        try:
+            while waiting or rejected or not submitter.done():
+                while rejected:
+                    yield rejected.pop(0)
+
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    break
+                wake.clear()
+                waker = asyncio.ensure_future(wake.wait())
+                watched = set(waiting) | {waker}
+                if not submitter.done():
+                    watched.add(submitter)
+                done, _ = await asyncio.wait(
+                    watched, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                waker.cancel()
+                if not done:
+                    break
+                if submitter in done:
+                    # Surface submission errors such as an invalid chunk size
+                    submitter.result()
+
+                for future in [f for f in done if f in waiting]:
+                    request_id = waiting.pop(future)
+                    items = awaited.pop(request_id)
+                    if future.cancelled():
+                        # The registry gave up on the request after its ttl
+                        for item in items:
+                            yield RevealCompletion(
+                                request_id=request_id,
+                                item=item,
+                                status="abandoned",
+                                error="No callback received before the request expired",
+                            )
+                        continue
+                    self.complete_reveal_request(request_id)
+                    for completion in future.result():
+                        yield completion
+
+            if waiting or not submitter.done():
+                self.logger.warning(
+                    "Stopped waiting for reveal callbacks",
+                    outstanding_requests=len(waiting),
+                    timeout=timeout,
+                )
+        finally:
+            if not submitter.done():
+                submitter.cancel()
+                with suppress(asyncio.CancelledError):
+                    await submitter
+            # Outstanding futures are left alone: cancelling the wrappers would
+            # cancel the registry futures that a late callback still resolves
+
+    async def reveal_and_wait(
+        self,
+        items: AsyncIterable[str] | Iterable[str],
+        timeout: float | None = None,
+        **options: Any,
+    ) -> dict[str, RevealCompletion]:
+        """
+        Reveal items and wait for their callbacks, up to ``timeout`` seconds.
+        Returns item -> completion; items still outstanding at the timeout
+        are absent. ``options`` are passed to iter_revealed.
+        """
+        results: dict[str, RevealCompletion] = {}
+        async for completion in self.iter_revealed(items, timeout, **options):
+            results[completion.item] = completion
         return results
 
+    def get_reveal_request_items(self, request_id: str | int) -> list[str] | None:
+        """Return the items submitted under a Person API request ID, if known."""
+        return self.reveal_registry.items_for(request_id)
+
+    def complete_reveal_request(self, request_id: str | int) -> list[str] | None:
+        """Forget a reveal request once its callback has been handled."""
+        return self.reveal_registry.discard(request_id)
+
+    def failed_reveal_items(
+        self, request_id: str | int, callback_data: list[Any]
+    ) -> list[str]:
+        """
+        Items of a request that should be revealed again: those the callback
+        reported as timeout_exceeded and those it did not mention at all.
+        """
+        submitted = self.get_reveal_request_items(request_id) or []
+        statuses: dict[str, str | None] = {}
+        for entry in callback_data or []:
+            if isinstance(entry, dict):
+                statuses[str(entry.get("item"))] = entry.get("status")
+            else:
+                statuses[str(getattr(entry, "item", None))] = getattr(
+                    entry, "status", None
+                )
+
+        return [
+            item
+            for item in submitted
+            if item not in statuses or statuses[item] in RETRYABLE_CALLBACK_STATUSES
+        ]
+
+    async def retry_failed_items(
+        self,
+        request_id: str | int,
+        callback_data: list[Any],
+        items_per_request: int = PERSON_API_MAX_ITEMS,
+    ) -> list[APIResponse]:
+        """Resubmit only the failed items of a request and retire the original."""
+        retry_items = self.failed_reveal_items(request_id, callback_data)
+        self.complete_reveal_request(request_id)
+        if not retry_items:
+            return []
+        self.logger.info(
+            "Retrying failed reveal items",
+            request_id=str(request_id),
+            items=len(retry_items),
+        )
+        return await self.batch_reveal_items(
+            retry_items, items_per_request=items_per_request
+        )
+
+    async def batch_reveal_contacts(
+        self,
+        prospect_ids: list[str],
+        batch_size: int = 10,
+        progress_callback: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+        items_per_request: int = 1,
+    ) -> list[APIResponse]:
+        """
+        Reveal contacts for multiple prospects with enhanced progress reporting.
+        Requests run through the sliding window of stream_reveal, bounded by
+        max_concurrency; ``batch_size`` is only reported in progress events.
+        With ``items_per_request`` > 1 prospects are packed into multi-item
+        Person API requests (see batch_reveal_items).
+        """
+        # Validate inputs
+        if not isinstance(prospect_ids, list) or any(
+            not isinstance(p, str) for p in prospect_ids
+        ):
+            raise SignalHireAPIError("prospect_ids must be a list of strings")
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise SignalHireAPIError("batch_size must be a positive integer")
+
+        total = len(prospect_ids)
+
+        # Credit pre-check (assume 1 credit per reveal)
+        remaining = None
+        try:
+            # Usually answered from the X-Credits-Left ledger without a request
+            credits_response = await self.check_credits()
+            if credits_response.success:
+                remaining = credits_response.credits_remaining
+                if remaining is None:
+                    remaining = (credits_response.data or {}).get("credits_remaining")
+            if isinstance(remaining, int) and remaining < total:
+                raise SignalHireAPIError(
+                    f"Insufficient credits: need {total}, have {remaining}",
+                    status_code=402,
+                    response_data={"needed": total, "remaining": remaining},
+                )
+        except SignalHireAPIError:
+            # Propagate credit errors
+            raise
+        except Exception as e:
+            # If credits check fails for other reasons, proceed but log the issue
+            self.logger.warning("Credit pre-check failed", error=str(e))
+
+        return await self._collect_reveals(
+            prospect_ids,
+            items_per_request,
+            progress_callback,
+            batch_size=batch_size,
+            credits_remaining=remaining,
+        )
+
     async def get_search_suggestions(self, query: str) -> APIResponse:
         """Get search suggestions for companies, titles, or locations."""
         params = {"q": query}
-        return await self._make_request("GET", "/suggestions", params=params)
+        return await self._single_flight.do(
+            ("GET", "/suggestions", query),
+            lambda: self._make_request("GET", "/suggestions", params=params),
+        )
 
     async def validate_api_key(self) -> bool:
         """Validate the current API key."""
@@ -1246,12 +1997,29 @@ class SignalHireClient:
         """Invalidate the credits cache to force a fresh check."""
         self._credits_cache = None
         self._cache_timestamp = None
+        if self.api_key:
+            self.credit_ledger.invalidate(self.api_key)
 
     def get_retry_stats(self) -> dict[str, Any]:
         """
-        Get comprehensive retry statistics and circuit breaker status.
+        Get comprehensive retry statistics, circuit breaker status and the
+        adaptive concurrency state of each endpoint family.
         """
-        return self.retry_strategy.get_stats()
+        stats = self.retry_strategy.get_stats()
+        stats["concurrency"] = {
+            family: limiter.get_stats()
+            for family, limiter in self.concurrency_limiters.items()
+        }
+        stats["single_flight"] = self.get_single_flight_stats()
+        return stats
+
+    def get_single_flight_stats(self) -> dict[str, int]:
+        """Credit ledger/cache hits and how many idempotent calls were coalesced."""
+        return {
+            "credits_ledger_hits": self._credits_ledger_hits,
+            "credits_cache_hits": self._credits_cache_hits,
+            **self._single_flight.get_stats(),
+        }
 
     def reset_retry_stats(self):
         """
@@ -1365,7 +2133,9 @@ class SignalHireClient:
         batch_size: int | None = None,
         max_batches: int | None = None,
         progress_callback: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
-        batch_delay: float = 1.0,
+        batch_delay: float = 0.0,
+        streaming: bool = False,
+        items_per_request: int = 1,
     ) -> dict[str, Any]:
         """
         Process the entire queue until empty or limits reached.
@@ -1373,7 +2143,12 @@ class SignalHireClient:
             batch_size: Size of each processing batch
             max_batches: Maximum number of batches to process (None = unlimited)
             progress_callback: Callback for progress updates
-            batch_delay: Delay between batches in seconds
+            batch_delay: Extra delay between batches in seconds (pacing is
+                normally left to the adaptive concurrency limiters)
+            streaming: Feed the queue through stream_reveal instead of
+                lock-step batches (batch_size, max_batches and batch_delay
+                are ignored)
+            items_per_request: Items per Person API request when streaming
         Returns:
             Comprehensive processing statistics
         """
@@ -1385,50 +2160,62 @@ class SignalHireClient:
         start_time = datetime.now()
 
         self.logger.info(
-            "Starting queue processing", queue_size=self.batch_queue.queue.qsize()
+            "Starting queue processing",
+            queue_size=len(self.batch_queue),
+            streaming=streaming,
         )
 
-        while True:
-            # Check if we've reached the batch limit
-            if max_batches and batches_processed >= max_batches:
-                self.logger.info(
-                    "Reached maximum batch limit", batches_processed=batches_processed
-                )
-                break
+        if streaming:
+            totals = await self._stream_queue(items_per_request, progress_callback)
+            total_processed = totals["processed"]
+            total_successful = totals["successful"]
+            total_failed = totals["failed"]
+            total_credits_used = totals["credits_used"]
+        else:
+            while True:
+                # Check if we've reached the batch limit
+                if max_batches and batches_processed >= max_batches:
+                    self.logger.info(
+                        "Reached maximum batch limit",
+                        batches_processed=batches_processed,
+                    )
+                    break
 
-            # Check if queue is empty
-            if not self.batch_queue.queue:
-                self.logger.info("Queue is empty, processing complete")
-                break
+                # Check if queue is empty
+                if not len(self.batch_queue):
+                    self.logger.info("Queue is empty, processing complete")
+                    break
 
-            # Process next batch
-            batch_result = await self.process_queue_batch(batch_size, progress_callback)
+                # Process next batch
+                batch_result = await self.process_queue_batch(
+                    batch_size, progress_callback
+                )
 
-            if batch_result["processed"] == 0:
-                # No items were processed (likely due to daily limits)
-                self.logger.info("No items processed, likely due to limits")
-                break
+                if batch_result["processed"] == 0:
+                    # No items were processed (likely due to daily limits)
+                    self.logger.info("No items processed, likely due to limits")
+                    break
 
-            # Update totals
-            total_processed += batch_result["processed"]
-            total_successful += batch_result["successful"]
-            total_failed += batch_result["failed"]
-            total_credits_used += batch_result["credits_used"]
-            batches_processed += 1
+                # Update totals
+                total_processed += batch_result["processed"]
+                total_successful += batch_result["successful"]
+                total_failed += batch_result["failed"]
+                total_credits_used += batch_result["credits_used"]
+                batches_processed += 1
 
-            # Log batch completion
-            self.logger.info(
-                "Batch completed",
-                batch=batches_processed,
-                processed=batch_result["processed"],
-                successful=batch_result["successful"],
-                failed=batch_result["failed"],
-                credits_used=batch_result["credits_used"],
-            )
+                # Log batch completion
+                self.logger.info(
+                    "Batch completed",
+                    batch=batches_processed,
+                    processed=batch_result["processed"],
+                    successful=batch_result["successful"],
+                    failed=batch_result["failed"],
+                    credits_used=batch_result["credits_used"],
+                )
 
-            # Delay between batches to respect rate limits
-            if batch_delay > 0:
-                await asyncio.sleep(batch_delay)
+                # Delay between batches to respect rate limits
+                if batch_delay > 0:
+                    await asyncio.sleep(batch_delay)
 
         # Calculate final statistics
         total_time = (datetime.now() - start_time).total_seconds()
@@ -1451,6 +2238,76 @@ class SignalHireClient:
 
         return final_stats
 
+    async def _stream_queue(
+        self,
+        items_per_request: int,
+        progress_callback: Callable[[dict[str, Any]], Awaitable[None]] | None,
+    ) -> dict[str, int]:
+        """Drain the batch queue through the sliding reveal window.
+
+        Items are leased a window's worth at a time and handed to the window
+        from memory, so the queue is touched once per chunk rather than per
+        item.
+        """
+        leased: list[QueueItem] = []
+        acked: set[str] = set()
+        totals = {"processed": 0, "successful": 0, "failed": 0, "credits_used": 0}
+        chunk_size = items_per_request * self.max_concurrency
+        waiting = 0
+
+        async def queued_prospects() -> AsyncIterator[str]:
+            nonlocal waiting
+            while True:
+                batch = self.batch_queue.get_next_batch(chunk_size)
+                if not batch:
+                    return
+                leased.extend(batch)
+                waiting = len(self.batch_queue)
+                for item in batch:
+                    yield item.prospect_id
+
+        try:
+            async for result in self.stream_reveal(
+                queued_prospects(), items_per_request=items_per_request
+            ):
+                resp = result.response
+                item_id = leased[result.index].id
+                self.batch_queue.mark_completed(item_id, resp.success)
+                acked.add(item_id)
+                totals["processed"] += 1
+                if resp.success:
+                    totals["successful"] += 1
+                    totals["credits_used"] += resp.credits_used
+                else:
+                    totals["failed"] += 1
+                    self.logger.warning(
+                        "Queue item failed",
+                        item_id=item_id,
+                        prospect_id=result.item,
+                        error=resp.error,
+                    )
+
+                if progress_callback:
+                    with suppress(Exception):
+                        await progress_callback(
+                            {
+                                "current": totals["processed"],
+                                "successful": totals["successful"],
+                                "failed": totals["failed"],
+                                "remaining_contacts": waiting
+                                + len(leased)
+                                - len(acked),
+                                "credits_used": totals["credits_used"],
+                            }
+                        )
+        finally:
+            # Hand unfinished leases back at once instead of waiting for expiry
+            self.batch_queue.release(
+                item.id for item in leased if item.id not in acked
+            )
+
+        return totals
+
     def get_queue_status(self) -> dict[str, Any]:
         """
         Get current queue status and statistics.
@@ -1476,10 +2333,14 @@ class SignalHireClient:
         """
         prospect_ids = getattr(operation, "prospect_ids", [])
         batch_size = getattr(operation, "batch_size", 10)
+        items_per_request = getattr(operation, "items_per_request", 1)
 
         # Use enhanced batch_reveal_contacts with progress reporting
         results = await self.batch_reveal_contacts(
-            prospect_ids, batch_size=batch_size, progress_callback=progress_callback
+            prospect_ids,
+            batch_size=batch_size,
+            progress_callback=progress_callback,
+            items_per_request=items_per_request,
         )
 
         prospect_records: list[dict[str, Any]] = []
@@ -1556,6 +2417,48 @@ class SignalHireClient:
 # Utility functions
 
 
+def _endpoint_family(endpoint_path: str) -> str | None:
+    """Map an API path to the concurrency limiter family that governs it."""
+    if endpoint_path == "/candidate/search":
+        return "reveal"
+    if endpoint_path.startswith(("/candidate/searchByQuery", "/candidate/scrollSearch")):
+        return "search"
+    if endpoint_path == "/credits":
+        return "credits"
+    return None
+
+
+async def _aiter_items(items: AsyncIterable[str] | Iterable[str]) -> AsyncIterator[str]:
+    """Iterate plain and async iterables alike."""
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def _next_chunk(
+    source: AsyncIterator[str], size: int
+) -> tuple[list[str], bool]:
+    """Pull up to ``size`` items; the flag is True once the source is exhausted."""
+    chunk: list[str] = []
+    while len(chunk) < size:
+        try:
+            chunk.append(await anext(source))
+        except StopAsyncIteration:
+            return chunk, True
+    return chunk, False
+
+
+def _extract_request_id(data: dict[str, Any] | None) -> str | None:
+    """Pull the Person API request ID out of a response payload."""
+    if not isinstance(data, dict):
+        return None
+    request_id = data.get("requestId") or data.get("request_id")
+    return str(request_id) if request_id is not None else None
+
+
 async def create_signalhire_client(api_key: str | None = None) -> SignalHireClient:
     """Create and initialize a SignalHire client."""
     client = SignalHireClient(api_key=api_key)
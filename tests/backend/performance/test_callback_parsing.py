@@ -0,0 +1,72 @@
+"""
+Parsing benchmark for 100-item Person API callbacks.
+
+Compares plain ``json.loads`` with the one-pass ``TypeAdapter.validate_json``
+path used for typed callback handlers, and with the per-item
+``model_validate`` loop handlers used before.
+"""
+
+import json
+import time
+
+import pytest
+
+from src.models.person_callback import PersonCallbackItem, parse_person_callback
+
+pytestmark = pytest.mark.performance
+
+ITEMS_PER_CALLBACK = 100
+ROUNDS = 200
+
+
+def _body() -> bytes:
+    return json.dumps(
+        [
+            {
+                "status": "success",
+                "item": f"uid-{i}",
+                "candidate": {
+                    "uid": f"uid-{i}",
+                    "fullName": f"Person {i}",
+                    "locations": [{"name": "Houston, Texas, United States"}],
+                    "contacts": [
+                        {"type": "email", "value": f"p{i}@example.com", "rating": "100", "subType": "work"},
+                        {"type": "phone", "value": "+1 555 0100", "rating": "80", "subType": "work_phone"},
+                    ],
+                    "social": [{"type": "li", "link": f"https://linkedin.com/in/p{i}", "rating": "100"}],
+                    "skills": ["welding", "hydraulics", "diesel"],
+                    "experience": [
+                        {"position": "Technician", "company": {"name": f"Co {j}"}, "started": "2015-01", "ended": "2019-06"}
+                        for j in range(4)
+                    ],
+                    "education": [{"university": "State College", "degree": ["AAS"], "endedYear": 2012}],
+                    "headLine": "Heavy equipment technician",
+                },
+            }
+            for i in range(ITEMS_PER_CALLBACK)
+        ]
+    ).encode()
+
+
+def _time(parse, body: bytes) -> float:
+    parse(body)
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        parse(body)
+    return (time.perf_counter() - started) / ROUNDS
+
+
+def test_validate_json_close_to_json_loads():
+    body = _body()
+    raw = _time(json.loads, body)
+    bulk = _time(parse_person_callback, body)
+    per_item = _time(
+        lambda b: [PersonCallbackItem.model_validate(e) for e in json.loads(b)], body
+    )
+
+    print(
+        f"\njson.loads {raw * 1e3:.2f} ms | validate_json {bulk * 1e3:.2f} ms | "
+        f"per-item model_validate {per_item * 1e3:.2f} ms"
+    )
+    assert bulk < per_item
+    assert bulk < 4 * raw
@@ -0,0 +1,155 @@
+"""
+Load benchmark for the multi-process callback server.
+
+Starts 1 and then N server processes sharing one port (SO_REUSEPORT) and a
+SQLite callback store, posts a burst of 100-item callbacks and measures
+callbacks/sec from the first request until every callback has been processed.
+Handlers validate every item with the Person callback models, which is the
+CPU-bound part that more processes spread over more cores.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import time
+
+import httpx
+import pytest
+
+from src.lib.callback_server import CallbackServer
+from src.lib.callback_store import SharedCallbackStore
+from src.models.person_callback import PersonCallbackItem
+
+pytestmark = pytest.mark.performance
+
+CALLBACKS = 300
+ITEMS_PER_CALLBACK = 100
+CONCURRENCY = 32
+
+
+def _payload(request: int) -> bytes:
+    return json.dumps(
+        [
+            {
+                "status": "success",
+                "item": f"uid-{request}-{i}",
+                "candidate": {
+                    "uid": f"uid-{request}-{i}",
+                    "fullName": f"Person {i}",
+                    "contacts": [
+                        {
+                            "type": "email",
+                            "value": f"p{i}@example.com",
+                            "rating": "100",
+                            "subType": "work",
+                        }
+                    ],
+                    "skills": ["welding", "hydraulics", "diesel"],
+                },
+            }
+            for i in range(ITEMS_PER_CALLBACK)
+        ]
+    ).encode()
+
+
+def _validate(callback_data):
+    for entry in callback_data:
+        PersonCallbackItem.model_validate(entry)
+
+
+def _serve(port: int, store_path: str) -> None:
+    server = CallbackServer(
+        host="127.0.0.1",
+        port=port,
+        store_path=store_path,
+        reuse_port=True,
+        fsync=False,
+        max_backlog=CALLBACKS * 2,
+        poll_interval=0.05,
+    )
+    server.register_handler("validate", _validate)
+    server.start(background=False)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_ready(port: int, processes: int, timeout: float = 15.0) -> None:
+    """Wait until every server process answers /health, or fail the test.
+
+    Each probe uses a new connection, so SO_REUSEPORT spreads the probes
+    over the processes instead of reusing one keep-alive connection.
+    """
+    deadline = time.monotonic() + timeout
+    healthy = 0
+    while healthy < processes * 4:
+        if time.monotonic() > deadline:
+            pytest.fail(f"callback servers on port {port} did not become ready")
+        try:
+            async with httpx.AsyncClient(timeout=2) as probe:
+                response = await probe.get(f"http://127.0.0.1:{port}/health")
+            healthy = healthy + 1 if response.status_code == 200 else 0
+        except httpx.TransportError:
+            healthy = 0
+            await asyncio.sleep(0.05)
+
+
+async def _burst(port: int, processes: int, store: SharedCallbackStore) -> float:
+    url = f"http://127.0.0.1:{port}/signalhire/callback"
+    bodies = [_payload(i) for i in range(CALLBACKS)]
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    await _wait_ready(port, processes)
+
+    async with httpx.AsyncClient(timeout=30) as client:
+
+        async def post(i: int) -> None:
+            async with semaphore:
+                response = await client.post(
+                    url, content=bodies[i], headers={"Request-Id": str(i)}
+                )
+                assert response.status_code == 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(post(i) for i in range(CALLBACKS)))
+    while store.pending:
+        await asyncio.sleep(0.02)
+    return CALLBACKS / (time.perf_counter() - started)
+
+
+def _measure(processes: int, tmp_path) -> float:
+    port = _free_port()
+    store_path = str(tmp_path / f"callbacks-{processes}.db")
+    store = SharedCallbackStore(store_path, fsync=False)
+    store.open()
+    context = multiprocessing.get_context("fork")
+    servers = [
+        context.Process(target=_serve, args=(port, store_path), daemon=True)
+        for _ in range(processes)
+    ]
+    for server in servers:
+        server.start()
+    try:
+        return asyncio.run(_burst(port, processes, store))
+    finally:
+        for server in servers:
+            server.terminate()
+            server.join(10)
+        store.close()
+
+
+@pytest.mark.slow
+def test_callbacks_per_second_scale_with_processes(tmp_path):
+    cores = os.cpu_count() or 1
+    if cores < 2:
+        pytest.skip(f"only {cores} CPU core; scaling needs at least 2")
+    counts = [1, min(4, cores)]
+    rates = {count: _measure(count, tmp_path) for count in counts}
+
+    for count, rate in rates.items():
+        print(f"{count} process(es): {rate:.1f} callbacks/sec")
+    assert rates[counts[-1]] >= 1.3 * rates[1]
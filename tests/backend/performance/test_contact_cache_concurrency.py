@@ -0,0 +1,75 @@
+"""
+Stress test: N writer processes upserting into one contact cache.
+
+Every writer merges contacts and metadata into the same hot UIDs, as a
+reveal run and the callback server do. The test checks that no update is
+lost and reports upserts per second for 1 and N writers in SQLite and log
+mode. The scaling assertion needs at least two CPU cores.
+"""
+
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from src.lib.contact_cache import ContactCache
+
+pytestmark = pytest.mark.performance
+
+UPSERTS = 500
+SHARED_UIDS = 50
+
+
+def _write(path: str, mode: str, writer: int, start) -> None:
+    cache = ContactCache(path, mode=mode)
+    start.wait()
+    for i in range(UPSERTS):
+        cache.upsert(
+            f"u{i % SHARED_UIDS}",
+            contacts=[{"type": "email", "value": f"w{writer}-{i}@acme.com"}],
+            metadata={f"w{writer}": i},
+        )
+    cache.close()
+
+
+def _run(path: str, mode: str, writers: int) -> float:
+    context = multiprocessing.get_context("fork")
+    start = context.Event()
+    processes = [
+        context.Process(target=_write, args=(path, mode, writer, start))
+        for writer in range(writers)
+    ]
+    for process in processes:
+        process.start()
+    started = time.perf_counter()
+    start.set()
+    for process in processes:
+        process.join(300)
+    elapsed = time.perf_counter() - started
+    assert [process.exitcode for process in processes] == [0] * writers
+
+    cache = ContactCache(path, mode=mode)
+    for n in range(SHARED_UIDS):
+        record = cache.get(f"u{n}")
+        assert len(record.contacts) == writers * len(range(n, UPSERTS, SHARED_UIDS))
+        assert len(record.metadata) == writers
+    cache.close()
+    return writers * UPSERTS / elapsed
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("mode, name", [("sqlite", "contacts.db"), ("log", "contacts-log")])
+def test_concurrent_writers_keep_every_update(tmp_path, mode, name):
+    cores = os.cpu_count() or 1
+    counts = sorted({1, max(4, min(8, cores))})
+    rates = {count: _run(str(tmp_path / f"{count}-{name}"), mode, count) for count in counts}
+
+    for count, rate in rates.items():
+        print(f"{mode}: {count} writer(s): {rate:.0f} upserts/sec")
+
+    if cores < 2:
+        pytest.skip(f"only {cores} CPU core; scaling needs at least 2")
+    # Writers serialize on the store's lock, but decoding, merging and
+    # encoding run in parallel, so more writers must not be slower overall
+    assert rates[counts[-1]] >= rates[1] * 0.9
@@ -0,0 +1,72 @@
+"""
+Startup and memory benchmark for ContactCache lookups.
+
+Builds a cache of 20,000 profiles with experience and education, then opens
+it and reads a handful of UIDs, as a CLI call would. Compares the peak
+traced memory and time of a lookup against decoding the whole legacy JSON
+file up front.
+"""
+
+import json
+import time
+import tracemalloc
+
+import pytest
+
+from src.lib.contact_cache import ContactCache, _load_json_cache
+
+pytestmark = pytest.mark.performance
+
+PROFILES = 20_000
+
+
+def _profile(i: int) -> dict:
+    return {
+        "fullName": f"Person {i}",
+        "experience": [
+            {"position": "Technician", "company": f"Co {j}", "summary": "x" * 200}
+            for j in range(5)
+        ],
+        "education": [{"university": "State College", "degree": ["AAS"]}],
+        "skills": ["welding", "hydraulics", "diesel"] * 5,
+    }
+
+
+@pytest.mark.slow
+def test_lookup_decodes_only_requested_records(tmp_path):
+    legacy = tmp_path / "revealed_contacts.json"
+    legacy.write_text(
+        json.dumps(
+            {
+                f"u{i}": {"contacts": [{"type": "email", "value": f"p{i}@x.com"}], "profile": _profile(i)}
+                for i in range(PROFILES)
+            }
+        )
+    )
+    # Migrate once, as the first CLI call after upgrading would
+    migrated = ContactCache(tmp_path / "contacts.db")
+    assert len(migrated.list_cached_uids()) == PROFILES
+    migrated.close()
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    eager = _load_json_cache(legacy)
+    eager_time = time.perf_counter() - started
+    eager_peak = tracemalloc.get_traced_memory()[1]
+    del eager
+    tracemalloc.reset_peak()
+
+    started = time.perf_counter()
+    cache = ContactCache(tmp_path / "contacts.db")
+    records = [cache.get(f"u{i}") for i in range(0, PROFILES, PROFILES // 10)]
+    lazy_time = time.perf_counter() - started
+    lazy_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(
+        f"\neager JSON load {eager_time:.2f}s / {eager_peak / 1e6:.0f} MB | "
+        f"lazy lookup {lazy_time * 1e3:.1f} ms / {lazy_peak / 1e6:.1f} MB"
+    )
+    assert all(records)
+    assert lazy_peak * 20 < eager_peak
+    assert lazy_time * 20 < eager_time
@@ -0,0 +1,132 @@
+"""
+Unit tests for the adaptive (AIMD) concurrency limiter
+
+Covers:
+- Additive increase while latency and error rate are healthy
+- Multiplicative decrease on 429 and Retry-After cooldown
+- Slot accounting for waiting callers
+- Retry-After parsing
+- SignalHireClient routing requests to per-family limiters and exposing state
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.lib.adaptive_concurrency import AdaptiveConcurrencyLimiter, parse_retry_after
+
+
+pytestmark = pytest.mark.unit
+
+
+class FakeClock:
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _complete(limiter, latency=0.1, status_code=200, retry_after=None):
+    await limiter.acquire()
+    limiter.release(latency, status_code, retry_after)
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_additively_when_healthy():
+    limiter = AdaptiveConcurrencyLimiter("reveal", initial_limit=2, max_limit=4)
+
+    for _ in range(2):
+        await _complete(limiter)
+    assert limiter.limit == 3
+
+    for _ in range(20):
+        await _complete(limiter)
+    assert limiter.limit == 4  # capped at max_limit
+
+
+@pytest.mark.asyncio
+async def test_slow_responses_block_increase():
+    limiter = AdaptiveConcurrencyLimiter(
+        "reveal", initial_limit=2, latency_target=1.0
+    )
+    for _ in range(10):
+        await _complete(limiter, latency=3.0)
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_429_halves_limit_once_per_event():
+    clock = FakeClock()
+    limiter = AdaptiveConcurrencyLimiter(
+        "reveal", initial_limit=8, time_fn=clock
+    )
+
+    for _ in range(3):
+        await _complete(limiter, status_code=429)
+    assert limiter.limit == 4
+
+    clock.now += 5
+    await _complete(limiter, status_code=429)
+    assert limiter.limit == 2
+
+    decisions = limiter.get_stats()["recent_decisions"]
+    assert [d["action"] for d in decisions] == ["decrease", "decrease"]
+    assert decisions[-1]["reason"] == "429"
+
+
+@pytest.mark.asyncio
+async def test_retry_after_pauses_new_requests():
+    limiter = AdaptiveConcurrencyLimiter("search", initial_limit=3, max_limit=3)
+
+    await _complete(limiter, status_code=429, retry_after=0.2)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await limiter.acquire()
+    assert loop.time() - started >= 0.15
+    limiter.release(0.1, 200)
+
+
+@pytest.mark.asyncio
+async def test_waiters_get_freed_slots():
+    limiter = AdaptiveConcurrencyLimiter("credits", initial_limit=1, max_limit=1)
+    await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    limiter.release(0.1, 200)
+    await asyncio.wait_for(waiter, timeout=1)
+    assert limiter.in_flight == 1
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("30") == 30.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after("Thu, 01 Jan 1970 00:01:40 GMT", now=40.0) == 60.0
+
+
+@pytest.mark.asyncio
+async def test_client_feeds_family_limiters(mock_signalhire_client):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/credits"):
+            return httpx.Response(429, headers={"Retry-After": "0"}, json={})
+        return httpx.Response(201, json={"requestId": 1})
+
+    client = mock_signalhire_client(handler)
+    client.concurrency_limiters["credits"]._limit = 4
+
+    await client._make_request("GET", "/credits")
+    await client._make_request("POST", "/candidate/search", json={"items": ["a"]})
+    await client.close_session()
+
+    stats = client.get_retry_stats()["concurrency"]
+    assert set(stats) == {"search", "reveal", "credits"}
+    assert stats["credits"]["limit"] == 2
+    assert stats["credits"]["throttled"] == 1
+    assert stats["reveal"]["acquired"] == 1
+    assert stats["search"]["max_limit"] == 3
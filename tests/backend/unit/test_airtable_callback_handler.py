@@ -0,0 +1,335 @@
+"""
+Unit tests for the batching callback -> Airtable writer
+
+Covers:
+- Candidate to Airtable field mapping, including nested company objects
+- Callback payloads left unmodified for the other handlers
+- Size-triggered 10-record upserts and time-triggered partial flushes
+- Failed batches kept in the durable outbox and retried by a later writer
+- Writers sharing an outbox lease batches, so each record is sent once
+- Outbox access kept off the event loop while another writer holds the lock
+- Requests throttled per base through the rate limit registry
+- Writers sharing the process-wide Airtable client and its session
+- register_airtable_handler / get_handler_stats wiring
+"""
+
+import asyncio
+import json
+import sqlite3
+
+import httpx
+import pytest
+
+from src.lib.callback_server import CallbackServer
+from src.lib.rate_limit_registry import RateLimit, RateLimitRegistry
+from src.services import airtable_callback_handler
+from src.services.airtable_callback_handler import (
+    AirtableCallbackWriter,
+    candidate_to_fields,
+    get_handler_stats,
+    register_airtable_handler,
+)
+from src.services.airtable_client import (
+    AirtableClient,
+    set_airtable_client,
+    shared_airtable_client,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+def _items(count: int, start: int = 0) -> list[dict]:
+    return [
+        {
+            "status": "success",
+            "item": f"uid-{i}",
+            "candidate": {
+                "uid": f"uid-{i}",
+                "fullName": f"Person {i}",
+                "contacts": [{"type": "email", "value": f"p{i}@example.com"}],
+            },
+        }
+        for i in range(start, start + count)
+    ]
+
+
+class FakeAirtable:
+    def __init__(self, fail: int = 0):
+        self.batches: list[list[dict]] = []
+        self.fail = fail
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if self.fail:
+            self.fail -= 1
+            return httpx.Response(503, json={"error": "unavailable"})
+        assert body["performUpsert"] == {"fieldsToMergeOn": ["SignalHire ID"]}
+        self.batches.append(body["records"])
+        return httpx.Response(200, json={"records": body["records"]})
+
+
+def _writer(airtable: FakeAirtable, **kwargs) -> AirtableCallbackWriter:
+    kwargs.setdefault("registry", RateLimitRegistry({}))
+    return AirtableCallbackWriter(
+        "key", "appTest", "tblContacts", transport=httpx.MockTransport(airtable), **kwargs
+    )
+
+
+def test_candidate_fields():
+    fields = candidate_to_fields(
+        {
+            "uid": "u1",
+            "fullName": "Ada Lovelace",
+            "locations": [{"name": "London"}],
+            "experience": [{"position": "Engineer", "company": "Analytical"}],
+            "contacts": [
+                {"type": "email", "value": "a@example.com"},
+                {"type": "phone", "value": "+1 555 0100"},
+            ],
+            "social": [{"type": "li", "link": "https://linkedin.com/in/ada"}],
+            "skills": ["math", "poetry"],
+        }
+    )
+
+    assert fields["SignalHire ID"] == "u1"
+    assert fields["Job Title"] == "Engineer"
+    assert fields["Company"] == "Analytical"
+    assert fields["Phone Number"] == "+1 555 0100"
+    assert fields["LinkedIn URL"] == "https://linkedin.com/in/ada"
+    assert fields["Skills"] == "math, poetry"
+    assert fields["Status"] == airtable_callback_handler.STATUS_REVEALED
+
+
+def test_candidate_fields_unwrap_company_objects():
+    fields = candidate_to_fields(
+        {
+            "uid": "u1",
+            "experience": [
+                {"position": "Engineer", "company": {"name": "Analytical", "id": 7}}
+            ],
+        }
+    )
+    assert fields["Company"] == "Analytical"
+    assert fields["Status"] == airtable_callback_handler.STATUS_NO_CONTACTS
+
+
+@pytest.mark.asyncio
+async def test_handler_does_not_modify_the_callback():
+    airtable = FakeAirtable()
+    writer = _writer(airtable)
+    callback = _items(1)
+    del callback[0]["candidate"]["uid"]
+
+    await writer.handle(callback)
+    await writer.flush(force=True)
+
+    assert "uid" not in callback[0]["candidate"]
+    assert airtable.batches[0][0]["fields"]["SignalHire ID"] == "uid-0"
+    await writer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_size_and_time_triggered_flushes():
+    airtable = FakeAirtable()
+    writer = _writer(airtable, flush_interval=0.1)
+
+    failed = [{"status": "failed", "item": "uid-x", "candidate": None}]
+    await writer.handle(_items(25) + failed)
+    await asyncio.sleep(0.02)
+    # Two full batches go out immediately, the remainder waits for the timer
+    assert [len(batch) for batch in airtable.batches] == [10, 10]
+
+    await asyncio.sleep(0.25)
+    assert [len(batch) for batch in airtable.batches] == [10, 10, 5]
+
+    stats = writer.get_stats()
+    assert stats["received"] == 25
+    assert stats["skipped"] == 1
+    assert stats["records_written"] == 25
+    assert stats["requests"] == 3
+    assert stats["pending"] == 0
+    assert stats["max_lag_seconds"] >= 0.1
+    await writer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_retry_from_durable_outbox(tmp_path):
+    outbox = tmp_path / "outbox.db"
+    now = [1000.0]
+    down = FakeAirtable(fail=1)
+    first = _writer(down, outbox_path=outbox, time_fn=lambda: now[0])
+    await first.handle(_items(10))
+    await first.flush()
+
+    stats = first.get_stats()
+    assert stats["failed_batches"] == 1
+    assert stats["pending"] == 10
+    first.close()
+
+    # A restarted writer picks the records up once their backoff has passed
+    now[0] += 60
+    up = FakeAirtable()
+    second = _writer(up, outbox_path=outbox, time_fn=lambda: now[0])
+    assert await second.flush() == 10
+    assert len(up.batches) == 1
+    assert second.get_stats()["pending"] == 0
+    second.close()
+
+
+class SlowAirtable(FakeAirtable):
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.01)
+        return self(request)
+
+
+@pytest.mark.asyncio
+async def test_writers_sharing_an_outbox_send_each_record_once(tmp_path):
+    outbox = tmp_path / "outbox.db"
+    airtable = SlowAirtable()
+    writers = [
+        AirtableCallbackWriter(
+            "key",
+            "appTest",
+            "tblContacts",
+            outbox_path=outbox,
+            registry=RateLimitRegistry({}),
+            transport=httpx.MockTransport(airtable.handle),
+        )
+        for _ in range(3)
+    ]
+    writers[0].enqueue(candidate_to_fields(item["candidate"]) for item in _items(50))
+    # A newer version of uid-0 must not go out alongside the first one
+    writers[0].enqueue(candidate_to_fields(item["candidate"]) for item in _items(1))
+
+    written = await asyncio.gather(*(writer.flush(force=True) for writer in writers))
+
+    ids = [r["fields"]["SignalHire ID"] for batch in airtable.batches for r in batch]
+    assert sum(written) == 51
+    assert sorted(ids) == sorted([f"uid-{i}" for i in range(50)] + ["uid-0"])
+    assert all(writer.get_stats()["pending"] == 0 for writer in writers)
+    for writer in writers:
+        writer.close()
+
+
+@pytest.mark.asyncio
+async def test_expired_leases_are_sent_by_another_writer(tmp_path):
+    outbox = tmp_path / "outbox.db"
+    now = [1000.0]
+    crashed = _writer(FakeAirtable(), outbox_path=outbox, time_fn=lambda: now[0])
+    crashed.enqueue(candidate_to_fields(item["candidate"]) for item in _items(3))
+    assert len(crashed._next_batch()) == 3  # leased, then the process dies
+    crashed.close()
+
+    airtable = FakeAirtable()
+    other = _writer(airtable, outbox_path=outbox, time_fn=lambda: now[0])
+    assert await other.flush(force=True) == 0
+    now[0] += 121
+    assert await other.flush(force=True) == 3
+    assert len(airtable.batches) == 1
+    other.close()
+
+
+@pytest.mark.asyncio
+async def test_locked_outbox_does_not_block_the_loop(tmp_path):
+    outbox = tmp_path / "outbox.db"
+    writer = _writer(FakeAirtable(), outbox_path=outbox)
+    other_process = sqlite3.connect(outbox, isolation_level=None)
+    other_process.execute("BEGIN IMMEDIATE")
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticking = asyncio.create_task(ticker())
+    handling = asyncio.create_task(writer.handle(_items(3)))
+    await asyncio.sleep(0.2)
+    other_process.execute("COMMIT")
+    await handling
+    ticking.cancel()
+
+    assert ticks >= 10
+    assert await writer.flush(force=True) == 3
+    other_process.close()
+    await writer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_duplicate_ids_split_across_batches():
+    airtable = FakeAirtable()
+    writer = _writer(airtable)
+    writer.enqueue(candidate_to_fields(item["candidate"]) for item in _items(3))
+    writer.enqueue(candidate_to_fields(item["candidate"]) for item in _items(1))
+
+    await writer.flush(force=True)
+
+    ids = [[r["fields"]["SignalHire ID"] for r in batch] for batch in airtable.batches]
+    assert ids == [["uid-0", "uid-1", "uid-2"], ["uid-0"]]
+
+
+@pytest.mark.asyncio
+async def test_requests_throttled_per_base():
+    airtable = FakeAirtable()
+    registry = RateLimitRegistry({"airtable/key:*": RateLimit(2, 0.2)})
+    writer = _writer(airtable, registry=registry)
+    writer.enqueue(candidate_to_fields(item["candidate"]) for item in _items(30))
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    assert await writer.flush() == 30
+    assert loop.time() - started >= 0.15
+    assert registry.get_stats()["acquired"] == 3
+
+
+@pytest.mark.asyncio
+async def test_writer_uses_the_process_wide_client():
+    airtable = FakeAirtable()
+    shared = AirtableClient(
+        "key", registry=RateLimitRegistry({}), transport=httpx.MockTransport(airtable)
+    )
+    set_airtable_client(shared)
+    try:
+        writer = AirtableCallbackWriter("key", "appTest", "tblContacts")
+        writer.enqueue(candidate_to_fields(item["candidate"]) for item in _items(3))
+        async with shared_airtable_client("key"):
+            assert await writer.flush(force=True) == 3
+            session = shared._session
+            await writer.aclose()
+            # Another user still holds the shared session
+            assert not session.is_closed
+        assert session.is_closed
+    finally:
+        set_airtable_client(None)
+
+    assert len(airtable.batches) == 1
+
+
+@pytest.mark.asyncio
+async def test_registered_handler_receives_callbacks(tmp_path, monkeypatch):
+    monkeypatch.setattr(airtable_callback_handler, "_writer", None)
+    assert get_handler_stats() == {"registered": False}
+
+    airtable = FakeAirtable()
+    writer = _writer(airtable, flush_interval=0.05)
+    server = CallbackServer(wal_dir=tmp_path / "wal", workers=1)
+    assert register_airtable_handler(server, writer) is writer
+
+    await server.start_ingest()
+    transport = httpx.ASGITransport(app=server.create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://cb") as client:
+        await client.post(
+            "/signalhire/callback",
+            content=json.dumps(_items(3)),
+            headers={"Request-Id": "1"},
+        )
+    await server.wait_idle()
+    await asyncio.sleep(0.15)
+
+    stats = get_handler_stats()
+    assert stats["registered"] is True
+    assert stats["records_written"] == 3
+    await server.stop_ingest()
+    await writer.aclose()
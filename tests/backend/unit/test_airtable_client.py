@@ -0,0 +1,262 @@
+"""
+Unit tests for the shared Airtable client
+
+Covers:
+- Creates, updates and deletes split into 10-record requests
+- Rejected chunks reported while the remaining chunks are still sent
+- performUpsert payloads merged on SignalHire ID
+- 429 responses pause the base for the penalty before retrying, and after
+  the last retry
+- Requests throttled per base through the rate limit registry
+- One pooled session per event loop; the previous loop's session is closed
+- Shared client sessions closed by the last of their concurrent users
+- Batched SignalHire ID lookups behind the CLI status updates
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.cli.reveal_commands import update_airtable_contacts_status
+from src.lib.rate_limit_registry import RateLimit, RateLimitRegistry
+from src.services.airtable_client import (
+    AirtableClient,
+    AirtableClientError,
+    AirtableContactIndex,
+    match_formula,
+    set_airtable_client,
+    shared_airtable_client,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+class FakeAirtable:
+    def __init__(
+        self,
+        records: list[dict] | None = None,
+        rate_limited: int = 0,
+        errors: dict[int, int] | None = None,
+    ):
+        self.requests: list[httpx.Request] = []
+        self.records = records or []
+        self.rate_limited = rate_limited
+        # Request number -> HTTP status to answer it with
+        self.errors = errors or {}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        status = self.errors.get(len(self.requests))
+        if status:
+            return httpx.Response(status, json={"error": {"type": "INVALID_VALUE_FOR_COLUMN"}})
+        if self.rate_limited:
+            self.rate_limited -= 1
+            return httpx.Response(429, json={"errors": [{"error": "RATE_LIMIT_REACHED"}]})
+        if request.method == "GET":
+            return httpx.Response(200, json={"records": self.records})
+        if request.method == "DELETE":
+            ids = request.url.params.get_list("records[]")
+            return httpx.Response(200, json={"records": [{"id": i, "deleted": True} for i in ids]})
+        body = json.loads(request.content)
+        records = [{"id": r.get("id", f"rec{n}"), **r} for n, r in enumerate(body["records"])]
+        payload = {"records": records}
+        if "performUpsert" in body:
+            payload["createdRecords"] = [r["id"] for r in records[:1]]
+            payload["updatedRecords"] = [r["id"] for r in records[1:]]
+        return httpx.Response(200, json=payload)
+
+
+def _client(airtable: FakeAirtable, **kwargs) -> AirtableClient:
+    kwargs.setdefault("registry", RateLimitRegistry({}))
+    return AirtableClient("key", transport=httpx.MockTransport(airtable), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_writes_are_chunked_into_ten_records():
+    airtable = FakeAirtable()
+    client = _client(airtable)
+
+    created = await client.create_records("appA", "tbl", [{"n": i} for i in range(25)])
+    await client.update_records("appA", "tbl", [{"id": f"rec{i}", "fields": {}} for i in range(11)])
+    deleted = await client.delete_records("appA", "tbl", [f"rec{i}" for i in range(12)])
+
+    sizes = [
+        len(json.loads(r.content)["records"]) if r.content else len(r.url.params.get_list("records[]"))
+        for r in airtable.requests
+    ]
+    assert sizes == [10, 10, 5, 10, 1, 10, 2]
+    assert [r.method for r in airtable.requests] == ["POST"] * 3 + ["PATCH"] * 2 + ["DELETE"] * 2
+    assert airtable.requests[0].url.path == "/v0/appA/tbl"
+    assert airtable.requests[0].headers["Authorization"] == "Bearer key"
+    assert len(created.records) == 25 and not created.failed
+    assert [r["id"] for r in deleted.records] == [f"rec{i}" for i in range(12)]
+    assert not deleted.failed
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_upsert_merges_on_signalhire_id():
+    airtable = FakeAirtable()
+    client = _client(airtable)
+
+    result = await client.upsert_records(
+        "appA", "tbl", [{"SignalHire ID": f"u{i}"} for i in range(12)]
+    )
+
+    body = json.loads(airtable.requests[0].content)
+    assert body["performUpsert"] == {"fieldsToMergeOn": ["SignalHire ID"]}
+    assert body["typecast"] is True
+    assert len(airtable.requests) == 2
+    assert len(result.records) == 12
+    assert len(result.created) == 2 and len(result.updated) == 10
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_base_waits_out_the_penalty():
+    clock = [0.0]
+    slept: list[float] = []
+
+    async def sleep(seconds: float) -> None:
+        slept.append(seconds)
+        clock[0] += seconds
+
+    airtable = FakeAirtable(rate_limited=1)
+    client = _client(airtable, sleep=sleep, time_fn=lambda: clock[0])
+
+    records = await client.list_records("appA", "tbl")
+    assert records == []
+    assert slept == [30.0]
+    assert len(airtable.requests) == 2
+
+    # The penalty is over; other bases were never paused
+    await client.list_records("appB", "tbl")
+    assert slept == [30.0]
+    assert client.get_stats()["rate_limited"] == 1
+
+    airtable.rate_limited = 5
+    with pytest.raises(AirtableClientError) as error:
+        await client.list_records("appA", "tbl")
+    assert error.value.status_code == 429
+
+    # Giving up still leaves the base paused for everyone else
+    slept.clear()
+    airtable.rate_limited = 0
+    await client.list_records("appA", "tbl")
+    assert slept == [30.0]
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_requests_throttled_per_base():
+    registry = RateLimitRegistry({"airtable/key:*": RateLimit(2, 0.2)})
+    client = _client(FakeAirtable(), registry=registry)
+
+    started = asyncio.get_running_loop().time()
+    await client.create_records("appA", "tbl", [{"n": i} for i in range(30)])
+    await client.list_records("appB", "tbl")
+    elapsed = asyncio.get_running_loop().time() - started
+
+    stats = registry.get_stats()
+    assert stats["acquired"] == 4
+    assert stats["delayed"] == 1
+    assert len(stats["usage"]) == 2
+    assert elapsed >= 0.15
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_rejected_chunks_do_not_stop_the_write():
+    airtable = FakeAirtable(errors={2: 422})
+    client = _client(airtable)
+
+    result = await client.create_records("appA", "tbl", [{"n": i} for i in range(25)])
+
+    assert len(airtable.requests) == 3
+    assert len(result.records) == 15
+    assert [(f.start, len(f.records), f.error.status_code) for f in result.failed] == [
+        (10, 10, 422)
+    ]
+    assert result.failed_indexes == set(range(10, 20))
+
+    # Every later chunk would be refused as well, so none are sent
+    airtable = FakeAirtable(errors={1: 403})
+    client = _client(airtable)
+    result = await client.upsert_records("appA", "tbl", [{"SignalHire ID": "u"}] * 25)
+    assert len(airtable.requests) == 1
+    assert [f.start for f in result.failed] == [0, 10, 20]
+
+    airtable = FakeAirtable(errors={1: 422})
+    client = _client(airtable)
+    result = await client.delete_records("appA", "tbl", [f"rec{i}" for i in range(15)])
+    assert len(airtable.requests) == 2
+    assert [r["id"] for r in result.records] == [f"rec{i}" for i in range(10, 15)]
+    assert result.failed_indexes == set(range(10))
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_shared_session_closed_by_its_last_user():
+    client = _client(FakeAirtable())
+    set_airtable_client(client)
+    try:
+        async with shared_airtable_client("key") as first:
+            async with shared_airtable_client("key") as second:
+                await second.list_records("appA", "tbl")
+                session = client._session
+            # The other user's session survives
+            assert first._session is session and not session.is_closed
+            await first.list_records("appA", "tbl")
+        assert client._session is None and session.is_closed
+
+        index = AirtableContactIndex(api_key="key", base_id="appA", table_id="tbl")
+        await index._fetch_all()
+        assert client._session is None
+    finally:
+        set_airtable_client(None)
+
+
+def test_session_pooled_per_event_loop():
+    client = _client(FakeAirtable())
+
+    async def sessions():
+        await client.list_records("appA", "tbl")
+        first = client._session
+        await client.list_records("appA", "tbl")
+        return first, client._session
+
+    first, second = asyncio.run(sessions())
+    assert first is second
+    third, _ = asyncio.run(sessions())
+    assert third is not first
+    assert first.is_closed
+
+
+def test_match_formula_quotes_values():
+    assert match_formula("SignalHire ID", ["a"]) == "{SignalHire ID} = 'a'"
+    assert match_formula("Name", ["O'Neil", "b"]) == "OR({Name} = 'O\\'Neil', {Name} = 'b')"
+
+
+@pytest.mark.asyncio
+async def test_status_updates_batch_lookups_and_writes():
+    ids = [f"u{i}" for i in range(15)]
+    records = [
+        {"id": f"rec{i}", "createdTime": f"2026-01-{i + 1:02d}", "fields": {"SignalHire ID": uid}}
+        for i, uid in enumerate(ids[:12])
+    ]
+    airtable = FakeAirtable(records=records)
+    set_airtable_client(_client(airtable))
+    try:
+        await update_airtable_contacts_status(ids, "selContacted", airtable_api_key="key")
+    finally:
+        set_airtable_client(None)
+
+    lookups = [r for r in airtable.requests if r.method == "GET"]
+    patches = [json.loads(r.content)["records"] for r in airtable.requests if r.method == "PATCH"]
+    assert len(lookups) == 1
+    assert "OR(" in lookups[0].url.params["filterByFormula"]
+    assert [len(batch) for batch in patches] == [10, 2]
+    assert patches[0][0] == {"id": "rec0", "fields": {"Status": "selContacted"}}
@@ -0,0 +1,124 @@
+"""
+Unit tests for the durable reveal BatchQueue
+
+Covers:
+- Priority ordering with FIFO within a priority
+- Lease/ack semantics, retries and exhausted items
+- Backlog and daily count surviving a restart, expired leases resumed
+- On-disk queue by default, in memory only when asked for
+- Releasing unfinished leases
+- Bulk enqueue logging once per batch
+"""
+
+import time
+
+import pytest
+from structlog.testing import capture_logs
+
+from src.services.signalhire_client import BatchQueue
+
+
+pytestmark = pytest.mark.unit
+
+
+def test_priority_order_is_fifo_within_priority():
+    queue = BatchQueue(path=":memory:")
+    queue.add_batch(["n1", "n2"])
+    queue.add_item("h1", priority=2)
+    queue.add_item("u1", priority=3)
+    queue.add_item("h2", priority=2)
+
+    assert [item.prospect_id for item in queue.queue] == ["u1", "h1", "h2", "n1", "n2"]
+    batch = queue.get_next_batch(3)
+    assert [item.prospect_id for item in batch] == ["u1", "h1", "h2"]
+    assert len(queue) == 2
+
+
+def test_ack_completes_leased_items_and_retries_failures():
+    queue = BatchQueue(path=":memory:")
+    queue.add_batch(["a", "b"])
+    a, b = queue.get_next_batch()
+
+    queue.mark_completed(a.id, success=True)
+    queue.mark_completed(b.id, success=False)
+    stats = queue.get_queue_stats()
+    assert stats["completed"] == 1
+    assert stats["daily_count"] == 1
+    assert stats["queue_size"] == 1
+
+    # The failed item comes back until it runs out of retries
+    for _ in range(2):
+        (retry,) = queue.get_next_batch()
+        assert retry.id == b.id
+        queue.mark_completed(retry.id, success=False)
+    stats = queue.get_queue_stats()
+    assert stats["failed"] == 1
+    assert stats["queue_size"] == 0
+    assert queue.clear_completed() == 1
+
+
+def test_backlog_survives_restart_and_expired_leases_resume(tmp_path):
+    path = tmp_path / "queue.db"
+    first = BatchQueue(path=path, lease_timeout=0.05)
+    first.add_batch([f"p{i}" for i in range(5)])
+    done, interrupted = first.get_next_batch(2)
+    first.mark_completed(done.id)
+    first.close()  # simulated crash: `interrupted` is never acknowledged
+
+    second = BatchQueue(path=path, lease_timeout=60)
+    assert second.daily_count == 1
+    assert [item.prospect_id for item in second.get_next_batch(10)] == [
+        "p2",
+        "p3",
+        "p4",
+    ]
+
+    time.sleep(0.06)
+    (resumed,) = second.get_next_batch(10)
+    assert resumed.id == interrupted.id
+    assert second.get_queue_stats()["durable"] is True
+    second.close()
+
+
+def test_queue_is_on_disk_by_default(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("SIGNALHIRE_QUEUE_DB", raising=False)
+    queue = BatchQueue()
+    queue.add_item("a")
+    queue.close()
+
+    assert queue.durable
+    assert len(BatchQueue()) == 1
+    assert (tmp_path / ".signalhire-agent" / "queue" / "batch_queue.db").exists()
+
+    monkeypatch.setenv("SIGNALHIRE_QUEUE_DB", ":memory:")
+    assert len(BatchQueue()) == 0
+    assert BatchQueue().get_queue_stats()["durable"] is False
+
+
+def test_release_returns_leases_without_counting_retry():
+    queue = BatchQueue(path=":memory:")
+    queue.add_batch(["a", "b"])
+    batch = queue.get_next_batch()
+
+    assert queue.release(item.id for item in batch) == 2
+    assert [item.retry_count for item in queue.queue] == [0, 0]
+
+
+def test_daily_limit_caps_leases():
+    queue = BatchQueue(max_daily_contacts=2, path=":memory:")
+    queue.add_batch(["a", "b", "c"])
+    for item in queue.get_next_batch(10):
+        queue.mark_completed(item.id)
+
+    assert queue.get_next_batch(10) == []
+    assert len(queue) == 1
+
+
+def test_bulk_enqueue_logs_once():
+    queue = BatchQueue(path=":memory:")
+    with capture_logs() as logs:
+        ids = queue.add_batch([f"p{i}" for i in range(1000)])
+
+    assert len(set(ids)) == 1000
+    assert [entry["event"] for entry in logs] == ["Batch added to queue"]
@@ -0,0 +1,175 @@
+"""
+Unit tests for multi-item Person API reveals
+
+Covers:
+- Packing items into requests of up to 100 items
+- Request ID to items mapping for callback correlation
+- Bisecting requests rejected as malformed
+- Resubmitting only timed out / missing callback items
+- Rate limiter charging per item rather than per request
+- `reveal --items-per-request` reaching the reveal operation
+"""
+
+import pytest
+from click.testing import CliRunner
+
+from src.cli import reveal_commands
+from src.cli.main import main
+from src.lib.contact_cache import ContactCache, set_contact_cache
+from src.lib.rate_limit_registry import RateLimitRegistry
+from src.lib.revealed_index import RevealedIndex, set_revealed_index
+from src.services.signalhire_client import (
+    APIResponse,
+    RateLimiter,
+    SignalHireAPIError,
+    SignalHireClient,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+class FakeRevealAPI:
+    """Records Person API payloads and hands out sequential request IDs."""
+
+    def __init__(self, reject_item: str | None = None):
+        self.payloads: list[list[str]] = []
+        self.reject_item = reject_item
+
+    async def __call__(self, method, endpoint, **kwargs):
+        items = kwargs["json"]["items"]
+        self.payloads.append(list(items))
+        if self.reject_item in items:
+            return APIResponse(success=False, error="Malformed item", status_code=422)
+        return APIResponse(
+            success=True, data={"requestId": len(self.payloads)}, status_code=201
+        )
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = SignalHireClient(api_key="test-key", callback_url="http://cb")
+    api = FakeRevealAPI()
+    monkeypatch.setattr(client, "_make_request", api)
+    client.fake_api = api
+    return client
+
+
+@pytest.mark.asyncio
+async def test_batch_reveal_items_packs_100_items_per_request(client):
+    items = [f"uid-{i}" for i in range(250)]
+
+    results = await client.batch_reveal_items(items)
+
+    assert sorted(len(p) for p in client.fake_api.payloads) == [50, 100, 100]
+    assert [r.data["item"] for r in results] == items
+    assert all(r.success for r in results)
+
+    for response in results:
+        request_id = response.data["requestId"]
+        assert response.data["item"] in client.get_reveal_request_items(request_id)
+
+
+@pytest.mark.asyncio
+async def test_reveal_items_rejects_more_than_100_items(client):
+    with pytest.raises(SignalHireAPIError) as exc:
+        await client.reveal_items([f"uid-{i}" for i in range(101)])
+    assert exc.value.status_code == 406
+    assert client.fake_api.payloads == []
+
+
+@pytest.mark.asyncio
+async def test_malformed_request_is_bisected(client):
+    client.fake_api.reject_item = "bad"
+    items = ["a", "b", "bad", "c", "d", "e", "f", "g"]
+
+    results = await client.batch_reveal_items(items)
+
+    failed = [r.data["item"] for r in results if not r.success]
+    assert failed == ["bad"]
+    assert all(r.status_code == 201 for r in results if r.success)
+    # One full request, then halving down to the single offending item
+    assert ["bad"] in client.fake_api.payloads
+
+
+@pytest.mark.asyncio
+async def test_retry_failed_items_resubmits_only_failures(client):
+    resp = await client.reveal_items(["a", "b", "c", "d"])
+    request_id = resp.data["requestId"]
+
+    callback = [
+        {"item": "a", "status": "success"},
+        {"item": "b", "status": "timeout_exceeded"},
+        {"item": "c", "status": "failed"},
+    ]
+    assert client.failed_reveal_items(request_id, callback) == ["b", "d"]
+
+    retried = await client.retry_failed_items(request_id, callback)
+
+    assert client.fake_api.payloads[-1] == ["b", "d"]
+    assert [r.data["item"] for r in retried] == ["b", "d"]
+    assert client.get_reveal_request_items(request_id) is None
+
+
+@pytest.mark.asyncio
+async def test_batch_reveal_contacts_uses_multi_item_requests(client, monkeypatch):
+    async def fake_credits():
+        return APIResponse(success=True, data={"credits_remaining": 1000})
+
+    monkeypatch.setattr(client, "check_credits", fake_credits)
+
+    results = await client.batch_reveal_contacts(
+        [f"uid-{i}" for i in range(30)], items_per_request=10
+    )
+
+    assert len(client.fake_api.payloads) == 3
+    assert len(results) == 30
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_charges_per_item():
+    registry = RateLimitRegistry()
+    limiter = RateLimiter(max_requests=600, daily_limit=5000, registry=registry, api_key="k")
+
+    await limiter.wait_if_needed(credits_needed=100, elements=100)
+
+    # One per-minute window: the registry's per-key scope
+    assert list(registry.get_stats()["usage"].values()) == [100]
+
+
+def test_reveal_cli_passes_items_per_request(monkeypatch, tmp_path):
+    monkeypatch.setenv("SIGNALHIRE_API_KEY", "test-key")
+    for name in ("AIRTABLE_API_KEY", "AIRTABLE_TOKEN", "AIRTABLE_BASE_ID"):
+        monkeypatch.delenv(name, raising=False)
+    operations = []
+
+    async def confirm(config, total_prospects, logger):
+        return True
+
+    async def skip_status_update(**kwargs):
+        return None
+
+    async def bulk_reveal(self, operation, progress_callback=None):
+        operations.append(operation)
+        return {"revealed_count": 0, "failed_count": 0, "prospects": []}
+
+    monkeypatch.setattr(reveal_commands, "check_credits_and_confirm", confirm)
+    monkeypatch.setattr(
+        reveal_commands, "update_airtable_contacts_status", skip_status_update
+    )
+    monkeypatch.setattr(SignalHireClient, "bulk_reveal", bulk_reveal)
+    index = RevealedIndex(tmp_path / "revealed.idx")
+    set_revealed_index(index)
+    set_contact_cache(ContactCache(tmp_path / "contacts.db", revealed_index=index))
+    try:
+        result = CliRunner().invoke(
+            main, ["reveal", "uid-1", "uid-2", "--items-per-request", "7"]
+        )
+    finally:
+        set_revealed_index(None)
+        set_contact_cache(None)
+
+    assert result.exit_code == 0, result.output
+    assert [(op.prospect_ids, op.items_per_request) for op in operations] == [
+        (["uid-1", "uid-2"], 7)
+    ]
@@ -0,0 +1,197 @@
+"""
+Unit tests for idempotent callback processing
+
+Covers:
+- Bloom filter membership and false-positive rate
+- Items keyed by (Request-Id, item, payload hash); duplicate_query items dropped
+- Seen-set persisted across restarts and shared between processes
+- Filter sized to every retained key; expired keys pruned periodically
+- Redelivered callbacks never reaching the handlers
+- Waiters resolved with the whole callback when some items were already seen
+- Items whose handler failed retried, then dropped on redelivery
+"""
+
+import json
+
+import httpx
+import pytest
+
+from src.lib import callback_dedupe, callback_server
+from src.lib.callback_dedupe import BloomFilter, CallbackDeduper, item_key
+from src.lib.callback_server import CallbackServer
+from src.lib.reveal_registry import RevealRegistry
+
+
+pytestmark = pytest.mark.unit
+
+
+def _item(uid: str, status: str = "success", email: str = "a@example.com") -> dict:
+    return {
+        "status": status,
+        "item": uid,
+        "candidate": {"uid": uid, "contacts": [{"type": "email", "value": email}]},
+    }
+
+
+def test_bloom_filter_false_positive_rate():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    for i in range(2000):
+        bloom.add(item_key("r", {"item": i}))
+
+    assert all(item_key("r", {"item": i}) in bloom for i in range(2000))
+    false_positives = sum(item_key("other", {"item": i}) in bloom for i in range(5000))
+    assert false_positives / 5000 < 0.03
+
+
+def test_duplicates_and_duplicate_queries_dropped():
+    dedupe = CallbackDeduper()
+    callback = [_item("u1"), _item("u2"), _item("u3", status="duplicate_query")]
+
+    fresh, keys = dedupe.admit("1", callback)
+    assert [entry["item"] for entry in fresh] == ["u1", "u2"]
+    # A redelivery while the first is still being handled is dropped too
+    assert dedupe.admit("1", callback)[0] == []
+    dedupe.commit(keys)
+
+    again, _ = dedupe.admit("1", callback + [_item("u1", email="new@example.com")])
+    # Same item with a different payload is new data
+    assert [entry["candidate"]["contacts"][0]["value"] for entry in again] == [
+        "new@example.com"
+    ]
+    assert dedupe.admit("2", [_item("u1")])[0] != []
+
+    stats = dedupe.get_stats()
+    assert stats["duplicates_dropped"] == 4
+    assert stats["duplicate_queries_dropped"] == 3
+    assert stats["indexed"] == 2
+
+
+def test_released_items_can_be_handled_again():
+    dedupe = CallbackDeduper()
+    fresh, keys = dedupe.admit("1", [_item("u1")])
+    dedupe.release(keys)
+    assert dedupe.admit("1", [_item("u1")])[0] == fresh
+
+
+def test_seen_set_persists_and_is_shared(tmp_path):
+    path = tmp_path / "seen.db"
+    first = CallbackDeduper(path, capacity=100)
+    other_process = CallbackDeduper(path, capacity=100)
+    _, keys = first.admit("1", [_item("u1")])
+    first.commit(keys)
+
+    # Picked up incrementally by a deduper that was already open
+    assert other_process.admit("1", [_item("u1")])[0] == []
+    first.close()
+
+    restarted = CallbackDeduper(path, capacity=100)
+    assert restarted.admit("1", [_item("u1")])[0] == []
+    assert restarted.get_stats()["false_positives"] == 0
+
+
+def test_filter_grows_to_cover_every_retained_key(tmp_path):
+    path = tmp_path / "seen.db"
+    dedupe = CallbackDeduper(path, capacity=10)
+    for i in range(25):
+        _, keys = dedupe.admit("1", [_item(f"u{i}")])
+        dedupe.commit(keys)
+    dedupe.close()
+
+    # After a restart even the oldest keys are still known
+    restarted = CallbackDeduper(path, capacity=10)
+    assert all(restarted.admit("1", [_item(f"u{i}")])[0] == [] for i in range(25))
+    stats = restarted.get_stats()
+    assert stats["filter_keys"] == 25
+    assert stats["filter_capacity"] >= 50
+
+
+def test_expired_keys_are_pruned_periodically(tmp_path, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(callback_dedupe.time, "time", lambda: now[0])
+    dedupe = CallbackDeduper(tmp_path / "seen.db", retention=100, prune_interval=10)
+    _, keys = dedupe.admit("1", [_item("u1")])
+    dedupe.commit(keys)
+
+    now[0] += 50
+    dedupe.admit("1", [_item("u2")])
+    assert dedupe.get_stats()["indexed"] == 1
+
+    now[0] += 60
+    # Past the retention window the item is new again, without a restart
+    assert dedupe.admit("1", [_item("u1")])[0] != []
+    assert dedupe.get_stats()["indexed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_redelivered_callback_skips_handlers(tmp_path):
+    server = CallbackServer(wal_dir=tmp_path, workers=1)
+    handled = []
+    server.register_handler("record", lambda data: handled.append(len(data)))
+
+    transport = httpx.ASGITransport(app=server.create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://cb") as client:
+        for body in ([_item("u1"), _item("u2")], [_item("u2"), _item("u1")]):
+            await client.post(
+                "/signalhire/callback",
+                content=json.dumps(body),
+                headers={"Request-Id": "9"},
+            )
+    await server.wait_idle()
+
+    assert handled == [2]
+    ingest = server.status["ingest"]
+    assert ingest["duplicate_callbacks"] == 1
+    assert ingest["dedupe"]["duplicates_dropped"] == 2
+    assert (tmp_path / "seen.db").exists()
+    await server.stop_ingest()
+
+
+async def _deliver(server: CallbackServer, *bodies: list[dict]) -> None:
+    transport = httpx.ASGITransport(app=server.create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://cb") as client:
+        for body in bodies:
+            await client.post(
+                "/signalhire/callback",
+                content=json.dumps(body),
+                headers={"Request-Id": "9"},
+            )
+            await server.wait_idle()
+
+
+@pytest.mark.asyncio
+async def test_waiters_get_every_item_of_a_partly_seen_callback(tmp_path):
+    registry = RevealRegistry()
+    server = CallbackServer(wal_dir=tmp_path, workers=1, reveal_registry=registry)
+    handled = []
+    server.register_handler("record", lambda data: handled.append([i["item"] for i in data]))
+
+    await _deliver(server, [_item("u1")])
+    registry.discard("9")
+    future = registry.expect("9", ["u1", "u2"])
+    await _deliver(server, [_item("u1"), _item("u2")])
+
+    assert handled == [["u1"], ["u2"]]
+    assert [c.item for c in future.result()] == ["u1", "u2"]
+    await server.stop_ingest()
+
+
+@pytest.mark.asyncio
+async def test_items_are_not_marked_seen_when_a_handler_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr(callback_server, "RETRY_BASE_DELAY", 0.01)
+    server = CallbackServer(wal_dir=tmp_path, workers=1)
+    handled = []
+
+    def flaky(data):
+        handled.append(len(data))
+        if len(handled) == 1:
+            raise RuntimeError("Airtable is down")
+
+    server.register_handler("record", flaky)
+    await _deliver(server, [_item("u1"), _item("u2")], [_item("u1"), _item("u2")])
+
+    # The retry handles both items; only then does the redelivery count as seen
+    assert handled == [2, 2]
+    ingest = server.status["ingest"]
+    assert ingest["handler_errors"] == 1
+    assert ingest["duplicate_callbacks"] == 1
+    await server.stop_ingest()
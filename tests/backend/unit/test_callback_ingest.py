@@ -0,0 +1,277 @@
+"""
+Unit tests for the callback write-ahead log and ingest worker pool
+
+Covers:
+- Group-committed appends, segment rollover and deletion once acknowledged
+- Torn trailing writes ignored on replay
+- Callback endpoint acknowledging after logging and workers running handlers
+- Backpressure with 503 + Retry-After when the backlog is full
+- Unprocessed callbacks replayed by a restarted server
+- Workers surviving processing errors: retries, then moved aside
+- Callbacks whose handler failed retried, request handlers kept until they succeed
+- Appends whose fsync failed dropped from the backlog
+- Appends waiting on a flush failing once the log is closed
+"""
+
+import asyncio
+import json
+import sqlite3
+
+import httpx
+import pytest
+
+from src.lib import callback_server, callback_wal
+from src.lib.callback_server import CallbackServer
+from src.lib.callback_wal import CallbackWAL
+
+
+pytestmark = pytest.mark.unit
+
+CALLBACK = [{"status": "success", "item": "uid-1", "candidate": {"uid": "uid-1"}}]
+
+
+@pytest.mark.asyncio
+async def test_appends_share_fsyncs_and_segments_roll(tmp_path):
+    wal = CallbackWAL(tmp_path, segment_bytes=400)
+    wal.open()
+
+    entries = await asyncio.gather(
+        *(wal.append(f"req-{i}", b'[{"status":"failed"}]') for i in range(30))
+    )
+    stats = wal.get_stats()
+    assert [entry.seq for entry in entries] == list(range(1, 31))
+    assert stats["fsyncs"] < 30
+    assert stats["segments"] > 1
+
+    for entry in entries:
+        wal.ack(entry.seq)
+    # Only the active segment remains once everything is acknowledged
+    assert wal.get_stats()["segments"] == 1
+    assert len(list(tmp_path.glob("wal-*.log"))) == 1
+    wal.close()
+
+
+def test_replay_skips_acknowledged_and_torn_entries(tmp_path):
+    wal = CallbackWAL(tmp_path, fsync=False)
+    wal.open()
+    first = asyncio.run(wal.append("req-1", b"[1]"))
+    asyncio.run(wal.append("req-2", b"[2]"))
+    wal.ack(first.seq)
+    wal.close()
+    segment = next(tmp_path.glob("wal-*.log"))
+    with open(segment, "ab") as handle:
+        handle.write(b'{"seq": 3, "request_id": "req-3", "bo')
+
+    reopened = CallbackWAL(tmp_path, fsync=False)
+    replay = reopened.open()
+    assert [(entry.request_id, entry.body) for entry in replay] == [("req-2", b"[2]")]
+    assert reopened.pending == 1
+    reopened.close()
+
+
+def _client(server: CallbackServer) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=server.create_app()),
+        base_url="http://callback",
+    )
+
+
+@pytest.mark.asyncio
+async def test_callbacks_are_logged_then_processed(tmp_path):
+    server = CallbackServer(wal_dir=tmp_path, workers=2)
+    received = []
+
+    async def handler(data):
+        received.append(data)
+
+    server.register_handler("record", handler)
+    async with _client(server) as client:
+        response = await client.post(
+            "/signalhire/callback",
+            content=json.dumps(CALLBACK),
+            headers={"Request-Id": "42"},
+        )
+        missing_id = await client.post("/signalhire/callback", json=CALLBACK)
+
+    assert response.status_code == 200
+    assert missing_id.status_code == 400
+    await server.wait_idle()
+    assert received == [CALLBACK]
+    ingest = server.status["ingest"]
+    assert ingest["processed"] == 1
+    assert ingest["backlog"] == 0
+    await server.stop_ingest()
+
+
+@pytest.mark.asyncio
+async def test_full_backlog_returns_503(tmp_path):
+    server = CallbackServer(wal_dir=tmp_path, workers=1, max_backlog=2, retry_after=7)
+    release = asyncio.Event()
+
+    async def slow_handler(data):
+        await release.wait()
+
+    server.register_handler("slow", slow_handler)
+    async with _client(server) as client:
+        statuses = []
+        for i in range(3):
+            response = await client.post(
+                "/signalhire/callback", json=CALLBACK, headers={"Request-Id": str(i)}
+            )
+            statuses.append(response.status_code)
+
+    assert statuses == [200, 200, 503]
+    assert response.headers["Retry-After"] == "7"
+    release.set()
+    await server.wait_idle()
+    assert server.status["ingest"]["rejected"] == 1
+    await server.stop_ingest()
+
+
+@pytest.mark.asyncio
+async def test_restart_replays_unprocessed_callbacks(tmp_path):
+    crashed = CallbackServer(wal_dir=tmp_path, workers=1)
+    stuck = asyncio.Event()
+
+    async def never_finishes(data):
+        await stuck.wait()
+
+    crashed.register_handler("stuck", never_finishes)
+    async with _client(crashed) as client:
+        for i in range(2):
+            await client.post(
+                "/signalhire/callback", json=CALLBACK, headers={"Request-Id": str(i)}
+            )
+    await crashed.stop_ingest()
+
+    restarted = CallbackServer(wal_dir=tmp_path, workers=2)
+    seen = []
+    restarted.register_request_handler("1", lambda request_id, data: seen.append(request_id))
+    restarted.register_handler("record", lambda data: seen.append("global"))
+    await restarted.start_ingest()
+    await restarted.wait_idle()
+
+    assert sorted(seen) == ["1", "global", "global"]
+    assert restarted.status["ingest"]["wal"]["replayed"] == 2
+    await restarted.stop_ingest()
+
+
+def _flaky_dedupe(server: CallbackServer, failures: int) -> None:
+    admit = server.dedupe.admit
+    remaining = {"n": failures}
+
+    def flaky(request_id, items):
+        if remaining["n"]:
+            remaining["n"] -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return admit(request_id, items)
+
+    server.dedupe.admit = flaky
+
+
+@pytest.mark.asyncio
+async def test_workers_survive_processing_errors(tmp_path, monkeypatch):
+    monkeypatch.setattr(callback_server, "RETRY_BASE_DELAY", 0.01)
+    server = CallbackServer(wal_dir=tmp_path, workers=1)
+    received = []
+    server.register_handler("record", received.append)
+    _flaky_dedupe(server, failures=2)
+
+    async with _client(server) as client:
+        await client.post("/signalhire/callback", json=CALLBACK, headers={"Request-Id": "1"})
+    await asyncio.wait_for(server.wait_idle(), 5)
+
+    assert received == [CALLBACK]
+    ingest = server.status["ingest"]
+    assert (ingest["failed"], ingest["processed"], ingest["backlog"]) == (2, 1, 0)
+    assert not server._worker_tasks[0].done()
+    await server.stop_ingest()
+
+
+@pytest.mark.asyncio
+async def test_callbacks_that_keep_failing_are_moved_aside(tmp_path, monkeypatch):
+    monkeypatch.setattr(callback_server, "RETRY_BASE_DELAY", 0.01)
+    server = CallbackServer(wal_dir=tmp_path, workers=1, max_attempts=2)
+    received = []
+    server.register_handler("record", received.append)
+    _flaky_dedupe(server, failures=2)
+
+    async with _client(server) as client:
+        await client.post("/signalhire/callback", json=CALLBACK, headers={"Request-Id": "1"})
+        await asyncio.wait_for(server.wait_idle(), 5)
+        await client.post("/signalhire/callback", json=CALLBACK, headers={"Request-Id": "2"})
+    await asyncio.wait_for(server.wait_idle(), 5)
+
+    dead = [json.loads(line) for line in (tmp_path / "dead.log").read_text().splitlines()]
+    assert [(d["request_id"], d["error"]) for d in dead] == [("1", "database is locked")]
+    assert received == [CALLBACK]
+    assert server.status["ingest"]["dead"] == 1
+    assert server.status["ingest"]["backlog"] == 0
+    await server.stop_ingest()
+
+
+@pytest.mark.asyncio
+async def test_failed_handlers_are_retried_before_the_callback_is_acked(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr(callback_server, "RETRY_BASE_DELAY", 0.01)
+    server = CallbackServer(wal_dir=tmp_path, workers=1)
+    calls = {"request": 0, "global": 0}
+
+    def request_handler(request_id, data):
+        calls["request"] += 1
+        if calls["request"] == 1:
+            raise RuntimeError("cache is locked")
+
+    def global_handler(data):
+        calls["global"] += 1
+        if calls["global"] == 1:
+            raise RuntimeError("Airtable is down")
+
+    server.register_request_handler("1", request_handler)
+    server.register_handler("record", global_handler)
+    async with _client(server) as client:
+        await client.post("/signalhire/callback", json=CALLBACK, headers={"Request-Id": "1"})
+    await asyncio.wait_for(server.wait_idle(), 5)
+
+    # A request handler that succeeded is not run again by the next retry
+    assert calls == {"request": 2, "global": 2}
+    ingest = server.status["ingest"]
+    assert (ingest["failed"], ingest["processed"], ingest["backlog"]) == (2, 1, 0)
+    assert server.status["pending_requests"] == []
+    await server.stop_ingest()
+
+
+@pytest.mark.asyncio
+async def test_failed_fsync_leaves_nothing_pending(tmp_path, monkeypatch):
+    wal = CallbackWAL(tmp_path)
+    wal.open()
+
+    def broken_fsync(fd):
+        raise OSError("I/O error")
+
+    monkeypatch.setattr(callback_wal.os, "fsync", broken_fsync)
+    with pytest.raises(OSError):
+        await wal.append("req-1", b"[1]")
+    monkeypatch.undo()
+
+    assert wal.pending == 0
+    await wal.append("req-2", b"[2]")
+    wal.close()
+    # The refused callback is redelivered by SignalHire, not replayed
+    reopened = CallbackWAL(tmp_path)
+    assert [entry.request_id for entry in reopened.open()] == ["req-2"]
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_appends_fail_when_the_log_closes_before_the_flush(tmp_path):
+    wal = CallbackWAL(tmp_path)
+    wal.open()
+
+    append = asyncio.create_task(wal.append("req-1", b"[1]"))
+    await asyncio.sleep(0)
+    wal.close()
+
+    with pytest.raises(OSError):
+        await asyncio.wait_for(append, 5)
@@ -0,0 +1,120 @@
+"""
+Unit tests for running the callback server on the caller's event loop
+
+Covers:
+- astart/astop serving on an ephemeral port, repeatable between jobs
+- Coroutine handlers awaited on the caller's loop and thread
+- Background-thread mode actually stopping
+- reveal_and_wait completing through an in-loop server
+"""
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from src.lib.callback_server import CallbackServer
+from src.lib.reveal_registry import RevealRegistry
+from src.services.signalhire_client import APIResponse, SignalHireClient
+
+
+pytestmark = pytest.mark.unit
+
+CALLBACK = [{"status": "success", "item": "uid-1", "candidate": {"uid": "uid-1"}}]
+
+
+def _server(tmp_path, **kwargs) -> CallbackServer:
+    return CallbackServer(host="127.0.0.1", port=0, wal_dir=tmp_path, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_in_loop_server_runs_handlers_on_caller_loop(tmp_path):
+    server = _server(tmp_path)
+    seen = []
+
+    async def handler(data):
+        seen.append((asyncio.get_running_loop(), threading.get_ident()))
+
+    server.register_handler("record", handler)
+
+    for request_id in ("1", "2"):
+        # Started and stopped once per job
+        async with server:
+            assert server.is_running and server.port != 0
+            async with httpx.AsyncClient() as client:
+                response = await client.post(
+                    server.get_callback_url(),
+                    json=CALLBACK,
+                    headers={"Request-Id": request_id},
+                )
+            assert response.status_code == 200
+            await server.wait_idle()
+        assert not server.is_running
+
+    loop = asyncio.get_running_loop()
+    assert seen == [(loop, threading.get_ident())] * 2
+
+
+@pytest.mark.asyncio
+async def test_astart_fails_when_port_is_taken(tmp_path):
+    first = _server(tmp_path / "a")
+    await first.astart()
+    second = CallbackServer(host="127.0.0.1", port=first.port, wal_dir=tmp_path / "b")
+    try:
+        with pytest.raises(RuntimeError):
+            await second.astart()
+        assert not second.is_running
+    finally:
+        await first.astop()
+
+
+def test_background_thread_server_stops(tmp_path):
+    server = _server(tmp_path)
+    server.start(background=True)
+    thread = server.server_thread
+    for _ in range(200):
+        if server._uvicorn.started:
+            break
+        threading.Event().wait(0.01)
+
+    server.stop()
+    assert not thread.is_alive()
+    assert not server.is_running
+
+
+@pytest.mark.asyncio
+async def test_reveal_and_wait_through_in_loop_server(tmp_path):
+    registry = RevealRegistry()
+    async with _server(tmp_path, reveal_registry=registry) as server:
+        client = SignalHireClient(
+            api_key="test-key",
+            callback_url=server.get_callback_url(),
+            reveal_registry=registry,
+        )
+        posts = []
+
+        async def deliver(request_id, items):
+            async with httpx.AsyncClient() as http:
+                await http.post(
+                    server.get_callback_url(),
+                    json=[
+                        {"status": "success", "item": i, "candidate": {"uid": i}}
+                        for i in items
+                    ],
+                    headers={"Request-Id": str(request_id)},
+                )
+
+        async def fake_request(method, endpoint, **kwargs):
+            items = kwargs["json"]["items"]
+            posts.append(asyncio.create_task(deliver(len(posts) + 1, items)))
+            return APIResponse(success=True, data={"requestId": len(posts)})
+
+        client._make_request = fake_request
+        results = await client.reveal_and_wait(
+            ["u1", "u2", "u3"], timeout=5, items_per_request=2
+        )
+        await asyncio.gather(*posts)
+
+    assert sorted(results) == ["u1", "u2", "u3"]
+    assert all(completion.succeeded for completion in results.values())
@@ -0,0 +1,148 @@
+"""
+Unit tests for the shared SQLite callback store
+
+Covers:
+- Redelivered callbacks dropped at insert, across store connections
+- Exclusive claims and reclaiming expired leases
+- Failed callbacks retried after a delay, then archived as dead
+- Dead rows from older stores archived on open; backlog counter kept by triggers
+- Named request-handler registrations visible to every server sharing the store
+- Servers sharing one store processing each other's backlog
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.lib.callback_server import CallbackServer
+from src.lib.callback_store import SharedCallbackStore
+
+
+pytestmark = pytest.mark.unit
+
+CALLBACK = [{"status": "success", "item": "uid-1", "candidate": {"uid": "uid-1"}}]
+
+
+def _store(path, **kwargs) -> SharedCallbackStore:
+    store = SharedCallbackStore(path, fsync=False, **kwargs)
+    store.open()
+    return store
+
+
+def test_duplicates_dropped_and_claims_exclusive(tmp_path):
+    path = tmp_path / "callbacks.db"
+    first, second = _store(path), _store(path)
+
+    entry = first.append_sync("1", b"[1]")
+    assert entry is not None
+    assert second.append_sync("1", b"[1]") is None
+    assert second.append_sync("1", b"[2]") is not None
+    assert first.pending == 2
+
+    claimed = [first.claim_sync(), second.claim_sync(), first.claim_sync()]
+    assert sorted(e.seq for e in claimed[:2]) == [entry.seq, entry.seq + 1]
+    assert claimed[2] is None
+
+    for claimed_entry in claimed[:2]:
+        first.ack_sync(claimed_entry.seq)
+    assert second.pending == 0
+    # The digest outlives the callback, so a late redelivery is still dropped
+    assert second.append_sync("1", b"[1]") is None
+    assert second.get_stats()["duplicates"] == 2
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    path = tmp_path / "callbacks.db"
+    crashed = _store(path, lease_timeout=0.0)
+    survivor = _store(path)
+
+    crashed.append_sync("7", b"[]")
+    assert crashed.claim_sync() is not None
+    # The crashed process never acks; its lease has expired
+    reclaimed = survivor.claim_sync()
+    assert reclaimed is not None and reclaimed.request_id == "7"
+
+
+def test_failed_callbacks_are_retried_then_marked_dead(tmp_path):
+    store = _store(tmp_path / "callbacks.db")
+    store.append_sync("7", b"[]")
+
+    first = store.claim_sync()
+    assert first.attempts == 1
+    assert store.retry_sync(first.seq, 60, max_attempts=2) is False
+    # Not claimable until the retry delay has passed
+    assert store.claim_sync() is None
+    store.retry_sync(first.seq, 0, max_attempts=2)
+
+    second = store.claim_sync()
+    assert second.seq == first.seq and second.attempts == 2
+    assert store.retry_sync(second.seq, 0, max_attempts=2) is True
+    assert store.claim_sync() is None
+    assert store.pending == 0
+    assert store.get_stats()["dead"] == 1
+    with store._lock:
+        dead = store._db.execute("SELECT request_id, attempts FROM dead_callbacks").fetchall()
+    assert dead == [("7", 2)]
+
+
+def test_dead_rows_of_older_stores_are_archived(tmp_path):
+    path = tmp_path / "callbacks.db"
+    store = _store(path)
+    for i in range(3):
+        store.append_sync(str(i), b"[]")
+    with store._lock:
+        store._db.execute("UPDATE callbacks SET state = 'dead' WHERE request_id != '1'")
+    store.close()
+
+    reopened = _store(path)
+    assert reopened.pending == 1
+    assert reopened.claim_sync().request_id == "1"
+    with reopened._lock:
+        archived = reopened._db.execute("SELECT COUNT(*) FROM dead_callbacks").fetchone()
+    assert archived == (2,)
+
+
+@pytest.mark.asyncio
+async def test_servers_share_backlog_and_registrations(tmp_path):
+    path = tmp_path / "callbacks.db"
+    ran = []
+
+    def make_server(name: str) -> CallbackServer:
+        server = CallbackServer(
+            store_path=path, workers=2, fsync=False, poll_interval=0.02
+        )
+        server.define_request_handler(
+            "record", lambda request_id, data: ran.append((name, request_id))
+        )
+        return server
+
+    a, b = make_server("a"), make_server("b")
+    a.register_request_handler("42", "record")
+    await b.start_ingest()
+    assert b.status["pending_requests"] == ["42"]
+
+    async def post(server: CallbackServer) -> httpx.Response:
+        transport = httpx.ASGITransport(app=server.create_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://cb") as client:
+            return await client.post(
+                "/signalhire/callback",
+                content=json.dumps(CALLBACK),
+                headers={"Request-Id": "42"},
+            )
+
+    first = await post(a)
+    redelivered = await post(b)
+    await asyncio.wait_for(b.wait_idle(), 2)
+
+    assert first.json()["status"] == "accepted"
+    assert redelivered.json()["status"] == "duplicate"
+    # Run exactly once, by whichever process claimed the callback
+    assert [request_id for _, request_id in ran] == ["42"]
+    assert a.store.request_handler_ids() == []
+
+    with pytest.raises(KeyError):
+        a.register_request_handler("43", "undefined")
+    await a.stop_ingest()
+    await b.stop_ingest()
@@ -0,0 +1,236 @@
+"""
+Unit tests for the revealed-contact cache
+
+Covers:
+- SQLite storage: per-record writes visible to other instances without save()
+- Batched upserts committed (or rolled back) as one transaction
+- Readers not blocked by an open write transaction (WAL)
+- Automatic one-time migration of the legacy revealed_contacts.json
+- Legacy JSON format still available for .json paths
+- Lazily decoded records in a size-bounded LRU with hit/miss/eviction stats
+- Concurrent writer processes merging into one cache without lost updates
+- Decoded records refreshed after another process writes, one UID at a time
+"""
+
+import json
+import multiprocessing
+
+import pytest
+
+from src.lib.contact_cache import ContactCache
+
+
+pytestmark = pytest.mark.unit
+
+EMAIL = {"type": "email", "value": "jane@acme.com", "label": None}
+
+
+def test_upserts_are_written_per_record(tmp_path):
+    path = tmp_path / "contacts.db"
+    cache = ContactCache(path)
+    cache.upsert("u1", contacts=[EMAIL], profile={"fullName": "Jane"})
+    cache.upsert("u1", contacts=[EMAIL, {"type": "phone", "value": "555"}])
+
+    reader = ContactCache(path)
+    record = reader.get("u1")
+    assert [c["value"] for c in record.contacts] == ["jane@acme.com", "555"]
+    assert record.profile == {"fullName": "Jane"}
+    assert reader.list_cached_uids() == ["u1"]
+    assert reader.get("missing") is None
+
+
+def test_batches_commit_atomically(tmp_path):
+    path = tmp_path / "contacts.db"
+    cache = ContactCache(path)
+    cache.merge_profiles({f"u{i}": {"fullName": f"P{i}"} for i in range(50)})
+    assert len(ContactCache(path).list_cached_uids()) == 50
+
+    with pytest.raises(RuntimeError):
+        with cache.batch():
+            cache.upsert("u100", contacts=[EMAIL])
+            raise RuntimeError("interrupted")
+    assert cache.get("u100") is None
+
+    reader = ContactCache(path)
+    with cache.batch():
+        cache.upsert("u200", contacts=[EMAIL])
+        # Readers see the last committed state while the batch is open
+        assert reader.get("u1").profile == {"fullName": "P1"}
+        assert reader.get("u200") is None
+    assert reader.get("u200") is not None
+
+
+def test_legacy_json_is_migrated_once(tmp_path):
+    legacy = tmp_path / "revealed_contacts.json"
+    legacy.write_text(
+        json.dumps(
+            {
+                "u1": {"contacts": [EMAIL], "first_revealed_at": "2024-01-01T00:00:00+00:00"},
+                "u2": {"profile": {"fullName": "Bob"}},
+            }
+        )
+    )
+    path = tmp_path / "contacts.db"
+
+    cache = ContactCache(path)
+    assert sorted(cache.list_cached_uids()) == ["u1", "u2"]
+    assert cache.get("u1").first_revealed_at == "2024-01-01T00:00:00+00:00"
+    assert legacy.exists()
+
+    cache.clear()
+    cache.close()
+    # Not imported again on the next open
+    assert ContactCache(path).list_cached_uids() == []
+
+
+def test_json_paths_keep_the_legacy_format(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = ContactCache(path)
+    cache.upsert("u1", contacts=[EMAIL])
+    assert not path.exists()
+    cache.save()
+
+    assert json.loads(path.read_text())["u1"]["contacts"] == [EMAIL]
+    assert ContactCache(path).get("u1").contacts == [EMAIL]
+    assert not list(tmp_path.glob("*.db"))
+
+
+def test_decoded_records_bounded_by_memory_ceiling(tmp_path):
+    cache = ContactCache(tmp_path / "contacts.db", max_memory_bytes=2000)
+    cache.merge_profiles({f"u{i}": {"summary": "x" * 300} for i in range(20)})
+
+    first = cache.get("u0")
+    assert cache.get("u0") is first
+    for i in range(1, 20):
+        cache.get(f"u{i}")
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 20
+    assert stats["evictions"] > 0
+    assert stats["bytes"] <= 2000
+    # Evicted records are decoded again from the store
+    assert cache.get("u0") is not first
+    assert cache.get("u0").profile == first.profile
+
+    cache.upsert("u19", metadata={"fresh": True})
+    assert cache.get("u19").metadata == {"fresh": True}
+
+
+def test_json_entries_decoded_on_access(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text(
+        json.dumps({f"u{i}": {"contacts": [EMAIL], "profile": {"n": i}} for i in range(100)})
+    )
+    cache = ContactCache(path, max_records=10)
+
+    assert len(cache.list_cached_uids()) == 100
+    assert cache.get("u42").profile == {"n": 42}
+    assert cache.get_stats()["records"] == 1
+
+    cache.upsert("u42", metadata={"seen": True})
+    cache.save()
+    saved = json.loads(path.read_text())
+    assert saved["u42"]["metadata"] == {"seen": True}
+    assert saved["u7"]["profile"] == {"n": 7}
+
+
+WRITERS = 4
+UPSERTS = 20
+SHARED_UIDS = 3
+
+
+def _write(path: str, mode: str, writer: int) -> None:
+    cache = ContactCache(path, mode=mode)
+    for i in range(UPSERTS):
+        cache.upsert(
+            f"u{i % SHARED_UIDS}",
+            contacts=[{"type": "email", "value": f"w{writer}-{i}@acme.com"}],
+            metadata={f"w{writer}": i},
+        )
+        # Each save is a separate CLI run as far as the JSON file is concerned
+        cache.save()
+    cache.close()
+
+
+@pytest.mark.parametrize(
+    "mode, name", [("sqlite", "contacts.db"), ("log", "contacts-log"), ("json", "cache.json")]
+)
+def test_concurrent_writer_processes_lose_no_updates(tmp_path, mode, name):
+    path = str(tmp_path / name)
+    context = multiprocessing.get_context("fork")
+    writers = [
+        context.Process(target=_write, args=(path, mode, writer)) for writer in range(WRITERS)
+    ]
+    for process in writers:
+        process.start()
+    for process in writers:
+        process.join(60)
+    assert [process.exitcode for process in writers] == [0] * WRITERS
+
+    cache = ContactCache(path, mode=mode)
+    for n in range(SHARED_UIDS):
+        record = cache.get(f"u{n}")
+        expected = {
+            f"w{writer}-{i}@acme.com"
+            for writer in range(WRITERS)
+            for i in range(n, UPSERTS, SHARED_UIDS)
+        }
+        assert {contact["value"] for contact in record.contacts} == expected
+        assert set(record.metadata) == {f"w{writer}" for writer in range(WRITERS)}
+
+
+@pytest.mark.parametrize("mode, name", [("sqlite", "contacts.db"), ("json", "cache.json")])
+def test_decoded_records_see_other_writers(tmp_path, mode, name):
+    path = tmp_path / name
+    reader = ContactCache(path, mode=mode)
+    writer = ContactCache(path, mode=mode)
+    writer.upsert("u1", profile={"fullName": "Jane"})
+    writer.save()
+    assert reader.get("u1").profile == {"fullName": "Jane"}
+
+    writer.upsert("u1", contacts=[EMAIL])
+    writer.save()
+    assert reader.get("u1").contacts == [EMAIL]
+
+
+@pytest.mark.parametrize(
+    "mode, name",
+    [("sqlite", "contacts.db"), ("json", "cache.json"), ("log", "contacts-log")],
+)
+def test_other_writers_invalidate_only_the_records_they_touch(tmp_path, mode, name):
+    path = tmp_path / name
+    reader = ContactCache(path, mode=mode)
+    writer = ContactCache(path, mode=mode)
+    writer.upsert_many({uid: {"profile": {"fullName": uid}} for uid in ("u1", "u2")})
+    writer.save()
+    untouched = reader.get("u1")
+    reader.get("u2")
+
+    writer.upsert("u2", contacts=[EMAIL])
+    writer.save()
+
+    assert reader.get("u2").contacts == [EMAIL]
+    assert reader.get("u1") is untouched
+    stats = reader.get_stats()
+    assert stats["renewals"] == 1
+    assert stats["hits"] == 0
+
+
+def test_json_saves_merge_with_the_file_on_disk(tmp_path):
+    path = tmp_path / "cache.json"
+    first = ContactCache(path)
+    second = ContactCache(path)
+    first.get("u1")
+    second.get("u1")
+
+    first.upsert("u1", contacts=[EMAIL], profile={"fullName": "Jane"})
+    second.upsert("u1", contacts=[{"type": "phone", "value": "555"}], profile={"title": "CEO"})
+    second.upsert("u2", metadata={"source": "callback"})
+    first.save()
+    second.save()
+
+    saved = json.loads(path.read_text())
+    assert [c["value"] for c in saved["u1"]["contacts"]] == ["jane@acme.com", "555"]
+    assert saved["u1"]["profile"] == {"fullName": "Jane", "title": "CEO"}
+    assert saved["u2"]["metadata"] == {"source": "callback"}
@@ -0,0 +1,104 @@
+"""
+Unit tests for the log-structured contact cache
+
+Covers:
+- Upserts appended as deltas and folded on read
+- Index rebuilt from sealed segment footers; tail scanned and torn writes truncated
+- Compaction folding sealed segments and dropping superseded deltas
+- Legacy JSON migration into a new log
+"""
+
+import json
+
+import pytest
+
+from src.lib.contact_cache import ContactCache
+from src.lib.contact_log import LogContactStore
+
+
+pytestmark = pytest.mark.unit
+
+
+def _email(i: int) -> dict:
+    return {"type": "email", "value": f"p{i}@acme.com", "label": None}
+
+
+def _cache(path, **options) -> ContactCache:
+    return ContactCache(path, mode="log", **options)
+
+
+def test_deltas_fold_into_records(tmp_path):
+    cache = _cache(tmp_path / "log")
+    cache.upsert("u1", profile={"fullName": "Jane", "title": "Welder"})
+    cache.upsert("u1", contacts=[_email(1)])
+    record = cache.upsert("u1", contacts=[_email(1), _email(2)], metadata={"source": "api"})
+
+    assert [c["value"] for c in record.contacts] == ["p1@acme.com", "p2@acme.com"]
+    stored = _cache(tmp_path / "log").get("u1")
+    assert stored.to_dict() == record.to_dict()
+    assert stored.profile == {"fullName": "Jane", "title": "Welder"}
+    assert stored.metadata == {"source": "api"}
+
+
+def test_startup_reads_footers_and_repairs_the_tail(tmp_path):
+    directory = tmp_path / "log"
+    store = LogContactStore(directory, segment_bytes=300, compact_segments=100)
+    for i in range(20):
+        store.append(f"u{i % 5}", contacts=[_email(i)])
+    sealed = store.get_stats()["sealed"]
+    assert sealed >= 2
+    store.append("u9", contacts=[_email(99)])
+    store.flush()
+
+    # A write torn by a crash leaves a partial last line
+    tail = sorted(directory.glob("segment-*.log"))[-1]
+    with open(tail, "ab") as handle:
+        handle.write(b'{"u":"u9","t":"2024')
+
+    reopened = LogContactStore(directory, segment_bytes=300, compact_segments=100)
+    assert sorted(reopened.uids()) == ["u0", "u1", "u2", "u3", "u4", "u9"]
+    assert [c["value"] for c in reopened.get("u0").contacts] == [
+        "p0@acme.com", "p5@acme.com", "p10@acme.com", "p15@acme.com"
+    ]
+    assert reopened.get("u9").contacts == [_email(99)]
+    reopened.append("u9", metadata={"after": "crash"})
+    reopened.close()
+
+    # close() seals the tail, so every segment has a footer
+    assert all(
+        LogContactStore._read_footer(path) is not None
+        for path in directory.glob("segment-*.log")
+    )
+    assert LogContactStore(directory).get("u9").metadata == {"after": "crash"}
+
+
+def test_compaction_drops_superseded_deltas(tmp_path):
+    directory = tmp_path / "log"
+    store = LogContactStore(directory, segment_bytes=400, compact_segments=3)
+    for i in range(60):
+        store.append(f"u{i % 3}", contacts=[_email(i)], metadata={"n": i})
+    store.wait_for_compaction()
+    expected = {uid: store.get(uid).to_dict() for uid in store.uids()}
+
+    store.compact()
+    stats = store.get_stats()
+    assert stats["compactions"] >= 1
+    assert stats["dropped_deltas"] > 0
+    assert stats["deltas"] < 60
+    assert {uid: store.get(uid).to_dict() for uid in store.uids()} == expected
+    store.close()
+
+    reopened = LogContactStore(directory)
+    assert {uid: reopened.get(uid).to_dict() for uid in reopened.uids()} == expected
+
+
+def test_legacy_json_migrated_into_new_log(tmp_path):
+    (tmp_path / "revealed_contacts.json").write_text(
+        json.dumps({"u1": {"contacts": [_email(1)], "profile": {"fullName": "Ann"}}})
+    )
+    cache = _cache(tmp_path / "contacts-log")
+    assert cache.get("u1").profile == {"fullName": "Ann"}
+
+    cache.clear()
+    cache.close()
+    assert _cache(tmp_path / "contacts-log").list_cached_uids() == []
@@ -0,0 +1,141 @@
+"""
+Unit tests for the X-Credits-Left credit ledger
+
+Covers:
+- Freshness window and invalidation
+- Balances shared through the ledger file without leaking API keys
+- Debounced writes: unchanged balances skipped, changes flushed
+- SignalHireClient updating the ledger from response headers
+- check_credits and the reveal pre-check answering without a /credits call
+"""
+
+import httpx
+import pytest
+
+from src.lib.credit_ledger import CreditLedger
+
+
+pytestmark = pytest.mark.unit
+
+
+class FakeClock:
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_balance_is_fresh_for_max_age(tmp_path):
+    clock = FakeClock()
+    ledger = CreditLedger(tmp_path / "credits.json", max_age=60, time_fn=clock)
+    ledger.update("key-a", 120)
+
+    assert ledger.fresh("key-a").credits == 120
+    assert ledger.fresh("key-b") is None
+    clock.now += 60
+    assert ledger.fresh("key-a") is None
+    assert ledger.get("key-a").credits == 120
+
+    ledger.invalidate("key-a")
+    assert ledger.get("key-a") is None
+
+
+def test_ledger_file_is_shared_between_instances(tmp_path):
+    path = tmp_path / "credits.json"
+    CreditLedger(path).update("secret-key", 42)
+    CreditLedger(path).update("other-key", 7)
+
+    reader = CreditLedger(path)
+    assert reader.fresh("secret-key").credits == 42
+    assert reader.fresh("other-key").credits == 7
+    assert "secret-key" not in path.read_text()
+
+
+def test_writes_are_debounced(tmp_path, monkeypatch):
+    clock = FakeClock()
+    path = tmp_path / "credits.json"
+    ledger = CreditLedger(path, max_age=60, persist_interval=5, time_fn=clock)
+    writes = []
+    persist = ledger._persist
+    monkeypatch.setattr(ledger, "_persist", lambda *a, **k: (writes.append(1), persist(*a, **k)))
+
+    ledger.update("key-a", 100)
+    for credits in (99, 98, 97):
+        clock.now += 1
+        ledger.update("key-a", credits)
+    assert len(writes) == 1
+    assert CreditLedger(path).get("key-a").credits == 100
+
+    # A changed balance is written once the interval has passed
+    clock.now += 5
+    ledger.update("key-a", 96)
+    assert len(writes) == 2
+
+    # An unchanged balance is not rewritten until the copy on disk ages
+    clock.now += 10
+    ledger.update("key-a", 96)
+    assert len(writes) == 2
+    clock.now += 30
+    ledger.update("key-a", 96)
+    assert len(writes) == 3
+
+    clock.now += 1
+    ledger.update("key-a", 95)
+    ledger.flush()
+    ledger.flush()
+    assert len(writes) == 4
+    assert CreditLedger(path, time_fn=clock).fresh("key-a").credits == 95
+
+
+@pytest.mark.asyncio
+async def test_responses_feed_check_credits(tmp_path, mock_signalhire_client):
+    paths = []
+    left = {"value": 500}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path.rsplit("/", 1)[-1])
+        left["value"] -= 1
+        return httpx.Response(
+            201,
+            json={"requestId": len(paths)},
+            headers={"X-Credits-Left": str(left["value"])},
+        )
+
+    ledger = CreditLedger(tmp_path / "credits.json")
+    client = mock_signalhire_client(handler, credit_ledger=ledger)
+
+    await client.reveal_contact("uid-1")
+    credits = await client.check_credits()
+    assert credits.credits_remaining == 499
+    assert credits.data["source"] == "header"
+
+    # The pre-check is answered by the ledger; only reveal requests are sent
+    await client.batch_reveal_contacts(["uid-2", "uid-3"])
+    await client.close()
+
+    assert paths == ["search", "search", "search"]
+    assert client.get_single_flight_stats()["credits_ledger_hits"] == 2
+    # A later invocation reads the persisted balance
+    assert CreditLedger(tmp_path / "credits.json").fresh("test-key").credits == 497
+
+
+@pytest.mark.asyncio
+async def test_credits_endpoint_used_when_ledger_is_stale(tmp_path, mock_signalhire_client):
+    paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path.rsplit("/", 1)[-1])
+        return httpx.Response(200, json={"credits": 80})
+
+    client = mock_signalhire_client(
+        handler, credit_ledger=CreditLedger(tmp_path / "credits.json")
+    )
+    first = await client.check_credits()
+    client.invalidate_credits_cache()
+    await client.check_credits()
+    await client.close()
+
+    assert first.credits_remaining == 80
+    assert paths == ["credits", "credits"]
+    assert client.credit_ledger.fresh("test-key").source == "credits"
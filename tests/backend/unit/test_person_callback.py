@@ -0,0 +1,113 @@
+"""
+Unit tests for Person API callback parsing
+
+Covers:
+- One-pass validation of raw callback bodies into typed items
+- Lenient fields: numbers as strings, unknown keys, missing optional fields
+- Malformed items dropped without losing the rest of the callback
+- Lazy experience/education entries
+- Typed global handlers on the callback server
+"""
+
+import json
+
+import httpx
+import pytest
+
+from src.lib.callback_server import CallbackServer
+from src.models.person_callback import PersonCallbackItem, parse_person_callback
+
+
+pytestmark = pytest.mark.unit
+
+CANDIDATE = {
+    "uid": "10000000000000000000000000001006",
+    "fullName": "John Doe",
+    "photo": {"url": "https://example.com/photo.jpg"},
+    "contacts": [{"type": "email", "value": "john@acme.com", "rating": 100}],
+    "social": [{"type": "li", "link": "https://linkedin.com/in/jdoe"}],
+    "experience": [
+        {"position": "Welder", "company": {"name": "Acme"}, "started": "2019-05", "current": True},
+        {"company": "No title"},
+    ],
+    "education": [{"university": "State College", "degree": ["AAS"], "endedYear": 2012}],
+    "newField": {"ignored": True},
+}
+
+
+def test_parses_raw_body_leniently():
+    body = json.dumps(
+        [
+            {"status": "success", "item": "u1", "candidate": CANDIDATE},
+            {"status": "failed", "item": "u2", "candidate": None},
+        ]
+    ).encode()
+
+    items = parse_person_callback(body)
+
+    assert all(isinstance(item, PersonCallbackItem) for item in items)
+    candidate = items[0].candidate
+    assert candidate.full_name == "John Doe"
+    assert candidate.contacts[0].rating == "100"
+    assert candidate.contacts[0].sub_type is None
+    assert items[1].candidate is None
+    # Decoded input is accepted too
+    assert parse_person_callback(json.loads(body)) == items
+
+
+def test_malformed_items_dropped():
+    body = json.dumps(
+        [
+            {"status": "success", "item": "u1", "candidate": CANDIDATE},
+            {"status": "success"},
+            {"status": "not-a-status", "item": "u3"},
+            {"status": "failed", "item": "u4"},
+        ]
+    )
+    assert [item.item for item in parse_person_callback(body)] == ["u1", "u4"]
+
+    with pytest.raises(ValueError):
+        parse_person_callback(b"{not json")
+    with pytest.raises(ValueError):
+        parse_person_callback(b'{"status": "success"}')
+
+
+def test_experience_and_education_built_on_access():
+    candidate = parse_person_callback(
+        [{"status": "success", "item": "u1", "candidate": CANDIDATE}]
+    )[0].candidate
+
+    assert candidate.experience[0]["position"] == "Welder"
+    experience = candidate.experience_entries
+    assert [(e.job_title, e.company_name, e.is_current) for e in experience] == [
+        ("Welder", "Acme", True)
+    ]
+    assert candidate.experience_entries is experience
+
+    education = candidate.education_entries
+    assert education[0].institution_name == "State College"
+    assert education[0].degree_name == "AAS"
+    assert education[0].end_date == "2012"
+
+
+@pytest.mark.asyncio
+async def test_typed_handlers_get_models(tmp_path):
+    server = CallbackServer(wal_dir=tmp_path, workers=1)
+    received = {}
+    server.register_handler("raw", lambda data: received.setdefault("raw", data))
+    server.register_handler(
+        "typed", lambda data: received.setdefault("typed", data), typed=True
+    )
+
+    transport = httpx.ASGITransport(app=server.create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://cb") as client:
+        await client.post(
+            "/signalhire/callback",
+            content=json.dumps([{"status": "success", "item": "u1", "candidate": CANDIDATE}]),
+            headers={"Request-Id": "5"},
+        )
+    await server.wait_idle()
+
+    assert received["raw"][0]["candidate"]["fullName"] == "John Doe"
+    assert received["typed"][0].candidate.full_name == "John Doe"
+    await server.stop_ingest()
@@ -0,0 +1,144 @@
+"""
+Unit tests for the hierarchical rate limit registry
+
+Covers:
+- Global, API and per-key (Airtable base) levels all gating admission
+- Independent budgets per key
+- Waiters admitted in arrival order, so large requests are not starved
+- Budgets shared across registries through the state file
+- Waiting for the state file lock without blocking the event loop
+- httpx event hooks throttling Airtable requests by base
+- SignalHire RateLimiter acquiring through the registry
+"""
+
+import asyncio
+import fcntl
+import json
+
+import httpx
+import pytest
+
+from src.lib.rate_limit_registry import RateLimit, RateLimitRegistry
+from src.services.signalhire_client import RateLimiter
+
+
+pytestmark = pytest.mark.unit
+
+
+async def _elapsed(coro) -> float:
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await coro
+    return loop.time() - started
+
+
+@pytest.mark.asyncio
+async def test_every_level_must_have_room():
+    registry = RateLimitRegistry(
+        {"global": RateLimit(3, 0.2), "airtable/key:*": RateLimit(5, 0.2)}
+    )
+
+    for _ in range(3):
+        assert await registry.acquire("airtable", key="appA") == 0.0
+
+    # The base still has room but the global level is exhausted
+    assert await _elapsed(registry.acquire("airtable", key="appA")) >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_keys_have_independent_budgets():
+    registry = RateLimitRegistry({"airtable/key:*": RateLimit(2, 0.2)})
+
+    await registry.acquire("airtable", key="appA")
+    await registry.acquire("airtable", key="appA")
+    assert await registry.acquire("airtable", key="appB") == 0.0
+    assert await _elapsed(registry.acquire("airtable", key="appA")) >= 0.15
+
+    # One window per base, keyed by fingerprint rather than the base ID
+    usage = registry.get_stats()["usage"]
+    assert len(usage) == 2
+    assert not any("appA" in scope for scope in usage)
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_admitted_in_arrival_order():
+    registry = RateLimitRegistry({"signalhire/key:*": RateLimit(100, 0.2)})
+    await registry.acquire("signalhire", key="k", n=60)
+    admitted = []
+
+    async def acquire(name: str, n: int) -> None:
+        await registry.acquire("signalhire", key="k", n=n)
+        admitted.append(name)
+
+    big = asyncio.create_task(acquire("big", 100))
+    await asyncio.sleep(0)
+    # These would fit in the window right now but queue behind the big request
+    small = [asyncio.create_task(acquire(f"small{i}", 1)) for i in range(5)]
+    await asyncio.gather(big, *small)
+
+    assert admitted[0] == "big"
+    assert registry.get_stats()["delayed"] == 6
+
+
+@pytest.mark.asyncio
+async def test_state_file_shares_budget_between_registries(tmp_path):
+    state = tmp_path / "rate_limits.json"
+    limits = {"signalhire/key:*": RateLimit(2, 0.3)}
+    first = RateLimitRegistry(limits, state_path=state)
+    second = RateLimitRegistry(limits, state_path=state)
+
+    await first.acquire("signalhire", key="secret-key", n=2)
+    assert await _elapsed(second.acquire("signalhire", key="secret-key")) >= 0.2
+
+    assert "secret-key" not in state.read_text()
+    assert sum(second.get_stats()["usage"].values()) == 1
+    assert json.loads(state.read_text())
+
+
+@pytest.mark.asyncio
+async def test_locked_state_file_does_not_block_the_loop(tmp_path):
+    state = tmp_path / "limits.json"
+    registry = RateLimitRegistry({"airtable/key:*": RateLimit(5, 1.0)}, state_path=state)
+
+    with open(state, "a+") as holder:
+        # Another process holds the lock; the loop keeps running meanwhile
+        fcntl.flock(holder.fileno(), fcntl.LOCK_EX)
+        acquire = asyncio.ensure_future(registry.acquire("airtable", key="appA"))
+        ticks = 0
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+        assert ticks == 5 and not acquire.done()
+        fcntl.flock(holder.fileno(), fcntl.LOCK_UN)
+
+    assert await asyncio.wait_for(acquire, 5) == 0.0
+    assert registry.get_stats()["acquired"] == 1
+
+
+@pytest.mark.asyncio
+async def test_event_hooks_throttle_airtable_by_base():
+    registry = RateLimitRegistry({"airtable/key:*": RateLimit(2, 0.2)})
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json={}))
+
+    async with httpx.AsyncClient(
+        transport=transport, event_hooks=registry.event_hooks()
+    ) as client:
+        url = "https://api.airtable.com/v0/appA/tblContacts"
+        elapsed = await _elapsed(
+            asyncio.gather(*(client.get(url) for _ in range(3)))
+        )
+
+    assert elapsed >= 0.15
+    assert registry.get_stats()["acquired"] == 3
+
+
+@pytest.mark.asyncio
+async def test_signalhire_rate_limiter_uses_registry(tmp_path):
+    registry = RateLimitRegistry({"signalhire/reveal": RateLimit(100, 60)})
+    limiter = RateLimiter(registry=registry, api_key="k")
+    await limiter.wait_if_needed(credits_needed=10, elements=10, endpoint="reveal")
+
+    assert registry.get_stats()["usage"] == {"signalhire/reveal": 10}
+
+    with pytest.raises(ValueError):
+        await registry.acquire("signalhire", "reveal", n=101)
@@ -0,0 +1,222 @@
+"""
+Unit tests for contact freshness and the re-reveal queue
+
+Covers:
+- Per-contact-type TTLs measured from when each type was last verified
+- O(1) freshness checks on cached records; naive times taken as UTC
+- Profile and metadata merges not refreshing contact verification
+- Stale enumeration as a range scan over the verified_at index
+- Claims bounded by a rolling daily budget, skipped while pending, released on failure
+- Callback contacts stamped as verified in the cache
+- Stale contacts re-revealed only when claimed from the queue, not on skip
+- The reveal command re-revealing stale contacts and draining the queue
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from click.testing import CliRunner
+
+from src.cli import reveal_commands
+from src.cli.main import main
+from src.cli.reveal_commands import (
+    ProspectWorkItem,
+    deduplicate_work_items,
+    partition_prospects,
+)
+from src.lib import contact_cache
+from src.lib.contact_cache import ContactCache, FreshnessPolicy, set_contact_cache
+from src.lib.rereveal_queue import ReRevealQueue
+from src.lib.revealed_index import set_revealed_index
+from src.services.signalhire_client import SignalHireClient
+
+
+pytestmark = pytest.mark.unit
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+PHONE = {"type": "phone", "value": "555", "label": None}
+EMAIL = {"type": "email", "value": "jane@acme.com", "label": None}
+
+
+def _cache(tmp_path, ages: dict, **options) -> ContactCache:
+    """Migrate a legacy file whose records were last updated ``ages[uid]`` days ago."""
+    records = {}
+    for uid, (days, contacts) in ages.items():
+        stamp = (NOW - timedelta(days=days)).isoformat()
+        records[uid] = {
+            "contacts": contacts,
+            "first_revealed_at": stamp,
+            "last_updated_at": stamp,
+        }
+    (tmp_path / "revealed_contacts.json").write_text(json.dumps(records))
+    return ContactCache(tmp_path / "contacts.db", **options)
+
+
+def test_ttls_apply_per_contact_type():
+    policy = FreshnessPolicy()
+    stamp = (NOW - timedelta(days=100)).isoformat()
+    assert policy.stale_fields([PHONE, EMAIL], stamp, NOW) == ["phone"]
+    assert policy.stale_fields([EMAIL, {"type": "other", "value": "x"}], stamp, NOW) == []
+    assert policy.shortest_ttl() == timedelta(days=90)
+
+    strict = FreshnessPolicy({"email": timedelta(days=30)}, default_ttl=timedelta(days=1))
+    assert strict.stale_fields([PHONE, EMAIL], stamp, NOW) == ["email", "phone"]
+
+
+def test_freshness_of_cached_records(tmp_path):
+    cache = _cache(tmp_path, {"old": (120, [PHONE, EMAIL]), "new": (5, [PHONE])})
+
+    assert cache.is_fresh("new", now=NOW)
+    assert not cache.is_fresh("old", now=NOW)
+    assert cache.is_fresh("old", "email", now=NOW)
+    assert not cache.is_fresh("old", "phone", now=NOW)
+    assert not cache.is_fresh("missing", now=NOW)
+    assert not cache.is_fresh("new", "email", now=NOW)
+    assert not cache.is_fresh("old", now=NOW.replace(tzinfo=None))
+    assert [item.uid for item in cache.iter_stale(now=NOW.replace(tzinfo=None))] == ["old"]
+
+
+def test_only_reveals_refresh_verification(tmp_path, monkeypatch):
+    cache = ContactCache(tmp_path / "contacts.db")
+    revealed = (NOW - timedelta(days=100)).isoformat()
+    monkeypatch.setattr(contact_cache, "_utc_now_iso", lambda: revealed)
+    cache.upsert("u1", contacts=[PHONE, EMAIL])
+
+    monkeypatch.setattr(contact_cache, "_utc_now_iso", lambda: NOW.isoformat())
+    cache.merge_profiles({"u1": {"fullName": "Jane"}})
+    cache.upsert("u1", metadata={"source": "airtable"})
+    assert not cache.is_fresh("u1", "phone", now=NOW)
+    assert [item.stale_fields for item in cache.iter_stale(now=NOW)] == [["phone"]]
+
+    # A reveal returning a phone again re-verifies only that type
+    cache.upsert("u1", contacts=[PHONE])
+    assert cache.is_fresh("u1", now=NOW)
+    assert cache.get("u1").verified == {"phone": NOW.isoformat(), "email": revealed}
+
+
+def test_stale_records_listed_oldest_first_from_the_index(tmp_path):
+    ages = {f"u{days}": (days, [PHONE]) for days in (10, 400, 95, 200)}
+    ages["email-only"] = (150, [EMAIL])
+    cache = _cache(tmp_path, ages)
+
+    stale = list(cache.iter_stale(now=NOW))
+    assert [item.uid for item in stale] == ["u400", "u200", "u95"]
+    assert stale[0].stale_fields == ["phone"]
+    assert list(cache.iter_stale(now=NOW - timedelta(days=320))) == []
+
+    # Paging walks the index in order without skipping or repeating rows
+    rows = list(cache._store.verified_before(NOW.isoformat(), page_size=2))
+    assert [row.uid for row in rows] == ["u400", "u200", "email-only", "u95", "u10"]
+
+    plan = cache._store._conn().execute(
+        "EXPLAIN QUERY PLAN SELECT uid FROM contacts WHERE verified_at < ? "
+        "ORDER BY verified_at, uid",
+        (NOW.isoformat(),),
+    ).fetchall()
+    assert "contacts_verified" in str(plan)
+
+
+def test_claims_bounded_by_daily_budget(tmp_path):
+    cache = _cache(tmp_path, {f"u{i}": (100 + i, [PHONE]) for i in range(5)})
+    clock = [NOW.timestamp()]
+    queue = ReRevealQueue(
+        cache, daily_budget=2, retry_after=3 * 24 * 3600, time_fn=lambda: clock[0]
+    )
+
+    assert [item.uid for item in queue.claim()] == ["u4", "u3"]
+    assert queue.claim() == []
+    assert queue.get_stats() == {"daily_budget": 2, "spent": 2, "remaining": 0, "pending": 2}
+
+    # Budget refills after 24 hours; pending UIDs are skipped until retry_after
+    clock[0] += 25 * 3600
+    assert [item.uid for item in queue.claim(limit=1)] == ["u2"]
+    assert queue.release(["u2"]) == 1
+    assert queue.remaining_budget() == 2
+
+    # A landed reveal makes the record fresh, so it is never claimed again
+    cache.upsert("u1", contacts=[PHONE])
+    clock[0] += 3 * 24 * 3600
+    claimed = [item.uid for item in queue.claim(limit=10)]
+    assert claimed == ["u4", "u3"]
+
+
+def _aged_cache(tmp_path, ages: dict) -> ContactCache:
+    """Cache whose records were last verified ``ages[uid]`` days before now."""
+    now = datetime.now(timezone.utc)
+    return _cache(
+        tmp_path,
+        {uid: (days - (now - NOW).days, contacts) for uid, (days, contacts) in ages.items()},
+    )
+
+
+def test_callback_contacts_are_stamped_as_verified(tmp_path):
+    cache = _aged_cache(tmp_path, {"u1": (120, [PHONE])})
+    assert not cache.is_fresh("u1")
+
+    written = cache.record_callback(
+        [
+            {"status": "success", "item": "u1", "candidate": {"uid": "u1", "contacts": [PHONE]}},
+            {"status": "failed", "item": "u2"},
+        ]
+    )
+
+    assert written == 1
+    assert cache.is_fresh("u1")
+    assert "u1" in cache.revealed_index
+
+
+def test_stale_contacts_are_only_re_revealed_through_the_queue(tmp_path):
+    cache = _aged_cache(tmp_path, {"old": (120, [PHONE]), "new": (5, [PHONE])})
+    cache.revealed_index.add(["old", "new"])
+    items = deduplicate_work_items(
+        [ProspectWorkItem(uid=uid) for uid in ("old", "new", "unknown", "claimed")]
+        + [ProspectWorkItem(uid="claimed", source="stale")]
+    )
+    cache.revealed_index.add(["claimed"])
+
+    pending, revealed = partition_prospects(items, None, True, cache.revealed_index)
+
+    # Stale but unclaimed UIDs are answered from the index without a re-buy
+    assert [item.uid for item in pending] == ["unknown", "claimed"]
+    assert [item.uid for item, _ in revealed] == ["old", "new"]
+
+
+def test_reveal_refresh_stale_drains_the_queue(tmp_path, monkeypatch):
+    monkeypatch.setenv("SIGNALHIRE_API_KEY", "test-key")
+    for name in ("AIRTABLE_API_KEY", "AIRTABLE_TOKEN", "AIRTABLE_BASE_ID"):
+        monkeypatch.delenv(name, raising=False)
+    cache = _aged_cache(tmp_path, {f"u{i}": (100 + i, [PHONE]) for i in range(3)})
+    cache.revealed_index.add(["u0", "u1", "u2"])
+    revealed = []
+
+    async def confirm(config, total_prospects, logger):
+        return True
+
+    async def skip_status_update(**kwargs):
+        return None
+
+    async def bulk_reveal(self, operation, progress_callback=None):
+        revealed.append(sorted(operation.prospect_ids))
+        return {"revealed_count": len(operation.prospect_ids), "prospects": []}
+
+    monkeypatch.setattr(reveal_commands, "check_credits_and_confirm", confirm)
+    monkeypatch.setattr(
+        reveal_commands, "update_airtable_contacts_status", skip_status_update
+    )
+    monkeypatch.setattr(SignalHireClient, "bulk_reveal", bulk_reveal)
+    set_contact_cache(cache)
+    set_revealed_index(cache.revealed_index)
+    try:
+        runner = CliRunner()
+        dry = runner.invoke(main, ["reveal", "fresh-uid", "--refresh-stale", "2", "--dry-run"])
+        result = runner.invoke(main, ["reveal", "fresh-uid", "--refresh-stale", "2"])
+    finally:
+        set_contact_cache(None)
+        set_revealed_index(None)
+
+    assert dry.exit_code == 0, dry.output
+    assert result.exit_code == 0, result.output
+    # The dry run refunded its claims; the real run spent two of the budget
+    assert revealed == [["fresh-uid", "u1", "u2"]]
+    assert ReRevealQueue(cache).get_stats()["spent"] == 2
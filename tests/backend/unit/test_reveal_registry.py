@@ -0,0 +1,216 @@
+"""
+Unit tests for correlating Person API callbacks with reveal requests
+
+Covers:
+- Futures resolved from another thread, early callbacks kept, redeliveries ignored
+- Resolved and never-answered requests expiring after the TTL
+- Streaming completions to subscribers
+- CallbackServer resolving awaited requests after its handlers ran
+- reveal_and_wait / iter_revealed completing as callbacks land, with timeout
+- Requests abandoned by the registry yielded as abandoned, not cancelled
+"""
+
+import asyncio
+import json
+import threading
+
+import httpx
+import pytest
+
+from src.lib.callback_server import CallbackServer
+from src.lib.reveal_registry import RevealRegistry
+from src.services.signalhire_client import APIResponse, SignalHireClient
+
+
+pytestmark = pytest.mark.unit
+
+
+def _callback(*items: str, status: str = "success") -> list[dict]:
+    return [
+        {"status": status, "item": item, "candidate": {"uid": item}}
+        for item in items
+    ]
+
+
+@pytest.mark.asyncio
+async def test_future_resolved_from_callback_thread():
+    registry = RevealRegistry()
+    future = asyncio.wrap_future(registry.expect("7", ["a", "b"]))
+
+    worker = threading.Thread(target=registry.resolve, args=("7", _callback("a", "b")))
+    worker.start()
+    completions = await asyncio.wait_for(future, 1)
+    worker.join()
+
+    assert [c.item for c in completions] == ["a", "b"]
+    assert all(c.succeeded and c.request_id == "7" for c in completions)
+    assert registry.items_for("7") == ["a", "b"]
+
+    # A redelivered callback does not change the result
+    registry.resolve("7", _callback("a", status="failed"))
+    assert registry.get_stats()["resolved"] == 1
+
+
+def test_callback_arriving_before_wait_is_kept():
+    registry = RevealRegistry()
+    registry.resolve("9", _callback("x"))
+
+    future = registry.wait_for("9")
+    assert future.done()
+    assert future.result()[0].item == "x"
+    assert registry.get_stats()["unexpected"] == 1
+
+    registry.discard("9")
+    assert registry.get_stats()["completed"] == 0
+
+
+def test_resolved_requests_expire():
+    now = [0.0]
+    registry = RevealRegistry(ttl=10, max_completed=2, time_fn=lambda: now[0])
+    for request_id in ("1", "2", "3"):
+        registry.resolve(request_id, [])
+    assert registry.get_stats()["completed"] == 2
+
+    now[0] = 20.0
+    registry.resolve("4", [])
+    assert registry.get_stats()["completed"] == 1
+
+
+def test_unanswered_requests_are_abandoned():
+    now = [0.0]
+    registry = RevealRegistry(ttl=10, time_fn=lambda: now[0])
+    client = SignalHireClient(api_key="test-key", reveal_registry=registry)
+    lost = registry.expect("1", ["a"])
+    assert client.get_reveal_request_items("1") == ["a"]
+
+    now[0] = 20.0
+    kept = registry.expect("2", ["b"])
+
+    assert lost.cancelled() and not kept.done()
+    assert registry.pending == ["2"]
+    assert registry.get_stats()["abandoned"] == 1
+    # The client's view of submitted items expires with the registry
+    assert client.get_reveal_request_items("1") is None
+
+
+@pytest.mark.asyncio
+async def test_completions_stream_to_subscribers():
+    registry = RevealRegistry()
+    stream = registry.completions()
+    first = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+
+    registry.resolve("1", _callback("a"))
+    assert (await asyncio.wait_for(first, 1)).item == "a"
+    await stream.aclose()
+    assert registry.get_stats()["subscribers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_server_resolves_after_handlers(tmp_path):
+    registry = RevealRegistry()
+    server = CallbackServer(wal_dir=tmp_path, workers=1, reveal_registry=registry)
+    order = []
+    future = server.register_request_handler(
+        "42", lambda request_id, data: order.append("handler")
+    )
+    future.add_done_callback(lambda _: order.append("resolved"))
+
+    transport = httpx.ASGITransport(app=server.create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://cb") as client:
+        await client.post(
+            "/signalhire/callback",
+            content=json.dumps(_callback("uid-1")),
+            headers={"Request-Id": "42"},
+        )
+
+    completions = await server.wait_for_request("42", timeout=1)
+    assert [c.item for c in completions] == ["uid-1"]
+    assert order == ["handler", "resolved"]
+    await server.stop_ingest()
+
+
+def _client_with_server(registry: RevealRegistry, callbacks: dict):
+    """Client whose reveal requests are answered by ``callbacks[request_id]``."""
+    client = SignalHireClient(api_key="test-key", reveal_registry=registry)
+    submitted = []
+
+    async def fake_request(method, endpoint, **kwargs):
+        items = kwargs["json"]["items"]
+        if "bad" in items:
+            return APIResponse(success=False, error="Invalid item", status_code=403)
+        request_id = len(submitted) + 1
+        submitted.append(items)
+        delay, status = callbacks.get(request_id, (None, "success"))
+        if delay is not None:
+            loop = asyncio.get_running_loop()
+            loop.call_later(
+                delay, registry.resolve, request_id, _callback(*items, status=status)
+            )
+        return APIResponse(success=True, data={"requestId": request_id})
+
+    client._make_request = fake_request
+    return client, submitted
+
+
+@pytest.mark.asyncio
+async def test_reveal_and_wait_returns_when_callbacks_land():
+    registry = RevealRegistry()
+    client, submitted = _client_with_server(
+        registry, {1: (0.05, "success"), 2: (0.01, "timeout_exceeded")}
+    )
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    results = await client.reveal_and_wait(
+        ["u1", "u2", "u3", "u4", "bad"], timeout=5, items_per_request=2
+    )
+
+    assert loop.time() - started < 1
+    assert results["u1"].succeeded and results["u2"].succeeded
+    assert results["u3"].status == results["u4"].status == "timeout_exceeded"
+    assert results["bad"].status == "request_failed"
+    assert len(submitted) == 2
+    # Consumed requests are dropped from the registry and the client
+    assert registry.get_stats()["completed"] == 0
+    assert client.get_reveal_request_items(1) is None
+
+
+@pytest.mark.asyncio
+async def test_iter_revealed_streams_and_honours_timeout():
+    registry = RevealRegistry()
+    client, _ = _client_with_server(registry, {1: (0.01, "success")})
+
+    arrived = [
+        completion.item
+        async for completion in client.iter_revealed(
+            ["u1", "u2"], timeout=0.2, items_per_request=1
+        )
+    ]
+
+    # Request 2 never gets a callback; request 1 is still delivered
+    assert arrived == ["u1"]
+    assert registry.pending == ["2"]
+    # Single-item requests are registered with their item like chunks are
+    assert client.get_reveal_request_items(2) == ["u2"]
+
+
+@pytest.mark.asyncio
+async def test_iter_revealed_yields_requests_abandoned_by_the_registry():
+    now = [0.0]
+    registry = RevealRegistry(ttl=3600, time_fn=lambda: now[0])
+    client, _ = _client_with_server(registry, {2: (0.01, "success")})
+
+    async def items():
+        yield "u1"
+        await asyncio.sleep(0.05)
+        # Request 1 never got a callback; the next expect() abandons it
+        now[0] += 3601
+        yield "u2"
+
+    results = await client.reveal_and_wait(items(), timeout=5, items_per_request=1)
+
+    assert results["u1"].status == "abandoned"
+    assert results["u1"].request_id == "1"
+    assert results["u2"].succeeded
+    assert registry.get_stats()["abandoned"] == 1
@@ -0,0 +1,149 @@
+"""
+Unit tests for the memory-mapped revealed-UID index
+
+Covers:
+- 32-char hex UIDs packed into 16-byte keys
+- Lookups from the delta log and, after a merge, from the sorted mapped file
+- Changes made by another index instance picked up on refresh
+- Long-lived readers re-checking the files after refresh_interval
+- Incremental updates from the contact cache and the Airtable writer
+- Clearing the contact cache emptying the index
+- partition_prospects skipping indexed UIDs without an Airtable entry
+"""
+
+import json
+
+import httpx
+import pytest
+
+from src.cli.reveal_commands import ProspectWorkItem, partition_prospects
+from src.lib.contact_cache import ContactCache
+from src.lib.rate_limit_registry import RateLimitRegistry
+from src.lib.revealed_index import KEY_SIZE, RevealedIndex, pack_uid
+from src.services.airtable_callback_handler import AirtableCallbackWriter
+
+
+pytestmark = pytest.mark.unit
+
+
+def _uid(i: int) -> str:
+    return f"{i:032x}"
+
+
+def test_uids_packed_into_16_bytes():
+    assert pack_uid("10000000000000000000000000001006") == bytes.fromhex(
+        "10000000000000000000000000001006"
+    )
+    assert len(pack_uid("not-a-hex-uid")) == KEY_SIZE
+    assert pack_uid("a") != pack_uid("b")
+
+
+def test_lookups_before_and_after_merge(tmp_path):
+    path = tmp_path / "revealed.idx"
+    index = RevealedIndex(path, merge_threshold=100)
+    assert index.add(_uid(i) for i in range(0, 150, 3)) == 50
+    assert not path.exists()
+    assert _uid(3) in index and _uid(4) not in index
+
+    index.add(_uid(i) for i in range(0, 300, 2))
+    # The delta crossed the threshold and was merged into the sorted file
+    assert path.stat().st_size == 16 + len(index) * KEY_SIZE
+    assert index.delta_path.stat().st_size == 0
+    assert all(_uid(i) in index for i in range(0, 150, 3))
+    assert all(_uid(i) in index for i in range(0, 300, 2))
+    assert _uid(301) not in index and "" not in index
+    assert index.add([_uid(2)]) == 0
+
+
+def test_other_instances_see_updates_after_refresh(tmp_path):
+    path = tmp_path / "revealed.idx"
+    writer = RevealedIndex(path, merge_threshold=4)
+    reader = RevealedIndex(path, merge_threshold=4)
+    assert _uid(1) not in reader
+
+    writer.add([_uid(1), _uid(2)])
+    reader.refresh()
+    assert _uid(1) in reader
+
+    writer.add([_uid(3), _uid(4), _uid(5)])
+    reader.refresh()
+    assert all(_uid(i) in reader for i in range(1, 6))
+
+    writer.rebuild([_uid(9)])
+    reader.refresh()
+    assert _uid(9) in reader and _uid(1) not in reader
+
+
+def test_readers_pick_up_changes_without_explicit_refresh(tmp_path):
+    path = tmp_path / "revealed.idx"
+    now = [0.0]
+    writer = RevealedIndex(path)
+    reader = RevealedIndex(path, refresh_interval=5, time_fn=lambda: now[0])
+    assert _uid(1) not in reader
+
+    writer.add([_uid(1)])
+    assert _uid(1) not in reader
+    now[0] = 5.0
+    assert _uid(1) in reader
+
+    writer.rebuild([_uid(2)])
+    now[0] = 10.0
+    assert _uid(2) in reader and _uid(1) not in reader
+
+
+def test_contact_cache_feeds_the_index(tmp_path):
+    cache = ContactCache(tmp_path / "contacts.db")
+    cache.upsert(_uid(1), profile={"fullName": "No contacts yet"})
+    cache.upsert(_uid(2), contacts=[{"type": "email", "value": "a@b.com"}])
+    cache.upsert_many({_uid(3): {"contacts": [{"type": "phone", "value": "555"}]}})
+
+    index = RevealedIndex(tmp_path / "revealed.idx")
+    assert [_uid(i) in index for i in (1, 2, 3)] == [False, True, True]
+
+    cache.revealed_index.rebuild([])
+    assert cache.rebuild_revealed_index() == 2
+
+    cache.clear()
+    assert len(cache.revealed_index) == 0
+    assert _uid(2) not in cache.revealed_index
+
+
+@pytest.mark.asyncio
+async def test_airtable_writer_feeds_the_index(tmp_path):
+    index = RevealedIndex(tmp_path / "revealed.idx")
+    writer = AirtableCallbackWriter(
+        "key",
+        "appTest",
+        "tblContacts",
+        registry=RateLimitRegistry({}),
+        revealed_index=index,
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(
+                200, json={"records": json.loads(request.content)["records"]}
+            )
+        ),
+    )
+    writer.enqueue(
+        [
+            {"SignalHire ID": _uid(1), "Primary Email": "a@b.com"},
+            {"SignalHire ID": _uid(2), "Full Name": "No contacts"},
+        ]
+    )
+    await writer.flush(force=True)
+    await writer.aclose()
+
+    assert _uid(1) in index and _uid(2) not in index
+
+
+def test_partition_skips_indexed_uids(tmp_path):
+    index = RevealedIndex(tmp_path / "revealed.idx")
+    index.add([_uid(1)])
+    items = [ProspectWorkItem(uid=_uid(1)), ProspectWorkItem(uid=_uid(2))]
+
+    pending, revealed = partition_prospects(items, None, True, index)
+    assert [item.uid for item in pending] == [_uid(2)]
+    assert revealed[0][0].uid == _uid(1)
+    assert revealed[0][1].record_id == ""
+
+    pending, revealed = partition_prospects(items, None, False, index)
+    assert len(pending) == 2 and revealed == []
@@ -0,0 +1,95 @@
+"""
+Unit tests for pipelined scroll-search pagination
+
+Covers:
+- Pages yielded in order until the scroll runs out or max_pages is reached
+- The next page requested while the caller is still processing the current one
+- One pooled session for the whole scroll
+- Failed pages raising SignalHireAPIError
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.services.signalhire_client import SignalHireAPIError
+
+
+pytestmark = pytest.mark.unit
+
+
+def _scroll_handler(pages: int, requested: list[str], fail_on: str | None = None):
+    def handler(request: httpx.Request) -> httpx.Response:
+        scroll_id = json.loads(request.content)["scrollId"]
+        requested.append(scroll_id)
+        if scroll_id == fail_on:
+            return httpx.Response(500, json={"error": "boom"})
+        number = int(scroll_id.removeprefix("s"))
+        data = {"profiles": [{"uid": f"p{number}-{i}"} for i in range(2)]}
+        if number < pages:
+            data["scrollId"] = f"s{number + 1}"
+        return httpx.Response(200, json=data)
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_pages_are_yielded_in_order(mock_signalhire_client):
+    requested: list[str] = []
+    client = mock_signalhire_client(_scroll_handler(pages=3, requested=requested))
+    session = client.session
+
+    pages = [page async for page in client.iter_search_pages(7, "s1")]
+    await client.close()
+
+    assert [page.number for page in pages] == [1, 2, 3]
+    assert [page.scroll_id for page in pages] == ["s2", "s3", None]
+    assert requested == ["s1", "s2", "s3"]
+    assert client.session is None and session.is_closed
+
+
+@pytest.mark.asyncio
+async def test_next_page_is_prefetched_while_caller_processes(mock_signalhire_client):
+    requested: list[str] = []
+    client = mock_signalhire_client(_scroll_handler(pages=5, requested=requested))
+
+    async for page in client.iter_search_pages(7, "s1"):
+        if page.number == 1:
+            # Give the prefetch task a chance to run while page 1 is in hand
+            for _ in range(20):
+                await asyncio.sleep(0)
+            assert requested == ["s1", "s2"]
+            break
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_max_pages_stops_without_extra_request(mock_signalhire_client):
+    requested: list[str] = []
+    client = mock_signalhire_client(_scroll_handler(pages=5, requested=requested))
+
+    profiles = [
+        profile["uid"]
+        async for profile in client.iter_search_profiles(7, "s1", max_pages=2)
+    ]
+    await client.close()
+
+    assert profiles == ["p1-0", "p1-1", "p2-0", "p2-1"]
+    assert requested == ["s1", "s2"]
+
+
+@pytest.mark.asyncio
+async def test_failed_page_raises(mock_signalhire_client):
+    requested: list[str] = []
+    client = mock_signalhire_client(_scroll_handler(pages=5, requested=requested, fail_on="s2"))
+    seen = []
+
+    with pytest.raises(SignalHireAPIError) as exc_info:
+        async for page in client.iter_search_pages(7, "s1"):
+            seen.append(page.number)
+    await client.close()
+
+    assert seen == [1]
+    assert exc_info.value.status_code == 500
@@ -0,0 +1,137 @@
+"""
+Unit tests for the on-disk search response cache
+
+Covers:
+- Canonical criteria keys (key order, whitespace, Boolean operator case)
+- TTL expiry and LRU eviction by entry count and size
+- SignalHireClient serving repeated searches from the cache without charging quota
+- Refresh bypassing the lookup but updating the entry
+- Scroll pages and paginated first pages never served from the cache
+"""
+
+import httpx
+import pytest
+
+from src.lib.search_cache import SearchCache, canonicalize_criteria, search_cache_key
+
+
+pytestmark = pytest.mark.unit
+
+
+class FakeClock:
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_equivalent_criteria_share_a_key():
+    first = {"currentTitle": "engineer  or  manager", "location": " Denver ", "size": 10}
+    second = {"size": 10, "location": "Denver", "currentTitle": "engineer OR manager"}
+
+    assert search_cache_key("/candidate/searchByQuery", first) == search_cache_key(
+        "/candidate/searchByQuery", second
+    )
+    assert search_cache_key("/candidate/searchByQuery", first) != search_cache_key(
+        "/candidate/searchByQuery", first, namespace="other-account"
+    )
+    # Quoted phrases are literal
+    assert canonicalize_criteria({"keywords": '"research and development" and sales'}) == {
+        "keywords": '"research and development" AND sales'
+    }
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    clock = FakeClock()
+    cache = SearchCache(tmp_path, ttl=60, time_fn=clock)
+    cache.put("k", {"profiles": []})
+
+    clock.now += 59
+    assert cache.get("k") == {"profiles": []}
+    clock.now += 1
+    assert cache.get("k") is None
+    assert not (tmp_path / "k.json").exists()
+    assert cache.get_stats()["expired"] == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = SearchCache(tmp_path, max_entries=2)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    cache.get("a")
+    cache.put("c", {"n": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.get_stats()["evictions"] == 1
+
+    # A fresh instance rebuilds the index from disk
+    assert SearchCache(tmp_path, max_entries=2).get_stats()["entries"] == 2
+
+
+def test_size_bound_evicts(tmp_path):
+    cache = SearchCache(tmp_path, max_bytes=400)
+    for key in "abc":
+        cache.put(key, {"profiles": ["x" * 100]})
+
+    stats = cache.get_stats()
+    assert stats["bytes"] <= 400
+    assert stats["entries"] < 3
+
+
+@pytest.mark.asyncio
+async def test_client_serves_repeat_searches_from_cache(tmp_path, mock_signalhire_client):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(
+            200, json={"requestId": 1, "profiles": [{"uid": "u1"}], "total": 1}
+        )
+
+    client = mock_signalhire_client(handler, search_cache=SearchCache(tmp_path))
+
+    first = await client.search_prospects({"currentTitle": "engineer or manager"}, size=5)
+    second = await client.search_prospects({"currentTitle": " engineer  OR manager"}, size=5)
+    assert first.success and second.success
+    assert second.data == first.data
+    assert len(calls) == 1
+    # The hit was not charged
+    assert client.rate_limiter.usage_ledger.totals()["searches"] == 1
+
+    refreshed = await client.search_prospects(
+        {"currentTitle": "engineer or manager"}, size=5, refresh=True
+    )
+    await client.close()
+
+    assert refreshed.success
+    assert len(calls) == 2
+    assert client.search_cache.get_stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_scroll_cursors_are_never_cached(tmp_path, mock_signalhire_client):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(
+            200,
+            json={"requestId": 1, "scrollId": f"s{len(calls)}", "profiles": [{"uid": "u1"}]},
+        )
+
+    cache = SearchCache(tmp_path)
+    client = mock_signalhire_client(handler, search_cache=cache)
+
+    await client.search_prospects({"currentTitle": "engineer"}, size=5)
+    # A search whose scrollId will be followed always gets a live cursor
+    paged = await client.search_prospects({"currentTitle": "engineer"}, size=5, use_cache=False)
+    first = await client.scroll_search(1, "s1")
+    second = await client.scroll_search(1, "s1")
+    await client.close()
+
+    assert paged.data["scrollId"] == "s2"
+    assert (first.data["scrollId"], second.data["scrollId"]) == ("s3", "s4")
+    assert len(calls) == 4
+    assert cache.get_stats()["entries"] == 1
@@ -0,0 +1,88 @@
+"""
+Unit tests for single-flight coalescing of idempotent requests
+
+Covers:
+- Concurrent identical calls sharing one execution and its exception
+- Cancelling one waiter leaving the shared call running for the others
+- SignalHireClient coalescing /credits, suggestions and prospect details
+- Hit/coalesce counters in the client stats
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.lib.async_utils import SingleFlight
+from src.lib.credit_ledger import CreditLedger
+
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+    assert results == [1] * 5
+    assert flight.get_stats() == {"executed": 1, "coalesced": 4, "in_flight": 0}
+
+    # Nothing is cached once the call completes
+    assert await flight.do("k", work) == 2
+
+
+@pytest.mark.asyncio
+async def test_exceptions_are_shared_and_cancellation_is_isolated():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def failing():
+        await release.wait()
+        raise RuntimeError("boom")
+
+    first = asyncio.create_task(flight.do("k", failing))
+    second = asyncio.create_task(flight.do("k", failing))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    with pytest.raises(RuntimeError):
+        await second
+
+
+@pytest.mark.asyncio
+async def test_client_coalesces_idempotent_requests(mock_signalhire_client):
+    paths = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path.rsplit("/", 1)[-1])
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"credits": 10})
+
+    client = mock_signalhire_client(handler, credit_ledger=CreditLedger())
+
+    await asyncio.gather(
+        *(client.check_credits() for _ in range(10)),
+        *(client.get_search_suggestions("acme") for _ in range(3)),
+        *(client.get_prospect_details("uid-1") for _ in range(3)),
+        client.get_prospect_details("uid-2"),
+    )
+    assert await client.validate_api_key()
+    await client.close()
+
+    assert sorted(paths) == ["credits", "searchByQuery", "searchByQuery", "suggestions"]
+    stats = client.get_retry_stats()["single_flight"]
+    assert stats["executed"] == 4
+    assert stats["coalesced"] == 13
+    # The follow-up check is answered from the balance /credits reported
+    assert stats["credits_ledger_hits"] == 1
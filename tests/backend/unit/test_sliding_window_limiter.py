@@ -0,0 +1,89 @@
+"""
+Unit tests for the sliding-window request limiter
+
+Covers:
+- Admission up to the limit and expiry as the window slides
+- Multi-slot admissions (multi-item Person API requests)
+- No overshoot with many concurrent callers
+- Cancellation while waiting
+"""
+
+import asyncio
+
+import pytest
+
+from src.lib.rate_limiter import SlidingWindowLimiter
+
+
+pytestmark = pytest.mark.unit
+
+
+class FakeClock:
+    def __init__(self, start: float = 100.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_window_slides():
+    clock = FakeClock()
+    limiter = SlidingWindowLimiter(3, 60, time_fn=clock)
+
+    assert all(limiter.try_acquire() for _ in range(3))
+    assert not limiter.try_acquire()
+
+    clock.now += 59.9
+    assert not limiter.try_acquire()
+    clock.now += 0.1
+    assert limiter.try_acquire()
+    assert limiter.count == 1
+
+
+def test_multi_slot_admission():
+    clock = FakeClock()
+    limiter = SlidingWindowLimiter(600, 60, time_fn=clock)
+
+    assert limiter.try_acquire(100)
+    assert limiter.try_acquire(500)
+    assert not limiter.try_acquire(1)
+    assert limiter.count == 600
+
+    with pytest.raises(ValueError):
+        asyncio.run(limiter.acquire(601))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_never_overshoot():
+    limiter = SlidingWindowLimiter(5, 0.2)
+    loop = asyncio.get_running_loop()
+    admitted: list[float] = []
+
+    async def caller():
+        await limiter.acquire()
+        admitted.append(loop.time())
+
+    started = loop.time()
+    await asyncio.gather(*(caller() for _ in range(15)))
+
+    # 15 admissions at 5 per 0.2s need at least two full window slides
+    assert loop.time() - started >= 0.35
+    admitted.sort()
+    for i in range(len(admitted) - 5):
+        assert admitted[i + 5] - admitted[i] >= 0.19
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_admits_nothing():
+    limiter = SlidingWindowLimiter(1, 0.2)
+    await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert limiter.count == 1
+    await asyncio.wait_for(limiter.acquire(), timeout=1)
+    assert limiter.count == 1
@@ -0,0 +1,140 @@
+"""
+Unit tests for the sliding-window streaming reveal engine
+
+Covers:
+- Results streamed in completion order without per-batch barriers
+- Window size bound on requests in flight
+- Async iterator sources and multi-item packing
+- batch_reveal_contacts beyond 100 prospects
+- Streaming queue processing, leasing a window of items at a time
+"""
+
+import asyncio
+
+import pytest
+
+from src.services.signalhire_client import APIResponse, SignalHireClient
+
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.asyncio
+async def test_slow_request_does_not_block_window(monkeypatch):
+    client = SignalHireClient(api_key="test-key")
+    in_flight = 0
+    observed_max = 0
+
+    async def fake_reveal(prospect_id: str):
+        nonlocal in_flight, observed_max
+        in_flight += 1
+        observed_max = max(observed_max, in_flight)
+        await asyncio.sleep(0.2 if prospect_id == "slow" else 0.01)
+        in_flight -= 1
+        return APIResponse(success=True)
+
+    monkeypatch.setattr(client, "reveal_contact", fake_reveal)
+
+    items = ["slow"] + [f"p{i}" for i in range(8)]
+    completed = [r.item async for r in client.stream_reveal(items, max_in_flight=3)]
+
+    # Everything else finishes while the slow request is still in flight
+    assert completed[-1] == "slow"
+    assert sorted(completed) == sorted(items)
+    assert observed_max == 3
+
+
+@pytest.mark.asyncio
+async def test_stream_reveal_accepts_async_source(monkeypatch):
+    client = SignalHireClient(api_key="test-key")
+    payloads = []
+
+    async def fake_request(method, endpoint, **kwargs):
+        payloads.append(kwargs["json"]["items"])
+        return APIResponse(success=True, data={"requestId": len(payloads)})
+
+    monkeypatch.setattr(client, "_make_request", fake_request)
+
+    async def uids():
+        for i in range(25):
+            await asyncio.sleep(0)
+            yield f"uid-{i}"
+
+    results = [
+        r async for r in client.stream_reveal(uids(), items_per_request=10)
+    ]
+
+    assert sorted(len(p) for p in payloads) == [5, 10, 10]
+    assert sorted(r.index for r in results) == list(range(25))
+    assert all(r.response.data["item"] == r.item for r in results)
+
+
+@pytest.mark.asyncio
+async def test_batch_reveal_contacts_handles_more_than_100(monkeypatch):
+    client = SignalHireClient(api_key="test-key")
+
+    async def fake_credits():
+        return APIResponse(success=True, data={"credits_remaining": 5000})
+
+    async def fake_reveal(prospect_id: str):
+        return APIResponse(success=True, data={"prospect_id": prospect_id})
+
+    monkeypatch.setattr(client, "check_credits", fake_credits)
+    monkeypatch.setattr(client, "reveal_contact", fake_reveal)
+
+    ids = [f"p{i}" for i in range(250)]
+    results = await client.batch_reveal_contacts(ids)
+
+    assert [r.data["prospect_id"] for r in results] == ids
+
+
+@pytest.mark.asyncio
+async def test_process_queue_until_empty_streaming(monkeypatch):
+    client = SignalHireClient(api_key="test-key")
+    revealed = []
+
+    async def fake_reveal(prospect_id: str):
+        revealed.append(prospect_id)
+        return APIResponse(success=True)
+
+    monkeypatch.setattr(client, "reveal_contact", fake_reveal)
+    client.queue_batch([f"p{i}" for i in range(12)])
+
+    stats = await client.process_queue_until_empty(streaming=True)
+
+    assert sorted(revealed) == sorted(f"p{i}" for i in range(12))
+    assert stats["total_processed"] == 12
+    assert stats["total_successful"] == 12
+    assert not client.batch_queue.queue
+
+
+@pytest.mark.asyncio
+async def test_streaming_queue_leases_a_window_at_a_time(monkeypatch):
+    client = SignalHireClient(api_key="test-key")
+    client.max_concurrency = 4
+    leases = []
+    lease = client.batch_queue.get_next_batch
+
+    def counting_lease(batch_size=None):
+        batch = lease(batch_size)
+        leases.append(len(batch))
+        return batch
+
+    async def fake_reveal(prospect_id: str):
+        return APIResponse(success=True)
+
+    async def record(progress):
+        remaining.append(progress["remaining_contacts"])
+
+    remaining = []
+    monkeypatch.setattr(client.batch_queue, "get_next_batch", counting_lease)
+    monkeypatch.setattr(client, "reveal_contact", fake_reveal)
+    client.queue_batch([f"p{i}" for i in range(10)])
+
+    stats = await client.process_queue_until_empty(
+        streaming=True, progress_callback=record
+    )
+
+    assert stats["total_processed"] == 10
+    assert leases == [4, 4, 2, 0]
+    assert remaining == list(range(9, -1, -1))
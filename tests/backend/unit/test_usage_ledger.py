@@ -0,0 +1,238 @@
+"""
+Unit tests for the hour-bucketed usage ledger
+
+Covers:
+- Rolling 24h totals and bucket expiry
+- Sharing usage between ledger instances (separate CLI processes)
+- Compaction by another process detected by inode, not size
+- One-time migration from legacy operation files, also when several
+  processes create the ledger at once
+- Unchanged ledgers answered from memory after one stat
+- RateLimiter daily checks reading from the ledger off the event loop
+"""
+
+import asyncio
+import fcntl
+import json
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.lib.usage_ledger import UsageLedger
+from src.services.signalhire_client import RateLimiter
+
+
+pytestmark = pytest.mark.unit
+
+
+class FakeClock:
+    def __init__(self, start: float = 1_700_000_000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_rolling_window_expires_old_buckets(tmp_path):
+    clock = FakeClock()
+    ledger = UsageLedger(
+        tmp_path / "ledger.jsonl", operations_dir=tmp_path / "ops", time_fn=clock
+    )
+
+    ledger.record(credits_used=3, reveals=3)
+    clock.now += 3600 * 5
+    ledger.record(search_profiles=25, searches=1)
+
+    assert ledger.totals() == {
+        "credits_used": 3,
+        "reveals": 3,
+        "search_profiles": 25,
+        "searches": 1,
+    }
+
+    # First bucket leaves the 24h window, second one remains
+    clock.now += 3600 * 20
+    totals = ledger.totals()
+    assert totals["credits_used"] == 0
+    assert totals["search_profiles"] == 25
+
+
+def test_usage_is_shared_between_instances(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "ledger.jsonl"
+    first = UsageLedger(path, operations_dir=tmp_path / "ops", time_fn=clock)
+    second = UsageLedger(path, operations_dir=tmp_path / "ops", time_fn=clock)
+
+    first.record(credits_used=2, reveals=2)
+    assert second.totals()["credits_used"] == 2
+
+    second.record(credits_used=1, reveals=1)
+    assert first.totals()["credits_used"] == 3
+
+
+def test_migration_from_operation_files(tmp_path):
+    ops_dir = tmp_path / "operations"
+    ops_dir.mkdir()
+    recent = datetime.now().isoformat()
+    stale = (datetime.now() - timedelta(days=3)).isoformat()
+
+    operations = [
+        {"type": "reveal", "status": "completed", "created_at": recent,
+         "results": {"credits_used": 4}},
+        {"type": "search", "status": "completed", "created_at": recent,
+         "results": {"profiles": [{"uid": "a"}, {"uid": "b"}]}},
+        {"type": "reveal", "status": "completed", "created_at": stale,
+         "results": {"credits_used": 50}},
+        {"type": "reveal", "status": "failed", "created_at": recent},
+    ]
+    for i, op in enumerate(operations):
+        (ops_dir / f"op{i}.json").write_text(json.dumps(op))
+    (ops_dir / "broken.json").write_text("{not json")
+
+    ledger = UsageLedger(tmp_path / "ledger.jsonl", operations_dir=ops_dir)
+    totals = ledger.totals()
+
+    assert totals == {
+        "credits_used": 4,
+        "reveals": 1,
+        "search_profiles": 2,
+        "searches": 1,
+    }
+
+    # Migration only runs once: a fresh instance reads the ledger, not the files
+    (ops_dir / "op0.json").unlink()
+    assert UsageLedger(tmp_path / "ledger.jsonl", operations_dir=ops_dir).totals() == totals
+
+
+def test_concurrent_first_use_migrates_once(tmp_path):
+    ops_dir = tmp_path / "operations"
+    ops_dir.mkdir()
+    (ops_dir / "op.json").write_text(json.dumps(
+        {"type": "reveal", "status": "completed",
+         "created_at": datetime.now().isoformat(), "results": {"credits_used": 4}}
+    ))
+    path = tmp_path / "ledger.jsonl"
+    ledgers = [UsageLedger(path, operations_dir=ops_dir) for _ in range(8)]
+    # Every instance finds the ledger missing before any of them creates it
+    barrier = threading.Barrier(len(ledgers))
+    for ledger in ledgers:
+        initialise = ledger._initialise
+
+        def racing(initialise=initialise):
+            barrier.wait()
+            initialise()
+
+        ledger._initialise = racing
+
+    threads = [threading.Thread(target=ledger.totals) for ledger in ledgers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(path.read_text().splitlines()) == 1
+    assert UsageLedger(path, operations_dir=ops_dir).totals()["credits_used"] == 4
+
+
+def test_compaction_keeps_totals(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "ledger.jsonl"
+    ledger = UsageLedger(path, operations_dir=tmp_path / "ops", time_fn=clock)
+    for _ in range(100):
+        ledger.record(credits_used=1, reveals=1)
+
+    reloaded = UsageLedger(path, operations_dir=tmp_path / "ops", time_fn=clock)
+    assert reloaded.totals()["credits_used"] == 100
+    assert len(path.read_text().splitlines()) == 1
+
+
+def test_reader_notices_compaction_followed_by_appends(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "ledger.jsonl"
+    reader = UsageLedger(path, operations_dir=tmp_path / "ops", time_fn=clock)
+    for _ in range(20):
+        reader.record(credits_used=1)
+    offset = path.stat().st_size
+
+    # Another process compacts the ledger, then appends past the reader's offset
+    writer = UsageLedger(path, operations_dir=tmp_path / "ops", time_fn=clock)
+    writer.totals()
+    assert len(path.read_text().splitlines()) == 1
+    for _ in range(30):
+        writer.record(credits_used=1)
+    assert path.stat().st_size > offset
+
+    assert reader.totals()["credits_used"] == 50
+    assert writer.totals()["credits_used"] == 50
+
+
+def test_unchanged_ledger_is_answered_from_memory(tmp_path, monkeypatch):
+    clock = FakeClock()
+    path = tmp_path / "ledger.jsonl"
+    reader = UsageLedger(path, operations_dir=tmp_path / "ops", time_fn=clock)
+    writer = UsageLedger(path, operations_dir=tmp_path / "ops", time_fn=clock)
+    writer.record(credits_used=1)
+    assert reader.totals()["credits_used"] == 1
+
+    reads = []
+    read_new_lines = reader._read_new_lines
+    monkeypatch.setattr(
+        reader, "_read_new_lines", lambda: reads.append(1) or read_new_lines()
+    )
+    for _ in range(5):
+        assert reader.totals()["credits_used"] == 1
+    assert reads == []
+
+    writer.record(credits_used=2)
+    assert reader.totals()["credits_used"] == 3
+    assert reads == [1]
+
+
+@pytest.mark.asyncio
+async def test_locked_ledger_does_not_block_the_loop(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "ledger.jsonl"
+    hour = int(clock() // 3600)
+    # Enough lines to make the first load compact the ledger under its lock
+    line = json.dumps({"hour": hour, "credits_used": 1}) + "\n"
+    path.write_text(line * 20)
+    ledger = UsageLedger(path, operations_dir=tmp_path / "ops", time_fn=clock)
+    limiter = RateLimiter(usage_ledger=ledger)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    with open(path, "a") as other_process:
+        fcntl.flock(other_process.fileno(), fcntl.LOCK_EX)
+        # Released from a thread so a blocked loop cannot keep the lock forever
+        release = threading.Timer(
+            0.2, fcntl.flock, (other_process.fileno(), fcntl.LOCK_UN)
+        )
+        release.start()
+        ticking = asyncio.create_task(ticker())
+        status = await asyncio.wait_for(limiter.check_daily_limits(), 5)
+        release.join()
+    ticking.cancel()
+
+    assert ticks >= 5
+    assert status["current_usage"] == 20
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_reads_daily_usage_from_ledger(tmp_path):
+    ledger = UsageLedger(tmp_path / "ledger.jsonl", operations_dir=tmp_path / "ops")
+    limiter = RateLimiter(daily_limit=10, usage_ledger=ledger)
+
+    limiter.record_usage(credits_used=9, reveals=9)
+    status = await limiter.check_daily_limits()
+    assert status["current_usage"] == 9
+    assert status["remaining"] == 1
+
+    limiter.record_usage(credits_used=1, reveals=1)
+    with pytest.raises(Exception, match="Insufficient daily credits"):
+        await limiter.wait_if_needed(credits_needed=1)
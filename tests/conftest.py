@@ -33,6 +33,56 @@ def pytest_collection_modifyitems(config, items):
 
 
 
+@pytest.fixture(autouse=True)
+def in_memory_batch_queue(monkeypatch):
+    """Keep SignalHireClient batch queues out of ~/.signalhire-agent."""
+    monkeypatch.setenv("SIGNALHIRE_QUEUE_DB", ":memory:")
+
+
+@pytest.fixture(autouse=True)
+def isolated_usage_ledger(tmp_path, monkeypatch):
+    """Point rate limiters built without a ledger at a per-test one."""
+    from src.lib import usage_ledger
+
+    monkeypatch.setattr(
+        usage_ledger, "_default_ledger_path", lambda: tmp_path / "usage" / "ledger.jsonl"
+    )
+    monkeypatch.setattr(
+        usage_ledger, "_default_operations_dir", lambda: tmp_path / "operations"
+    )
+
+
+@pytest.fixture(autouse=True)
+def isolated_contact_cache(tmp_path, monkeypatch):
+    """Give the shared contact cache and revealed index per-test files."""
+    from src.lib import contact_cache, revealed_index
+
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(
+        contact_cache, "_default_cache_path", lambda: cache_dir / "contacts.db"
+    )
+    monkeypatch.setattr(
+        revealed_index, "_default_index_path", lambda: cache_dir / "revealed.idx"
+    )
+    monkeypatch.setattr(contact_cache, "_default_cache", None)
+    monkeypatch.setattr(revealed_index, "_default_index", None)
+
+
+@pytest.fixture
+def mock_signalhire_client():
+    """Build SignalHireClients whose HTTP requests are answered by ``handler``."""
+    import httpx
+
+    from src.services.signalhire_client import SignalHireClient
+
+    def build(handler, **kwargs) -> SignalHireClient:
+        client = SignalHireClient(api_key="test-key", **kwargs)
+        client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return client
+
+    return build
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Create an instance of the default event loop for the test session."""